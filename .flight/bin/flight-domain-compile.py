@@ -13,6 +13,8 @@ Single source of truth: .flight YAML generates both spec and validator.
 """
 
 import argparse
+import ast
+import hashlib
 import itertools
 import json
 import re
@@ -133,6 +135,7 @@ class DomainSpec:
     anti_patterns: list = field(default_factory=list)
     sources: list = field(default_factory=list)
     exclude_patterns: list = field(default_factory=list)
+    activation: dict = field(default_factory=dict)  # literals / pattern content signature
 
     def rules_by_severity(self, severity: str) -> list:
         """Get rules filtered by severity, sorted by ID."""
@@ -325,6 +328,17 @@ def validate_spec(data: dict, domain: str) -> tuple[list, list]:
                         f"{domain}.flight: Rule {rule_id} has type 'ast' but no 'query' field"
                     )
 
+            # python_ast is an alternative form of an ast query for Python's ast module
+            if "python_ast" in check:
+                if check_type != "ast":
+                    errors.append(
+                        f"{domain}.flight: Rule {rule_id} has 'python_ast' but is not type 'ast'"
+                    )
+                errors.extend(
+                    f"{domain}.flight: Rule {rule_id} {error}"
+                    for error in validate_python_ast(check["python_ast"])
+                )
+
         # Provenance warnings (schema v2)
         provenance = rule_data.get("provenance", {})
         if rule_data.get("mechanical"):
@@ -354,6 +368,27 @@ def validate_spec(data: dict, domain: str) -> tuple[list, list]:
                 f"{domain}.flight: Info {info_id} has invalid regex pattern"
             )
 
+    # Validate domain activation signature
+    activation = data.get("activation")
+    if activation is not None:
+        if not isinstance(activation, dict):
+            errors.append(f"{domain}.flight: 'activation' must be a mapping")
+        else:
+            literals = activation.get("literals", [])
+            pattern = activation.get("pattern", "")
+            if not isinstance(literals, list) or not all(isinstance(lit, str) and lit for lit in literals):
+                errors.append(
+                    f"{domain}.flight: activation.literals must be a list of non-empty strings"
+                )
+            if not literals and not pattern:
+                errors.append(
+                    f"{domain}.flight: activation needs 'literals' or 'pattern'"
+                )
+            if pattern and not validate_regex_pattern(pattern, "activation", domain):
+                errors.append(
+                    f"{domain}.flight: activation has invalid regex pattern"
+                )
+
     # Domain-level provenance warnings
     domain_prov = data.get("provenance", {})
     if domain_prov:
@@ -387,6 +422,7 @@ def parse_domain_spec(data: dict) -> DomainSpec:
         anti_patterns=data.get("anti_patterns", []),
         sources=data.get("sources", []),
         exclude_patterns=data.get("exclude_patterns", []),
+        activation=data.get("activation", {}),
     )
 
 
@@ -711,6 +747,38 @@ fi
 '''
 
 
+def generate_activation_filter(spec: DomainSpec) -> str:
+    """Generate code that keeps only files containing the domain's activation signature."""
+    if not spec.activation:
+        return ""
+
+    greps = []
+    for literal in spec.activation.get("literals", []):
+        greps.append(f'grep -qF -- "{escape_bash_pattern(literal)}" "$f" 2>/dev/null')
+    pattern = spec.activation.get("pattern", "")
+    if pattern:
+        greps.append(f'grep -qE -- "{escape_bash_pattern(pattern)}" "$f" 2>/dev/null')
+    condition = " || ".join(greps)
+
+    return f'''
+# Activation: only files containing the domain signature can violate its rules
+ACTIVE_FILES=()
+for f in "${{FILES[@]}}"; do
+    if {condition}; then
+        ACTIVE_FILES+=("$f")
+    fi
+done
+
+if [[ ${{#ACTIVE_FILES[@]}} -eq 0 ]]; then
+    green "  RESULT: SKIP (no files match activation signature)"
+    exit 0
+fi
+
+FILES=("${{ACTIVE_FILES[@]}}")
+printf 'Active files: %d\\n\\n' "${{#FILES[@]}}"
+'''
+
+
 def escape_bash_pattern(pattern: str) -> str:
     """Escape a pattern for use in bash double quotes."""
     # Escape characters that have special meaning in bash double quotes
@@ -835,9 +903,12 @@ def generate_check_command(rule: Rule) -> str:
         escaped_pattern = escape_bash_pattern(pattern)
         base_cmd = f'grep {flags} "{escaped_pattern}" "${{FILES[@]}}"'
 
-        # Handle ignore_when - filter out lines matching any exclusion pattern
+        # Handle ignore_when (basic regex) and exclude (extended regex) - filter
+        # out lines matching any exclusion pattern
         ignore_when = check.get("ignore_when", [])
-        if ignore_when:
+        exclude = check.get("exclude") or []
+        exclude_patterns = exclude if isinstance(exclude, list) else [exclude]
+        if ignore_when or exclude_patterns:
             # Build pipeline: grep pattern | grep -v exclude1 | grep -v exclude2
             # Use bash -c with positional args to pass FILES, similar to script type
             # Escape patterns for single-quoted bash -c context
@@ -846,6 +917,9 @@ def generate_check_command(rule: Rule) -> str:
             for ignore_pattern in ignore_when:
                 escaped_ignore = escape_pattern_for_bash_c(ignore_pattern)
                 pipeline_parts.append(f'grep -v "{escaped_ignore}"')
+            for exclude_pattern in exclude_patterns:
+                escaped_exclude = escape_pattern_for_bash_c(exclude_pattern)
+                pipeline_parts.append(f'grep -Ev "{escaped_exclude}"')
             pipeline = " | ".join(pipeline_parts)
             return f"bash -c '({pipeline}) || true' _ \"${{FILES[@]}}\""
 
@@ -1099,6 +1173,10 @@ def generate_sh(spec: DomainSpec) -> str:
     # Header
     lines.append(generate_sh_header(spec))
 
+    # Activation signature filter if configured
+    if spec.activation:
+        lines.append(generate_activation_filter(spec))
+
     # API file detection if configured
     if spec.api_file_detection:
         lines.append(generate_api_file_detection(spec))
@@ -1168,15 +1246,113 @@ def infer_language_from_domain(domain_name: str, file_patterns: list) -> str:
             return 'go'
         if '.rs' in pattern:
             return 'rust'
+        if pattern.endswith(('.c', '.h', '.{c,h}')):
+            return 'c'
 
     return 'unknown'
 
 
+# Check types flight-lint evaluates natively
+LINT_CHECK_TYPES = ('grep', 'presence', 'requires', 'multi-condition', 'file_exists', 'script', 'ast')
+
+
+def grep_flag_letters(flags) -> str:
+    """Collect the single-letter options of a grep flags value ('-Ein', ['-E', '-i'])."""
+    if isinstance(flags, list):
+        flags = " ".join(flags)
+    return "".join(word[1:] for word in str(flags).split() if word.startswith('-') and not word.startswith('--'))
+
+
+# A basic-regex interval such as \{2,\}
+BRE_INTERVAL = re.compile(r'\\\{\d*,?\d*\\\}')
+
+
+def to_extended_regex(pattern: str) -> str:
+    """Convert an ignore_when pattern to an extended regex.
+
+    The generated validators pass ignore_when to `grep -v`, which reads basic
+    regexes, but most patterns are written as extended ones. Patterns that
+    only make sense as basic regexes (an interval like \\{2,\\}, or a
+    literal '(' that does not compile otherwise) are converted; the rest are
+    kept as written.
+    """
+    try:
+        re.compile(pattern)
+        if not BRE_INTERVAL.search(pattern):
+            return pattern
+    except re.error:
+        pass
+
+    extended = []
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == '\\' and index + 1 < len(pattern):
+            escaped = pattern[index + 1]
+            extended.append(escaped if escaped in '(){}|+?' else char + escaped)
+            index += 2
+            continue
+        extended.append('\\' + char if char in '(){}|+?' else char)
+        index += 1
+    return ''.join(extended)
+
+
+def convert_check_fields(check: dict, check_type: str) -> dict:
+    """Convert the type-specific fields of a check to .rules.json fields.
+
+    Grep flags become ignore_case (-i) and multiline (-z, which makes grep
+    match across lines); exclude, an extended regex, is folded into
+    ignore_when, the way the generated validators filter both out of grep's
+    output.
+    """
+    fields = {}
+    if check_type in ('grep', 'presence'):
+        flag_letters = grep_flag_letters(check.get('flags', ''))
+        if 'i' in flag_letters:
+            fields['ignore_case'] = True
+        if check_type == 'grep' and ('z' in flag_letters or check.get('multiline')):
+            fields['multiline'] = True
+
+    if check_type == 'grep':
+        ignore_when = [to_extended_regex(pattern) for pattern in check.get('ignore_when', [])]
+        exclude = check.get('exclude')
+        if exclude:
+            ignore_when.extend(exclude if isinstance(exclude, list) else [exclude])
+        if ignore_when:
+            fields['ignore_when'] = ignore_when
+    elif check_type == 'requires':
+        if check.get('must_exist'):
+            fields['must_exist'] = check['must_exist']
+        else:
+            fields['trigger'] = check.get('trigger', '')
+            fields['requirement'] = check.get('requirement', '')
+            if check.get('trigger_count'):
+                fields['trigger_count'] = check['trigger_count']
+    elif check_type == 'multi-condition':
+        fields['logic'] = check.get('logic', 'AND')
+        conditions = []
+        for condition in check.get('conditions', []):
+            json_condition = {'pattern': condition.get('pattern', '')}
+            # Conditions default to -Ei, as in the generated validators
+            if 'i' in grep_flag_letters(condition.get('flags', '-Ei')):
+                json_condition['ignore_case'] = True
+            conditions.append(json_condition)
+        fields['conditions'] = conditions
+    elif check_type == 'file_exists':
+        fields['paths'] = list(check.get('paths', []))
+    elif check_type == 'script':
+        fields['code'] = check.get('code', '').strip()
+    elif check_type == 'ast' and check.get('python_ast'):
+        fields['python_ast'] = check['python_ast']
+    return fields
+
+
 def convert_check_to_rule(rule: Rule, domain_name: str = '', file_patterns: list | None = None) -> dict | None:
     """Convert a Rule with check config to a JSON rule entry.
 
-    Returns None for non-mechanical rules or unsupported check types.
-    Supports grep, presence, and ast types.
+    Returns None for non-mechanical rules or unknown check types.
+    Every check type of the generated validators is supported, together
+    with the rule's path scoping (skip_paths, only_paths, api_files_only).
 
     Args:
         rule: The rule to convert
@@ -1189,8 +1365,7 @@ def convert_check_to_rule(rule: Rule, domain_name: str = '', file_patterns: list
     check = rule.check
     check_type = check.get('type', 'grep')
 
-    # Support grep, presence, and ast types
-    if check_type not in ('grep', 'presence', 'ast'):
+    if check_type not in LINT_CHECK_TYPES:
         return None
 
     # Determine output type and fields based on check type
@@ -1200,7 +1375,7 @@ def convert_check_to_rule(rule: Rule, domain_name: str = '', file_patterns: list
         'id': rule.id,
         'title': rule.title,
         'severity': rule.severity,
-        'type': 'ast' if is_ast else 'grep',
+        'type': check_type,
     }
 
     # AST rules require a language field - infer from domain if not specified
@@ -1211,9 +1386,18 @@ def convert_check_to_rule(rule: Rule, domain_name: str = '', file_patterns: list
         if rule_language and rule_language != 'unknown':
             json_rule['language'] = rule_language
 
-    json_rule['pattern'] = None if is_ast else check.get('pattern', '')
+    # Only grep and presence checks match a single pattern
+    json_rule['pattern'] = check.get('pattern', '') if check_type in ('grep', 'presence') else None
     json_rule['query'] = check.get('query', '').strip() if is_ast else None
     json_rule['message'] = rule.description.strip() if rule.description else rule.title
+    json_rule.update(convert_check_fields(check, check_type))
+
+    if rule.skip_paths:
+        json_rule['skip_paths'] = list(rule.skip_paths)
+    if rule.only_paths:
+        json_rule['only_paths'] = list(rule.only_paths)
+    if rule.api_files_only:
+        json_rule['api_files_only'] = True
 
     # Add rule-level provenance if present
     if rule.provenance:
@@ -1260,6 +1444,22 @@ def generate_rules_json(spec: DomainSpec) -> str:
     if spec.exclude_patterns:
         rules_file['exclude_patterns'] = spec.exclude_patterns
 
+    # Content signature checked once per file before any of the domain's rules
+    if spec.activation:
+        activation = {}
+        if spec.activation.get('literals'):
+            activation['literals'] = spec.activation['literals']
+        if spec.activation.get('pattern'):
+            activation['pattern'] = spec.activation['pattern']
+        rules_file['activation'] = activation
+
+    # How api_files_only rules recognise API endpoint files
+    if spec.api_file_detection:
+        rules_file['api_file_detection'] = {
+            'paths': list(spec.api_file_detection.get('paths', [])),
+            'patterns': list(spec.api_file_detection.get('patterns', [])),
+        }
+
     # Add domain-level provenance if present
     if spec.provenance:
         prov = {}
@@ -1300,10 +1500,386 @@ def validate_rules_json(json_content: str) -> bool:
                     f"Rule {idx} (id={rule_entry.get('id', 'unknown')}) "
                     f"missing required field: {field_name}"
                 )
+        if 'python_ast' in rule_entry:
+            python_ast_errors = validate_python_ast(rule_entry['python_ast'])
+            if python_ast_errors:
+                raise ValueError(f"Rule {idx} (id={rule_entry['id']}) {python_ast_errors[0]}")
 
     return True
 
 
+# .rules.json rule keys that describe the rule rather than its check
+RULE_ENTRY_KEYS = ('id', 'title', 'severity', 'message', 'provenance', 'skip_paths', 'only_paths', 'api_files_only')
+
+
+def rules_json_to_spec_data(rules_data: dict) -> dict:
+    """Convert .rules.json content back to the layout parse_domain_spec() reads.
+
+    Lets tools that consume compiled rules (flight-validate) share the
+    DomainSpec/Rule model. Every compiled rule is mechanical; its check holds
+    the .rules.json check fields (type, pattern, ignore_case, trigger, ...)
+    rather than the .flight ones they were compiled from.
+    """
+    rules = {}
+    for rule_entry in rules_data.get('rules', []):
+        check = {
+            key: value for key, value in rule_entry.items()
+            if key not in RULE_ENTRY_KEYS and value is not None
+        }
+        check.setdefault('type', 'grep')
+        rules[rule_entry['id']] = {
+            'title': rule_entry.get('title', ''),
+            'severity': rule_entry.get('severity', 'GUIDANCE'),
+            'mechanical': True,
+            'description': rule_entry.get('message', ''),
+            'check': check,
+            'api_files_only': rule_entry.get('api_files_only', False),
+            'skip_paths': rule_entry.get('skip_paths', []),
+            'only_paths': rule_entry.get('only_paths', []),
+        }
+
+    spec_data = {key: value for key, value in rules_data.items() if key not in ('rules', 'provenance')}
+    spec_data['rules'] = rules
+    return spec_data
+
+
+# =============================================================================
+# Rules Bundle (rules.bundle.json for flight-lint --auto)
+# =============================================================================
+
+# Bumped whenever the bundle layout changes; flight-lint ignores other versions
+RULES_BUNDLE_VERSION = 2
+RULES_BUNDLE_FILENAME = "rules.bundle.json"
+
+# Regex features flight-lint cannot run over a whole buffer at once
+# (lookaround, backreferences, named groups); keep in sync with
+# LINE_BOUND_PATTERN_FEATURES in flight-lint/src/executor.ts
+LINE_BOUND_PATTERN_FEATURES = re.compile(r'\(\?<?[=!]|\\[1-9]|\\k<|\(\?<[A-Za-z_$]')
+
+
+def to_lint_provenance(prov_data: dict, key_map: dict) -> dict:
+    """Rename provenance keys to flight-lint's camelCase, dropping unknown ones."""
+    return {lint_key: prov_data[json_key] for json_key, lint_key in key_map.items() if json_key in prov_data}
+
+
+# Check fields of a .rules.json rule and their flight-lint names, in the
+# order flight-lint's loader sets them
+LINT_CHECK_FIELDS = {
+    'ignore_case': 'ignoreCase',
+    'multiline': 'multiline',
+    'api_files_only': 'apiFilesOnly',
+    'skip_paths': 'skipPaths',
+    'only_paths': 'onlyPaths',
+    'ignore_when': 'ignoreWhen',
+    'must_exist': 'mustExist',
+    'trigger': 'trigger',
+    'requirement': 'requirement',
+    'trigger_count': 'triggerCount',
+    'logic': 'logic',
+    'conditions': 'conditions',
+    'paths': 'paths',
+    'code': 'code',
+}
+
+# Check fields each rule type reads; flight-lint ignores the rest
+LINT_TYPE_FIELDS = {
+    'grep': ('ignore_when',),
+    'requires': ('must_exist', 'trigger', 'requirement', 'trigger_count'),
+    'multi-condition': ('logic', 'conditions'),
+    'file_exists': ('paths',),
+    'script': ('code',),
+}
+
+
+def to_lint_check_fields(rule_entry: dict) -> dict:
+    """Convert the check fields of a .rules.json rule to flight-lint's camelCase.
+
+    Mirrors flight-lint's loader: flags are kept only when true, a requires
+    rule with must_exist ignores its trigger, and multi-condition logic
+    defaults to AND.
+    """
+    rule_type = rule_entry.get('type') or 'grep'
+    read_fields = {'ignore_case', 'multiline', 'api_files_only', 'skip_paths', 'only_paths'}
+    read_fields.update(LINT_TYPE_FIELDS.get(rule_type, ()))
+    if rule_type == 'requires' and rule_entry.get('must_exist') is not None:
+        read_fields -= {'trigger', 'requirement', 'trigger_count'}
+
+    lint_fields = {}
+    for json_key, lint_key in LINT_CHECK_FIELDS.items():
+        value = rule_entry.get(json_key)
+        if json_key not in read_fields or value is None or value is False:
+            continue
+        if json_key == 'conditions':
+            value = [
+                {'pattern': condition['pattern'], 'ignoreCase': True} if condition.get('ignore_case')
+                else {'pattern': condition['pattern']}
+                for condition in value
+            ]
+        lint_fields[lint_key] = value
+    if rule_type == 'multi-condition':
+        lint_fields.setdefault('logic', 'AND')
+    return lint_fields
+
+
+def to_lint_rule(rule_entry: dict) -> dict:
+    """Convert a .rules.json rule to the shape flight-lint holds in memory."""
+    lint_rule = {
+        'id': rule_entry['id'],
+        'title': rule_entry['title'],
+        'severity': rule_entry['severity'],
+        'type': rule_entry.get('type'),
+        'language': rule_entry.get('language'),
+        'pattern': rule_entry.get('pattern'),
+        'query': rule_entry.get('query'),
+        'message': rule_entry['message'],
+    }
+    if rule_entry.get('provenance'):
+        prov = rule_entry['provenance']
+        lint_prov = to_lint_provenance(prov, {
+            'last_verified': 'lastVerified',
+            'confidence': 'confidence',
+            're_verify_after': 'reVerifyAfter',
+        })
+        if prov.get('superseded_by'):
+            lint_prov['supersededBy'] = prov['superseded_by']
+        lint_rule['provenance'] = lint_prov
+    lint_rule.update(to_lint_check_fields(rule_entry))
+    # Drop unset optional fields, as flight-lint's loader leaves them undefined
+    return {key: value for key, value in lint_rule.items() if value is not None or key in ('pattern', 'query')}
+
+
+def to_lint_rules_file(rules_data: dict) -> dict:
+    """Convert a .rules.json document to the shape flight-lint holds in memory."""
+    lint_rules_file = {
+        'domain': rules_data['domain'],
+        'version': rules_data['version'],
+        'filePatterns': rules_data['file_patterns'],
+    }
+    if 'exclude_patterns' in rules_data:
+        lint_rules_file['excludePatterns'] = rules_data['exclude_patterns']
+    if rules_data.get('activation'):
+        lint_rules_file['activation'] = rules_data['activation']
+    if rules_data.get('api_file_detection'):
+        detection = rules_data['api_file_detection']
+        lint_rules_file['apiFileDetection'] = {
+            'paths': detection.get('paths', []),
+            'patterns': detection.get('patterns', []),
+        }
+    if rules_data.get('provenance'):
+        lint_rules_file['provenance'] = to_lint_provenance(rules_data['provenance'], {
+            'last_full_audit': 'lastFullAudit',
+            'audited_by': 'auditedBy',
+            'next_audit_due': 'nextAuditDue',
+        })
+    lint_rules_file['rules'] = [to_lint_rule(rule_entry) for rule_entry in rules_data['rules']]
+    return lint_rules_file
+
+
+def pattern_extensions(file_patterns: list) -> list:
+    """List the file extensions a domain's file_patterns select.
+
+    Patterns whose file name has no literal extension (e.g. '**/Dockerfile')
+    contribute nothing; the index is a hint, never a filter.
+    """
+    extensions = set()
+    for file_pattern in file_patterns:
+        for expanded in expand_brace_pattern(file_pattern):
+            file_name = expanded.rsplit('/', 1)[-1]
+            extension = file_name.rsplit('.', 1)[-1] if '.' in file_name else ''
+            if extension and not any(c in extension for c in '*?[]'):
+                extensions.add('.' + extension)
+    return sorted(extensions)
+
+
+def rule_hash(rule_entry: dict) -> str:
+    """Hash a rule's canonical JSON so consumers can tell which rules changed."""
+    canonical = json.dumps(rule_entry, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def validate_lint_constraints(rules_data: dict) -> None:
+    """Apply the checks flight-lint's loader makes beyond validate_rules_json().
+
+    Bundled entries skip flight-lint's validation, so anything it would
+    reject must be rejected here. Raises ValueError on the first problem.
+    """
+    for field_name in ('domain', 'version'):
+        if not isinstance(rules_data[field_name], str):
+            raise ValueError(f"Invalid '{field_name}'")
+    if not isinstance(rules_data['file_patterns'], list) or not isinstance(rules_data['rules'], list):
+        raise ValueError("'file_patterns' and 'rules' must be arrays")
+
+    activation = rules_data.get('activation')
+    if activation is not None:
+        literals = activation.get('literals') if isinstance(activation, dict) else None
+        pattern = activation.get('pattern') if isinstance(activation, dict) else None
+        if not isinstance(activation, dict) or not (literals or pattern):
+            raise ValueError("'activation' needs 'literals' or 'pattern'")
+        if literals is not None and not all(isinstance(literal, str) and literal for literal in literals):
+            raise ValueError("Invalid 'activation.literals'")
+        if pattern is not None and not (isinstance(pattern, str) and pattern):
+            raise ValueError("Invalid 'activation.pattern'")
+
+    for idx, rule_entry in enumerate(rules_data['rules']):
+        if rule_entry['severity'] not in SEVERITIES:
+            raise ValueError(f"Rule {idx} has invalid severity '{rule_entry['severity']}'")
+        if 'query' not in rule_entry or not (rule_entry['query'] is None or isinstance(rule_entry['query'], str)):
+            raise ValueError(f"Rule {idx} has invalid 'query'")
+        if rule_entry.get('type') == 'ast' and not rule_entry.get('language'):
+            raise ValueError(f"Rule {idx} ({rule_entry['id']}) is type 'ast' but missing 'language'")
+        validate_lint_check_fields(rule_entry, f"Rule {idx} ({rule_entry['id']})")
+
+    detection = rules_data.get('api_file_detection')
+    if detection is not None:
+        if not isinstance(detection, dict) or not (detection.get('paths') or detection.get('patterns')):
+            raise ValueError("'api_file_detection' needs 'paths' or 'patterns'")
+        for field_name in ('paths', 'patterns'):
+            if not is_string_list(detection.get(field_name, [])):
+                raise ValueError(f"Invalid 'api_file_detection.{field_name}'")
+    api_rule = next((rule_entry for rule_entry in rules_data['rules'] if rule_entry.get('api_files_only')), None)
+    if api_rule is not None and detection is None:
+        raise ValueError(f"Rule {api_rule['id']} sets 'api_files_only' but there is no 'api_file_detection'")
+
+
+def is_string_list(value) -> bool:
+    """Check that a value is a list of non-empty strings."""
+    return isinstance(value, list) and all(isinstance(item, str) and item for item in value)
+
+
+def validate_lint_check_fields(rule_entry: dict, rule_label: str) -> None:
+    """Apply flight-lint's checks of a rule's type and check fields.
+
+    Raises ValueError on the first problem.
+    """
+    rule_type = rule_entry.get('type')
+    if rule_type is not None and rule_type not in LINT_CHECK_TYPES:
+        raise ValueError(f"{rule_label} has invalid type '{rule_type}'")
+
+    for flag_name in ('ignore_case', 'multiline', 'api_files_only'):
+        if flag_name in rule_entry and not isinstance(rule_entry[flag_name], bool):
+            raise ValueError(f"Invalid '{rule_label} {flag_name}'")
+    for list_name in ('skip_paths', 'only_paths'):
+        if list_name in rule_entry and not is_string_list(rule_entry[list_name]):
+            raise ValueError(f"Invalid '{rule_label} {list_name}'")
+
+    def require_pattern(field_name: str, value) -> None:
+        if not (isinstance(value, str) and value):
+            raise ValueError(f"Missing or invalid '{rule_label} {field_name}'")
+
+    if rule_type in (None, 'grep'):
+        if 'ignore_when' in rule_entry and not is_string_list(rule_entry['ignore_when']):
+            raise ValueError(f"Invalid '{rule_label} ignore_when'")
+    elif rule_type == 'presence':
+        require_pattern('pattern', rule_entry.get('pattern'))
+    elif rule_type == 'requires':
+        if rule_entry.get('must_exist') is not None:
+            require_pattern('must_exist', rule_entry['must_exist'])
+        else:
+            trigger_count = rule_entry.get('trigger_count')
+            if trigger_count is not None and not (
+                isinstance(trigger_count, int) and not isinstance(trigger_count, bool) and trigger_count > 0
+            ):
+                raise ValueError(f"Invalid '{rule_label} trigger_count'")
+            require_pattern('trigger', rule_entry.get('trigger'))
+            require_pattern('requirement', rule_entry.get('requirement'))
+    elif rule_type == 'multi-condition':
+        if rule_entry.get('logic', 'AND') not in ('AND', 'OR'):
+            raise ValueError(f"Invalid '{rule_label} logic'")
+        conditions = rule_entry.get('conditions')
+        if not isinstance(conditions, list) or not conditions:
+            raise ValueError(f"Missing or invalid '{rule_label} conditions'")
+        for condition_index, condition in enumerate(conditions):
+            if not isinstance(condition, dict):
+                raise ValueError(f"Invalid '{rule_label} conditions[{condition_index}]'")
+            require_pattern(f"conditions[{condition_index}].pattern", condition.get('pattern'))
+    elif rule_type == 'file_exists':
+        if not is_string_list(rule_entry.get('paths')) or not rule_entry['paths']:
+            raise ValueError(f"{rule_label} needs at least one path in 'paths'")
+    elif rule_type == 'script':
+        code = rule_entry.get('code')
+        if not (isinstance(code, str) and code.strip()):
+            raise ValueError(f"Missing or invalid '{rule_label} code'")
+
+
+def generate_bundle_entry(rules_path: Path, domains_dir: Path) -> dict:
+    """Build the bundle entry for one .rules.json file.
+
+    Raises ValueError if the file is not valid rules JSON.
+    """
+    source_bytes = rules_path.read_bytes()
+    json_content = source_bytes.decode('utf-8')
+    validate_rules_json(json_content)
+    rules_data = json.loads(json_content)
+    validate_lint_constraints(rules_data)
+    source_stat = rules_path.stat()
+
+    rules = rules_data['rules']
+    # Only grep rules run as one line-by-line program; presence patterns are
+    # judged over whole files
+    grep_rules = [
+        rule_entry for rule_entry in rules
+        if rule_entry.get('type') in (None, 'grep') and rule_entry.get('pattern')
+    ]
+    ast_rules = [rule_entry for rule_entry in rules if rule_entry.get('query')]
+
+    return {
+        'source': rules_path.relative_to(domains_dir).as_posix(),
+        # Stat signature flight-lint compares before trusting the entry;
+        # nanoseconds exceed JSON's safe integers, so keep them as a string
+        'size': source_stat.st_size,
+        'mtimeNs': str(source_stat.st_mtime_ns),
+        'sha256': hashlib.sha256(source_bytes).hexdigest(),
+        'rulesFile': to_lint_rules_file(rules_data),
+        'grepRuleIds': [rule_entry['id'] for rule_entry in grep_rules],
+        'astRuleIds': [rule_entry['id'] for rule_entry in ast_rules],
+        'lineBoundRuleIds': [
+            rule_entry['id'] for rule_entry in grep_rules
+            if LINE_BOUND_PATTERN_FEATURES.search(rule_entry['pattern'])
+        ],
+        'languages': sorted({rule_entry['language'] for rule_entry in ast_rules if rule_entry.get('language')}),
+        'extensions': pattern_extensions(rules_data['file_patterns']),
+        'ruleHashes': {rule_entry['id']: rule_hash(rule_entry) for rule_entry in rules},
+    }
+
+
+def generate_rules_bundle(domains_dir: Path) -> tuple[str, list]:
+    """Generate rules.bundle.json content from every .rules.json in domains_dir.
+
+    The bundle holds each rules file already validated and converted to
+    flight-lint's in-memory shape, so `flight-lint --auto` loads every domain
+    with one read. Files that fail validation are left out (flight-lint then
+    loads them directly and reports the error).
+
+    Returns (json_content, errors) where errors lists the skipped files.
+    """
+    domains = []
+    errors = []
+    for rules_path in sorted(domains_dir.rglob("*.rules.json")):
+        try:
+            domains.append(generate_bundle_entry(rules_path, domains_dir))
+        except (ValueError, KeyError, TypeError, UnicodeDecodeError) as bundle_error:
+            errors.append(f"{rules_path.name}: {bundle_error}")
+
+    by_language = {}
+    by_extension = {}
+    for entry in domains:
+        domain = entry['rulesFile']['domain']
+        for language in entry['languages']:
+            by_language.setdefault(language, []).append(domain)
+        for extension in entry['extensions']:
+            by_extension.setdefault(extension, []).append(domain)
+
+    bundle = {
+        'bundleVersion': RULES_BUNDLE_VERSION,
+        'domains': domains,
+        'index': {
+            'languages': dict(sorted(by_language.items())),
+            'extensions': dict(sorted(by_extension.items())),
+        },
+    }
+    return json.dumps(bundle, separators=(',', ':')), errors
+
+
 def validate_yaml_syntax(flight_path: Path) -> bool:
     """Validate .flight file using yaml.validate.sh (dogfooding).
 
@@ -1381,6 +1957,95 @@ def validate_regex_pattern(pattern: str, rule_id: str, domain: str) -> bool:
         return False
 
 
+# Node classes kept only as deprecated aliases of ast.Constant; parsing
+# never produces them
+DEPRECATED_AST_NODES = {'Str', 'Num', 'Bytes', 'NameConstant', 'Ellipsis'}
+
+
+def python_ast_node_class(node_name) -> Optional[type]:
+    """Resolve a node name of a python_ast query to its ast class, or None."""
+    node_class = getattr(ast, node_name, None) if isinstance(node_name, str) else None
+    if node_name in DEPRECATED_AST_NODES or not (isinstance(node_class, type) and issubclass(node_class, ast.AST)):
+        return None
+    return node_class
+
+
+def validate_python_ast(query) -> list:
+    """Validate a python_ast query against Python's ast module.
+
+    A query is a list of node matchers, and a node matching any of them is
+    reported. A matcher names one or more ast node classes in 'node',
+    constrains their attributes in 'fields', and may require the node to sit
+    in one of the parent fields named in 'in_field' (e.g. defaults). A field
+    constraint is a literal, a list of literals, {match: regex} for names,
+    a nested matcher, or {any: matcher} for list fields.
+
+    Returns a list of error messages (empty if valid).
+    """
+    if not isinstance(query, list) or not query:
+        return ["python_ast must be a non-empty list of node matchers"]
+    errors = []
+    for index, matcher in enumerate(query):
+        matcher_errors = validate_python_ast_matcher(matcher, f"python_ast[{index}]")
+        if not matcher_errors:
+            # Reported nodes need a position
+            node_names = matcher['node'] if isinstance(matcher['node'], list) else [matcher['node']]
+            matcher_errors = [
+                f"python_ast[{index}] reports ast node '{node_name}', which has no position"
+                for node_name in node_names if 'lineno' not in python_ast_node_class(node_name)._attributes
+            ]
+        errors.extend(matcher_errors)
+    return errors
+
+
+def validate_python_ast_matcher(matcher, path: str) -> list:
+    """Validate one node matcher of a python_ast query; see validate_python_ast()."""
+    if not isinstance(matcher, dict) or 'node' not in matcher:
+        return [f"{path} must be a mapping with 'node'"]
+    unknown_keys = sorted(set(matcher) - {'node', 'fields', 'in_field'})
+    if unknown_keys:
+        return [f"{path} has unknown key '{unknown_keys[0]}'"]
+
+    node_names = matcher['node'] if isinstance(matcher['node'], list) else [matcher['node']]
+    node_classes = [python_ast_node_class(node_name) for node_name in node_names]
+    errors = [
+        f"{path} has unknown ast node '{node_name}'"
+        for node_name, node_class in zip(node_names, node_classes) if node_class is None
+    ]
+    if errors or not node_classes:
+        return errors or [f"{path} names no ast node"]
+
+    in_field = matcher.get('in_field', [])
+    if not all(isinstance(field_name, str) for field_name in (in_field if isinstance(in_field, list) else [in_field])):
+        errors.append(f"{path}.in_field must be a field name or a list of them")
+
+    fields = matcher.get('fields', {})
+    if not isinstance(fields, dict):
+        return errors + [f"{path}.fields must be a mapping"]
+    for field_name, constraint in fields.items():
+        field_path = f"{path}.fields.{field_name}"
+        missing = [
+            node_class.__name__ for node_class in node_classes
+            if field_name not in node_class._fields + node_class._attributes
+        ]
+        if missing:
+            errors.append(f"{field_path}: ast node '{missing[0]}' has no field '{field_name}'")
+        elif isinstance(constraint, dict) and 'match' in constraint:
+            try:
+                re.compile(constraint['match'])
+            except (re.error, TypeError):
+                errors.append(f"{field_path} has invalid regex pattern")
+        elif isinstance(constraint, dict) and 'any' in constraint:
+            errors.extend(validate_python_ast_matcher(constraint['any'], f"{field_path}.any"))
+        elif isinstance(constraint, dict):
+            errors.extend(validate_python_ast_matcher(constraint, field_path))
+        elif isinstance(constraint, list) and not all(
+            item is None or isinstance(item, (str, int, float, bool)) for item in constraint
+        ):
+            errors.append(f"{field_path} must list literals only")
+    return errors
+
+
 def validate_shell_script(sh_path: Path) -> bool:
     """Validate generated shell script using bash -n (syntax check).
 
@@ -1639,6 +2304,15 @@ def main() -> int:
             if result != 0:
                 errors += 1
 
+        # One prevalidated bundle lets flight-lint --auto skip per-file loading
+        if not args.check and not args.md_only and not args.sh_only:
+            bundle_content, bundle_errors = generate_rules_bundle(domains_dir)
+            for bundle_error in bundle_errors:
+                print(f"WARNING: Not bundled: {bundle_error}", file=sys.stderr)
+            bundle_path = domains_dir / RULES_BUNDLE_FILENAME
+            bundle_path.write_text(bundle_content, encoding='utf-8')
+            print(f"\nWrote {bundle_path}")
+
         print(f"\n{'='*50}")
         print(f"Compiled {len(flight_files)} domain(s), {errors} error(s)")
         print(f"{'='*50}")
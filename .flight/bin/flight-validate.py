@@ -0,0 +1,1490 @@
+#!/usr/bin/env python3
+"""
+flight-validate: Run compiled .rules.json rules without Node
+
+Usage:
+    flight-validate --auto                         # Rules of this project's domains
+    flight-validate --auto --severity MUST         # NEVER and MUST rules only
+    flight-validate --auto --count-only            # One-line totals
+    flight-validate --auto --summary-file out.json # Also write the run summary
+    flight-validate domains/api.rules.json         # Specific rules files
+
+Python counterpart of flight-lint for projects without Node, npm or
+tree-sitter. It discovers domains and files the way flight-lint does, runs
+every rule except tree-sitter AST queries, and prints the same --format json,
+--count-only and --summary-file output. AST rules that also have a python_ast
+query run on Python files with the ast module instead.
+"""
+
+import argparse
+import ast
+import bisect
+import importlib.util
+import json
+import mmap
+import os
+import re
+import subprocess
+import sys
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Optional
+
+
+def load_compiler_module():
+    """Load flight-domain-compile.py, whose domain model this tool shares."""
+    module = sys.modules.get("flight_domain_compile")
+    if module is None:
+        compiler_path = Path(__file__).resolve().parent / "flight-domain-compile.py"
+        module_spec = importlib.util.spec_from_file_location("flight_domain_compile", compiler_path)
+        module = importlib.util.module_from_spec(module_spec)
+        sys.modules["flight_domain_compile"] = module
+        module_spec.loader.exec_module(module)
+    return module
+
+
+flight_domain_compile = load_compiler_module()
+DomainSpec = flight_domain_compile.DomainSpec
+Rule = flight_domain_compile.Rule
+SEVERITIES = flight_domain_compile.SEVERITIES
+
+EXIT_SUCCESS = 0
+EXIT_VIOLATIONS = 1
+EXIT_CONFIG_ERROR = 2
+
+FLIGHT_DOMAINS_DIR = ".flight/domains"
+FLIGHT_CONFIG_FILE = ".flight/flight.json"
+FLIGHTIGNORE_FILE = ".flightignore"
+RULES_FILE_SUFFIX = ".rules.json"
+
+# Keep in sync with flight-lint/src/discovery.ts and .flight/exclusions.sh
+EXCLUDED_DIRECTORIES = [
+    "node_modules", "vendor", ".venv", "venv",
+    "dist", "build", "target", "obj", ".next", ".turbo", "out", ".output", ".nuxt", ".svelte-kit",
+    ".git",
+    ".idea", ".vscode",
+    "coverage", ".pytest_cache", ".nyc_output", ".coverage", "__pycache__", ".tox", ".nox",
+    "fixtures", "validator-fixtures",
+    "tests", "test", "__tests__", "e2e",
+    ".cache", ".parcel-cache", ".webpack", ".rollup.cache",
+    ".terraform", ".serverless",
+    ".flight", ".claude",
+    "flight-lint",
+    "scripts", "tooling", "tools",
+    "docs",
+]
+EXCLUDED_FILES = [
+    "supabase.ts", "database.types.ts", "*.generated.ts", "graphql.ts",
+    "update.sh",
+    "*.config.js", "*.config.ts", "*.config.mjs", "*.config.cjs",
+    "eslint.config.*", "prettier.config.*", "vitest.config.*", "vite.config.*", "jest.config.*",
+    "webpack.config.*", "rollup.config.*", "tailwind.config.*", "postcss.config.*", "next.config.*",
+    "nuxt.config.*", "svelte.config.*", "astro.config.*",
+    "tsconfig.json", "tsconfig.*.json", "jsconfig.json",
+    "package.json", "package-lock.json", "pnpm-lock.yaml", "yarn.lock", "bun.lockb",
+    "Cargo.toml", "Cargo.lock", "go.mod", "go.sum", "requirements.txt", "pyproject.toml",
+    "poetry.lock", "Gemfile", "Gemfile.lock", "composer.json", "composer.lock",
+]
+
+# Huge-file guard, as in flight-lint (--max-parse-bytes, --max-file-bytes)
+DEFAULT_MAX_PARSE_BYTES = 1_048_576
+DEFAULT_MAX_FILE_BYTES = 16_777_216
+SNIFF_BYTES = 8192
+MINIFIED_MEAN_LINE_LENGTH = 200
+
+# Files handed to each worker process at a time; smaller runs stay in-process
+FILES_PER_BATCH = 32
+
+DEFAULT_SUMMARY_TOP = 10
+
+# A script rule still running after this long is killed and its domain's
+# results marked incomplete (the Stop hook's lint budget)
+SCRIPT_TIMEOUT_SECONDS = 50
+
+LANGUAGE_BY_EXTENSION = {
+    "js": "javascript", "mjs": "javascript", "cjs": "javascript",
+    "jsx": "jsx",
+    "ts": "typescript", "mts": "typescript", "cts": "typescript",
+    "tsx": "tsx",
+    "py": "python", "pyi": "python",
+    "go": "go",
+    "rs": "rust",
+    "c": "c", "h": "c",
+}
+LANGUAGE_COMPATIBILITY = {
+    "javascript": ("javascript", "jsx"),
+    "typescript": ("typescript", "tsx"),
+}
+
+NON_ASCII_BYTE = re.compile(rb"[\x80-\xff]")
+NEWLINE = {bytes: re.compile(rb"\n"), str: re.compile(r"\n")}
+JS_NAMED_GROUP = re.compile(r"\(\?<(?![=!])")
+JS_NAMED_BACKREFERENCE = re.compile(r"\\k<([A-Za-z_]\w*)>")
+
+
+# =============================================================================
+# Discovery (same walk, exclusions and globs as flight-lint)
+# =============================================================================
+
+def glob_to_regex(glob_pattern: str, match_dot_segments: bool = True) -> str:
+    """Convert a glob pattern to a regex source, as flight-lint does.
+
+    Supports *, **, ? and {a,b}. Unless match_dot_segments is set, wildcards
+    do not match a leading "." in a path segment.
+    """
+    segment_guard = "" if match_dot_segments else r"(?!\.)"
+    regex_source = ""
+    brace_depth = 0
+    index = 0
+
+    while index < len(glob_pattern):
+        char = glob_pattern[index]
+        starts_segment = index == 0 or glob_pattern[index - 1] == "/"
+
+        if char == "*":
+            if glob_pattern[index + 1:index + 2] == "*":
+                # "**/" matches zero or more directories, a bare "**" anything
+                if glob_pattern[index + 2:index + 3] == "/":
+                    regex_source += "(?:.*/)?" if match_dot_segments else f"(?:{segment_guard}[^/]*/)*"
+                    index += 2
+                else:
+                    regex_source += ".*" if match_dot_segments else f"(?:{segment_guard}[^/]*(?:/{segment_guard}[^/]*)*)?"
+                    index += 1
+            else:
+                regex_source += (segment_guard if starts_segment else "") + "[^/]*"
+        elif char == "?":
+            regex_source += (segment_guard if starts_segment else "") + "[^/]"
+        elif char == "{":
+            regex_source += "(?:"
+            brace_depth += 1
+        elif char == "}" and brace_depth > 0:
+            regex_source += ")"
+            brace_depth -= 1
+        elif char == "," and brace_depth > 0:
+            regex_source += "|"
+        else:
+            regex_source += "\\" + char if char in ".+^$()|[]\\" else char
+        index += 1
+
+    return regex_source
+
+
+def compile_globs(glob_patterns: list, match_dot_segments: bool = True) -> Optional[re.Pattern]:
+    """Compile globs into one pattern for fullmatch(), or None if there are none."""
+    if not glob_patterns:
+        return None
+    return re.compile("|".join(glob_to_regex(pattern, match_dot_segments) for pattern in glob_patterns))
+
+
+def load_flightignore(project_root: Path) -> list:
+    """Read .flightignore entries as exclusion globs."""
+    ignore_path = project_root / FLIGHTIGNORE_FILE
+    if not ignore_path.is_file():
+        return []
+
+    patterns = []
+    for raw_line in ignore_path.read_text(encoding="utf-8").split("\n"):
+        line = raw_line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.endswith("/"):
+            patterns.append(f"**/{line[:-1]}/**")
+        elif line.startswith("/"):
+            patterns.append(line[1:])
+        elif line.startswith("**/"):
+            patterns.append(line)
+        else:
+            patterns.append(f"**/{line}")
+    return patterns
+
+
+@dataclass
+class WalkExclusions:
+    """Exclusion globs of a project walk, compiled once."""
+    directory_names: set
+    directory_matcher: Optional[re.Pattern]
+    file_matcher: Optional[re.Pattern]
+
+    def excludes_directory(self, name: str, relative_path: str) -> bool:
+        return name in self.directory_names or bool(
+            self.directory_matcher and self.directory_matcher.fullmatch(relative_path)
+        )
+
+    def excludes_file(self, relative_path: str) -> bool:
+        return bool(self.file_matcher and self.file_matcher.fullmatch(relative_path))
+
+
+def load_walk_exclusions(project_root: Path) -> WalkExclusions:
+    """Compile the default exclusions and .flightignore of a project.
+
+    Patterns that do not end in "/**" exclude files and are also tested on
+    directories, so "**/build" prunes build/ as it does in flight-lint.
+    """
+    directory_names = set(EXCLUDED_DIRECTORIES)
+    directory_patterns = []
+    file_patterns = []
+
+    for pattern in [f"**/{name}" for name in EXCLUDED_FILES] + load_flightignore(project_root):
+        is_contents_pattern = pattern.endswith("/**")
+        if not is_contents_pattern:
+            file_patterns.append(pattern)
+        directory_pattern = pattern[:-3] if is_contents_pattern else pattern
+        name = directory_pattern[3:] if directory_pattern.startswith("**/") else None
+        if name and "/" not in name and not re.search(r"[*?{}\[\]]", name):
+            directory_names.add(name)
+        else:
+            directory_patterns.append(directory_pattern)
+
+    return WalkExclusions(directory_names, compile_globs(directory_patterns), compile_globs(file_patterns))
+
+
+def is_link_cycle(link_path: str, parent_path: str) -> bool:
+    """Check whether a directory link points at one of its own ancestors."""
+    target_path = os.path.realpath(link_path)
+    parent_real_path = os.path.realpath(parent_path)
+    return parent_real_path == target_path or parent_real_path.startswith(target_path + os.sep)
+
+
+def walk_project_files(project_root: Path) -> list:
+    """Walk the project once, pruning excluded directories before descending.
+
+    Returns sorted forward-slash paths relative to the project root. Dot files
+    are included; symbolic links are followed unless they loop.
+    """
+    exclusions = load_walk_exclusions(project_root)
+    project_files = []
+    pending_directories = [""]
+
+    while pending_directories:
+        relative_directory = pending_directories.pop()
+        absolute_directory = os.path.join(project_root, relative_directory)
+        try:
+            directory_entries = list(os.scandir(absolute_directory))
+        except OSError:
+            continue
+
+        for entry in directory_entries:
+            relative_path = f"{relative_directory}/{entry.name}" if relative_directory else entry.name
+            try:
+                is_directory = entry.is_dir()
+                is_file = entry.is_file()
+            except OSError:
+                continue
+            if is_directory and entry.is_symlink() and is_link_cycle(entry.path, absolute_directory):
+                continue
+
+            if is_directory:
+                if not exclusions.excludes_directory(entry.name, relative_path):
+                    pending_directories.append(relative_path)
+            elif is_file and not exclusions.excludes_file(relative_path):
+                project_files.append(relative_path)
+
+    return sorted(project_files)
+
+
+def discover_rules_files(project_root: Path) -> list:
+    """List the .rules.json files under .flight/domains, skipping dot entries."""
+    rules_file_paths = []
+
+    def collect(directory: Path) -> None:
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            return
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            if entry.is_dir():
+                collect(Path(entry.path))
+            elif entry.is_file() and entry.name.endswith(RULES_FILE_SUFFIX):
+                rules_file_paths.append(entry.path)
+
+    collect(project_root / FLIGHT_DOMAINS_DIR)
+    return sorted(rules_file_paths)
+
+
+def load_enabled_domains(project_root: Path) -> Optional[list]:
+    """Load the domains enabled in .flight/flight.json.
+
+    Schema v2 enables domains.source plus domains.test; v1 uses enabled_domains.
+    Returns None without flight.json or when it lists domains under neither
+    key; an explicitly empty list gives [].
+    """
+    config_path = project_root / FLIGHT_CONFIG_FILE
+    if not config_path.exists():
+        return None
+
+    try:
+        config = json.loads(config_path.read_text(encoding="utf-8"))
+    except ValueError:
+        raise ValueError(f"Invalid JSON in project config: {config_path}")
+    if not isinstance(config, dict):
+        raise ValueError(f"Project config must be an object: {config_path}")
+
+    domain_names = set()
+    domains_by_category = config.get("domains")
+    candidates = [config.get("enabled_domains")]
+    if isinstance(domains_by_category, dict):
+        candidates += [domains_by_category.get("source"), domains_by_category.get("test")]
+    domain_lists = [candidate for candidate in candidates if isinstance(candidate, list)]
+    if not domain_lists:
+        return None
+    for domain_list in domain_lists:
+        domain_names.update(name for name in domain_list if isinstance(name, str))
+    return sorted(domain_names)
+
+
+def select_auto_rules_files(project_root: Path) -> list:
+    """Select the discovered rules files of the domains enabled for this project.
+
+    Without flight.json, or a domain list in it, every domain is kept;
+    domains whose file_patterns match no project file are dropped once files
+    are mapped.
+    """
+    rules_file_paths = discover_rules_files(project_root)
+    enabled_domains = load_enabled_domains(project_root)
+    if enabled_domains is None:
+        return rules_file_paths
+    return [
+        rules_file_path for rules_file_path in rules_file_paths
+        if Path(rules_file_path).name[:-len(RULES_FILE_SUFFIX)] in enabled_domains
+    ]
+
+
+def load_domain_spec(rules_file_path: str) -> DomainSpec:
+    """Load a .rules.json file into the compiler's DomainSpec model.
+
+    Raises ValueError if the file is not a valid rules file.
+    """
+    try:
+        json_content = Path(rules_file_path).read_text(encoding="utf-8")
+        flight_domain_compile.validate_rules_json(json_content)
+        rules_data = json.loads(json_content)
+    except (OSError, ValueError) as error:
+        raise ValueError(f"Invalid rules file {rules_file_path}: {error}")
+    return flight_domain_compile.parse_domain_spec(flight_domain_compile.rules_json_to_spec_data(rules_data))
+
+
+def filter_rules_by_severity(spec: DomainSpec, minimum_severity: str) -> DomainSpec:
+    """Keep the rules at or above a severity."""
+    maximum_index = SEVERITIES.index(minimum_severity)
+    return replace(spec, rules={
+        rule_id: rule for rule_id, rule in spec.rules.items()
+        if rule.severity in SEVERITIES and SEVERITIES.index(rule.severity) <= maximum_index
+    })
+
+
+def map_files_to_domains(project_files: list, specs: list, project_root: Path) -> list:
+    """Assign each domain the absolute paths of the walked files it matches.
+
+    File patterns never match a leading "." in a path segment unless they
+    spell it out; exclude patterns do.
+    """
+    domain_files = [[] for _ in specs]
+    matchers = [
+        (compile_globs(spec.file_patterns, False), compile_globs(spec.exclude_patterns))
+        for spec in specs
+    ]
+
+    for relative_path in project_files:
+        absolute_path = os.path.join(project_root, relative_path)
+        for domain_index, (file_matcher, exclude_matcher) in enumerate(matchers):
+            if file_matcher and file_matcher.fullmatch(relative_path) and not (
+                exclude_matcher and exclude_matcher.fullmatch(relative_path)
+            ):
+                domain_files[domain_index].append(absolute_path)
+    return domain_files
+
+
+# =============================================================================
+# Compiled rules
+# =============================================================================
+
+@dataclass
+class Regex:
+    """A pattern compiled for both kinds of buffer: bytes for files matched
+    in place, str for files that had to be decoded."""
+    as_bytes: re.Pattern
+    as_text: re.Pattern
+
+
+def compile_regex(source: str, flags: int = 0) -> Regex:
+    """Compile a flight-lint (JavaScript) pattern with Python's re.
+
+    Named groups are translated; \\w, \\d and \\b stay ASCII as in JavaScript.
+    Raises re.error for patterns re cannot compile.
+    """
+    python_source = JS_NAMED_BACKREFERENCE.sub(r"(?P=\1)", JS_NAMED_GROUP.sub("(?P<", source))
+    with warnings.catch_warnings():
+        # "[[" is a literal bracket in JavaScript; re only warns about it
+        warnings.simplefilter("ignore", FutureWarning)
+        return Regex(
+            re.compile(python_source.encode("utf-8"), flags),
+            re.compile(python_source, flags | re.ASCII),
+        )
+
+
+def join_alternatives(patterns: list) -> str:
+    """Join regex sources into one alternation."""
+    return "|".join(f"(?:{pattern})" for pattern in patterns)
+
+
+def compile_optional(patterns: list, flags: int = 0) -> Optional[Regex]:
+    """Compile the alternation of some patterns, or None if there are none."""
+    return compile_regex(join_alternatives(patterns), flags) if patterns else None
+
+
+@dataclass
+class GrepCheck:
+    """A grep rule checked line by line."""
+    line_regex: Regex
+    ignore_regex: Optional[Regex]
+    # Index of the whole-buffer prefilter the rule takes part in, or None
+    prefilter_index: Optional[int]
+
+
+@dataclass
+class ContentCheck:
+    """A rule evaluated over a whole file rather than line by line.
+
+    kind is span (multiline grep), presence, must-exist, trigger, conditions,
+    or applies (a project-wide rule that only needs the file in scope).
+    """
+    kind: str
+    regex: Optional[Regex] = None
+    ignore_regex: Optional[Regex] = None
+    requirement_regex: Optional[Regex] = None
+    trigger_count: int = 1
+    condition_regexes: list = field(default_factory=list)
+    require_all: bool = True
+
+
+@dataclass
+class PathScope:
+    """skip_paths, only_paths and ignore_when of a rule, matched on its path."""
+    skip_matcher: Optional[re.Pattern]
+    only_matcher: Optional[re.Pattern]
+    ignore_regex: Optional[re.Pattern]
+
+    def includes(self, project_path: str) -> bool:
+        if self.skip_matcher and self.skip_matcher.fullmatch(project_path):
+            return False
+        if self.ignore_regex and self.ignore_regex.search(project_path):
+            return False
+        return self.only_matcher is None or bool(self.only_matcher.fullmatch(project_path))
+
+
+def is_line_grep_rule(rule: Rule) -> bool:
+    """Check if a rule reports matches of its pattern line by line."""
+    check = rule.check
+    return check.get("type", "grep") == "grep" and bool(check.get("pattern")) and not check.get("multiline")
+
+
+def has_ast_query(rule: Rule) -> bool:
+    """Check if a rule is a tree-sitter query, which flight-validate does not run."""
+    return bool(rule.check.get("query"))
+
+
+def has_python_ast_query(rule: Rule) -> bool:
+    """Check if a rule has a python_ast query, which runs on Python files instead."""
+    return bool(rule.check.get("python_ast")) and is_rule_compatible_with_file("python", rule.check.get("language"))
+
+
+def compile_path_scope(rule: Rule) -> Optional[PathScope]:
+    """Compile a rule's path scope, or None if it runs on every path."""
+    ignore_when = rule.check.get("ignore_when", [])
+    if not (rule.skip_paths or rule.only_paths or ignore_when):
+        return None
+    try:
+        ignore_regex = compile_optional(ignore_when)
+    except re.error:
+        ignore_regex = None
+    return PathScope(
+        compile_globs(rule.skip_paths),
+        compile_globs(rule.only_paths) if rule.only_paths else None,
+        ignore_regex.as_text if ignore_regex else None,
+    )
+
+
+def compile_grep_check(rule: Rule) -> Optional[GrepCheck]:
+    """Compile a line grep rule, or None if it is not one or does not compile."""
+    if not is_line_grep_rule(rule):
+        return None
+    check = rule.check
+    try:
+        return GrepCheck(
+            compile_regex(check["pattern"], re.IGNORECASE if check.get("ignore_case") else 0),
+            compile_optional(check.get("ignore_when", [])),
+            None if flight_domain_compile.LINE_BOUND_PATTERN_FEATURES.search(check["pattern"])
+            else int(bool(check.get("ignore_case"))),
+        )
+    except re.error:
+        return None
+
+
+def compile_content_check(rule: Rule) -> Optional[ContentCheck]:
+    """Compile a rule's whole-file check, or None if it has none that can run.
+
+    Patterns keep grep's line semantics (MULTILINE), except multiline grep
+    rules, which match across lines as grep -z does (DOTALL).
+    """
+    check = rule.check
+    case_flag = re.IGNORECASE if check.get("ignore_case") else 0
+    check_type = check.get("type", "grep")
+
+    try:
+        if check_type == "grep":
+            if not (check.get("multiline") and check.get("pattern")):
+                return None
+            return ContentCheck(
+                "span",
+                regex=compile_regex(check["pattern"], re.DOTALL | case_flag),
+                ignore_regex=compile_optional(check.get("ignore_when", [])),
+            )
+        if check_type == "presence":
+            return ContentCheck("presence", regex=compile_regex(check["pattern"], re.MULTILINE | case_flag)) \
+                if check.get("pattern") else None
+        if check_type == "requires":
+            if check.get("must_exist"):
+                return ContentCheck("must-exist", regex=compile_regex(check["must_exist"], re.MULTILINE))
+            if not (check.get("trigger") and check.get("requirement")):
+                return None
+            return ContentCheck(
+                "trigger",
+                regex=compile_regex(check["trigger"], re.MULTILINE),
+                requirement_regex=compile_regex(check["requirement"], re.MULTILINE),
+                trigger_count=check.get("trigger_count", 1),
+            )
+        if check_type == "multi-condition":
+            if not check.get("conditions"):
+                return None
+            return ContentCheck(
+                "conditions",
+                condition_regexes=[
+                    compile_regex(condition["pattern"], re.MULTILINE | (re.IGNORECASE if condition.get("ignore_case") else 0))
+                    for condition in check["conditions"]
+                ],
+                require_all=check.get("logic") != "OR",
+            )
+        if check_type in ("file_exists", "script"):
+            return ContentCheck("applies")
+    except re.error:
+        # Invalid regex pattern - skip silently, as flight-lint does
+        pass
+    return None
+
+
+@dataclass
+class CompiledDomain:
+    """A domain's rules compiled once per process; lists are indexed like rules."""
+    spec: DomainSpec
+    rules: list
+    path_scopes: list
+    grep_checks: list
+    content_checks: list
+    # Whole-buffer prefilters: case-sensitive rules share the first,
+    # case-insensitive rules the second
+    prefilters: list
+    activation_literals: list
+    activation_regex: Optional[Regex]
+    api_path_regex: Optional[re.Pattern]
+    api_content_regex: Optional[Regex]
+    # Node matchers of each rule's python_ast query, or None
+    python_ast_matchers: list
+
+
+def compile_domain(spec: DomainSpec) -> CompiledDomain:
+    """Compile the rules, activation and API file detection of a domain."""
+    rules = list(spec.rules.values())
+    grep_checks = [compile_grep_check(rule) for rule in rules]
+
+    prefilters = []
+    for prefilter_index, case_flag in enumerate((0, re.IGNORECASE)):
+        prefilter_sources = [
+            rule.check["pattern"] for rule, grep_check in zip(rules, grep_checks)
+            if grep_check and grep_check.prefilter_index == prefilter_index
+        ]
+        try:
+            prefilters.append(compile_optional(prefilter_sources, re.MULTILINE | case_flag))
+        except re.error:
+            # Patterns that compile alone but not together are checked line by line
+            prefilters.append(None)
+    for grep_check in grep_checks:
+        if grep_check and grep_check.prefilter_index is not None and prefilters[grep_check.prefilter_index] is None:
+            grep_check.prefilter_index = None
+
+    activation = spec.activation or {}
+    api_file_detection = spec.api_file_detection or {}
+    api_paths = compile_optional(api_file_detection.get("paths", []))
+    return CompiledDomain(
+        spec=spec,
+        rules=rules,
+        path_scopes=[compile_path_scope(rule) for rule in rules],
+        grep_checks=grep_checks,
+        content_checks=[compile_content_check(rule) for rule in rules],
+        prefilters=prefilters,
+        activation_literals=list(activation.get("literals", [])),
+        activation_regex=compile_regex(activation["pattern"]) if activation.get("pattern") else None,
+        api_path_regex=api_paths.as_text if api_paths else None,
+        api_content_regex=compile_optional(api_file_detection.get("patterns", []), re.MULTILINE),
+        python_ast_matchers=[
+            [compile_node_matcher(matcher) for matcher in rule.check["python_ast"]] if has_python_ast_query(rule) else None
+            for rule in rules
+        ],
+    )
+
+
+# =============================================================================
+# Scanning
+# =============================================================================
+
+class SourceBuffer:
+    """A file's content as rules see it.
+
+    ASCII files are matched in place on their memory mapping with bytes
+    patterns and never decoded. Other files are decoded once, so that "."
+    and columns count characters (UTF-16 units) the way flight-lint does.
+    """
+
+    def __init__(self, content):
+        self.content = content
+        self.is_text = isinstance(content, str)
+        self._line_starts = None
+
+    def regex(self, regex: Regex) -> re.Pattern:
+        return regex.as_text if self.is_text else regex.as_bytes
+
+    def find(self, literal: str) -> bool:
+        return self.content.find(literal if self.is_text else literal.encode("utf-8")) != -1
+
+    @property
+    def line_starts(self) -> list:
+        """Offset at which each line starts, indexed on first use."""
+        if self._line_starts is None:
+            newline = NEWLINE[str if self.is_text else bytes]
+            self._line_starts = [0] + [match.end() for match in newline.finditer(self.content)]
+        return self._line_starts
+
+    def line_index(self, offset: int) -> int:
+        return bisect.bisect_right(self.line_starts, offset) - 1
+
+    def line_text(self, line_index: int):
+        line_starts = self.line_starts
+        line_end = line_starts[line_index + 1] - 1 if line_index + 1 < len(line_starts) else len(self.content)
+        return self.content[line_starts[line_index]:line_end]
+
+    def column(self, line_prefix) -> int:
+        """1-indexed column after a line prefix, in UTF-16 units."""
+        if not self.is_text:
+            return len(line_prefix) + 1
+        return len(line_prefix.encode("utf-16-le")) // 2 + 1
+
+    def locate(self, offset: int) -> tuple:
+        """1-indexed line and column of an offset."""
+        line_index = self.line_index(offset)
+        return line_index + 1, self.column(self.content[self.line_starts[line_index]:offset])
+
+    def locate_utf8(self, line: int, utf8_offset: int) -> tuple:
+        """1-indexed line and column of a position ast reports: a line and a
+        UTF-8 byte offset into it."""
+        if not self.is_text:
+            return line, utf8_offset + 1
+        line_prefix = self.line_text(line - 1).encode("utf-8")[:utf8_offset].decode("utf-8", "replace")
+        return line, self.column(line_prefix)
+
+
+def open_source_buffer(file_handle, size: int):
+    """Map a file, decoding it only if it has non-ASCII bytes.
+
+    Returns (buffer, mapping); close the mapping once the buffer is done with.
+    """
+    if size == 0:
+        return SourceBuffer(b""), None
+    mapping = mmap.mmap(file_handle.fileno(), 0, access=mmap.ACCESS_READ)
+    if NON_ASCII_BYTE.search(mapping):
+        content = mapping[:].decode("utf-8", "replace")
+        mapping.close()
+        return SourceBuffer(content), None
+    return SourceBuffer(mapping), mapping
+
+
+def assess_source(file_handle, size: int, max_parse_bytes: int, max_file_bytes: int) -> Optional[str]:
+    """Decide how much of a file can be linted, from its size and first block.
+
+    Returns None to lint it normally, "ast-skipped" for files too large to
+    parse or "minified" to run grep rules only, or the reason to skip it
+    ("too-large", "binary").
+    """
+    if size > max_file_bytes:
+        return "too-large"
+    first_block = file_handle.read(SNIFF_BYTES)
+    if b"\0" in first_block:
+        return "binary"
+    # Only judge full blocks; a short file with one long line is harmless
+    if len(first_block) == SNIFF_BYTES and len(first_block) / (first_block.count(b"\n") + 1) > MINIFIED_MEAN_LINE_LENGTH:
+        return "minified"
+    return "ast-skipped" if size > max_parse_bytes else None
+
+
+def is_domain_active(domain: CompiledDomain, buffer: SourceBuffer) -> bool:
+    """Check whether content carries the domain's activation signature."""
+    if not domain.spec.activation:
+        return True
+    return any(buffer.find(literal) for literal in domain.activation_literals) or bool(
+        domain.activation_regex and buffer.regex(domain.activation_regex).search(buffer.content)
+    )
+
+
+def is_api_file(domain: CompiledDomain, project_path: str, buffer: SourceBuffer) -> bool:
+    """Check whether the path or content marks a file as an API endpoint file."""
+    return bool(domain.api_path_regex and domain.api_path_regex.search(project_path)) or bool(
+        domain.api_content_regex and buffer.regex(domain.api_content_regex).search(buffer.content)
+    )
+
+
+def find_candidate_lines(buffer: SourceBuffer, prefilter: Regex) -> list:
+    """Lines some pattern of a prefilter matches, in one pass over the buffer."""
+    candidate_lines = []
+    regex = buffer.regex(prefilter)
+    match = regex.search(buffer.content)
+
+    while match:
+        line_index = buffer.line_index(match.start())
+        candidate_lines.append(line_index)
+        if line_index + 1 >= len(buffer.line_starts):
+            break
+        # One candidate per line is enough; resume at the next line
+        match = regex.search(buffer.content, buffer.line_starts[line_index + 1])
+    return candidate_lines
+
+
+def run_grep_checks(domain: CompiledDomain, rule_indexes: list, buffer: SourceBuffer, on_violation) -> None:
+    """Report the line matches of grep rules, in rule order.
+
+    Prefiltered rules are confirmed on the prefilter's candidate lines only;
+    the others run on every line.
+    """
+    candidate_lines = [None, None]
+    for rule_index in rule_indexes:
+        grep_check = domain.grep_checks[rule_index]
+        if grep_check is None:
+            continue
+
+        prefilter_index = grep_check.prefilter_index
+        if prefilter_index is None:
+            searched_lines = range(len(buffer.line_starts))
+        else:
+            if candidate_lines[prefilter_index] is None:
+                candidate_lines[prefilter_index] = find_candidate_lines(buffer, domain.prefilters[prefilter_index])
+            searched_lines = candidate_lines[prefilter_index]
+
+        line_regex = buffer.regex(grep_check.line_regex)
+        ignore_regex = buffer.regex(grep_check.ignore_regex) if grep_check.ignore_regex else None
+        for line_index in searched_lines:
+            line_text = buffer.line_text(line_index)
+            match = line_regex.search(line_text)
+            if match and not (ignore_regex and ignore_regex.search(line_text)):
+                on_violation(rule_index, line_index + 1, buffer.column(line_text[:match.start()]))
+
+
+def collect_line_matches(buffer: SourceBuffer, regex: Regex, ignore_regex: Optional[Regex]) -> list:
+    """Locate every match of a pattern, at most one per line, skipping
+    matches the ignore pattern also matches."""
+    matches = []
+    content = buffer.content
+    pattern = buffer.regex(regex)
+    ignore_pattern = buffer.regex(ignore_regex) if ignore_regex else None
+    last_line_index = -1
+    match = pattern.search(content)
+
+    while match:
+        line_index = buffer.line_index(match.start())
+        if line_index != last_line_index and not (ignore_pattern and ignore_pattern.search(match.group(0))):
+            matches.append(buffer.locate(match.start()))
+            last_line_index = line_index
+        if line_index + 1 >= len(buffer.line_starts):
+            break
+        # Resume at the next line; this also steps past empty matches
+        match = pattern.search(content, max(buffer.line_starts[line_index + 1], match.start() + 1))
+    return matches
+
+
+def run_content_checks(domain: CompiledDomain, rule_indexes: list, buffer: SourceBuffer, on_violation, on_project_check) -> None:
+    """Report what the whole-file checks of a file find, in rule order.
+
+    A missing must_exist pattern is reported at the file's first line;
+    presence and project-wide rules are handed to on_project_check.
+    """
+    content = buffer.content
+    for rule_index in rule_indexes:
+        content_check = domain.content_checks[rule_index]
+        if content_check is None:
+            continue
+        kind = content_check.kind
+        violations = []
+
+        if kind == "span":
+            violations = collect_line_matches(buffer, content_check.regex, content_check.ignore_regex)
+        elif kind == "must-exist":
+            if not buffer.regex(content_check.regex).search(content):
+                violations = [(1, 1)]
+        elif kind == "trigger":
+            trigger_matches = collect_line_matches(buffer, content_check.regex, None)
+            if len(trigger_matches) >= content_check.trigger_count and not buffer.regex(content_check.requirement_regex).search(content):
+                violations = trigger_matches
+        elif kind == "conditions":
+            condition_matches = [buffer.regex(regex).search(content) for regex in content_check.condition_regexes]
+            first_match = next((match for match in condition_matches if match), None)
+            is_met = all(condition_matches) if content_check.require_all else first_match is not None
+            if is_met and first_match:
+                violations = [buffer.locate(first_match.start())]
+        elif kind == "presence":
+            on_project_check(rule_index, bool(buffer.regex(content_check.regex).search(content)))
+        else:
+            on_project_check(rule_index, False)
+
+        for line, column in violations:
+            on_violation(rule_index, line, column)
+
+
+def select_domain_rules(domain: CompiledDomain, rule_indexes: list, project_path: str, buffer: SourceBuffer) -> Optional[list]:
+    """Narrow a domain's in-scope rules by the file's content.
+
+    Returns None if the domain is not active in the file; api_files_only
+    rules are dropped unless it is an API file.
+    """
+    if not is_domain_active(domain, buffer):
+        return None
+    if any(domain.rules[rule_index].api_files_only for rule_index in rule_indexes) and \
+            not is_api_file(domain, project_path, buffer):
+        return [rule_index for rule_index in rule_indexes if not domain.rules[rule_index].api_files_only]
+    return rule_indexes
+
+
+# =============================================================================
+# Python AST rules (python_ast)
+# =============================================================================
+
+@dataclass
+class FieldConstraint:
+    """A compiled python_ast field constraint.
+
+    kind is equals, one-of, match (regex on a name), node (nested matcher)
+    or any (some element of a list field matches a nested matcher).
+    """
+    kind: str
+    expected: object
+
+
+@dataclass
+class NodeMatcher:
+    """A compiled python_ast node matcher."""
+    node_classes: tuple
+    field_constraints: list
+    # Parent fields the node must sit in; empty for anywhere
+    parent_fields: frozenset
+
+
+def compile_node_matcher(matcher: dict) -> NodeMatcher:
+    """Compile a node matcher that flight-domain-compile has validated."""
+    node_names = matcher["node"] if isinstance(matcher["node"], list) else [matcher["node"]]
+    in_field = matcher.get("in_field", [])
+    return NodeMatcher(
+        node_classes=tuple(flight_domain_compile.python_ast_node_class(node_name) for node_name in node_names),
+        field_constraints=[
+            (field_name, compile_field_constraint(constraint))
+            for field_name, constraint in matcher.get("fields", {}).items()
+        ],
+        parent_fields=frozenset(in_field if isinstance(in_field, list) else [in_field]),
+    )
+
+
+def compile_field_constraint(constraint) -> FieldConstraint:
+    """Compile one field constraint of a node matcher."""
+    if isinstance(constraint, list):
+        return FieldConstraint("one-of", constraint)
+    if not isinstance(constraint, dict):
+        return FieldConstraint("equals", constraint)
+    if "match" in constraint:
+        return FieldConstraint("match", re.compile(constraint["match"]))
+    if "any" in constraint:
+        return FieldConstraint("any", compile_node_matcher(constraint["any"]))
+    return FieldConstraint("node", compile_node_matcher(constraint))
+
+
+def is_same_literal(expected, value) -> bool:
+    """Compare a literal without letting True equal 1 or 1 equal 1.0."""
+    return value is None if expected is None else type(value) is type(expected) and value == expected
+
+
+def matches_node(matcher: NodeMatcher, node: ast.AST, parent_field: Optional[str]) -> bool:
+    """Check a node, found in its parent's parent_field, against a matcher."""
+    if type(node) not in matcher.node_classes:
+        return False
+    if matcher.parent_fields and parent_field not in matcher.parent_fields:
+        return False
+    return all(
+        matches_field(constraint, getattr(node, field_name, None), field_name)
+        for field_name, constraint in matcher.field_constraints
+    )
+
+
+def matches_field(constraint: FieldConstraint, value, field_name: str) -> bool:
+    """Check a node's field value against a constraint."""
+    if constraint.kind == "equals":
+        return is_same_literal(constraint.expected, value)
+    if constraint.kind == "one-of":
+        return any(is_same_literal(expected, value) for expected in constraint.expected)
+    if constraint.kind == "match":
+        return isinstance(value, str) and constraint.expected.search(value) is not None
+    if constraint.kind == "node":
+        return isinstance(value, ast.AST) and matches_node(constraint.expected, value, field_name)
+    return isinstance(value, list) and any(
+        isinstance(item, ast.AST) and matches_node(constraint.expected, item, field_name) for item in value
+    )
+
+
+class PythonAstVisitor(ast.NodeVisitor):
+    """Evaluates the python_ast queries of a file in one traversal.
+
+    Matchers are indexed by node class, so each node is only tested against
+    the matchers that name its class. Each key's matches are collected as
+    (line, UTF-8 column offset) pairs.
+    """
+
+    def __init__(self, matchers_by_class: dict):
+        self.matchers_by_class = matchers_by_class
+        self.matches = {}
+        self.parent_field = None
+
+    def generic_visit(self, node: ast.AST) -> None:
+        matched_keys = set()
+        for key, matcher in self.matchers_by_class.get(type(node), ()):
+            if key not in matched_keys and matches_node(matcher, node, self.parent_field):
+                matched_keys.add(key)
+                self.matches.setdefault(key, []).append((node.lineno, node.col_offset))
+
+        for field_name, value in ast.iter_fields(node):
+            for child in value if isinstance(value, list) else (value,):
+                if isinstance(child, ast.AST):
+                    self.parent_field = field_name
+                    self.visit(child)
+
+
+def find_python_ast_matches(buffer: SourceBuffer, rule_matchers: dict) -> dict:
+    """Run python_ast queries over a Python file, parsing it once.
+
+    rule_matchers maps a key to a rule's node matchers. Returns each key's
+    (line, column) matches in position order; files that do not parse have
+    none.
+    """
+    matchers_by_class = {}
+    for key, matchers in rule_matchers.items():
+        for matcher in matchers:
+            for node_class in matcher.node_classes:
+                matchers_by_class.setdefault(node_class, []).append((key, matcher))
+
+    source = buffer.content if buffer.is_text else buffer.content[:]
+    visitor = PythonAstVisitor(matchers_by_class)
+    try:
+        with warnings.catch_warnings():
+            # Invalid escape sequences and the like are the code's business
+            warnings.simplefilter("ignore")
+            tree = ast.parse(source)
+        visitor.visit(tree)
+    except (SyntaxError, ValueError, RecursionError):
+        return {}
+
+    return {
+        key: [buffer.locate_utf8(line, utf8_offset) for line, utf8_offset in sorted(matches)]
+        for key, matches in visitor.matches.items()
+    }
+
+
+def is_rule_compatible_with_file(file_language: str, rule_language: Optional[str]) -> bool:
+    """Check if a rule's target language covers a file's language."""
+    if not rule_language:
+        return True
+    return file_language in LANGUAGE_COMPATIBILITY.get(rule_language, (rule_language,))
+
+
+@dataclass
+class FileVisit:
+    """What scanning one file found for the domains that include it."""
+    scanned_domains: list
+    # (domain index, rule index, line, column)
+    violations: list = field(default_factory=list)
+    # (domain index, rule index, whether the file satisfies the rule)
+    project_checks: list = field(default_factory=list)
+    skip_reason: Optional[str] = None
+    skipped_domains: list = field(default_factory=list)
+
+
+@dataclass
+class ScanSettings:
+    """Run-wide settings every scanning process needs."""
+    project_root: str
+    max_parse_bytes: int = DEFAULT_MAX_PARSE_BYTES
+    max_file_bytes: int = DEFAULT_MAX_FILE_BYTES
+
+
+# The domains and settings of the run, set once in each scanning process
+scan_domains: list = []
+scan_settings: Optional[ScanSettings] = None
+
+
+def init_scan(specs: list, settings: ScanSettings) -> None:
+    """Compile the run's domains in this process."""
+    global scan_domains, scan_settings
+    scan_domains = [compile_domain(spec) for spec in specs]
+    scan_settings = settings
+
+
+def scan_buffer(domain_rules: dict, project_path: str, file_language: Optional[str], visit: FileVisit,
+                buffer: SourceBuffer) -> None:
+    """Run the rules in scope of each domain over a file's buffer.
+
+    Each domain reports its grep rules, then its whole-file checks, then its
+    python_ast rules, whose queries for every domain share one traversal.
+    """
+    selected_rules = {}
+    for domain_index, rule_indexes in domain_rules.items():
+        rule_indexes = select_domain_rules(scan_domains[domain_index], rule_indexes, project_path, buffer)
+        if rule_indexes is not None:
+            selected_rules[domain_index] = rule_indexes
+
+    python_ast_matches = {}
+    if file_language == "python" and visit.skip_reason is None:
+        rule_matchers = {
+            (domain_index, rule_index): scan_domains[domain_index].python_ast_matchers[rule_index]
+            for domain_index, rule_indexes in selected_rules.items() for rule_index in rule_indexes
+            if scan_domains[domain_index].python_ast_matchers[rule_index]
+        }
+        if rule_matchers:
+            python_ast_matches = find_python_ast_matches(buffer, rule_matchers)
+
+    for domain_index, rule_indexes in selected_rules.items():
+        domain = scan_domains[domain_index]
+        run_grep_checks(
+            domain, rule_indexes, buffer,
+            lambda rule_index, line, column: visit.violations.append((domain_index, rule_index, line, column)),
+        )
+        run_content_checks(
+            domain, rule_indexes, buffer,
+            lambda rule_index, line, column: visit.violations.append((domain_index, rule_index, line, column)),
+            lambda rule_index, found: visit.project_checks.append((domain_index, rule_index, found)),
+        )
+        for rule_index in rule_indexes:
+            for line, column in python_ast_matches.get((domain_index, rule_index), ()):
+                visit.violations.append((domain_index, rule_index, line, column))
+
+
+def scan_file(file_path: str, domain_indexes: list) -> FileVisit:
+    """Scan one file for every domain that includes it.
+
+    Rules are narrowed to those whose path scope includes the file before it
+    is read. Binary and oversized files are skipped; minified files and
+    files too large to parse only lose their AST rules, as in flight-lint.
+    """
+    project_path = os.path.relpath(file_path, scan_settings.project_root).replace(os.sep, "/")
+    file_language = LANGUAGE_BY_EXTENSION.get(file_path.rsplit(".", 1)[-1].lower()) if "." in file_path else None
+    visit = FileVisit(scanned_domains=[])
+
+    # Skip files with no rule in scope, or only AST rules without language support
+    domain_rules = {}
+    for domain_index in domain_indexes:
+        domain = scan_domains[domain_index]
+        rule_indexes = [
+            rule_index for rule_index, path_scope in enumerate(domain.path_scopes)
+            if path_scope is None or path_scope.includes(project_path)
+        ]
+        if rule_indexes and (file_language is not None or any(
+            not has_ast_query(domain.rules[rule_index]) for rule_index in rule_indexes
+        )):
+            domain_rules[domain_index] = rule_indexes
+    if not domain_rules:
+        return visit
+
+    try:
+        with open(file_path, "rb") as file_handle:
+            size = os.fstat(file_handle.fileno()).st_size
+            visit.skip_reason = assess_source(file_handle, size, scan_settings.max_parse_bytes, scan_settings.max_file_bytes)
+            if visit.skip_reason not in (None, "ast-skipped", "minified"):
+                visit.skipped_domains = list(domain_rules)
+                return visit
+
+            buffer, mapping = open_source_buffer(file_handle, size)
+            try:
+                scan_buffer(domain_rules, project_path, file_language, visit, buffer)
+            finally:
+                if mapping is not None:
+                    mapping.close()
+    except OSError:
+        visit.skip_reason = None
+        return visit
+
+    visit.scanned_domains = list(domain_rules)
+    if visit.skip_reason in ("ast-skipped", "minified"):
+        # Only domains with AST rules for this language lost anything
+        visit.skipped_domains = [
+            domain_index for domain_index, rule_indexes in domain_rules.items()
+            if file_language is not None and any(
+                has_ast_query(scan_domains[domain_index].rules[rule_index]) and
+                is_rule_compatible_with_file(file_language, scan_domains[domain_index].rules[rule_index].check.get("language"))
+                for rule_index in rule_indexes
+            )
+        ]
+    return visit
+
+
+# =============================================================================
+# Project-wide rules
+# =============================================================================
+
+def exists_in_project(directory: str, path_segments: list) -> bool:
+    """Check whether a path or glob relative to a directory names something
+    that exists. Globs are resolved one segment at a time, skipping dot entries."""
+    if not path_segments:
+        return True
+    path_segment, remaining_segments = path_segments[0], path_segments[1:]
+    if not re.search(r"[*?\[{]", path_segment):
+        child_path = os.path.join(directory, path_segment)
+        return os.path.exists(child_path) and exists_in_project(child_path, remaining_segments)
+
+    try:
+        visible_entries = [entry for entry in os.scandir(directory) if not entry.name.startswith(".")]
+    except OSError:
+        return False
+
+    if path_segment == "**":
+        return exists_in_project(directory, remaining_segments) or any(
+            entry.is_dir() and exists_in_project(entry.path, path_segments) for entry in visible_entries
+        )
+    segment_matcher = re.compile(glob_to_regex(path_segment))
+    return any(
+        segment_matcher.fullmatch(entry.name) and exists_in_project(entry.path, remaining_segments)
+        for entry in visible_entries
+    )
+
+
+def run_script_rule(rule: Rule, file_paths: list, project_root: str) -> list:
+    """Run a script rule once over its files, as the generated validators do.
+
+    Each line the script prints is a violation: lines starting with
+    "path:line:" or "path:" for one of its files are reported there, any
+    other line at the project root. Returns (file path, line) pairs, or
+    None if the script ran past SCRIPT_TIMEOUT_SECONDS and was killed.
+    """
+    script_source = f'for file in "$@"; do\n{rule.check.get("code", "")}\ndone'
+    relative_paths = [os.path.relpath(file_path, project_root).replace(os.sep, "/") for file_path in file_paths]
+    try:
+        completed = subprocess.run(
+            ["bash", "-c", script_source, "flight-validate", *relative_paths],
+            cwd=project_root, capture_output=True, text=True, errors="replace", timeout=SCRIPT_TIMEOUT_SECONDS,
+        )
+    except subprocess.TimeoutExpired:
+        return None
+    except OSError:
+        return []
+
+    script_files = set(file_paths)
+    locations = []
+    for output_line in completed.stdout.split("\n"):
+        if not output_line.strip():
+            continue
+        location_match = re.match(r"([^:]+):(?:(\d+):)?", output_line)
+        reported_path = os.path.normpath(os.path.join(project_root, location_match.group(1))) if location_match else None
+        if reported_path in script_files:
+            locations.append((reported_path, int(location_match.group(2)) if location_match.group(2) else 1))
+        else:
+            locations.append((project_root, 1))
+    return locations
+
+
+def judge_project_rules(rules: list, project_outcomes: dict, project_root: str) -> list:
+    """Judge a domain's project-wide rules once all of its files are scanned.
+
+    project_outcomes maps a rule index to (files in scope, whether some file
+    matched). Returns (rule index, file path, line) violations in rule order,
+    and False if a script rule timed out; violations without a file of their
+    own are at the project root.
+    """
+    violations = []
+    complete = True
+    for rule_index in sorted(project_outcomes):
+        rule = rules[rule_index]
+        file_paths, found = project_outcomes[rule_index]
+        check_type = rule.check.get("type")
+
+        if check_type == "presence" and not found:
+            violations.append((rule_index, project_root, 1))
+        elif check_type == "file_exists":
+            if not any(
+                exists_in_project(project_root, [segment for segment in required_path.split("/") if segment not in ("", ".")])
+                for required_path in rule.check.get("paths", [])
+            ):
+                violations.append((rule_index, project_root, 1))
+        elif check_type == "script":
+            locations = run_script_rule(rule, file_paths, project_root)
+            if locations is None:
+                complete = False
+                continue
+            violations.extend((rule_index, file_path, line) for file_path, line in locations)
+    return violations, complete
+
+
+# =============================================================================
+# Running and reporting
+# =============================================================================
+
+@dataclass
+class DomainReport:
+    """Results of one domain, in flight-lint's summary layout."""
+    domain: str
+    file_count: int = 0
+    results: list = field(default_factory=list)
+    skipped_files: list = field(default_factory=list)
+    complete: bool = True
+
+    def to_summary(self) -> dict:
+        summary = {"domain": self.domain, "fileCount": self.file_count, "results": self.results}
+        if not self.complete:
+            summary["complete"] = False
+        if self.skipped_files:
+            summary["skippedFiles"] = self.skipped_files
+        return summary
+
+
+def validate_domains(targets: list, settings: ScanSettings, jobs: int = 1) -> list:
+    """Run domains over their files, each file read once for all of them.
+
+    targets is a list of (DomainSpec, absolute file paths). Files are visited
+    in path order; with several jobs they are spread over a process pool,
+    and results are still reported in visit order.
+    Returns a DomainReport per target.
+    """
+    specs = [spec for spec, _ in targets]
+    file_domains = {}
+    for domain_index, (_, file_paths) in enumerate(targets):
+        for file_path in dict.fromkeys(file_paths):
+            file_domains.setdefault(file_path, []).append(domain_index)
+    visit_order = sorted(file_domains)
+    domain_lists = [file_domains[file_path] for file_path in visit_order]
+
+    if jobs > 1 and len(visit_order) >= FILES_PER_BATCH * 2:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=init_scan, initargs=(specs, settings)) as pool:
+            visits = list(pool.map(scan_file, visit_order, domain_lists, chunksize=FILES_PER_BATCH))
+    else:
+        init_scan(specs, settings)
+        visits = [scan_file(file_path, domain_indexes) for file_path, domain_indexes in zip(visit_order, domain_lists)]
+
+    rules_by_domain = [list(spec.rules.values()) for spec in specs]
+    reports = [DomainReport(spec.domain) for spec in specs]
+    project_outcomes = [{} for _ in specs]
+
+    def add_result(domain_index: int, rule_index: int, file_path: str, line: int, column: int) -> None:
+        rule = rules_by_domain[domain_index][rule_index]
+        reports[domain_index].results.append({
+            "filePath": file_path,
+            "line": line,
+            "column": column,
+            "ruleId": rule.id,
+            "severity": rule.severity,
+            "message": rule.description,
+        })
+
+    for file_path, visit in zip(visit_order, visits):
+        for domain_index in visit.scanned_domains:
+            reports[domain_index].file_count += 1
+        for domain_index in visit.skipped_domains:
+            reports[domain_index].skipped_files.append({"filePath": file_path, "reason": visit.skip_reason})
+        for domain_index, rule_index, line, column in visit.violations:
+            add_result(domain_index, rule_index, file_path, line, column)
+        for domain_index, rule_index, found in visit.project_checks:
+            file_paths, was_found = project_outcomes[domain_index].get(rule_index, ([], False))
+            project_outcomes[domain_index][rule_index] = (file_paths + [file_path], was_found or found)
+
+    for domain_index, outcomes in enumerate(project_outcomes):
+        violations, complete = judge_project_rules(rules_by_domain[domain_index], outcomes, settings.project_root)
+        for rule_index, file_path, line in violations:
+            add_result(domain_index, rule_index, file_path, line, 1)
+        reports[domain_index].complete = complete
+
+    return reports
+
+
+def count_report(report: DomainReport) -> dict:
+    """Count a domain's results per severity and per rule."""
+    severity_counts = {severity: 0 for severity in SEVERITIES}
+    rule_counts = {}
+    for result in report.results:
+        severity_counts[result["severity"]] += 1
+        rule_counts[result["ruleId"]] = rule_counts.get(result["ruleId"], 0) + 1
+    return {"domain": report.domain, "fileCount": report.file_count, "severity": severity_counts,
+            "rules": rule_counts, "skippedFiles": report.skipped_files, "complete": report.complete}
+
+
+def total_counts(domain_counts: list) -> dict:
+    """Add up domain counts; errors are NEVER + MUST, warnings everything else."""
+    severity_totals = {severity: 0 for severity in SEVERITIES}
+    skipped_file_paths = set()
+    file_total = 0
+    for counts in domain_counts:
+        file_total += counts["fileCount"]
+        skipped_file_paths.update(skipped_file["filePath"] for skipped_file in counts["skippedFiles"])
+        for severity in SEVERITIES:
+            severity_totals[severity] += counts["severity"][severity]
+
+    violation_total = sum(severity_totals.values())
+    error_total = severity_totals["NEVER"] + severity_totals["MUST"]
+    return {
+        "files": file_total,
+        "total": violation_total,
+        "errors": error_total,
+        "warnings": violation_total - error_total,
+        "severity": severity_totals,
+        "complete": all(counts["complete"] for counts in domain_counts),
+        "skippedFiles": len(skipped_file_paths),
+    }
+
+
+def total_rule_counts(domain_counts: list) -> dict:
+    """Count each rule's violations, keyed "domain/ruleId"."""
+    rule_totals = {}
+    for counts in domain_counts:
+        for rule_id, rule_count in counts["rules"].items():
+            rule_key = f"{counts['domain']}/{rule_id}"
+            rule_totals[rule_key] = rule_totals.get(rule_key, 0) + rule_count
+    return rule_totals
+
+
+def to_compact_json(value) -> str:
+    """Serialise like JSON.stringify() without indentation."""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def format_counts(reports: list) -> str:
+    """Format totals as flight-lint --count-only does."""
+    domain_counts = [count_report(report) for report in reports]
+    totals = total_counts(domain_counts)
+    complete, skipped_files = totals.pop("complete"), totals.pop("skippedFiles")
+    return to_compact_json({**totals, "rules": total_rule_counts(domain_counts),
+                            "complete": complete, "skippedFiles": skipped_files})
+
+
+def format_run_summary(reports: list, top_count: int = DEFAULT_SUMMARY_TOP) -> str:
+    """Format the run summary record flight-lint --summary-file writes: the
+    count-only totals, per-domain totals and the most severe violations."""
+    domain_counts = [count_report(report) for report in reports]
+    counts_by_domain = {}
+    for counts in domain_counts:
+        counts_by_domain.setdefault(counts["domain"], []).append(counts)
+
+    top_by_severity = {severity: [] for severity in SEVERITIES}
+    for report in reports:
+        for result in report.results:
+            severity_results = top_by_severity[result["severity"]]
+            if len(severity_results) < top_count:
+                severity_results.append({"domain": report.domain, **result})
+
+    totals = total_counts(domain_counts)
+    complete, skipped_files = totals.pop("complete"), totals.pop("skippedFiles")
+    return to_compact_json({
+        **totals,
+        "rules": total_rule_counts(domain_counts),
+        "complete": complete,
+        "skippedFiles": skipped_files,
+        "domains": {domain: total_counts(same_domain_counts) for domain, same_domain_counts in counts_by_domain.items()},
+        "top": [result for severity in SEVERITIES for result in top_by_severity[severity]][:top_count],
+    })
+
+
+def prepare_targets(rules_file_paths: list, minimum_severity: str, project_root: Path) -> list:
+    """Load each rules file and assign it the project files it applies to.
+
+    Domains with no rules at the severity, or no matching files, are dropped.
+    Returns (DomainSpec, absolute file paths) pairs, in rules file order.
+    """
+    specs = []
+    for rules_file_path in rules_file_paths:
+        spec = filter_rules_by_severity(load_domain_spec(rules_file_path), minimum_severity)
+        if spec.rules:
+            specs.append(spec)
+
+    domain_files = map_files_to_domains(walk_project_files(project_root), specs, project_root)
+    return [(spec, file_paths) for spec, file_paths in zip(specs, domain_files) if file_paths]
+
+
+def parse_args(argv: Optional[list] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Run compiled .rules.json rules without Node (AST rules only as python_ast)",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+    flight-validate --auto                         # Rules of this project's domains
+    flight-validate --auto --count-only            # One-line totals
+    flight-validate --auto --summary-file out.json # Also write the run summary
+        """
+    )
+    parser.add_argument("rules_files", nargs="*", help="One or more .rules.json files")
+    parser.add_argument("--auto", action="store_true", help="Auto-discover .rules.json files in .flight/domains/")
+    parser.add_argument("--format", choices=["json"], default="json", help="Output format (flight-lint's json)")
+    parser.add_argument("--severity", choices=SEVERITIES[:3], default="SHOULD", help="Minimum severity")
+    parser.add_argument("--count-only", action="store_true", help="Only count violations and print a one-line JSON summary")
+    parser.add_argument("--summary-file", help="Also write the run summary record to this file")
+    parser.add_argument("--summary-top", type=int, default=DEFAULT_SUMMARY_TOP,
+                        help=f"Violations the run summary lists (default: {DEFAULT_SUMMARY_TOP})")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Processes to scan with (default: available cores)")
+    parser.add_argument("--max-parse-bytes", type=int, default=DEFAULT_MAX_PARSE_BYTES,
+                        help="Files above this are listed as ast-skipped (default: 1 MiB)")
+    parser.add_argument("--max-file-bytes", type=int, default=DEFAULT_MAX_FILE_BYTES,
+                        help="Skip larger files entirely (default: 16 MiB)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list] = None) -> int:
+    args = parse_args(argv)
+    project_root = Path(os.getcwd())
+
+    try:
+        rules_file_paths = list(args.rules_files)
+        if args.auto:
+            rules_file_paths += select_auto_rules_files(project_root)
+        if not rules_file_paths:
+            raise ValueError("No rules files given (pass .rules.json files or --auto)")
+        targets = prepare_targets(rules_file_paths, args.severity, project_root)
+    except ValueError as error:
+        print(f"Error: {error}", file=sys.stderr)
+        return EXIT_CONFIG_ERROR
+
+    for spec, _ in targets:
+        ast_rule_count = sum(
+            1 for rule in spec.rules.values() if has_ast_query(rule) and not has_python_ast_query(rule)
+        )
+        if ast_rule_count:
+            print(f"Warning: {spec.domain}: {ast_rule_count} AST rule(s) not run; use flight-lint for them",
+                  file=sys.stderr)
+
+    settings = ScanSettings(str(project_root), args.max_parse_bytes, args.max_file_bytes)
+    reports = validate_domains(targets, settings, max(args.jobs, 1))
+
+    if args.count_only:
+        print(format_counts(reports))
+    else:
+        for report in reports:
+            print(json.dumps(report.to_summary(), indent=2, ensure_ascii=False))
+    if args.summary_file:
+        summary_path = Path(args.summary_file)
+        summary_path.parent.mkdir(parents=True, exist_ok=True)
+        summary_path.write_text(format_run_summary(reports, args.summary_top) + "\n", encoding="utf-8")
+
+    has_failures = any(result["severity"] in ("NEVER", "MUST") for report in reports for result in report.results)
+    return EXIT_VIOLATIONS if has_failures else EXIT_SUCCESS
+
+
+if __name__ == "__main__":
+    sys.exit(main())
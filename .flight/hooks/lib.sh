@@ -8,9 +8,13 @@
 #
 # Provides:
 #   respond()              - Output JSON response to stdout
-#   run_flight_lint()      - Run flight-lint and capture JSON output
-#   count_by_severity()    - Count violations by severity level
-#   get_total_violations() - Get total violation count
+#   run_flight_lint()      - Run flight-lint and capture its summary record
+#   run_flight_lint_command() - Run flight-lint, showing stderr if it fails
+#   run_flight_lint_batch() - Lint in-memory file contents read from stdin
+#   read_lint_summary()    - Read counts and top violations from a summary record
+#   compute_tree_fingerprint()       - Hash the state of the working tree
+#   start_background_validation()    - Validate speculatively after an edit
+#   run_validation_reusing_speculation() - Reuse a speculative result if current
 #   check_jq_available()   - Check if jq is installed
 #
 # =============================================================================
@@ -24,6 +28,38 @@ readonly FLIGHT_DIR="$(dirname "$HOOKS_DIR")"
 readonly PROJECT_ROOT="$(dirname "$FLIGHT_DIR")"
 readonly FLIGHT_LINT_BIN="$PROJECT_ROOT/flight-lint/bin/flight-lint"
 
+# Wall-clock budgets for validation (ms), counted from flight-lint's start; each
+# stays under its hook's timeout in templates/claude-settings.json
+# (PreToolUse 15 s, PostToolUse 30 s, Stop and SubagentStop 60 s)
+readonly FLIGHT_LINT_PRE_BUDGET_MS="${FLIGHT_LINT_PRE_BUDGET_MS:-10000}"
+readonly FLIGHT_LINT_POST_BUDGET_MS="${FLIGHT_LINT_POST_BUDGET_MS:-25000}"
+readonly FLIGHT_LINT_STOP_BUDGET_MS="${FLIGHT_LINT_STOP_BUDGET_MS:-50000}"
+
+# Socket of a warm `flight-lint serve` daemon; used only while it exists
+readonly FLIGHT_LINT_SOCKET="${FLIGHT_LINT_SOCKET:-$FLIGHT_DIR/flight-lint.sock}"
+
+# Results of background validation runs, keyed by tree fingerprint
+readonly FLIGHT_LINT_STATE_DIR="${FLIGHT_LINT_STATE_DIR:-$FLIGHT_DIR/.lint-state}"
+readonly FLIGHT_LINT_RESULT_FILE="$FLIGHT_LINT_STATE_DIR/result"
+readonly FLIGHT_LINT_RUNNER_LOCK="$FLIGHT_LINT_STATE_DIR/runner.pid"
+
+# Runs one background runner makes before giving up on a tree that keeps changing
+readonly FLIGHT_LINT_SPECULATIVE_RUNS=3
+
+# A lock file still empty after this many seconds belongs to a runner that died
+# before writing its pid
+readonly FLIGHT_LINT_EMPTY_LOCK_GRACE_SECONDS=5
+
+# Timeout of the Stop and SubagentStop hooks (ms), as in templates/claude-settings.json
+readonly FLIGHT_STOP_HOOK_TIMEOUT_MS="${FLIGHT_STOP_HOOK_TIMEOUT_MS:-60000}"
+
+# Time kept back from a hook's timeout to read the result and respond (ms)
+readonly FLIGHT_HOOK_RESPONSE_MARGIN_MS=3000
+
+# Shortest budget the Stop hook keeps for its own run after waiting for a
+# background one (ms)
+readonly FLIGHT_LINT_MIN_FALLBACK_BUDGET_MS=10000
+
 # -----------------------------------------------------------------------------
 # check_jq_available - Check if jq is installed
 # -----------------------------------------------------------------------------
@@ -34,6 +70,44 @@ check_jq_available() {
     command -v jq &>/dev/null
 }
 
+# -----------------------------------------------------------------------------
+# now_ms - Print the wall-clock time in milliseconds
+# -----------------------------------------------------------------------------
+# Uses EPOCHREALTIME (bash 5) or GNU date; elsewhere the resolution is one
+# second.
+# -----------------------------------------------------------------------------
+now_ms() {
+    if [[ -n "${EPOCHREALTIME:-}" ]]; then
+        local realtime_us="${EPOCHREALTIME/[.,]/}"
+        printf '%s\n' "$((10#$realtime_us / 1000))"
+        return 0
+    fi
+
+    local date_ms
+    date_ms="$(date +%s%3N 2>/dev/null)" || date_ms=""
+    [[ "$date_ms" =~ ^[0-9]+$ ]] || date_ms="$(($(date +%s) * 1000))"
+    printf '%s\n' "$date_ms"
+}
+
+# When the hook that sourced this file started (ms)
+readonly FLIGHT_HOOK_STARTED_MS="$(now_ms)"
+
+# -----------------------------------------------------------------------------
+# hook_time_left_ms - Print how much of the hook's timeout is left
+# -----------------------------------------------------------------------------
+# Arguments:
+#   $1 - timeout_ms: The hook's timeout
+# Output:
+#   Milliseconds left before the response margin, 0 if none
+# -----------------------------------------------------------------------------
+hook_time_left_ms() {
+    local timeout_ms="$1"
+    local time_left_ms
+
+    time_left_ms=$((timeout_ms - FLIGHT_HOOK_RESPONSE_MARGIN_MS - ($(now_ms) - FLIGHT_HOOK_STARTED_MS)))
+    printf '%s\n' "$((time_left_ms > 0 ? time_left_ms : 0))"
+}
+
 # -----------------------------------------------------------------------------
 # escape_json_string - Escape a string for JSON output
 # -----------------------------------------------------------------------------
@@ -88,18 +162,61 @@ respond() {
 }
 
 # -----------------------------------------------------------------------------
-# run_flight_lint - Run flight-lint and capture JSON output
+# run_flight_lint_command - Run flight-lint, showing stderr if it fails
+# -----------------------------------------------------------------------------
+# stderr carries warnings such as invalid queries, which would corrupt the
+# output, so it is held back - and written out only when flight-lint exits
+# with neither 0 nor 1 (violations), i.e. when it could not lint.
+# Arguments:
+#   flight-lint arguments
+# Output:
+#   flight-lint's stdout; on failure, its stderr on stderr
+# Returns:
+#   Exit code from flight-lint
+# -----------------------------------------------------------------------------
+run_flight_lint_command() {
+    local exit_code=0
+    local stderr_file
+    stderr_file="$(mktemp "${TMPDIR:-/tmp}/flight-lint-stderr.XXXXXX" 2>/dev/null)" || stderr_file=""
+
+    "$FLIGHT_LINT_BIN" "$@" 2>"${stderr_file:-/dev/null}" || exit_code=$?
+
+    if [[ -n "$stderr_file" ]]; then
+        if [[ "$exit_code" -ne 0 ]] && [[ "$exit_code" -ne 1 ]]; then
+            printf 'flight-lint exited with code %s\n' "$exit_code" >&2
+            cat "$stderr_file" >&2
+        fi
+        rm -f "$stderr_file"
+    fi
+    return "$exit_code"
+}
+
+# -----------------------------------------------------------------------------
+# run_flight_lint - Run flight-lint and capture its summary record
 # -----------------------------------------------------------------------------
+# Arguments:
+#   $1 - time_budget_ms: Wall-clock budget (default: FLIGHT_LINT_STOP_BUDGET_MS)
 # Output:
-#   JSON from flight-lint --auto --format json
+#   One JSON line from flight-lint --auto --format summary --time-budget <ms>:
+#   run and per-domain counts plus the most severe violations (see
+#   read_lint_summary). NEVER rules run first, then MUST, then SHOULD;
+#   recently edited files first. "complete" is false if the budget ran out.
+#   Goes through the flight-lint serve daemon when its socket exists; the
+#   client falls back to a one-shot run if the daemon does not answer.
+#   Runs with --single-flight: hooks that overlap share one flight-lint run
+#   (one that started after all of their edits) instead of contending.
 #   Or special marker if flight-lint not found: __FLIGHT_LINT_NOT_FOUND__
+#   If flight-lint fails, its stderr is written to stderr (see
+#   run_flight_lint_command)
 # Returns:
 #   Exit code from flight-lint (0 = no violations, non-zero = violations found)
 #   Returns 127 if flight-lint binary not found
 # -----------------------------------------------------------------------------
 run_flight_lint() {
+    local time_budget_ms="${1:-$FLIGHT_LINT_STOP_BUDGET_MS}"
     local lint_output=""
     local exit_code=0
+    local connect_args=()
 
     # Check if flight-lint exists
     if [[ ! -x "$FLIGHT_LINT_BIN" ]]; then
@@ -107,14 +224,54 @@ run_flight_lint() {
         return 127
     fi
 
+    if [[ -S "$FLIGHT_LINT_SOCKET" ]]; then
+        connect_args=(--connect "$FLIGHT_LINT_SOCKET")
+    fi
+
     # Run flight-lint and capture output
-    lint_output="$("$FLIGHT_LINT_BIN" --auto --format json 2>&1)" || exit_code=$?
+    lint_output="$(run_flight_lint_command --auto --format summary --single-flight \
+        --time-budget "$time_budget_ms" ${connect_args[@]+"${connect_args[@]}"})" \
+        || exit_code=$?
 
     # Output the result
     printf '%s\n' "$lint_output"
     return "$exit_code"
 }
 
+# -----------------------------------------------------------------------------
+# run_flight_lint_batch - Lint file contents without writing them to disk
+# -----------------------------------------------------------------------------
+# Input:
+#   JSON batch on stdin: {"files": [{"path": ..., "content": ...}]}
+# Output:
+#   JSON from flight-lint --auto --stdin --format json --severity MUST
+#   --time-budget FLIGHT_LINT_PRE_BUDGET_MS, covering only the domains whose
+#   patterns match a batch path; if flight-lint fails, its stderr on stderr
+# Returns:
+#   Exit code from flight-lint, or 127 if the binary is not found
+# -----------------------------------------------------------------------------
+run_flight_lint_batch() {
+    local lint_output=""
+    local exit_code=0
+    local connect_args=()
+
+    if [[ ! -x "$FLIGHT_LINT_BIN" ]]; then
+        printf '__FLIGHT_LINT_NOT_FOUND__\n'
+        return 127
+    fi
+
+    if [[ -S "$FLIGHT_LINT_SOCKET" ]]; then
+        connect_args=(--connect "$FLIGHT_LINT_SOCKET")
+    fi
+
+    lint_output="$(run_flight_lint_command --auto --stdin --format json --severity MUST \
+        --time-budget "$FLIGHT_LINT_PRE_BUDGET_MS" ${connect_args[@]+"${connect_args[@]}"})" \
+        || exit_code=$?
+
+    printf '%s\n' "$lint_output"
+    return "$exit_code"
+}
+
 # -----------------------------------------------------------------------------
 # check_flight_lint_available - Check if flight-lint binary exists
 # -----------------------------------------------------------------------------
@@ -128,109 +285,360 @@ check_flight_lint_available() {
 # -----------------------------------------------------------------------------
 # run_all_validation - Run flight-lint (handles both AST and grep rules)
 # -----------------------------------------------------------------------------
+# Arguments:
+#   $1 - time_budget_ms: Wall-clock budget (default: FLIGHT_LINT_STOP_BUDGET_MS)
 # Output:
-#   JSON from flight-lint
+#   Summary record from flight-lint (see run_flight_lint)
 # Returns:
 #   0 if no violations, non-zero if violations found
 # -----------------------------------------------------------------------------
 run_all_validation() {
     # flight-lint is the single source of truth for all validation
     # It handles both AST rules (tree-sitter) and grep rules (regex patterns)
-    run_flight_lint
+    run_flight_lint "$@"
 }
 
 # -----------------------------------------------------------------------------
-# count_by_severity - Count violations by severity level
+# read_lint_summary - Read counts and top violations from a summary record
 # -----------------------------------------------------------------------------
+# One jq call reads everything the hooks report, however many violations the
+# run found: the record only lists the most severe ones.
 # Arguments:
-#   $1 - json_string: JSON output from flight-lint
-#   $2 - severity: NEVER, MUST, SHOULD, or GUIDANCE
-# Output:
-#   Integer count of violations with that severity
-# -----------------------------------------------------------------------------
-count_by_severity() {
-    local json_string="$1"
-    local severity="$2"
-    local violation_count=0
+#   $1 - summary_json: Summary record from run_flight_lint
+#   $2 - max_items: Maximum number of violations to list (default: 10)
+# Sets:
+#   LINT_NEVER_COUNT, LINT_MUST_COUNT, LINT_SHOULD_COUNT, LINT_TOTAL_COUNT
+#   LINT_COMPLETE       - "false" if the time budget ran out, else "true"
+#   LINT_TOP_VIOLATIONS - "- [SEVERITY] ruleId: message at file:line" lines,
+#                         most severe first
+#   LINT_ERROR          - What flight-lint wrote instead of a record when it
+#                         could not lint (e.g. its stderr), else empty
+# -----------------------------------------------------------------------------
+read_lint_summary() {
+    local summary_json="$1"
+    local max_items="${2:-10}"
+    local summary_lines=""
+
+    LINT_NEVER_COUNT=0
+    LINT_MUST_COUNT=0
+    LINT_SHOULD_COUNT=0
+    LINT_TOTAL_COUNT=0
+    LINT_COMPLETE=true
+    LINT_TOP_VIOLATIONS=""
+    LINT_ERROR=""
 
     if check_jq_available; then
-        # Use jq for accurate parsing (slurp to handle NDJSON - one object per domain)
-        violation_count="$(printf '%s' "$json_string" | \
-            jq -s "[.[].results[] | select(.severity == \"$severity\")] | length" \
-            2>/dev/null)" || violation_count=0
+        # First line: the counts; then one line per listed violation
+        summary_lines="$(printf '%s' "$summary_json" | jq -r --argjson max "$max_items" \
+            '"\(.severity.NEVER) \(.severity.MUST) \(.severity.SHOULD) \(.total) \(.complete)",
+             (.top[:$max][] | "- [\(.severity)] \(.ruleId): \(.message) at \(.filePath):\(.line)")' \
+            2>/dev/null)" || summary_lines=""
+        if [[ -n "$summary_lines" ]]; then
+            read -r LINT_NEVER_COUNT LINT_MUST_COUNT LINT_SHOULD_COUNT LINT_TOTAL_COUNT LINT_COMPLETE \
+                <<< "$(printf '%s\n' "$summary_lines" | head -1)"
+            LINT_TOP_VIOLATIONS="$(printf '%s\n' "$summary_lines" | tail -n +2)"
+        fi
     else
-        # Fallback: count occurrences of "severity":"LEVEL"
-        violation_count="$(printf '%s' "$json_string" | \
-            grep -c "\"severity\":\"$severity\"" 2>/dev/null)" || violation_count=0
+        # Fallback: the record is one line and its run totals come before the
+        # per-domain ones, so the first match of each key is the run's
+        LINT_NEVER_COUNT="$(printf '%s' "$summary_json" | grep -oE '"NEVER":[0-9]+' | head -1 | cut -d: -f2)" || true
+        LINT_MUST_COUNT="$(printf '%s' "$summary_json" | grep -oE '"MUST":[0-9]+' | head -1 | cut -d: -f2)" || true
+        LINT_SHOULD_COUNT="$(printf '%s' "$summary_json" | grep -oE '"SHOULD":[0-9]+' | head -1 | cut -d: -f2)" || true
+        LINT_TOTAL_COUNT="$(printf '%s' "$summary_json" | grep -oE '"total":[0-9]+' | head -1 | cut -d: -f2)" || true
+        if printf '%s' "$summary_json" | grep -qE '"complete":false'; then
+            LINT_COMPLETE=false
+        fi
+        LINT_TOP_VIOLATIONS="$(printf '%s' "$summary_json" | \
+            grep -oE '"ruleId":"[^"]*","severity":"[^"]*","message":"[^"]*"' | \
+            head -"$max_items")" || LINT_TOP_VIOLATIONS=""
     fi
 
-    # Ensure we output a number
-    if [[ ! "$violation_count" =~ ^[0-9]+$ ]]; then
-        violation_count=0
+    # Output with no run totals is an error report (a missing binary is not)
+    if ! printf '%s' "$summary_json" | grep -qE '"total": *[0-9]' \
+        && [[ -n "${summary_json//[[:space:]]/}" ]] \
+        && [[ "$summary_json" != *__FLIGHT_LINT_NOT_FOUND__* ]]; then
+        LINT_ERROR="$(printf '%s\n' "$summary_json" | head -20)"
     fi
 
-    printf '%d' "$violation_count"
+    # Ensure the counts are numbers
+    [[ "$LINT_NEVER_COUNT" =~ ^[0-9]+$ ]] || LINT_NEVER_COUNT=0
+    [[ "$LINT_MUST_COUNT" =~ ^[0-9]+$ ]] || LINT_MUST_COUNT=0
+    [[ "$LINT_SHOULD_COUNT" =~ ^[0-9]+$ ]] || LINT_SHOULD_COUNT=0
+    [[ "$LINT_TOTAL_COUNT" =~ ^[0-9]+$ ]] || LINT_TOTAL_COUNT=0
+    [[ "$LINT_COMPLETE" == "false" ]] || LINT_COMPLETE=true
 }
 
 # -----------------------------------------------------------------------------
-# get_total_violations - Get total violation count from flight-lint JSON
+# compute_tree_fingerprint - Hash the state of the working tree
+# -----------------------------------------------------------------------------
+# Covers HEAD, every change to tracked files (staged or not), the content of
+# untracked files, the content of flight-lint's own build, and the time
+# budget, so two equal fingerprints mean flight-lint would see the same files
+# and rules and lint them with the same code.
+# Git-ignored files are covered only where flight-lint's walk skips them
+# anyway (exclusions.sh) or git lists them one by one. An ignored directory
+# the walk would enter cannot be hashed cheaply, so then there is no
+# fingerprint and results are never reused.
+# Output:
+#   Fingerprint string
+# Returns:
+#   0 on success, 1 outside a git repository or when an ignored directory
+#   may be linted
+# -----------------------------------------------------------------------------
+compute_tree_fingerprint() {
+    (
+        cd "$PROJECT_ROOT" 2>/dev/null || exit 1
+        git rev-parse --git-dir &>/dev/null || exit 1
+
+        # A repository without commits is diffed against the empty tree
+        local base_revision
+        base_revision="$(git rev-parse --verify -q HEAD 2>/dev/null)" \
+            || base_revision="$(git hash-object -t tree /dev/null)"
+
+        # Hook state and the daemon socket change without changing what is linted
+        local excluded_pathspecs=()
+        local excluded_path
+        for excluded_path in "$FLIGHT_LINT_STATE_DIR" "$FLIGHT_LINT_SOCKET"; do
+            if [[ "$excluded_path" == "$PROJECT_ROOT/"* ]]; then
+                excluded_pathspecs+=(":(exclude)${excluded_path#"$PROJECT_ROOT/"}")
+            fi
+        done
+
+        local untracked_files
+        untracked_files="$(git ls-files --others --exclude-standard -- . \
+            ${excluded_pathspecs[@]+"${excluded_pathspecs[@]}"} 2>/dev/null)" || exit 1
+
+        # Ignored entries the walk would visit; wholly ignored directories
+        # are listed once, with a trailing slash
+        source "$FLIGHT_DIR/exclusions.sh"
+        local ignored_entries ignored_entry
+        local ignored_files=""
+        ignored_entries="$(git ls-files --others --ignored --exclude-standard --directory -- . \
+            ${excluded_pathspecs[@]+"${excluded_pathspecs[@]}"} 2>/dev/null)" || exit 1
+        while IFS= read -r ignored_entry; do
+            if [[ -z "$ignored_entry" ]] || flight_is_excluded "$ignored_entry"; then
+                continue
+            fi
+            [[ "$ignored_entry" != */ ]] || exit 1
+            ignored_files+="$ignored_entry"$'\n'
+        done <<< "$ignored_entries"
+
+        # The linter is outside the walk, but a rebuild can change its results
+        local linter_dir="${FLIGHT_LINT_BIN%/bin/*}"
+        local linter_files
+        linter_files="$(find "$linter_dir/bin" "$linter_dir/dist" -type f 2>/dev/null \
+            | grep -Ev '\.(d\.ts|map)$' | LC_ALL=C sort)" || true
+
+        {
+            printf 'base %s\nbudget %s\n' "$base_revision" "$FLIGHT_LINT_STOP_BUDGET_MS"
+            git diff "$base_revision" --binary 2>/dev/null || exit 1
+            if [[ -n "$untracked_files" ]]; then
+                printf '%s\n' "$untracked_files"
+                printf '%s\n' "$untracked_files" | git hash-object --stdin-paths 2>/dev/null
+            fi
+            if [[ -n "$ignored_files" ]]; then
+                printf 'ignored\n%s' "$ignored_files"
+                printf '%s' "$ignored_files" | git hash-object --stdin-paths 2>/dev/null
+            fi
+            if [[ -n "$linter_files" ]]; then
+                printf 'linter\n%s\n' "$linter_files"
+                printf '%s\n' "$linter_files" | git hash-object --stdin-paths 2>/dev/null
+            fi
+        } | git hash-object --stdin
+    )
+}
+
+# -----------------------------------------------------------------------------
+# store_validation_result - Persist a lint result under its fingerprint
+# -----------------------------------------------------------------------------
+# Arguments:
+#   $1 - fingerprint: Tree fingerprint the result was produced for
+#   $2 - lint_output: flight-lint output
+# The file is replaced atomically, so readers never see a partial result.
+# -----------------------------------------------------------------------------
+store_validation_result() {
+    local fingerprint="$1"
+    local lint_output="$2"
+    local temporary_file="$FLIGHT_LINT_RESULT_FILE.$$"
+
+    mkdir -p "$FLIGHT_LINT_STATE_DIR" 2>/dev/null || return 0
+    printf '%s\n%s\n' "$fingerprint" "$lint_output" > "$temporary_file" 2>/dev/null \
+        && mv -f "$temporary_file" "$FLIGHT_LINT_RESULT_FILE" 2>/dev/null \
+        || rm -f "$temporary_file"
+}
+
+# -----------------------------------------------------------------------------
+# load_validation_result - Read the stored lint result for a fingerprint
 # -----------------------------------------------------------------------------
 # Arguments:
-#   $1 - json_string: JSON output from flight-lint
+#   $1 - fingerprint: Current tree fingerprint
 # Output:
-#   Integer total count of all violations
+#   The stored flight-lint output
+# Returns:
+#   0 if the stored result was produced for this fingerprint, 1 otherwise
 # -----------------------------------------------------------------------------
-get_total_violations() {
-    local json_string="$1"
-    local total_count=0
+load_validation_result() {
+    local fingerprint="$1"
+    local stored_result
 
-    if check_jq_available; then
-        # Use jq for accurate parsing (slurp to handle NDJSON - one object per domain)
-        total_count="$(printf '%s' "$json_string" | \
-            jq -s '[.[].results[]] | length' 2>/dev/null)" \
-            || total_count=0
-    else
-        # Fallback: count occurrences of "severity" (each violation has one)
-        total_count="$(printf '%s' "$json_string" | \
-            grep -c '"severity"' 2>/dev/null)" || total_count=0
+    stored_result="$(cat "$FLIGHT_LINT_RESULT_FILE" 2>/dev/null)" || return 1
+    [[ "${stored_result%%$'\n'*}" == "$fingerprint" ]] || return 1
+
+    printf '%s\n' "${stored_result#*$'\n'}"
+}
+
+# -----------------------------------------------------------------------------
+# is_validation_running - Check whether a background runner holds the lock
+# -----------------------------------------------------------------------------
+# Returns:
+#   0 while a live runner holds the lock, 1 otherwise
+# -----------------------------------------------------------------------------
+is_validation_running() {
+    local runner_pid
+    runner_pid="$(cat "$FLIGHT_LINT_RUNNER_LOCK" 2>/dev/null)" || return 1
+
+    # Empty in the instant between creating the lock and writing the pid, and
+    # for good if the runner died in that instant
+    if [[ -z "$runner_pid" ]]; then
+        local lock_mtime
+        lock_mtime="$(stat -c %Y "$FLIGHT_LINT_RUNNER_LOCK" 2>/dev/null \
+            || stat -f %m "$FLIGHT_LINT_RUNNER_LOCK" 2>/dev/null)" || return 1
+        [[ $(($(date +%s) - lock_mtime)) -lt "$FLIGHT_LINT_EMPTY_LOCK_GRACE_SECONDS" ]]
+        return
     fi
 
-    # Ensure we output a number
-    if [[ ! "$total_count" =~ ^[0-9]+$ ]]; then
-        total_count=0
+    kill -0 "$runner_pid" 2>/dev/null
+}
+
+# -----------------------------------------------------------------------------
+# acquire_validation_lock - Become the only background runner
+# -----------------------------------------------------------------------------
+# A lock left by a runner that died is taken over.
+# Returns:
+#   0 if the lock was taken, 1 if a live runner holds it
+# -----------------------------------------------------------------------------
+acquire_validation_lock() {
+    # $$ is the hook's pid; the runner is a subshell (BASHPID needs bash 4)
+    local runner_pid="${BASHPID:-$(exec sh -c 'echo "$PPID"')}"
+
+    mkdir -p "$FLIGHT_LINT_STATE_DIR" 2>/dev/null || return 1
+
+    # noclobber makes creating the lock file atomic
+    if ! (set -C; printf '%s\n' "$runner_pid" > "$FLIGHT_LINT_RUNNER_LOCK") 2>/dev/null; then
+        if is_validation_running; then
+            return 1
+        fi
+        rm -f "$FLIGHT_LINT_RUNNER_LOCK"
+        (set -C; printf '%s\n' "$runner_pid" > "$FLIGHT_LINT_RUNNER_LOCK") 2>/dev/null || return 1
     fi
+}
+
+# -----------------------------------------------------------------------------
+# speculate_validation - Validate the tree until a result matches it
+# -----------------------------------------------------------------------------
+# Runs flight-lint and stores the output under the tree fingerprint, but only
+# if the tree did not change during the run; if it did, validates again.
+# Does nothing if another runner is active: that runner re-checks the tree
+# when its run finishes.
+# -----------------------------------------------------------------------------
+speculate_validation() {
+    acquire_validation_lock || return 0
+
+    local run_count fingerprint settled_fingerprint lint_output
+    for ((run_count = 0; run_count < FLIGHT_LINT_SPECULATIVE_RUNS; run_count++)); do
+        fingerprint="$(compute_tree_fingerprint)" || break
+        if load_validation_result "$fingerprint" >/dev/null; then
+            break
+        fi
+
+        # The result is for the Stop hook, so the run gets the Stop budget
+        lint_output="$(run_all_validation 2>&1)" || true
+
+        settled_fingerprint="$(compute_tree_fingerprint)" || break
+        if [[ "$settled_fingerprint" == "$fingerprint" ]]; then
+            store_validation_result "$fingerprint" "$lint_output"
+            break
+        fi
+    done
+
+    rm -f "$FLIGHT_LINT_RUNNER_LOCK"
+}
+
+# -----------------------------------------------------------------------------
+# start_background_validation - Validate speculatively without waiting
+# -----------------------------------------------------------------------------
+# Starts speculate_validation detached from the hook's streams, so the hook
+# returns at once while the run continues.
+# Returns:
+#   0 if a runner was started, 1 outside a git repository (no fingerprint)
+# -----------------------------------------------------------------------------
+start_background_validation() {
+    (cd "$PROJECT_ROOT" && git rev-parse --git-dir &>/dev/null) || return 1
 
-    printf '%d' "$total_count"
+    ( speculate_validation ) </dev/null >/dev/null 2>&1 &
+    disown 2>/dev/null || true
 }
 
 # -----------------------------------------------------------------------------
-# format_violations_summary - Format violations for human-readable output
+# wait_for_background_validation - Wait for a running background runner
 # -----------------------------------------------------------------------------
 # Arguments:
-#   $1 - json_string: JSON output from flight-lint (NDJSON format)
-#   $2 - max_items: Maximum number of violations to show (default: 5)
+#   $1 - max_wait_ms: Longest time to wait
+# Returns:
+#   0 once no runner is active, 1 if it is still running after max_wait_ms
+# -----------------------------------------------------------------------------
+wait_for_background_validation() {
+    local max_wait_ms="$1"
+    local waited_ms=0
+
+    while is_validation_running; do
+        if [[ "$waited_ms" -ge "$max_wait_ms" ]]; then
+            return 1
+        fi
+        sleep 0.1
+        waited_ms=$((waited_ms + 100))
+    done
+}
+
+# -----------------------------------------------------------------------------
+# run_validation_reusing_speculation - Validate, reusing a background result
+# -----------------------------------------------------------------------------
+# Waits for an in-flight background run instead of starting a second one,
+# then reuses the stored result if it was produced for the current tree.
+# Otherwise validates now and stores that result. The wait and that run
+# together fit in what is left of the Stop hook's timeout: the wait ends in
+# time to leave the run FLIGHT_LINT_MIN_FALLBACK_BUDGET_MS, and the run gets
+# whatever the wait left, up to the time budget.
 # Output:
-#   Formatted string with violation details
+#   flight-lint output, as from run_all_validation
 # -----------------------------------------------------------------------------
-format_violations_summary() {
-    local json_string="$1"
-    local max_items="${2:-5}"
-    local summary=""
+run_validation_reusing_speculation() {
+    local fingerprint=""
+    fingerprint="$(compute_tree_fingerprint)" || fingerprint=""
 
-    if check_jq_available; then
-        # Use jq to format violations (slurp to handle NDJSON - one object per domain)
-        summary="$(printf '%s' "$json_string" | jq -rs \
-            "[.[].results[]] | .[:$max_items][] | \"- [\(.severity)] \(.ruleId): \(.message) at \(.filePath):\(.line)\"" \
-            2>/dev/null)" || summary=""
-    else
-        # Fallback: basic extraction (less precise)
-        summary="$(printf '%s' "$json_string" | \
-            grep -oE '"ruleId":"[^"]*"|"message":"[^"]*"|"severity":"[^"]*"' | \
-            head -"$((max_items * 3))" | \
-            paste - - - 2>/dev/null)" || summary=""
+    if [[ -n "$fingerprint" ]]; then
+        local max_wait_ms
+        max_wait_ms=$(($(hook_time_left_ms "$FLIGHT_STOP_HOOK_TIMEOUT_MS") - FLIGHT_LINT_MIN_FALLBACK_BUDGET_MS))
+        wait_for_background_validation "$((max_wait_ms > 0 ? max_wait_ms : 0))" || true
+        if load_validation_result "$fingerprint"; then
+            return 0
+        fi
+    fi
+
+    local time_budget_ms
+    time_budget_ms="$(hook_time_left_ms "$FLIGHT_STOP_HOOK_TIMEOUT_MS")"
+    if [[ "$time_budget_ms" -gt "$FLIGHT_LINT_STOP_BUDGET_MS" ]]; then
+        time_budget_ms="$FLIGHT_LINT_STOP_BUDGET_MS"
     fi
 
-    printf '%s' "$summary"
+    local lint_output
+    lint_output="$(run_all_validation "$((time_budget_ms > 0 ? time_budget_ms : 1))" 2>&1)" || true
+
+    if [[ -n "$fingerprint" ]] && [[ "$(compute_tree_fingerprint)" == "$fingerprint" ]]; then
+        store_validation_result "$fingerprint" "$lint_output"
+    fi
+
+    printf '%s\n' "$lint_output"
 }
 
 # -----------------------------------------------------------------------------
@@ -5,8 +5,13 @@
 #
 # This hook runs after Claude Code writes or edits files. It:
 # 1. Checks if the tool was Write, Edit, or MultiEdit
-# 2. Runs flight-lint to validate the codebase
-# 3. Injects validation results into the agent's context
+# 2. Starts flight-lint in the background and returns at once; the result is
+#    stored under a fingerprint of the working tree
+# 3. The Stop hook reuses that result if the tree has not changed since, and
+#    waits for a run still in flight instead of starting another
+#
+# Outside a git repository there is no fingerprint, so it validates
+# synchronously and injects the results into the agent's context instead.
 #
 # This is FEEDBACK ONLY - always returns "approve". The Stop hook handles
 # blocking on violations.
@@ -52,25 +57,39 @@ main() {
             ;;
     esac
 
+    # Validate off the critical path; the Stop hook picks up the result
+    if start_background_validation; then
+        respond "approve" "" "Flight validation is running in the background; the Stop hook reports its results."
+        exit 0
+    fi
+
     # Run all validation (flight-lint AST + code-hygiene grep)
     local lint_output
-    lint_output="$(run_all_validation 2>&1)" || true
+    lint_output="$(run_all_validation "$FLIGHT_LINT_POST_BUDGET_MS" 2>&1)" || true
 
-    # Count violations
-    local total_violations
-    total_violations="$(get_total_violations "$lint_output")"
+    # Read counts and top violations from the run's summary record
+    read_lint_summary "$lint_output" 5
+    local total_violations="$LINT_TOTAL_COUNT"
+
+    if [[ -n "$LINT_ERROR" ]]; then
+        respond "approve" "" "Flight validation could not run:"$'\n\n'"$LINT_ERROR"
+        exit 0
+    fi
+
+    local incomplete_note=""
+    if [[ "$LINT_COMPLETE" == "false" ]]; then
+        incomplete_note="Note: validation was partial - the time budget ran out before every file was checked."
+    fi
 
     # Build response
     if [[ "$total_violations" -gt 0 ]]; then
         # Get violation counts by severity
-        local never_count must_count should_count
-        never_count="$(count_by_severity "$lint_output" "NEVER")"
-        must_count="$(count_by_severity "$lint_output" "MUST")"
-        should_count="$(count_by_severity "$lint_output" "SHOULD")"
+        local never_count="$LINT_NEVER_COUNT"
+        local must_count="$LINT_MUST_COUNT"
+        local should_count="$LINT_SHOULD_COUNT"
 
         # Get violation details
-        local violation_details
-        violation_details="$(format_violations_summary "$lint_output" 5)"
+        local violation_details="$LINT_TOP_VIOLATIONS"
 
         # Build summary message
         local summary
@@ -94,7 +113,13 @@ main() {
 
         summary="$summary\n\nConsider fixing these before completing."
 
+        if [[ -n "$incomplete_note" ]]; then
+            summary="$summary\n$incomplete_note"
+        fi
+
         respond "approve" "" "$summary"
+    elif [[ -n "$incomplete_note" ]]; then
+        respond "approve" "" "No violations found so far. $incomplete_note"
     else
         respond "approve" "" "Flight validation passed. No violations detected."
     fi
@@ -0,0 +1,151 @@
+#!/usr/bin/env bash
+# =============================================================================
+# PreToolUse Hook - Validate proposed content before Write/Edit/MultiEdit
+# =============================================================================
+#
+# This hook runs before Claude Code writes or edits a file. It:
+# 1. Builds the content the file would have after the tool runs
+# 2. Lints that content with flight-lint --stdin (nothing touches the disk)
+# 3. BLOCKS the tool call if it adds NEVER or MUST violations, with the
+#    details, so the agent revises the content before it is written
+#
+# Violations the file already had do not block: only rules that fire more
+# often on the proposed content than on the current file count. SHOULD rules
+# are left to the PostToolUse and Stop hooks.
+#
+# Requires jq to reconstruct edits; approves without it.
+#
+# =============================================================================
+set -euo pipefail
+
+# -----------------------------------------------------------------------------
+# Setup
+# -----------------------------------------------------------------------------
+readonly SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+# Source shared library
+if [[ -f "$SCRIPT_DIR/lib.sh" ]]; then
+    source "$SCRIPT_DIR/lib.sh"
+else
+    # Fallback if lib.sh not found - approve to avoid blocking
+    printf '{"decision":"approve"}\n'
+    exit 0
+fi
+
+# Applies the tool call to $current and wraps the result as a lint batch.
+# Edits replace the first occurrence unless replace_all is set; split/join
+# keeps offsets in characters on every jq version.
+readonly PROPOSED_BATCH_FILTER='
+  def replace_text($old; $new; $all):
+    if $old == "" then .
+    elif $all then split($old) | join($new)
+    else split($old) as $parts
+      | if ($parts | length) < 2 then . else $parts[0] + $new + ($parts[1:] | join($old)) end
+    end;
+  .tool_input as $toolInput
+  | if .tool_name == "Write" then $toolInput.content // ""
+    elif .tool_name == "Edit" then
+      $current | replace_text($toolInput.old_string // ""; $toolInput.new_string // ""; $toolInput.replace_all // false)
+    else
+      reduce ($toolInput.edits // [])[] as $edit ($current;
+        replace_text($edit.old_string // ""; $edit.new_string // ""; $edit.replace_all // false))
+    end
+  | {files: [{path: $toolInput.file_path, content: .}]}'
+
+# Counts the violations added per domain and rule, then lists the proposed
+# violations of every rule that fires more often than on the current file.
+readonly ADDED_VIOLATIONS_FILTER='
+  def keyed: [.[] | .domain as $domain | .results[] | . + {key: "\($domain) \(.ruleId)"}];
+  ($current | keyed | group_by(.key) | map({key: .[0].key, value: length}) | from_entries) as $currentCounts
+  | [$proposed | keyed | group_by(.key)[] | select(length > ($currentCounts[.[0].key] // 0))] as $addedGroups
+  | ($addedGroups | map(length - ($currentCounts[.[0].key] // 0)) | add // 0),
+    ($addedGroups | flatten[] | "- [\(.severity)] \(.ruleId): \(.message) at \(.filePath):\(.line)")'
+
+# -----------------------------------------------------------------------------
+# Main
+# -----------------------------------------------------------------------------
+main() {
+    # Read input JSON from stdin
+    local input_json
+    input_json="$(read_stdin_json)"
+
+    # Extract tool name
+    local tool_name
+    tool_name="$(get_tool_name "$input_json")"
+
+    # Only validate for file modification tools
+    case "$tool_name" in
+        Write|Edit|MultiEdit)
+            # Continue to validation
+            ;;
+        *)
+            respond "approve"
+            exit 0
+            ;;
+    esac
+
+    if ! check_jq_available || ! check_flight_lint_available; then
+        respond "approve"
+        exit 0
+    fi
+
+    local file_path
+    file_path="$(printf '%s' "$input_json" | jq -r '.tool_input.file_path // ""')"
+    if [[ -z "$file_path" ]]; then
+        respond "approve"
+        exit 0
+    fi
+
+    # Current content of the file; empty when the tool creates it
+    local current_args=(--arg current "")
+    if [[ -f "$file_path" ]]; then
+        current_args=(--rawfile current "$file_path")
+    fi
+
+    local proposed_batch
+    proposed_batch="$(printf '%s' "$input_json" | jq -c "${current_args[@]}" "$PROPOSED_BATCH_FILTER")" || {
+        respond "approve"
+        exit 0
+    }
+
+    # Exit code 1 means NEVER or MUST violations; anything else cannot block
+    local proposed_output
+    local proposed_status=0
+    proposed_output="$(printf '%s' "$proposed_batch" | run_flight_lint_batch)" || proposed_status=$?
+
+    if [[ "$proposed_status" -ne 1 ]]; then
+        respond "approve"
+        exit 0
+    fi
+
+    # Lint the current content the same way, so existing violations do not block
+    local current_output=""
+    if [[ -f "$file_path" ]]; then
+        current_output="$(jq -nc "${current_args[@]}" --arg path "$file_path" \
+            '{files: [{path: $path, content: $current}]}' | run_flight_lint_batch)" || true
+    fi
+
+    # First line: number of added violations; then the violations to show
+    local added_report
+    added_report="$(jq -nr \
+        --slurpfile current <(printf '%s' "$current_output") \
+        --slurpfile proposed <(printf '%s' "$proposed_output") \
+        "$ADDED_VIOLATIONS_FILTER")" || added_report="0"
+
+    local added_count
+    added_count="$(printf '%s\n' "$added_report" | head -1)"
+    if [[ ! "$added_count" =~ ^[0-9]+$ ]] || [[ "$added_count" -eq 0 ]]; then
+        respond "approve"
+        exit 0
+    fi
+
+    local shown_violations
+    shown_violations="$(printf '%s\n' "$added_report" | sed -n '2,11p')"
+
+    local reason
+    reason="Flight: this $tool_name would add $added_count NEVER/MUST violation(s) to $file_path:"$'\n\n'"$shown_violations"$'\n\n'"Revise the content so it passes before writing it."
+
+    respond "block" "$reason"
+}
+
+main "$@"
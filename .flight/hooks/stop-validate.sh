@@ -8,6 +8,15 @@
 # 2. BLOCKS completion if NEVER or MUST violations exist
 # 3. ALLOWS completion with SHOULD violations (warnings only)
 # 4. Injects violation details into context when blocking
+# 5. Says so explicitly when the time budget cut validation short
+#
+# The result of the PostToolUse hook's background run is reused when the
+# working tree has not changed since; a run still in flight is waited for.
+# "Changed" is judged by the tree fingerprint (lib.sh): git-tracked and
+# untracked files, git-ignored files that git lists one by one, and
+# flight-lint's own build. If an ignored directory may be linted, nothing is
+# reused and validation runs afresh. Edits git cannot see in any other way,
+# e.g. through a symlink out of the tree, are not noticed.
 #
 # This creates the self-correction loop - the agent cannot complete until
 # all critical violations are fixed.
@@ -44,21 +53,35 @@ main() {
         return 0
     fi
 
-    # Run all validation (flight-lint AST + code-hygiene grep)
+    # Run all validation (flight-lint AST + code-hygiene grep), or reuse the
+    # background run's result for this exact tree
     local lint_output
-    lint_output="$(run_all_validation 2>&1)" || true
+    lint_output="$(run_validation_reusing_speculation)" || true
+
+    # Read counts and top violations from the run's summary record
+    read_lint_summary "$lint_output" 10
+    local never_count="$LINT_NEVER_COUNT"
+    local must_count="$LINT_MUST_COUNT"
+    local should_count="$LINT_SHOULD_COUNT"
 
-    # Count violations by severity
-    local never_count must_count should_count total_count
-    never_count="$(count_by_severity "$lint_output" "NEVER")"
-    must_count="$(count_by_severity "$lint_output" "MUST")"
-    should_count="$(count_by_severity "$lint_output" "SHOULD")"
-    total_count="$(get_total_violations "$lint_output")"
+    # flight-lint could not lint: say why rather than report a clean pass
+    if [[ -n "$LINT_ERROR" ]]; then
+        respond "approve" "" "Flight validation could not run:"$'\n\n'"$LINT_ERROR"$'\n\n'"Fix the problem and run .flight/validate-all.sh for a full check."
+        return 0
+    fi
 
     # Calculate critical violations (NEVER + MUST)
     local critical_count
     critical_count=$((never_count + must_count))
 
+    # A partial run never counts as a clean pass
+    local incomplete_note=""
+    if [[ "$LINT_COMPLETE" == "false" ]]; then
+        incomplete_note="Validation INCOMPLETE: the time budget ran out before every file was checked."
+        incomplete_note="$incomplete_note NEVER and MUST rules ran first, so results so far are for the"
+        incomplete_note="$incomplete_note most severe rules and most recently edited files."
+    fi
+
     # Decision logic
     if [[ "$critical_count" -gt 0 ]]; then
         # BLOCK - critical violations found
@@ -70,8 +93,7 @@ main() {
         context="You MUST fix these violations before completing:\n\n"
 
         # Get violation details
-        local violation_details
-        violation_details="$(format_violations_summary "$lint_output" 10)"
+        local violation_details="$LINT_TOP_VIOLATIONS"
 
         if [[ -n "$violation_details" ]]; then
             context="$context$violation_details\n\n"
@@ -80,6 +102,10 @@ main() {
         context="${context}These are non-negotiable constraints from the domain files."
         context="$context Fix them and try completing again."
 
+        if [[ -n "$incomplete_note" ]]; then
+            context="$context\n\n$incomplete_note"
+        fi
+
         respond "block" "$reason" "$context"
 
     elif [[ "$should_count" -gt 0 ]]; then
@@ -89,7 +115,7 @@ main() {
 
         # Get warning details
         local warning_details
-        warning_details="$(format_violations_summary "$lint_output" 5)"
+        warning_details="$(printf '%s\n' "$LINT_TOP_VIOLATIONS" | head -5)"
 
         if [[ -n "$warning_details" ]]; then
             context="$context$warning_details\n\n"
@@ -97,8 +123,16 @@ main() {
 
         context="${context}Task completed. Consider addressing warnings in follow-up."
 
+        if [[ -n "$incomplete_note" ]]; then
+            context="$context\n\n$incomplete_note"
+        fi
+
         respond "approve" "" "$context"
 
+    elif [[ -n "$incomplete_note" ]]; then
+        # APPROVE - no violations found so far, but say the check was partial
+        respond "approve" "" "$incomplete_note Run .flight/validate-all.sh for a full check."
+
     else
         # APPROVE - clean
         respond "approve" "" "Flight validation passed. All domain constraints satisfied."
@@ -15,6 +15,12 @@ flight_domain_compile = importlib.util.module_from_spec(spec)
 sys.modules["flight_domain_compile"] = flight_domain_compile
 spec.loader.exec_module(flight_domain_compile)
 
+# flight-validate shares the compiler's model and loads it from sys.modules
+validate_spec = importlib.util.spec_from_file_location("flight_validate", BIN_DIR / "flight-validate.py")
+flight_validate = importlib.util.module_from_spec(validate_spec)
+sys.modules["flight_validate"] = flight_validate
+validate_spec.loader.exec_module(flight_validate)
+
 FIXTURES_DIR = Path(__file__).parent.parent / "test-fixtures"
 
 
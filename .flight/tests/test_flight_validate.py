@@ -0,0 +1,352 @@
+"""Tests for flight-validate, the Python engine for compiled .rules.json files."""
+
+import json
+import os
+import re
+import pytest
+from pathlib import Path
+
+import flight_validate
+from flight_domain_compile import parse_domain_spec, generate_rules_json, rules_json_to_spec_data
+from flight_validate import (
+    glob_to_regex,
+    load_domain_spec,
+    load_enabled_domains,
+    walk_project_files,
+    prepare_targets,
+    validate_domains,
+    format_counts,
+    main,
+    ScanSettings,
+)
+
+
+SPEC = {
+    "domain": "demo",
+    "version": "1.0.0",
+    "file_patterns": ["**/*.ts"],
+    "exclude_patterns": ["**/*.d.ts"],
+    "rules": {
+        "N1": {
+            "title": "No any",
+            "severity": "NEVER",
+            "mechanical": True,
+            "description": "No any.",
+            "check": {"type": "grep", "pattern": r":\s*any\b", "ignore_when": ["eslint-disable"]},
+        },
+        "M1": {
+            "title": "Handle errors",
+            "severity": "MUST",
+            "mechanical": True,
+            "description": "Fetch needs a catch.",
+            "check": {"type": "requires", "trigger": r"fetch\(", "requirement": r"catch"},
+        },
+        "S1": {
+            "title": "Readme exists",
+            "severity": "SHOULD",
+            "mechanical": True,
+            "description": "Add a README.",
+            "check": {"type": "file_exists", "paths": ["README.md"]},
+        },
+        "S2": {
+            "title": "No console in lib",
+            "severity": "SHOULD",
+            "mechanical": True,
+            "description": "No console.",
+            "check": {"type": "grep", "pattern": r"console\.log"},
+            "only_paths": ["lib/**"],
+        },
+    },
+}
+
+
+def write_project(project_root: Path, files: dict) -> Path:
+    """Write source files and the demo rules file; returns the rules path."""
+    for relative_path, content in files.items():
+        file_path = project_root / relative_path
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text(content, encoding="utf-8")
+    rules_path = project_root / ".flight" / "domains" / "demo.rules.json"
+    rules_path.parent.mkdir(parents=True, exist_ok=True)
+    rules_path.write_text(generate_rules_json(parse_domain_spec(SPEC)))
+    return rules_path
+
+
+def run_reports(project_root: Path, rules_path: Path, severity: str = "SHOULD", jobs: int = 1) -> list:
+    targets = prepare_targets([str(rules_path)], severity, project_root)
+    return validate_domains(targets, ScanSettings(str(project_root)), jobs)
+
+
+class TestSharedModel:
+    """flight-validate reads rules files into the compiler's model."""
+
+    def test_round_trips_compiled_rules(self, tmp_path: Path):
+        """Rules read back from .rules.json keep their checks and scopes."""
+        rules_path = write_project(tmp_path, {})
+
+        spec = load_domain_spec(str(rules_path))
+
+        assert spec.domain == "demo"
+        assert spec.file_patterns == ["**/*.ts"]
+        assert sorted(spec.rules) == ["M1", "N1", "S1", "S2"]
+        assert spec.rules["N1"].check["ignore_when"] == ["eslint-disable"]
+        assert spec.rules["M1"].check["type"] == "requires"
+        assert spec.rules["S2"].only_paths == ["lib/**"]
+
+    def test_converted_data_passes_parse_domain_spec(self):
+        """rules_json_to_spec_data() output parses without losing rules."""
+        rules_data = json.loads(generate_rules_json(parse_domain_spec(SPEC)))
+
+        spec = parse_domain_spec(rules_json_to_spec_data(rules_data))
+
+        assert all(rule.mechanical for rule in spec.rules.values())
+        assert spec.rules["S1"].check == {"type": "file_exists", "paths": ["README.md"]}
+
+    def test_rejects_invalid_rules_file(self, tmp_path: Path):
+        """Invalid rules files raise ValueError naming the file."""
+        rules_path = tmp_path / "broken.rules.json"
+        rules_path.write_text("{}")
+
+        with pytest.raises(ValueError, match="broken.rules.json"):
+            load_domain_spec(str(rules_path))
+
+
+class TestDiscovery:
+    """Project walk and glob semantics shared with flight-lint."""
+
+    def test_globs_skip_dot_segments_unless_spelled_out(self):
+        """Without dot matching, wildcards do not enter dot directories."""
+        pattern = re.compile(glob_to_regex("**/*.ts", match_dot_segments=False))
+
+        assert pattern.fullmatch("src/app.ts")
+        assert pattern.fullmatch("app.ts")
+        assert not pattern.fullmatch(".hidden/app.ts")
+        assert re.compile(glob_to_regex("**/.github/*.yml", False)).fullmatch(".github/ci.yml")
+
+    def test_walk_prunes_excluded_directories_and_flightignore(self, tmp_path: Path):
+        """Default exclusions and .flightignore entries are not walked."""
+        for relative_path in ["src/a.ts", "node_modules/x.ts", "tests/t.ts", "gen/g.ts", "package.json"]:
+            (tmp_path / relative_path).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / relative_path).write_text("")
+        (tmp_path / ".flightignore").write_text("gen/\n")
+
+        assert walk_project_files(tmp_path) == [".flightignore", "src/a.ts"]
+
+    def test_walk_prunes_directories_named_without_a_slash(self, tmp_path: Path):
+        """.flightignore entries without a trailing slash prune directories too."""
+        for relative_path in ["src/a.ts", "out-gen/x.ts", "src/stale/s.ts"]:
+            (tmp_path / relative_path).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / relative_path).write_text("")
+        (tmp_path / ".flightignore").write_text("out-gen\n/src/stale\n")
+
+        assert walk_project_files(tmp_path) == [".flightignore", "src/a.ts"]
+
+    def test_enabled_domains_need_a_domain_list(self, tmp_path: Path):
+        """A flight.json without domain keys leaves domain selection to the census."""
+        config_path = tmp_path / ".flight" / "flight.json"
+        config_path.parent.mkdir(parents=True)
+
+        config_path.write_text(json.dumps({"version": "2", "project": "demo"}))
+        assert load_enabled_domains(tmp_path) is None
+
+        config_path.write_text(json.dumps({"enabled_domains": []}))
+        assert load_enabled_domains(tmp_path) == []
+
+        config_path.write_text(json.dumps({"domains": {"source": ["react"], "test": ["testing"]}}))
+        assert load_enabled_domains(tmp_path) == ["react", "testing"]
+
+
+class TestValidation:
+    """Rule evaluation and flight-lint's output layout."""
+
+    def test_reports_grep_requires_and_project_rules(self, tmp_path: Path):
+        """Each check type reports where flight-lint does, in visit order."""
+        rules_path = write_project(tmp_path, {
+            "src/a.ts": "const a: any = 1;\nconst b: any = 2; // eslint-disable\n",
+            "src/b.ts": "fetch(url);\nfetch(other);\n",
+            "src/types.d.ts": "const c: any = 3;\n",
+        })
+
+        [report] = run_reports(tmp_path, rules_path)
+        locations = [(Path(result["filePath"]).name, result["line"], result["column"], result["ruleId"])
+                     for result in report.results]
+
+        assert report.file_count == 2
+        assert locations == [
+            ("a.ts", 1, 8, "N1"),
+            ("b.ts", 1, 1, "M1"),
+            ("b.ts", 2, 1, "M1"),
+            (tmp_path.name, 1, 1, "S1"),
+        ]
+
+    def test_path_scopes_limit_rules(self, tmp_path: Path):
+        """only_paths rules run on matching paths only."""
+        rules_path = write_project(tmp_path, {
+            "lib/a.ts": "console.log(1);\n",
+            "src/a.ts": "console.log(1);\n",
+            "README.md": "",
+        })
+
+        [report] = run_reports(tmp_path, rules_path)
+
+        assert [(result["filePath"], result["ruleId"]) for result in report.results] == [
+            (str(tmp_path / "lib" / "a.ts"), "S2"),
+        ]
+
+    def test_columns_count_utf16_units_in_decoded_files(self, tmp_path: Path):
+        """Non-ASCII files report columns in characters, as flight-lint does."""
+        rules_path = write_project(tmp_path, {"src/a.ts": "/* é😀 */ const a: any = 1;\n", "README.md": ""})
+
+        [report] = run_reports(tmp_path, rules_path)
+
+        assert [(result["line"], result["column"]) for result in report.results] == [(1, 18)]
+
+    def test_skips_binary_files(self, tmp_path: Path):
+        """Binary files are listed under skippedFiles rather than scanned."""
+        rules_path = write_project(tmp_path, {"src/a.ts": "const a: any = 1;\n", "README.md": ""})
+        (tmp_path / "src" / "b.ts").write_bytes(b"const b: any\0")
+
+        [report] = run_reports(tmp_path, rules_path)
+
+        assert report.file_count == 1
+        assert report.to_summary()["skippedFiles"] == [{"filePath": str(tmp_path / "src" / "b.ts"), "reason": "binary"}]
+
+    def test_runs_grep_rules_on_minified_files(self, tmp_path: Path):
+        """Minified files lose only their AST rules, as in flight-lint."""
+        minified_line = "const a: any = 1;" + "x" * 300
+        rules_path = write_project(tmp_path, {"src/min.ts": "\n".join([minified_line] * 40), "README.md": ""})
+        spec = {**SPEC, "rules": {**SPEC["rules"], "G1": {
+            "title": "No var", "severity": "GUIDANCE", "mechanical": True, "description": "No var.",
+            "check": {"type": "ast", "language": "typescript", "query": "(variable_declarator) @violation"},
+        }}}
+        rules_path.write_text(generate_rules_json(parse_domain_spec(spec)))
+
+        [report] = run_reports(tmp_path, rules_path, severity="GUIDANCE")
+
+        assert report.file_count == 1
+        assert [(result["line"], result["ruleId"]) for result in report.results] == [(line, "N1") for line in range(1, 41)]
+        assert report.to_summary()["skippedFiles"] == [{"filePath": str(tmp_path / "src" / "min.ts"), "reason": "minified"}]
+
+    def test_severity_filter_drops_rules(self, tmp_path: Path):
+        """Rules below the minimum severity are not run."""
+        rules_path = write_project(tmp_path, {"src/b.ts": "fetch(url);\n"})
+
+        [report] = run_reports(tmp_path, rules_path, severity="NEVER")
+
+        assert report.results == []
+
+    def test_process_pool_gives_same_results(self, tmp_path: Path):
+        """Results are identical, in the same order, with a process pool."""
+        rules_path = write_project(tmp_path, {
+            f"src/f{index:03}.ts": f"const a{index}: any = 1;\nfetch(x);\n" for index in range(80)
+        })
+
+        serial = [report.to_summary() for report in run_reports(tmp_path, rules_path)]
+        pooled = [report.to_summary() for report in run_reports(tmp_path, rules_path, jobs=3)]
+
+        assert pooled == serial
+        assert len(serial[0]["results"]) == 80 * 2 + 1
+
+    def test_count_only_output(self, tmp_path: Path):
+        """--count-only prints flight-lint's one-line totals."""
+        rules_path = write_project(tmp_path, {"src/a.ts": "const a: any = 1;\nfetch(x);\n"})
+
+        counts = json.loads(format_counts(run_reports(tmp_path, rules_path)))
+
+        assert counts == {
+            "files": 1, "total": 3, "errors": 2, "warnings": 1,
+            "severity": {"NEVER": 1, "MUST": 1, "SHOULD": 1, "GUIDANCE": 0},
+            "rules": {"demo/N1": 1, "demo/M1": 1, "demo/S1": 1},
+            "complete": True, "skippedFiles": 0,
+        }
+
+    def test_kills_slow_script_rules(self, tmp_path: Path, monkeypatch):
+        """A script rule past the timeout is killed and the domain marked incomplete."""
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "a.sh").write_text("ok\n")
+        spec = {**SPEC, "file_patterns": ["**/*.sh"], "exclude_patterns": [], "rules": {"S3": {
+            "title": "Slow", "severity": "SHOULD", "mechanical": True, "description": "Slow.",
+            "check": {"type": "script", "code": 'sleep 30; echo "$file:1: late"'},
+        }}}
+        rules_path = tmp_path / "slow.rules.json"
+        rules_path.write_text(generate_rules_json(parse_domain_spec(spec)))
+        monkeypatch.setattr(flight_validate, "SCRIPT_TIMEOUT_SECONDS", 0.5)
+
+        [report] = run_reports(tmp_path, rules_path)
+
+        assert report.results == []
+        assert report.to_summary()["complete"] is False
+        assert json.loads(format_counts([report]))["complete"] is False
+
+    def test_cli_prints_json_and_exits_on_errors(self, tmp_path: Path, capsys, monkeypatch):
+        """The CLI prints one indented summary per domain and exits 1 on errors."""
+        write_project(tmp_path, {"src/a.ts": "const a: any = 1;\n", "README.md": ""})
+        monkeypatch.chdir(tmp_path)
+
+        exit_code = main(["--auto"])
+        summary = json.loads(capsys.readouterr().out)
+
+        assert exit_code == 1
+        assert summary["domain"] == "demo"
+        assert summary["fileCount"] == 1
+        assert summary["results"][0]["filePath"] == os.path.join(os.getcwd(), "src", "a.ts")
+
+
+class TestPythonAst:
+    """python_ast rules, evaluated with Python's ast module."""
+
+    RULES = {
+        "domain": "py",
+        "version": "1.0.0",
+        "file_patterns": ["**/*.py"],
+        "rules": [
+            {
+                "id": "N1", "title": "No eval", "severity": "NEVER", "type": "ast", "language": "python",
+                "pattern": None, "query": "(call) @violation", "message": "No eval.",
+                "python_ast": [{"node": "Call", "fields": {"func": {"node": "Name", "fields": {"id": "eval"}}}}],
+            },
+            {
+                "id": "N2", "title": "Mutable defaults", "severity": "NEVER", "type": "ast", "language": "python",
+                "pattern": None, "query": "(default_parameter) @violation", "message": "No mutable defaults.",
+                "python_ast": [{"node": ["List", "Dict"], "in_field": ["defaults", "kw_defaults"]}],
+            },
+            {
+                "id": "N3", "title": "shell=True", "severity": "NEVER", "type": "ast", "language": "python",
+                "pattern": None, "query": "(call) @violation", "message": "No shell=True.",
+                "python_ast": [{"node": "Call", "fields": {"keywords": {"any": {
+                    "node": "keyword", "fields": {"arg": "shell", "value": {"node": "Constant", "fields": {"value": True}}},
+                }}}}],
+            },
+        ],
+    }
+
+    def run_python_rules(self, project_root: Path, source: str) -> list:
+        (project_root / "app.py").write_text(source, encoding="utf-8")
+        rules_path = project_root / "py.rules.json"
+        rules_path.write_text(json.dumps(self.RULES))
+        [report] = run_reports(project_root, rules_path)
+        return [(result["ruleId"], result["line"], result["column"]) for result in report.results]
+
+    def test_reports_each_rule_in_position_order(self, tmp_path: Path):
+        """Matches are reported per rule, each rule's in position order."""
+        source = (
+            "def f(a, b=[], *, c={}, d=None):\n"
+            "    run(x, shell=True)\n"
+            "    run(x, shell=1)\n"
+            "    return eval(a) + eval(b)\n"
+            "items = [eval]\n"
+        )
+
+        assert self.run_python_rules(tmp_path, source) == [
+            ("N1", 4, 12), ("N1", 4, 22),
+            ("N2", 1, 12), ("N2", 1, 21),
+            ("N3", 2, 5),
+        ]
+
+    def test_columns_count_utf16_units(self, tmp_path: Path):
+        """ast's UTF-8 byte offsets are reported as flight-lint columns."""
+        assert self.run_python_rules(tmp_path, 'x = "é😀"; eval(x)\n') == [("N1", 1, 12)]
+
+    def test_files_that_do_not_parse_have_no_ast_results(self, tmp_path: Path):
+        """A syntax error leaves the file without python_ast results."""
+        assert self.run_python_rules(tmp_path, "def f(:\n    eval(x)\n") == []
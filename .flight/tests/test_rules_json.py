@@ -1,13 +1,17 @@
 """Tests for generate_rules_json() and convert_check_to_rule() functions."""
 
 import json
+import subprocess
 import pytest
 from pathlib import Path
 
 from flight_domain_compile import (
     parse_domain_spec,
     generate_rules_json,
+    generate_rules_bundle,
     convert_check_to_rule,
+    generate_check_command,
+    validate_spec,
     Rule,
 )
 
@@ -66,6 +70,22 @@ class TestConvertCheckToRule:
         assert json_rule["query"] == query
         assert json_rule["pattern"] is None
 
+    def test_ast_rule_keeps_python_ast_query(self):
+        """Convert check copies a python_ast query next to the tree-sitter one."""
+        python_ast = [{"node": "Call", "fields": {"func": {"node": "Name", "fields": {"id": "eval"}}}}]
+        rule = Rule(
+            id="N1",
+            title="No eval",
+            severity="NEVER",
+            mechanical=True,
+            description="No eval allowed.",
+            check={"type": "ast", "language": "python", "query": "(call) @violation", "python_ast": python_ast},
+        )
+
+        json_rule = convert_check_to_rule(rule)
+
+        assert json_rule["python_ast"] == python_ast
+
     def test_preserves_rule_metadata(self):
         """Convert check preserves id, title, severity, and message."""
         rule = Rule(
@@ -215,3 +235,292 @@ class TestProvenanceInJson:
         # Check provenance fields
         rule_prov = rules_with_prov[0]["provenance"]
         assert "last_verified" in rule_prov or "confidence" in rule_prov
+
+
+class TestActivationInJson:
+    """Tests for domain activation signatures in generated JSON."""
+
+    ACTIVATION_SPEC = {
+        "domain": "clerk-like",
+        "version": "1.0.0",
+        "file_patterns": ["**/*.ts"],
+        "activation": {"literals": ["@clerk/"], "pattern": "CLERK_[A-Z]+"},
+        "rules": {
+            "N1": {
+                "title": "No secret keys",
+                "severity": "NEVER",
+                "mechanical": True,
+                "check": {"type": "grep", "pattern": "sk_live_"},
+            },
+        },
+    }
+
+    def test_includes_activation(self):
+        """Generate rules JSON carries the domain activation signature."""
+        spec = parse_domain_spec(self.ACTIVATION_SPEC)
+
+        parsed = json.loads(generate_rules_json(spec))
+
+        assert parsed["activation"] == {"literals": ["@clerk/"], "pattern": "CLERK_[A-Z]+"}
+
+    def test_omits_activation_when_absent(self):
+        """Generate rules JSON has no activation key for always-active domains."""
+        spec_data = {k: v for k, v in self.ACTIVATION_SPEC.items() if k != "activation"}
+        spec = parse_domain_spec(spec_data)
+
+        parsed = json.loads(generate_rules_json(spec))
+
+        assert "activation" not in parsed
+
+    def test_rejects_activation_without_signature(self):
+        """Validate spec errors when activation has neither literals nor pattern."""
+        spec_data = {**self.ACTIVATION_SPEC, "activation": {}}
+
+        errors, _ = validate_spec(spec_data, "clerk-like")
+
+        assert any("activation" in err for err in errors)
+
+
+class TestCheckTypesInJson:
+    """Tests for the check types and path scoping carried into generated JSON."""
+
+    CHECKS_SPEC = {
+        "domain": "checks",
+        "version": "1.0.0",
+        "file_patterns": ["**/*.ts"],
+        "api_file_detection": {"paths": ["api/"], "patterns": [r"router\.get\("]},
+        "rules": {
+            "N1": {
+                "title": "No console",
+                "severity": "NEVER",
+                "mechanical": True,
+                "skip_paths": ["**/tests/**"],
+                "check": {"type": "grep", "pattern": "console\\.", "flags": "-Ein",
+                          "ignore_when": [r"for\s*("], "exclude": "debug"},
+            },
+            "N2": {
+                "title": "Transactions",
+                "severity": "NEVER",
+                "mechanical": True,
+                "check": {"type": "requires", "trigger": "INSERT", "trigger_count": 3, "requirement": "BEGIN"},
+            },
+            "M1": {
+                "title": "License header",
+                "severity": "MUST",
+                "mechanical": True,
+                "only_paths": ["src/**"],
+                "check": {"type": "requires", "must_exist": "SPDX-License-Identifier"},
+            },
+            "M2": {
+                "title": "CORS",
+                "severity": "MUST",
+                "mechanical": True,
+                "api_files_only": True,
+                "check": {"type": "multi-condition", "logic": "AND", "conditions": [
+                    {"pattern": "origin.*\\*"}, {"pattern": "credentials", "flags": "-E"}]},
+            },
+            "S1": {
+                "title": "OpenAPI spec",
+                "severity": "SHOULD",
+                "mechanical": True,
+                "check": {"type": "file_exists", "paths": ["openapi.yaml", "docs/openapi.*"]},
+            },
+            "S2": {
+                "title": "Custom",
+                "severity": "SHOULD",
+                "mechanical": True,
+                "check": {"type": "script", "code": "grep -n TODO \"$file\"\n"},
+            },
+            "S3": {
+                "title": "Versioning",
+                "severity": "SHOULD",
+                "mechanical": True,
+                "check": {"type": "presence", "pattern": "/v[0-9]+", "flags": "-Ei", "invert": True},
+            },
+        },
+    }
+
+    def rules_by_id(self) -> dict:
+        parsed = json.loads(generate_rules_json(parse_domain_spec(self.CHECKS_SPEC)))
+        return {rule_entry["id"]: rule_entry for rule_entry in parsed["rules"]}
+
+    def test_keeps_every_check_type(self):
+        """Generate rules JSON emits a rule for every check type."""
+        rules = self.rules_by_id()
+
+        assert {rule_id: rule_entry["type"] for rule_id, rule_entry in rules.items()} == {
+            "M1": "requires",
+            "M2": "multi-condition",
+            "N1": "grep",
+            "N2": "requires",
+            "S1": "file_exists",
+            "S2": "script",
+            "S3": "presence",
+        }
+
+    def test_converts_check_fields(self):
+        """Check fields are carried with null pattern and query where unused."""
+        rules = self.rules_by_id()
+
+        assert rules["N2"]["trigger"] == "INSERT"
+        assert rules["N2"]["requirement"] == "BEGIN"
+        assert rules["N2"]["trigger_count"] == 3
+        assert rules["N2"]["pattern"] is None and rules["N2"]["query"] is None
+        assert rules["M1"]["must_exist"] == "SPDX-License-Identifier"
+        assert rules["M2"]["logic"] == "AND"
+        assert rules["M2"]["conditions"] == [
+            {"pattern": "origin.*\\*", "ignore_case": True},
+            {"pattern": "credentials"},
+        ]
+        assert rules["S1"]["paths"] == ["openapi.yaml", "docs/openapi.*"]
+        assert rules["S2"]["code"] == 'grep -n TODO "$file"'
+        assert rules["S3"]["pattern"] == "/v[0-9]+"
+        assert rules["S3"]["ignore_case"] is True
+
+    def test_converts_grep_flags_and_exclusions(self):
+        """Grep flags become ignore_case; exclude joins ignore_when as an extended regex."""
+        rules = self.rules_by_id()
+
+        assert rules["N1"]["ignore_case"] is True
+        assert "multiline" not in rules["N1"]
+        assert rules["N1"]["ignore_when"] == [r"for\s*\(", "debug"]
+
+    def test_generated_validator_applies_exclusions(self, tmp_path: Path):
+        """The generated validator drops the lines that ignore_when and exclude drop."""
+        source_path = tmp_path / "a.ts"
+        source_path.write_text("console.log(1);\nconsole.debug(2);\nfor (;;) console.log(3);\n")
+        rule = parse_domain_spec(self.CHECKS_SPEC).rules["N1"]
+
+        command = generate_check_command(rule)
+        output = subprocess.run(["bash", "-c", f"FILES=({str(source_path)!r}); {command}"],
+                                capture_output=True, text=True, check=True).stdout
+
+        assert output.splitlines() == ["1:console.log(1);"]
+
+    def test_carries_path_scoping(self):
+        """Path scopes, api_files_only and the domain's API file detection are carried."""
+        parsed = json.loads(generate_rules_json(parse_domain_spec(self.CHECKS_SPEC)))
+        rules = {rule_entry["id"]: rule_entry for rule_entry in parsed["rules"]}
+
+        assert rules["N1"]["skip_paths"] == ["**/tests/**"]
+        assert rules["M1"]["only_paths"] == ["src/**"]
+        assert rules["M2"]["api_files_only"] is True
+        assert "api_files_only" not in rules["N1"]
+        assert parsed["api_file_detection"] == {"paths": ["api/"], "patterns": [r"router\.get\("]}
+
+    def test_bundles_check_fields_in_camel_case(self, tmp_path: Path):
+        """Bundled rules carry check fields as flight-lint's loader sets them."""
+        (tmp_path / "checks.rules.json").write_text(generate_rules_json(parse_domain_spec(self.CHECKS_SPEC)))
+
+        bundle_json, errors = generate_rules_bundle(tmp_path)
+        entry = json.loads(bundle_json)["domains"][0]
+        rules = {rule_entry["id"]: rule_entry for rule_entry in entry["rulesFile"]["rules"]}
+
+        assert errors == []
+        assert entry["grepRuleIds"] == ["N1"]
+        assert entry["rulesFile"]["apiFileDetection"] == {"paths": ["api/"], "patterns": [r"router\.get\("]}
+        assert rules["N1"]["ignoreCase"] is True
+        assert rules["N1"]["skipPaths"] == ["**/tests/**"]
+        assert rules["N2"]["triggerCount"] == 3
+        assert rules["M1"] == {
+            "id": "M1",
+            "title": "License header",
+            "severity": "MUST",
+            "type": "requires",
+            "pattern": None,
+            "query": None,
+            "message": "License header",
+            "onlyPaths": ["src/**"],
+            "mustExist": "SPDX-License-Identifier",
+        }
+        assert rules["M2"]["conditions"] == [{"pattern": "origin.*\\*", "ignoreCase": True}, {"pattern": "credentials"}]
+
+    def test_rejects_api_rules_without_detection(self, tmp_path: Path):
+        """Rules files with api_files_only rules but no detection are not bundled."""
+        spec_data = {k: v for k, v in self.CHECKS_SPEC.items() if k != "api_file_detection"}
+        (tmp_path / "checks.rules.json").write_text(generate_rules_json(parse_domain_spec(spec_data)))
+
+        bundle_json, errors = generate_rules_bundle(tmp_path)
+
+        assert json.loads(bundle_json)["domains"] == []
+        assert len(errors) == 1 and "api_file_detection" in errors[0]
+
+
+class TestRulesBundle:
+    """Tests for generate_rules_bundle() (rules.bundle.json for flight-lint)."""
+
+    BUNDLE_SPEC = {
+        "domain": "bundled",
+        "version": "1.0.0",
+        "file_patterns": ["**/*.{ts,tsx}", "**/Dockerfile"],
+        "rules": {
+            "N1": {
+                "title": "No eval",
+                "severity": "NEVER",
+                "mechanical": True,
+                "check": {"type": "grep", "pattern": r"eval\("},
+            },
+            "M1": {
+                "title": "No lookbehind",
+                "severity": "MUST",
+                "mechanical": True,
+                "check": {"type": "grep", "pattern": r"(?<!\.)then\("},
+            },
+            "S1": {
+                "title": "No any",
+                "severity": "SHOULD",
+                "mechanical": True,
+                "check": {"type": "ast", "language": "typescript", "query": "(predefined_type) @violation"},
+            },
+        },
+    }
+
+    def write_domain(self, domains_dir: Path) -> Path:
+        rules_path = domains_dir / "bundled.rules.json"
+        rules_path.write_text(generate_rules_json(parse_domain_spec(self.BUNDLE_SPEC)))
+        return rules_path
+
+    def test_bundles_rules_in_flight_lint_shape(self, tmp_path: Path):
+        """Bundle entries carry camelCase rules files and rule partitions."""
+        rules_path = self.write_domain(tmp_path)
+
+        bundle_json, errors = generate_rules_bundle(tmp_path)
+        bundle = json.loads(bundle_json)
+        entry = bundle["domains"][0]
+
+        assert errors == []
+        assert bundle["bundleVersion"] == 2
+        assert entry["source"] == "bundled.rules.json"
+        assert entry["size"] == rules_path.stat().st_size
+        assert entry["mtimeNs"] == str(rules_path.stat().st_mtime_ns)
+        assert entry["rulesFile"]["filePatterns"] == ["**/*.{ts,tsx}", "**/Dockerfile"]
+        assert entry["grepRuleIds"] == ["M1", "N1"]
+        assert entry["astRuleIds"] == ["S1"]
+        assert entry["lineBoundRuleIds"] == ["M1"]
+        assert entry["languages"] == ["typescript"]
+        assert set(entry["ruleHashes"]) == {"M1", "N1", "S1"}
+
+    def test_indexes_domains_by_language_and_extension(self, tmp_path: Path):
+        """Bundle index maps languages and extensions to domains."""
+        self.write_domain(tmp_path)
+
+        bundle = json.loads(generate_rules_bundle(tmp_path)[0])
+
+        assert bundle["index"]["languages"] == {"typescript": ["bundled"]}
+        assert bundle["index"]["extensions"] == {".ts": ["bundled"], ".tsx": ["bundled"]}
+
+    def test_leaves_out_invalid_rules_files(self, tmp_path: Path):
+        """Rules files flight-lint would reject are reported, not bundled."""
+        self.write_domain(tmp_path)
+        (tmp_path / "broken.rules.json").write_text(json.dumps({
+            "domain": "broken",
+            "version": "1.0.0",
+            "file_patterns": ["**/*.js"],
+            "rules": [{"id": "N1", "title": "t", "severity": "SOMETIMES", "type": "grep",
+                       "pattern": "x", "query": None, "message": "m"}],
+        }))
+
+        bundle_json, errors = generate_rules_bundle(tmp_path)
+
+        assert [entry["source"] for entry in json.loads(bundle_json)["domains"]] == ["bundled.rules.json"]
+        assert len(errors) == 1 and "broken.rules.json" in errors[0]
@@ -4,7 +4,7 @@ import pytest
 from pathlib import Path
 
 # Import from compiler module (loaded in conftest.py)
-from flight_domain_compile import validate_spec
+from flight_domain_compile import validate_spec, validate_python_ast
 
 
 class TestValidateSpecRequiredFields:
@@ -73,3 +73,54 @@ class TestValidateSpecCheckTypes:
         errors, warnings = validate_spec(spec_data, "mixed-types")
 
         assert len(errors) == 0
+
+
+class TestValidatePythonAst:
+    """Tests for python_ast query validation."""
+
+    def spec_with_check(self, check: dict) -> dict:
+        return {
+            "domain": "demo",
+            "file_patterns": ["**/*.py"],
+            "rules": {"N1": {"title": "No eval", "severity": "NEVER", "mechanical": True, "check": check}},
+        }
+
+    def test_accepts_nested_matchers(self):
+        """Validate python_ast accepts nested, any, match and in_field matchers."""
+        query = [
+            {"node": "Call", "fields": {
+                "func": {"node": "Attribute", "fields": {"attr": {"match": "^loads?$"}}},
+                "keywords": {"any": {"node": "keyword", "fields": {"arg": "shell"}}},
+            }},
+            {"node": ["List", "Dict"], "in_field": ["defaults", "kw_defaults"]},
+        ]
+
+        assert validate_python_ast(query) == []
+
+    def test_rejects_unknown_nodes_and_fields(self):
+        """Validate python_ast names unknown node classes and fields."""
+        errors = validate_python_ast([
+            {"node": "Calls"},
+            {"node": "Call", "fields": {"callee": "eval"}},
+            {"node": "Str"},
+        ])
+
+        assert errors == [
+            "python_ast[0] has unknown ast node 'Calls'",
+            "python_ast[1].fields.callee: ast node 'Call' has no field 'callee'",
+            "python_ast[2] has unknown ast node 'Str'",
+        ]
+
+    def test_rejects_reported_nodes_without_position(self):
+        """Validate python_ast rejects matchers whose node cannot be located."""
+        errors = validate_python_ast([{"node": "arguments"}])
+
+        assert errors == ["python_ast[0] reports ast node 'arguments', which has no position"]
+
+    def test_rejects_python_ast_on_other_check_types(self):
+        """Validate spec only allows python_ast on ast checks."""
+        errors, warnings = validate_spec(
+            self.spec_with_check({"type": "grep", "pattern": "eval", "python_ast": [{"node": "Call"}]}), "demo"
+        )
+
+        assert errors == ["demo.flight: Rule N1 has 'python_ast' but is not type 'ast'"]
@@ -4,10 +4,13 @@ set -euo pipefail
 # =============================================================================
 # Flight Validator Runner
 # Runs flight-lint for all validation (AST and grep rules from .rules.json)
+# Without flight-lint, falls back to bin/flight-validate (Python; of the AST
+# rules it runs only those with a python_ast query)
 #
 # Usage:
 #   .flight/validate-all.sh                    # Validate codebase
 #   .flight/validate-all.sh --update-baseline  # Accept current warnings as baseline
+#   .flight/validate-all.sh --count-only       # Ratchet check only, no violation listing
 #
 # Baseline Ratchet:
 #   Prevents warning count from increasing. New projects start at 0.
@@ -28,12 +31,16 @@ NC='\033[0m'
 # Flag handling
 # -----------------------------------------------------------------------------
 UPDATE_BASELINE=false
+COUNT_ONLY=false
 
 for arg in "$@"; do
     case "$arg" in
         --update-baseline)
             UPDATE_BASELINE=true
             ;;
+        --count-only)
+            COUNT_ONLY=true
+            ;;
     esac
 done
 
@@ -64,7 +71,7 @@ EOF
 }
 
 # -----------------------------------------------------------------------------
-# Find flight-lint
+# Find flight-lint (or its Python counterpart)
 # -----------------------------------------------------------------------------
 
 FLIGHT_LINT=""
@@ -72,11 +79,16 @@ if [[ -x "$SCRIPT_DIR/../flight-lint/bin/flight-lint" ]]; then
     FLIGHT_LINT="$SCRIPT_DIR/../flight-lint/bin/flight-lint"
 elif command -v flight-lint &>/dev/null; then
     FLIGHT_LINT="flight-lint"
+elif "$SCRIPT_DIR/bin/flight-validate" --help &>/dev/null; then
+    # --help loads the engine and the compiler module it imports with the
+    # interpreter the wrapper picks, so a missing dependency shows up here
+    FLIGHT_LINT="$SCRIPT_DIR/bin/flight-validate"
 fi
 
 if [[ -z "$FLIGHT_LINT" ]]; then
-    echo -e "${RED}Error: flight-lint not found${NC}"
-    echo -e "${YELLOW}Build it: cd flight-lint && npm install && npm run build${NC}"
+    echo -e "${RED}Error: neither flight-lint nor a working flight-validate found${NC}"
+    echo -e "${YELLOW}Build flight-lint: cd flight-lint && npm install && npm run build${NC}"
+    echo -e "${YELLOW}Or use the Python engine (.flight/bin/flight-validate): install python3 and PyYAML (pip install pyyaml)${NC}"
     exit 2
 fi
 
@@ -88,21 +100,34 @@ echo -e "${BLUE}═════════════════════
 echo -e "${BLUE}       Flight Validation Runner${NC}"
 echo -e "${BLUE}═══════════════════════════════════════════${NC}"
 echo ""
-echo -e "${BLUE}Running flight-lint...${NC}"
+echo -e "${BLUE}Running $(basename "$FLIGHT_LINT")...${NC}"
 echo ""
 
-# Run flight-lint with auto-discovery
-LINT_OUTPUT=$("$FLIGHT_LINT" --auto --severity SHOULD 2>&1) || LINT_EXIT=$?
-LINT_EXIT=${LINT_EXIT:-0}
+# Run flight-lint with auto-discovery; the counts come from its summary record
+# Format: {"files":N,"total":N,"errors":N,"warnings":N,...}
+SUMMARY_FILE="$(mktemp)"
+trap 'rm -f "$SUMMARY_FILE"' EXIT
 
-# Show output
-echo "$LINT_OUTPUT"
-echo ""
+if [[ "$COUNT_ONLY" == true ]]; then
+    # Counters only: no per-violation results are built
+    LINT_OUTPUT=$("$FLIGHT_LINT" --auto --severity SHOULD --count-only --summary-file "$SUMMARY_FILE" 2>&1) || LINT_EXIT=$?
+    LINT_EXIT=${LINT_EXIT:-0}
+else
+    LINT_OUTPUT=$("$FLIGHT_LINT" --auto --severity SHOULD --summary-file "$SUMMARY_FILE" 2>&1) || LINT_EXIT=$?
+    LINT_EXIT=${LINT_EXIT:-0}
+
+    # Show output
+    echo "$LINT_OUTPUT"
+    echo ""
+fi
 
-# Parse flight-lint output for error/warning counts
-# Format: "✗ N error(s)" and "⚠ N warning(s)"
-TOTAL_FAIL=$( (echo "$LINT_OUTPUT" | grep -oE '✗ [0-9]+ error' | grep -oE '[0-9]+' | head -1) || echo "0")
-TOTAL_WARN=$( (echo "$LINT_OUTPUT" | grep -oE '⚠ [0-9]+ warning' | grep -oE '[0-9]+' | head -1) || echo "0")
+if command -v jq &>/dev/null; then
+    read -r TOTAL_FAIL TOTAL_WARN < <(jq -r '"\(.errors // 0) \(.warnings // 0)"' "$SUMMARY_FILE" 2>/dev/null) || true
+else
+    # The record is one line and its run totals come before the per-domain ones
+    TOTAL_FAIL=$( (grep -oE '"errors":[0-9]+' "$SUMMARY_FILE" | grep -oE '[0-9]+' | head -1) || echo "0")
+    TOTAL_WARN=$( (grep -oE '"warnings":[0-9]+' "$SUMMARY_FILE" | grep -oE '[0-9]+' | head -1) || echo "0")
+fi
 TOTAL_FAIL=${TOTAL_FAIL:-0}
 TOTAL_WARN=${TOTAL_WARN:-0}
 
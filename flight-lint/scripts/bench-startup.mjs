@@ -0,0 +1,99 @@
+#!/usr/bin/env node
+// Benchmark flight-lint cold start: `--version` and a one-file lint, each in a
+// fresh process, with Node's module compile cache disabled, empty and warm.
+// Hooks pay this start-up cost on every invocation that has no daemon.
+//
+// Usage: node scripts/bench-startup.mjs [runs] [path/to/flight-lint]
+
+import { spawnSync } from 'node:child_process';
+import { mkdtempSync, mkdirSync, writeFileSync, rmSync } from 'node:fs';
+import os from 'node:os';
+import path from 'node:path';
+import { fileURLToPath } from 'node:url';
+
+const runCount = Number(process.argv[2] ?? 20);
+const binaryPath = path.resolve(process.argv[3] ?? fileURLToPath(new URL('../bin/flight-lint', import.meta.url)));
+
+const workDir = mkdtempSync(path.join(os.tmpdir(), 'flight-lint-bench-'));
+const projectDir = path.join(workDir, 'project');
+const rulesPath = path.join(projectDir, 'bench.rules.json');
+mkdirSync(path.join(projectDir, 'src'), { recursive: true });
+writeFileSync(path.join(projectDir, 'src/app.ts'), 'export let count: any = 1;\nexport const total = count + 1;\n');
+writeFileSync(rulesPath, JSON.stringify({
+  domain: 'bench',
+  version: '1.0.0',
+  file_patterns: ['**/*.ts'],
+  rules: [
+    { id: 'N1', title: 'No let', severity: 'NEVER', type: 'grep', query: null, pattern: '\\blet\\b', message: 'Use const' },
+    {
+      id: 'N2',
+      title: 'No any',
+      severity: 'NEVER',
+      type: 'ast',
+      language: 'typescript',
+      pattern: null,
+      query: '((predefined_type) @violation (#eq? @violation "any"))',
+      message: 'Avoid any',
+    },
+  ],
+}));
+
+const scenarios = [
+  { name: '--version', args: ['--version'] },
+  { name: 'one-file lint', args: ['--format', 'summary', rulesPath] },
+];
+
+/**
+ * Time one run of the binary in a fresh process.
+ */
+function timeRun(args, cacheEnv) {
+  const startTime = process.hrtime.bigint();
+  const lintRun = spawnSync(process.execPath, [binaryPath, ...args], {
+    cwd: projectDir,
+    env: { ...process.env, NODE_DISABLE_COMPILE_CACHE: undefined, NODE_COMPILE_CACHE: undefined, ...cacheEnv },
+    encoding: 'utf-8',
+  });
+  const elapsedMs = Number(process.hrtime.bigint() - startTime) / 1e6;
+  if (lintRun.status !== 0 && lintRun.status !== 1) {
+    throw new Error(`flight-lint ${args.join(' ')} exited ${lintRun.status}: ${lintRun.stderr}`);
+  }
+  return elapsedMs;
+}
+
+/**
+ * Summarise run times as min and median milliseconds.
+ */
+function describeTimes(times) {
+  const sortedTimes = [...times].sort((left, right) => left - right);
+  const medianTime = sortedTimes[Math.floor(sortedTimes.length / 2)];
+  return `min ${sortedTimes[0].toFixed(1).padStart(6)} ms  median ${medianTime.toFixed(1).padStart(6)} ms`;
+}
+
+const warmCacheDir = path.join(workDir, 'warm-cache');
+const cacheModes = [
+  { name: 'cache disabled', env: () => ({ NODE_DISABLE_COMPILE_CACHE: '1' }) },
+  { name: 'cache empty', env: (runIndex) => ({ NODE_COMPILE_CACHE: path.join(workDir, `empty-cache-${runIndex}`) }) },
+  { name: 'cache warm', env: () => ({ NODE_COMPILE_CACHE: warmCacheDir }) },
+];
+
+try {
+  console.log(`flight-lint start-up: ${binaryPath} (${runCount} runs each, node ${process.version})\n`);
+  for (const scenario of scenarios) {
+    // Prime the warm cache, so every timed run of that mode hits it
+    timeRun(scenario.args, { NODE_COMPILE_CACHE: warmCacheDir });
+
+    const timesByMode = cacheModes.map(() => []);
+    // Interleave the modes so drift in machine load affects them alike
+    for (let runIndex = 0; runIndex < runCount; runIndex++) {
+      for (const [modeIndex, cacheMode] of cacheModes.entries()) {
+        timesByMode[modeIndex].push(timeRun(scenario.args, cacheMode.env(runIndex)));
+      }
+    }
+
+    for (const [modeIndex, cacheMode] of cacheModes.entries()) {
+      console.log(`${scenario.name.padEnd(14)} ${cacheMode.name.padEnd(15)} ${describeTimes(timesByMode[modeIndex])}`);
+    }
+  }
+} finally {
+  rmSync(workDir, { recursive: true, force: true });
+}
@@ -0,0 +1,719 @@
+import { execFile } from 'node:child_process';
+import fs from 'node:fs';
+import path from 'node:path';
+import { compileGlob } from './discovery.js';
+import type { Rule, ApiFileDetection } from './types.js';
+
+/**
+ * A regex match located in a buffer.
+ */
+export interface GrepMatch {
+  readonly line: number;   // 1-indexed
+  readonly column: number; // 1-indexed
+  readonly text: string;
+}
+
+/**
+ * Find the line containing an offset by binary search over line starts.
+ * @param lineStarts - Ascending line start offsets
+ * @param offset - Offset into the buffer
+ * @returns 0-indexed line number
+ */
+export function findLineIndex(lineStarts: readonly number[], offset: number): number {
+  let low = 0;
+  let high = lineStarts.length - 1;
+
+  while (low < high) {
+    const middle = (low + high + 1) >> 1;
+    if (lineStarts[middle]! <= offset) {
+      low = middle;
+    } else {
+      high = middle - 1;
+    }
+  }
+
+  return low;
+}
+
+/**
+ * Convert a path to the forward-slash project-relative form that path
+ * scopes and API file paths are matched against.
+ */
+export function toProjectPath(projectRoot: string, filePath: string): string {
+  return path.relative(projectRoot, filePath).split(path.sep).join('/');
+}
+
+/**
+ * Join regex sources into one alternation.
+ */
+export function joinAlternatives(patterns: readonly string[]): string {
+  return patterns.map((pattern) => `(?:${pattern})`).join('|');
+}
+
+/**
+ * Check if a rule reports matches of its pattern line by line.
+ * Rules without a type are grep rules if they have a pattern.
+ */
+export function isLineGrepRule(rule: Rule): boolean {
+  return (rule.type === undefined || rule.type === 'grep') &&
+    typeof rule.pattern === 'string' && rule.pattern.length > 0 && !rule.multiline;
+}
+
+// -----------------------------------------------------------------------------
+// Path scoping
+// -----------------------------------------------------------------------------
+
+/**
+ * The skip_paths and only_paths of a rule, compiled once per process.
+ */
+interface PathScope {
+  readonly skipMatchers: readonly RegExp[];
+  /** Null when the rule is not restricted to some paths */
+  readonly onlyMatchers: readonly RegExp[] | null;
+  /**
+   * The rule's ignore_when patterns: the generated validators drop grep
+   * output lines, which start with the file path, that match one of them,
+   * so a pattern matching the path drops the whole file
+   */
+  readonly ignoreRegex: RegExp | null;
+}
+
+const pathScopeCache = new WeakMap<Rule, PathScope | null>();
+
+/**
+ * Get the compiled path scope of a rule.
+ * @returns The scope, or null if the rule runs on every path
+ */
+function getPathScope(rule: Rule): PathScope | null {
+  let pathScope = pathScopeCache.get(rule);
+  if (pathScope === undefined) {
+    const hasScope = (rule.skipPaths?.length ?? 0) > 0 || rule.onlyPaths !== undefined || (rule.ignoreWhen?.length ?? 0) > 0;
+    pathScope = hasScope
+      ? {
+          skipMatchers: (rule.skipPaths ?? []).map(compileGlob),
+          onlyMatchers: rule.onlyPaths === undefined ? null : rule.onlyPaths.map(compileGlob),
+          ignoreRegex: rule.ignoreWhen?.length ? new RegExp(joinAlternatives(rule.ignoreWhen)) : null,
+        }
+      : null;
+    pathScopeCache.set(rule, pathScope);
+  }
+  return pathScope;
+}
+
+/**
+ * Check whether a rule runs on a path, from its skip_paths, only_paths and
+ * ignore_when.
+ * @param rule - The rule
+ * @param projectPath - Forward-slash path relative to the project root
+ * @returns True unless a skip glob or ignore pattern matches, or no only glob does
+ */
+export function isRuleInPathScope(rule: Rule, projectPath: string): boolean {
+  const pathScope = getPathScope(rule);
+  if (pathScope === null) {
+    return true;
+  }
+  if (pathScope.skipMatchers.some((skipMatcher) => skipMatcher.test(projectPath)) || (pathScope.ignoreRegex?.test(projectPath) ?? false)) {
+    return false;
+  }
+  return pathScope.onlyMatchers === null || pathScope.onlyMatchers.some((onlyMatcher) => onlyMatcher.test(projectPath));
+}
+
+/**
+ * Subsets of rules arrays, keyed by which rules they keep. Compiled grep
+ * programs and merged queries are cached per rules array, so every file
+ * that keeps the same rules must get the same array.
+ */
+const ruleSubsetCache = new WeakMap<readonly Rule[], Map<string, readonly Rule[]>>();
+
+/**
+ * Select some rules of a rules array, as a stable array per subset.
+ * @param rules - Rules of a rules file
+ * @param keepRule - Whether to keep each rule
+ * @returns The rules kept; the same array as rules if all of them are
+ */
+export function selectRules(rules: readonly Rule[], keepRule: (rule: Rule) => boolean): readonly Rule[] {
+  const keptFlags = rules.map(keepRule);
+  if (keptFlags.every(Boolean)) {
+    return rules;
+  }
+
+  let ruleSubsets = ruleSubsetCache.get(rules);
+  if (!ruleSubsets) {
+    ruleSubsets = new Map();
+    ruleSubsetCache.set(rules, ruleSubsets);
+  }
+
+  const subsetKey = keptFlags.map((isKept) => (isKept ? '1' : '0')).join('');
+  let ruleSubset = ruleSubsets.get(subsetKey);
+  if (!ruleSubset) {
+    ruleSubset = rules.filter((_rule, ruleIndex) => keptFlags[ruleIndex]);
+    ruleSubsets.set(subsetKey, ruleSubset);
+  }
+  return ruleSubset;
+}
+
+/**
+ * Narrow rules to those whose path scope includes a file. Only the path is
+ * needed, so scoped-out rules are dropped before the file is read.
+ * @param rules - Rules of a rules file
+ * @param projectPath - Forward-slash path relative to the project root
+ * @returns The rules that run on the file
+ */
+export function selectRulesForPath(rules: readonly Rule[], projectPath: string): readonly Rule[] {
+  return selectRules(rules, (rule) => isRuleInPathScope(rule, projectPath));
+}
+
+// -----------------------------------------------------------------------------
+// API file detection
+// -----------------------------------------------------------------------------
+
+/**
+ * A domain's API file detection, compiled once per process.
+ */
+interface ApiFileMatcher {
+  readonly pathRegex: RegExp | null;
+  readonly contentRegex: RegExp | null;
+}
+
+const apiFileMatcherCache = new WeakMap<ApiFileDetection, ApiFileMatcher>();
+
+/**
+ * Get the compiled form of a domain's API file detection.
+ */
+function getApiFileMatcher(apiFileDetection: ApiFileDetection): ApiFileMatcher {
+  let apiFileMatcher = apiFileMatcherCache.get(apiFileDetection);
+  if (!apiFileMatcher) {
+    const joinPatterns = (patterns: readonly string[], flags: string): RegExp | null =>
+      patterns.length === 0 ? null : new RegExp(joinAlternatives(patterns), flags);
+    apiFileMatcher = {
+      pathRegex: joinPatterns(apiFileDetection.paths, ''),
+      contentRegex: joinPatterns(apiFileDetection.patterns, 'm'),
+    };
+    apiFileMatcherCache.set(apiFileDetection, apiFileMatcher);
+  }
+  return apiFileMatcher;
+}
+
+/**
+ * Check whether a file's path alone marks it as an API endpoint file.
+ * @param apiFileDetection - The domain's detection, if any
+ * @param projectPath - Forward-slash path relative to the project root
+ */
+export function isApiFilePath(apiFileDetection: ApiFileDetection | undefined, projectPath: string): boolean {
+  return apiFileDetection !== undefined && (getApiFileMatcher(apiFileDetection).pathRegex?.test(projectPath) ?? false);
+}
+
+/**
+ * Check whether content marks its file as an API endpoint file.
+ * @param apiFileDetection - The domain's detection, if any
+ * @param content - The file content, or one chunk of it
+ */
+export function isApiFileContent(apiFileDetection: ApiFileDetection | undefined, content: string): boolean {
+  return apiFileDetection !== undefined && (getApiFileMatcher(apiFileDetection).contentRegex?.test(content) ?? false);
+}
+
+/**
+ * Narrow rules to those that run on a file, given whether it is an API
+ * endpoint file: rules with apiFilesOnly run on those files only.
+ * @param rules - Rules of a rules file
+ * @param apiFileDetection - The domain's detection, if any
+ * @param projectPath - Forward-slash path relative to the project root
+ * @param content - The file content
+ * @returns The rules that run on the file
+ */
+export function selectRulesForApiFile(
+  rules: readonly Rule[],
+  apiFileDetection: ApiFileDetection | undefined,
+  projectPath: string,
+  content: string
+): readonly Rule[] {
+  if (!rules.some((rule) => rule.apiFilesOnly)) {
+    return rules;
+  }
+  const isApiFile = isApiFilePath(apiFileDetection, projectPath) || isApiFileContent(apiFileDetection, content);
+  return isApiFile ? rules : selectRules(rules, (rule) => !rule.apiFilesOnly);
+}
+
+// -----------------------------------------------------------------------------
+// Whole-file checks
+// -----------------------------------------------------------------------------
+
+/**
+ * A rule evaluated over a whole file rather than line by line, compiled:
+ * - span: a multiline grep rule; each match is reported at its first line
+ * - presence: a pattern some file of the domain must match
+ * - must-exist: a pattern every file must match
+ * - trigger: trigger lines that need a requirement somewhere in the file
+ * - conditions: a file matching all or any of several patterns
+ * - applies: a project-wide rule that only needs to know the file is in scope
+ */
+type ContentCheck =
+  | { readonly kind: 'span'; readonly matchRegex: RegExp; readonly ignoreRegex: RegExp | null }
+  | { readonly kind: 'presence' | 'must-exist'; readonly presenceRegex: RegExp }
+  | {
+      readonly kind: 'trigger';
+      readonly triggerRegex: RegExp;
+      readonly requirementRegex: RegExp;
+      readonly triggerCount: number;
+    }
+  | { readonly kind: 'conditions'; readonly conditionRegexes: readonly RegExp[]; readonly requireAll: boolean }
+  | { readonly kind: 'applies' };
+
+/**
+ * Compiled whole-file checks, keyed by rule; null for rules that are not
+ * whole-file checks or whose patterns do not compile.
+ */
+const contentCheckCache = new WeakMap<Rule, ContentCheck | null>();
+
+/**
+ * Compile a rule's whole-file check.
+ * Patterns keep grep's line semantics ('m'), except multiline grep rules,
+ * which match across lines as grep -z does ('s').
+ */
+function compileContentCheck(rule: Rule): ContentCheck | null {
+  const caseFlag = rule.ignoreCase ? 'i' : '';
+
+  switch (rule.type) {
+    case 'grep':
+    case undefined:
+      if (!rule.multiline || !rule.pattern) {
+        return null;
+      }
+      return {
+        kind: 'span',
+        matchRegex: new RegExp(rule.pattern, `gs${caseFlag}`),
+        ignoreRegex: rule.ignoreWhen?.length ? new RegExp(joinAlternatives(rule.ignoreWhen)) : null,
+      };
+    case 'presence':
+      return rule.pattern ? { kind: 'presence', presenceRegex: new RegExp(rule.pattern, `m${caseFlag}`) } : null;
+    case 'requires':
+      if (rule.mustExist) {
+        return { kind: 'must-exist', presenceRegex: new RegExp(rule.mustExist, 'm') };
+      }
+      if (!rule.trigger || !rule.requirement) {
+        return null;
+      }
+      return {
+        kind: 'trigger',
+        triggerRegex: new RegExp(rule.trigger, 'gm'),
+        requirementRegex: new RegExp(rule.requirement, 'm'),
+        triggerCount: rule.triggerCount ?? 1,
+      };
+    case 'multi-condition':
+      if (!rule.conditions?.length) {
+        return null;
+      }
+      return {
+        kind: 'conditions',
+        conditionRegexes: rule.conditions.map((condition) =>
+          new RegExp(condition.pattern, condition.ignoreCase ? 'mi' : 'm')
+        ),
+        requireAll: rule.logic !== 'OR',
+      };
+    case 'file_exists':
+    case 'script':
+      return { kind: 'applies' };
+    default:
+      return null;
+  }
+}
+
+/**
+ * Get the compiled whole-file check of a rule, compiling it on first use.
+ * @returns The check, or null if the rule has none that can run
+ */
+function getContentCheck(rule: Rule): ContentCheck | null {
+  let contentCheck = contentCheckCache.get(rule);
+  if (contentCheck === undefined) {
+    try {
+      contentCheck = compileContentCheck(rule);
+    } catch {
+      // Invalid regex pattern - skip silently, as grep rules do
+      contentCheck = null;
+    }
+    contentCheckCache.set(rule, contentCheck);
+  }
+  return contentCheck;
+}
+
+/**
+ * Check if a rule is evaluated over whole files.
+ */
+export function isContentCheckRule(rule: Rule): boolean {
+  return getContentCheck(rule) !== null;
+}
+
+/**
+ * What one whole-file check has found so far in a file.
+ */
+interface ContentRuleScan {
+  readonly rule: Rule;
+  readonly contentCheck: ContentCheck;
+  /** Multiline grep matches, or trigger lines */
+  readonly matches: GrepMatch[];
+  /** First match of each condition */
+  readonly conditionMatches: (GrepMatch | null)[];
+  /** The presence pattern, mustExist or requirement has been seen */
+  found: boolean;
+}
+
+/**
+ * The whole-file checks of one file, fed chunk by chunk.
+ */
+export interface ContentScan {
+  readonly ruleScans: readonly ContentRuleScan[];
+}
+
+/**
+ * Receives what the checks of one file found.
+ */
+export interface RuleScanHandlers {
+  /** Called once per violation */
+  readonly onViolation: (rule: Rule, line: number, column: number) => void;
+  /** Called once per project-wide rule in scope, with whether the file satisfies it */
+  readonly onProjectCheck: (rule: Rule, found: boolean) => void;
+}
+
+/**
+ * Start the whole-file checks of a file.
+ * @param rules - Rules that run on the file; other kinds are ignored
+ * @returns The scan, empty if no rule is a whole-file check
+ */
+export function createContentScan(rules: readonly Rule[]): ContentScan {
+  const ruleScans: ContentRuleScan[] = [];
+  for (const rule of rules) {
+    const contentCheck = getContentCheck(rule);
+    if (contentCheck !== null) {
+      const conditionCount = contentCheck.kind === 'conditions' ? contentCheck.conditionRegexes.length : 0;
+      ruleScans.push({ rule, contentCheck, matches: [], conditionMatches: new Array(conditionCount).fill(null), found: false });
+    }
+  }
+  return { ruleScans };
+}
+
+/**
+ * Locate a regex match found in a chunk.
+ */
+function locateMatch(
+  lineStarts: readonly number[],
+  lineOffset: number,
+  matchIndex: number,
+  matchText: string
+): GrepMatch & { readonly lineIndex: number } {
+  const lineIndex = findLineIndex(lineStarts, matchIndex);
+  return {
+    lineIndex,
+    line: lineOffset + lineIndex + 1,
+    column: matchIndex - lineStarts[lineIndex]! + 1,
+    text: matchText,
+  };
+}
+
+/**
+ * Collect every match of a global regex in a chunk, at most one per line,
+ * skipping matches the ignore regex also matches.
+ */
+function collectLineMatches(
+  chunk: string,
+  lineStarts: readonly number[],
+  lineOffset: number,
+  globalRegex: RegExp,
+  ignoreRegex: RegExp | null,
+  matches: GrepMatch[]
+): void {
+  let lastLineIndex = -1;
+  globalRegex.lastIndex = 0;
+  let regexMatch = globalRegex.exec(chunk);
+
+  while (regexMatch) {
+    const grepMatch = locateMatch(lineStarts, lineOffset, regexMatch.index, regexMatch[0]);
+    if (grepMatch.lineIndex !== lastLineIndex && !(ignoreRegex?.test(regexMatch[0]) ?? false)) {
+      matches.push({ line: grepMatch.line, column: grepMatch.column, text: grepMatch.text });
+      lastLineIndex = grepMatch.lineIndex;
+    }
+    if (grepMatch.lineIndex + 1 >= lineStarts.length) {
+      break;
+    }
+    // Resume at the next line; this also steps past empty matches
+    globalRegex.lastIndex = Math.max(lineStarts[grepMatch.lineIndex + 1]!, regexMatch.index + 1);
+    regexMatch = globalRegex.exec(chunk);
+  }
+}
+
+/**
+ * Run the whole-file checks over one chunk of a file. Files are either one
+ * chunk or split at line breaks, so lines never straddle chunks; multiline
+ * matches are found within a chunk.
+ * @param contentScan - Scan from createContentScan()
+ * @param chunk - The content, or its next chunk
+ * @param lineStarts - Line start index of the chunk
+ * @param lineOffset - Number of lines in earlier chunks
+ */
+export function scanContentChunk(
+  contentScan: ContentScan,
+  chunk: string,
+  lineStarts: readonly number[],
+  lineOffset: number
+): void {
+  for (const ruleScan of contentScan.ruleScans) {
+    const { contentCheck } = ruleScan;
+
+    switch (contentCheck.kind) {
+      case 'span':
+        collectLineMatches(chunk, lineStarts, lineOffset, contentCheck.matchRegex, contentCheck.ignoreRegex, ruleScan.matches);
+        break;
+      case 'presence':
+      case 'must-exist':
+        ruleScan.found ||= contentCheck.presenceRegex.test(chunk);
+        break;
+      case 'trigger':
+        collectLineMatches(chunk, lineStarts, lineOffset, contentCheck.triggerRegex, null, ruleScan.matches);
+        ruleScan.found ||= contentCheck.requirementRegex.test(chunk);
+        break;
+      case 'conditions':
+        for (const [conditionIndex, conditionRegex] of contentCheck.conditionRegexes.entries()) {
+          const conditionMatch = ruleScan.conditionMatches[conditionIndex] === null ? conditionRegex.exec(chunk) : null;
+          if (conditionMatch) {
+            ruleScan.conditionMatches[conditionIndex] = locateMatch(lineStarts, lineOffset, conditionMatch.index, conditionMatch[0]);
+          }
+        }
+        break;
+      case 'applies':
+        break;
+    }
+  }
+}
+
+/**
+ * Report what the whole-file checks of a file found, once every chunk has
+ * been scanned. Violations of a whole file, such as a missing mustExist
+ * pattern, are reported at its first line.
+ * @param contentScan - Scan fed by scanContentChunk()
+ * @param handlers - Receive violations and project-wide checks
+ */
+export function finishContentScan(contentScan: ContentScan, handlers: RuleScanHandlers): void {
+  for (const { rule, contentCheck, matches, conditionMatches, found } of contentScan.ruleScans) {
+    let violationMatches: readonly GrepMatch[] = [];
+
+    switch (contentCheck.kind) {
+      case 'span':
+        violationMatches = matches;
+        break;
+      case 'must-exist':
+        violationMatches = found ? [] : [{ line: 1, column: 1, text: '' }];
+        break;
+      case 'trigger':
+        violationMatches = !found && matches.length >= contentCheck.triggerCount ? matches : [];
+        break;
+      case 'conditions': {
+        const firstMatch = conditionMatches.find((conditionMatch) => conditionMatch !== null) ?? null;
+        const isMet = contentCheck.requireAll ? conditionMatches.every((conditionMatch) => conditionMatch !== null) : firstMatch !== null;
+        violationMatches = isMet && firstMatch ? [firstMatch] : [];
+        break;
+      }
+      case 'presence':
+      case 'applies':
+        handlers.onProjectCheck(rule, found);
+        break;
+    }
+
+    for (const violationMatch of violationMatches) {
+      handlers.onViolation(rule, violationMatch.line, violationMatch.column);
+    }
+  }
+}
+
+// -----------------------------------------------------------------------------
+// Project-wide checks
+// -----------------------------------------------------------------------------
+
+/**
+ * The files a project-wide rule ran on during a scan.
+ */
+export interface ProjectRuleOutcome {
+  readonly rule: Rule;
+  /** Files in the rule's scope, in visit order */
+  readonly filePaths: string[];
+  /** Some file matched the rule's presence pattern */
+  found: boolean;
+}
+
+/**
+ * A violation of a project-wide rule.
+ */
+export interface ProjectViolation {
+  readonly rule: Rule;
+  readonly filePath: string;
+  readonly line: number;
+  readonly column: number;
+}
+
+/** Output a script rule may print before it is cut off (16 MiB) */
+const SCRIPT_OUTPUT_BYTES = 16_777_216;
+
+/**
+ * Check whether a path or glob relative to a directory names something that
+ * exists. Globs are resolved one segment at a time, skipping dot entries.
+ */
+function existsInProject(directory: string, pathSegments: readonly string[]): boolean {
+  const [pathSegment, ...remainingSegments] = pathSegments;
+  if (pathSegment === undefined) {
+    return true;
+  }
+  if (!/[*?[{]/.test(pathSegment)) {
+    const childPath = path.join(directory, pathSegment);
+    return fs.existsSync(childPath) && existsInProject(childPath, remainingSegments);
+  }
+
+  let directoryEntries: fs.Dirent[];
+  try {
+    directoryEntries = fs.readdirSync(directory, { withFileTypes: true });
+  } catch {
+    return false;
+  }
+  const visibleEntries = directoryEntries.filter((directoryEntry) => !directoryEntry.name.startsWith('.'));
+
+  if (pathSegment === '**') {
+    return existsInProject(directory, remainingSegments) || visibleEntries.some((directoryEntry) =>
+      directoryEntry.isDirectory() && existsInProject(path.join(directory, directoryEntry.name), pathSegments)
+    );
+  }
+  const segmentMatcher = compileGlob(pathSegment);
+  return visibleEntries.some((directoryEntry) =>
+    segmentMatcher.test(directoryEntry.name) && existsInProject(path.join(directory, directoryEntry.name), remainingSegments)
+  );
+}
+
+/**
+ * What a script rule printed, and whether it was killed at the deadline.
+ */
+interface ScriptRun {
+  readonly stdout: string;
+  readonly cutOff: boolean;
+}
+
+/**
+ * Run a script rule once over its files, as the generated validators do:
+ * bash runs the code with $file set to each project-relative path in turn.
+ * Exit codes are ignored; everything printed is output. A script still
+ * running at the deadline is killed, and its output is dropped.
+ * @param deadline - Time (ms since epoch) to kill the script at, if any
+ * @returns What the script printed on stdout
+ */
+function runScriptRule(
+  rule: Rule,
+  filePaths: readonly string[],
+  projectRoot: string,
+  deadline: number | undefined
+): Promise<ScriptRun> {
+  const scriptSource = `for file in "$@"; do\n${rule.code ?? ''}\ndone`;
+  const scriptArgs = filePaths.map((filePath) => toProjectPath(projectRoot, filePath));
+  const timeout = deadline === undefined ? 0 : deadline - Date.now();
+  if (deadline !== undefined && timeout <= 0) {
+    return Promise.resolve({ stdout: '', cutOff: true });
+  }
+
+  return new Promise((resolve) => {
+    execFile(
+      'bash',
+      ['-c', scriptSource, 'flight-lint', ...scriptArgs],
+      { cwd: projectRoot, encoding: 'utf-8', maxBuffer: SCRIPT_OUTPUT_BYTES, timeout, killSignal: 'SIGKILL' },
+      (scriptError, stdout) => {
+        if (scriptError?.killed && scriptError.signal === 'SIGKILL') {
+          resolve({ stdout: '', cutOff: true });
+          return;
+        }
+        resolve({ stdout: typeof stdout === 'string' ? stdout : '', cutOff: false });
+      }
+    );
+  });
+}
+
+/**
+ * Turn each line a script printed into a violation. Lines starting with
+ * "path:line:" or "path:" for one of the script's files are reported there;
+ * any other line is reported at the project root.
+ */
+function parseScriptOutput(
+  rule: Rule,
+  scriptOutput: string,
+  filePaths: readonly string[],
+  projectRoot: string
+): ProjectViolation[] {
+  const scriptFiles = new Set(filePaths);
+  const projectViolations: ProjectViolation[] = [];
+
+  for (const outputLine of scriptOutput.split('\n')) {
+    if (outputLine.trim().length === 0) {
+      continue;
+    }
+    const locationMatch = /^([^:]+):(?:(\d+):)?/.exec(outputLine);
+    const reportedPath = locationMatch ? path.resolve(projectRoot, locationMatch[1]!) : null;
+    const isFileLine = reportedPath !== null && scriptFiles.has(reportedPath);
+
+    projectViolations.push({
+      rule,
+      filePath: isFileLine ? reportedPath : projectRoot,
+      line: isFileLine && locationMatch?.[2] ? Number(locationMatch[2]) : 1,
+      column: 1,
+    });
+  }
+
+  return projectViolations;
+}
+
+/**
+ * Violations of a domain's project-wide rules.
+ */
+export interface ProjectJudgement {
+  readonly projectViolations: readonly ProjectViolation[];
+  /** False if a script rule was cut off at the deadline */
+  readonly complete: boolean;
+}
+
+/**
+ * Judge the project-wide rules of a domain once all of its files have been
+ * scanned. Rules that no file was in scope for are not judged.
+ * - presence: one violation if no file matched the pattern
+ * - file_exists: one violation if none of the paths exist
+ * - script: one violation per line the script printed
+ * Violations without a file of their own are reported at the project root.
+ * @param ruleOutcomes - What the scan found per rule, in rule order
+ * @param projectRoot - Directory paths are relative to and scripts run in
+ * @param runScripts - False to skip script rules, e.g. when the scanned
+ *   content is not on disk for a script to read
+ * @param deadline - Time (ms since epoch) past which script rules are killed
+ * @returns The violations, in rule order, and whether every rule was judged
+ */
+export async function judgeProjectRules(
+  ruleOutcomes: readonly ProjectRuleOutcome[],
+  projectRoot: string,
+  runScripts: boolean,
+  deadline?: number
+): Promise<ProjectJudgement> {
+  const projectViolations: ProjectViolation[] = [];
+  let complete = true;
+  const rootViolation = (rule: Rule): ProjectViolation => ({ rule, filePath: projectRoot, line: 1, column: 1 });
+
+  for (const { rule, filePaths, found } of ruleOutcomes) {
+    if (filePaths.length === 0) {
+      continue;
+    }
+    if (rule.type === 'presence' && !found) {
+      projectViolations.push(rootViolation(rule));
+    } else if (rule.type === 'file_exists') {
+      const hasRequiredPath = (rule.paths ?? []).some((requiredPath) =>
+        existsInProject(projectRoot, requiredPath.split('/').filter((pathSegment) => pathSegment !== '' && pathSegment !== '.'))
+      );
+      if (!hasRequiredPath) {
+        projectViolations.push(rootViolation(rule));
+      }
+    } else if (rule.type === 'script' && runScripts) {
+      const scriptRun = await runScriptRule(rule, filePaths, projectRoot, deadline);
+      complete &&= !scriptRun.cutOff;
+      projectViolations.push(...parseScriptOutput(rule, scriptRun.stdout, filePaths, projectRoot));
+    }
+  }
+
+  return { projectViolations, complete };
+}
@@ -1,19 +1,132 @@
-import { Command } from 'commander';
-import type { CliOptions, OutputFormat, ParsedArgs, Severity, LintResult } from './types.js';
-import { discoverFiles, discoverRulesFiles } from './discovery.js';
-import { loadRulesFile } from './loader.js';
-import { lintFiles } from './executor.js';
-import { formatResults, getExitCode } from './reporter.js';
-
-const VERSION = '0.1.0';
-
-const VALID_FORMATS: readonly OutputFormat[] = ['pretty', 'json', 'sarif'];
+import { Command, CommanderError } from 'commander';
+import fs from 'node:fs';
+import type { Readable, Writable } from 'node:stream';
+import type {
+  CliOptions,
+  OutputFormat,
+  ParsedArgs,
+  Severity,
+  LintCounts,
+  CompactLintSummary,
+  LintTarget,
+  StreamedResult,
+  RulesFile,
+  SourceBuffer,
+} from './types.js';
+import path from 'node:path';
+import {
+  discoverRulesFiles,
+  selectRelevantRulesFiles,
+  walkProjectFiles,
+  mapFilesToDomains,
+  filterWalkablePaths,
+  createWalkCache,
+  FLIGHT_DOMAINS_DIR,
+} from './discovery.js';
+import type { WalkCache } from './discovery.js';
+import {
+  loadRulesFile,
+  loadRulesBundle,
+  createRulesBundle,
+  filterRulesBySeverity,
+  selectRulesOfSeverity,
+} from './loader.js';
+import type { RulesBundle } from './loader.js';
+import {
+  lintTargetsCompact,
+  expandLintSummary,
+  countTargets,
+  streamTargets,
+  mergeCompactSummaries,
+  mergeLintCounts,
+  findInvalidQueries,
+  createFileVisitCache,
+  createBufferSourceCache,
+} from './executor.js';
+import type { ScanOptions, FileVisitCache } from './executor.js';
+import { createSourceCache, createParseHistory, DEFAULT_SOURCE_CACHE_BYTES, DEFAULT_FILE_SIZE_LIMITS } from './parser.js';
+import type { ParseHistory } from './parser.js';
+import { createWorkerPool, closeWorkerPool, getDefaultJobCount } from './worker-pool.js';
+import type { WorkerPool } from './worker-pool.js';
+import { hasFailureResults } from './result-table.js';
+// Pretty and SARIF output come from reporter.js, loaded only when selected
+// so other runs never load chalk
+import {
+  formatJson,
+  formatNormalizedJson,
+  formatCounts,
+  getCountsExitCode,
+  createNdjsonStream,
+  createSummaryStream,
+  createRunSummaryCollector,
+  countLintSummary,
+  DEFAULT_SUMMARY_TOP,
+} from './json-reporter.js';
+import type { ResultStream } from './json-reporter.js';
+import { VERSION } from './version.js';
+
+const VALID_FORMATS: readonly OutputFormat[] = ['pretty', 'json', 'json-normalized', 'ndjson', 'sarif', 'summary'];
 const VALID_SEVERITIES: readonly Severity[] = ['NEVER', 'MUST', 'SHOULD', 'GUIDANCE'];
 
 const EXIT_SUCCESS = 0;
 const EXIT_VIOLATIONS = 1;
 const EXIT_CONFIG_ERROR = 2;
 
+/** Quiet period after a change before re-linting, so a burst of writes triggers one run */
+const WATCH_DEBOUNCE_MS = 50;
+
+/**
+ * Where a lint run writes its output.
+ */
+export interface LintIo {
+  readonly stdout: Writable;
+  readonly stderr: Writable;
+  /** Where --stdin reads its batch from; defaults to process.stdin */
+  readonly stdin?: Readable;
+  /**
+   * When the run started, in epoch milliseconds; --time-budget counts from
+   * here, so start-up, the walk and rule loading are part of the budget.
+   * Defaults to when linting begins.
+   */
+  readonly startedAt?: number;
+}
+
+/**
+ * State kept warm across lint runs by `flight-lint serve`.
+ * Each cache checks what it holds against the file system before reusing it,
+ * so a session only saves work; it never changes results.
+ */
+export interface LintSession {
+  /** Directory every run in the session lints */
+  readonly projectRoot: string;
+  /** Loaded rules files by path, refreshed when a rules file changes */
+  readonly rulesBundle: RulesBundle;
+  /** Directory listings of the project walk */
+  readonly walkCache: WalkCache;
+  /** Scan results of unchanged files */
+  readonly fileVisitCache: FileVisitCache;
+  /** Last parses of recently parsed files, for incremental re-parsing */
+  readonly parseHistory: ParseHistory;
+  /** Worker threads shared by every run; runs are serial without them */
+  workerPool?: WorkerPool;
+}
+
+/**
+ * Create a lint session for a project, with the compiled rules bundle loaded
+ * if there is one.
+ * @param projectRoot - Directory every run in the session lints
+ * @returns A session with empty caches
+ */
+export function createLintSession(projectRoot: string): LintSession {
+  return {
+    projectRoot,
+    rulesBundle: loadRulesBundle(path.join(projectRoot, FLIGHT_DOMAINS_DIR)) ?? createRulesBundle(),
+    walkCache: createWalkCache(),
+    fileVisitCache: createFileVisitCache(),
+    parseHistory: createParseHistory(),
+  };
+}
+
 /**
  * Validate that a format string is a valid OutputFormat.
  */
@@ -40,8 +153,20 @@ function createProgram(): Command {
     .description('AST-based linter for Flight domains')
     .argument('[rules-files...]', 'One or more .rules.json files')
     .option('--auto', 'Auto-discover .rules.json files in .flight/domains/')
-    .option('--format <type>', 'Output format: pretty, json, sarif', 'pretty')
-    .option('--severity <level>', 'Minimum severity: NEVER, MUST, SHOULD', 'SHOULD');
+    .option('--format <type>', 'Output format: pretty, json, json-normalized, ndjson, sarif, summary', 'pretty')
+    .option('--severity <level>', 'Minimum severity: NEVER, MUST, SHOULD', 'SHOULD')
+    .option('--count-only', 'Only count violations and print a one-line JSON summary')
+    .option('--summary-file <path>', 'Also write the run summary record to this file')
+    .option('--summary-top <n>', `Violations the run summary lists (default: ${DEFAULT_SUMMARY_TOP})`)
+    .option('--time-budget <ms>', 'Stop starting new files after this many milliseconds')
+    .option('--jobs <n>', 'Worker threads to lint with (default: available cores)')
+    .option('--max-parse-bytes <n>', 'Run only grep rules, streamed, on larger files (default: 1 MiB)')
+    .option('--max-file-bytes <n>', 'Skip larger files entirely (default: 16 MiB)')
+    .option('--watch', 'Keep running and re-lint changed files whenever the project changes')
+    .option('--stdin', 'Lint a JSON batch of {path, content} files read from stdin instead of the files on disk')
+    .option('--connect <socket>', 'Lint through the daemon on this socket, if one is running')
+    .option('--single-flight', 'Share one run, and its output, with identical invocations that overlap it')
+    .addHelpText('after', '\nRun `flight-lint serve [--socket <path>]` to keep a lint daemon warm for this project.');
 
   return commandProgram;
 }
@@ -50,11 +175,31 @@ function createProgram(): Command {
  * Parse command line arguments and return structured ParsedArgs.
  */
 export function parseArgs(argv: readonly string[]): ParsedArgs {
-  const commandProgram = createProgram();
+  return parseProgramArgs(createProgram(), argv);
+}
 
+/**
+ * Parse command line arguments with a configured program.
+ * @param commandProgram - Program from createProgram()
+ * @param argv - Arguments, starting with the node and script paths
+ */
+function parseProgramArgs(commandProgram: Command, argv: readonly string[]): ParsedArgs {
   commandProgram.parse(argv as string[]);
 
-  const parsedOptions = commandProgram.opts<{ auto?: boolean; format?: string; severity?: string }>();
+  const parsedOptions = commandProgram.opts<{
+    auto?: boolean;
+    format?: string;
+    severity?: string;
+    countOnly?: boolean;
+    summaryFile?: string;
+    summaryTop?: string;
+    timeBudget?: string;
+    jobs?: string;
+    maxParseBytes?: string;
+    maxFileBytes?: string;
+    watch?: boolean;
+    stdin?: boolean;
+  }>();
   const rulesFiles = commandProgram.args;
 
   const formatValue = parsedOptions.format ?? 'pretty';
@@ -68,10 +213,52 @@ export function parseArgs(argv: readonly string[]): ParsedArgs {
     throw new Error(`Invalid severity '${severityValue}'. Valid: ${VALID_SEVERITIES.join(', ')}`);
   }
 
+  const timeBudgetMs = parsedOptions.timeBudget === undefined ? null : Number(parsedOptions.timeBudget);
+
+  if (timeBudgetMs !== null && (!Number.isInteger(timeBudgetMs) || timeBudgetMs <= 0)) {
+    throw new Error(`Invalid time budget '${parsedOptions.timeBudget}'. Expected a positive number of milliseconds`);
+  }
+
+  const summaryTop = parsedOptions.summaryTop === undefined ? DEFAULT_SUMMARY_TOP : Number(parsedOptions.summaryTop);
+
+  if (!Number.isInteger(summaryTop) || summaryTop < 0) {
+    throw new Error(`Invalid summary top '${parsedOptions.summaryTop}'. Expected a non-negative integer`);
+  }
+
+  const jobCount = parsedOptions.jobs === undefined ? getDefaultJobCount() : Number(parsedOptions.jobs);
+
+  if (!Number.isInteger(jobCount) || jobCount <= 0) {
+    throw new Error(`Invalid jobs '${parsedOptions.jobs}'. Expected a positive integer`);
+  }
+
+  const maxParseBytes = parsedOptions.maxParseBytes === undefined
+    ? DEFAULT_FILE_SIZE_LIMITS.maxParseBytes
+    : Number(parsedOptions.maxParseBytes);
+
+  if (!Number.isInteger(maxParseBytes) || maxParseBytes <= 0) {
+    throw new Error(`Invalid max parse bytes '${parsedOptions.maxParseBytes}'. Expected a positive integer`);
+  }
+
+  const maxFileBytes = parsedOptions.maxFileBytes === undefined
+    ? DEFAULT_FILE_SIZE_LIMITS.maxFileBytes
+    : Number(parsedOptions.maxFileBytes);
+
+  if (!Number.isInteger(maxFileBytes) || maxFileBytes <= 0) {
+    throw new Error(`Invalid max file bytes '${parsedOptions.maxFileBytes}'. Expected a positive integer`);
+  }
+
   const cliOptions: CliOptions = {
     auto: Boolean(parsedOptions.auto),
     format: formatValue,
     severity: severityValue,
+    countOnly: Boolean(parsedOptions.countOnly),
+    summaryFile: parsedOptions.summaryFile ?? null,
+    summaryTop,
+    timeBudgetMs,
+    jobs: jobCount,
+    fileSizeLimits: { maxParseBytes, maxFileBytes },
+    watch: Boolean(parsedOptions.watch),
+    stdin: Boolean(parsedOptions.stdin),
   };
 
   return {
@@ -83,111 +270,557 @@ export function parseArgs(argv: readonly string[]): ParsedArgs {
 
 /**
  * Collect all rules file paths from explicit args and auto-discovery.
+ * Auto-discovered domains are narrowed to those enabled in .flight/flight.json,
+ * or to those whose file patterns match at least one project file.
  * @param parsedArgs - Parsed CLI arguments
  * @param projectRoot - Project root directory for auto-discovery
+ * @param projectFiles - Project files from walkProjectFiles()
+ * @param rulesBundle - Prevalidated rules, if flight-domain-compile wrote them
  * @returns Array of rules file paths
  */
 async function collectRulesFilePaths(
   parsedArgs: ParsedArgs,
-  projectRoot: string
+  projectRoot: string,
+  projectFiles: readonly string[],
+  rulesBundle: RulesBundle | null
 ): Promise<string[]> {
   const rulesFilePaths: string[] = [...parsedArgs.rulesFiles];
 
   if (parsedArgs.options.auto) {
     const discoveredPaths = await discoverRulesFiles(projectRoot);
-    rulesFilePaths.push(...discoveredPaths);
+    const relevantPaths = await selectRelevantRulesFiles(discoveredPaths, projectRoot, projectFiles, rulesBundle);
+    rulesFilePaths.push(...relevantPaths);
   }
 
   return rulesFilePaths;
 }
 
 /**
- * Filter results by minimum severity level.
- * @param allResults - All lint results
- * @param minimumSeverity - Minimum severity to include
- * @returns Filtered results
+ * Load each rules file and assign it the project files it applies to.
+ * All domains share one walk of the project; domains with no qualifying
+ * rules or no matching files are dropped.
+ * Invalid AST queries are reported to stderr once; those rules are skipped.
+ * @param rulesFilePaths - Paths of the rules files to load
+ * @param minimumSeverity - Minimum severity to keep
+ * @param projectRoot - Project root directory for discovery
+ * @param projectFiles - Project files from walkProjectFiles()
+ * @param rulesBundle - Prevalidated rules; unchanged files are not re-read
+ * @param stderr - Stream for query warnings
+ * @returns Domains ready to lint, in rules file order
  */
-function filterResultsBySeverity(
-  allResults: readonly LintResult[],
-  minimumSeverity: Severity
-): LintResult[] {
-  const severityOrder: Record<Severity, number> = {
-    NEVER: 0,
-    MUST: 1,
-    SHOULD: 2,
-    GUIDANCE: 3,
-  };
+async function prepareDomains(
+  rulesFilePaths: readonly string[],
+  minimumSeverity: Severity,
+  projectRoot: string,
+  projectFiles: readonly string[],
+  rulesBundle: RulesBundle | null,
+  stderr: Writable
+): Promise<LintTarget[]> {
+  const loadedRulesFiles: RulesFile[] = [];
+
+  for (const rulesFilePath of rulesFilePaths) {
+    // Drop rules below the minimum severity before they are executed
+    const rulesFile = filterRulesBySeverity(await loadRulesFile(rulesFilePath, rulesBundle), minimumSeverity);
+
+    // Nothing left to run - leave this domain out of discovery entirely
+    if (rulesFile.rules.length === 0) {
+      continue;
+    }
 
-  const minimumLevel = severityOrder[minimumSeverity];
+    // Compile AST queries once; broken ones are reported here, not per file
+    for (const invalidQueryMessage of await findInvalidQueries(rulesFile)) {
+      stderr.write(`Warning: ${invalidQueryMessage}\n`);
+    }
 
-  return allResults.filter(
-    (lintResult) => severityOrder[lintResult.severity] <= minimumLevel
+    loadedRulesFiles.push(rulesFile);
+  }
+
+  // Match every domain's patterns against the single project walk
+  const domainsByFile = mapFilesToDomains(
+    projectFiles,
+    loadedRulesFiles.map((rulesFile) => ({
+      patterns: rulesFile.filePatterns,
+      excludePatterns: rulesFile.excludePatterns,
+    })),
+    projectRoot
   );
+  const domainSourceFiles: string[][] = loadedRulesFiles.map(() => []);
+  for (const [filePath, domainIndexes] of domainsByFile) {
+    for (const domainIndex of domainIndexes) {
+      domainSourceFiles[domainIndex]!.push(filePath);
+    }
+  }
+
+  return loadedRulesFiles
+    .map((rulesFile, domainIndex) => ({ rulesFile, sourceFiles: domainSourceFiles[domainIndex]! }))
+    .filter((preparedDomain) => preparedDomain.sourceFiles.length > 0);
+}
+
+/**
+ * Run one scan pass per severity across all domains, most severe first,
+ * stopping new files once the time budget is spent.
+ * Files are visited most recently modified first within each pass, and all
+ * passes share one source cache so later passes reuse earlier parses.
+ * @param preparedDomains - Domains to scan
+ * @param deadline - Epoch milliseconds after which no new file is started
+ * @param runOptions - Scan options for the whole run (e.g. the worker pool)
+ * @param scanPass - Scans a set of targets with the shared options
+ * @returns Pass outcomes grouped per domain, in domain order
+ */
+async function runBudgetedPasses<T>(
+  preparedDomains: readonly LintTarget[],
+  deadline: number,
+  runOptions: ScanOptions,
+  scanPass: (targets: readonly LintTarget[], scanOptions: ScanOptions) => Promise<T[]>
+): Promise<T[][]> {
+  const scanOptions: ScanOptions = {
+    ...runOptions,
+    deadline,
+    sourceCache: runOptions.sourceCache ?? createSourceCache(DEFAULT_SOURCE_CACHE_BYTES, runOptions.parseHistory ?? null),
+  };
+  const domainPasses: T[][] = preparedDomains.map(() => []);
+
+  for (const severity of VALID_SEVERITIES) {
+    const passDomainIndexes: number[] = [];
+    const passTargets: LintTarget[] = [];
+
+    for (const [domainIndex, preparedDomain] of preparedDomains.entries()) {
+      const severityRulesFile = selectRulesOfSeverity(preparedDomain.rulesFile, severity);
+      if (severityRulesFile.rules.length > 0) {
+        passDomainIndexes.push(domainIndex);
+        passTargets.push({ ...preparedDomain, rulesFile: severityRulesFile });
+      }
+    }
+
+    if (passTargets.length === 0) {
+      continue;
+    }
+
+    const passOutcomes = await scanPass(passTargets, scanOptions);
+    for (const [passIndex, domainIndex] of passDomainIndexes.entries()) {
+      domainPasses[domainIndex]!.push(passOutcomes[passIndex]!);
+    }
+  }
+
+  return domainPasses;
+}
+
+/**
+ * Parse the batch read by --stdin: an array of {path, content} objects, or
+ * an object holding one under "files".
+ * @param batchText - JSON text of the batch
+ * @returns The buffers, in batch order
+ * @throws Error if the text is not such a batch
+ */
+export function parseSourceBuffers(batchText: string): SourceBuffer[] {
+  let parsedBatch: unknown;
+  try {
+    parsedBatch = JSON.parse(batchText);
+  } catch (error) {
+    const errorMessage = error instanceof Error ? error.message : String(error);
+    throw new Error(`Invalid --stdin batch: ${errorMessage}`);
+  }
+
+  const batchFiles: unknown = Array.isArray(parsedBatch) || typeof parsedBatch !== 'object' || parsedBatch === null
+    ? parsedBatch
+    : (parsedBatch as Record<string, unknown>).files;
+  if (!Array.isArray(batchFiles)) {
+    throw new Error('Invalid --stdin batch: expected an array of {path, content} objects or {"files": [...]}');
+  }
+
+  return batchFiles.map((batchFile: unknown, fileIndex) => {
+    const batchEntry = typeof batchFile === 'object' && batchFile !== null
+      ? batchFile as Record<string, unknown>
+      : null;
+    const filePath = batchEntry?.path;
+    const content = batchEntry?.content;
+    if (typeof filePath !== 'string' || filePath === '' || typeof content !== 'string') {
+      throw new Error(`Invalid --stdin batch: file ${fileIndex} needs a string "path" and "content"`);
+    }
+    return { path: filePath, content };
+  });
+}
+
+/**
+ * Read a stream to the end as UTF-8 text.
+ */
+async function readStreamText(inputStream: Readable): Promise<string> {
+  const chunks: Buffer[] = [];
+  for await (const chunk of inputStream) {
+    chunks.push(typeof chunk === 'string' ? Buffer.from(chunk) : chunk);
+  }
+  return Buffer.concat(chunks).toString('utf-8');
 }
 
 /**
  * Main linting orchestration function.
  * Discovers rules, loads them, lints files, and outputs results.
  * @param parsedArgs - Parsed CLI arguments
+ * @param lintIo - Streams to write output to
+ * @param lintSession - Warm state to reuse, when run by the daemon
  * @returns Exit code (0 = success, 1 = violations, 2 = config error)
  */
-async function runLinting(parsedArgs: ParsedArgs): Promise<number> {
-  const projectRoot = process.cwd();
+async function runLinting(parsedArgs: ParsedArgs, lintIo: LintIo, lintSession?: LintSession): Promise<number> {
+  const projectRoot = lintSession?.projectRoot ?? process.cwd();
+  const { countOnly, summaryFile, timeBudgetMs } = parsedArgs.options;
+  const { stdout, stderr } = lintIo;
+  const deadline = timeBudgetMs === null ? null : (lintIo.startedAt ?? Date.now()) + timeBudgetMs;
+  const summaryPath = summaryFile === null ? null : path.resolve(projectRoot, summaryFile);
+
+  // A --stdin batch stands in for the project: its paths select the domains
+  // and its contents are linted in place of the files on disk
+  const bufferSourceCache = parsedArgs.options.stdin
+    ? createBufferSourceCache(
+      parseSourceBuffers(await readStreamText(lintIo.stdin ?? process.stdin)),
+      projectRoot,
+      parsedArgs.options.fileSizeLimits
+    )
+    : null;
+
+  // One walk of the project serves domain selection and file discovery
+  const projectFiles = bufferSourceCache
+    ? filterWalkablePaths(
+      [...bufferSourceCache.entries.keys()].map((filePath) => path.relative(projectRoot, filePath).split(path.sep).join('/')),
+      projectRoot
+    )
+    : await walkProjectFiles(projectRoot, lintSession?.walkCache);
+
+  // One read of the compiled bundle replaces loading each rules file
+  const rulesBundle = lintSession?.rulesBundle ?? loadRulesBundle(path.join(projectRoot, FLIGHT_DOMAINS_DIR));
 
   // Collect all rules file paths
-  const rulesFilePaths = await collectRulesFilePaths(parsedArgs, projectRoot);
+  const rulesFilePaths = await collectRulesFilePaths(parsedArgs, projectRoot, projectFiles, rulesBundle);
 
   // Handle no rules files found
   if (rulesFilePaths.length === 0) {
+    const emptySummary = createRunSummaryCollector(0).formatSummary([]);
+    if (summaryPath !== null) {
+      await writeSummaryFile(summaryPath, emptySummary);
+    }
+    if (parsedArgs.options.format === 'summary' && !countOnly) {
+      stdout.write(emptySummary + '\n');
+      return EXIT_SUCCESS;
+    }
+    if (countOnly) {
+      stdout.write(formatCounts([]) + '\n');
+      return EXIT_SUCCESS;
+    }
     if (parsedArgs.options.auto) {
-      process.stdout.write('No .rules.json files found in .flight/domains/\n');
+      stdout.write('No .rules.json files found in .flight/domains/\n');
       return EXIT_SUCCESS;
     }
     // No rules files and not auto mode - show help (handled in runCli)
     return EXIT_SUCCESS;
   }
 
-  const allResults: LintResult[] = [];
+  const preparedDomains = await prepareDomains(
+    rulesFilePaths,
+    parsedArgs.options.severity,
+    projectRoot,
+    projectFiles,
+    rulesBundle,
+    stderr
+  );
+
+  // Buffers are linted in-process from the cache; workers, the visit cache
+  // and script rules would read the files on disk instead
+  if (bufferSourceCache) {
+    return reportPreparedDomains(
+      preparedDomains,
+      parsedArgs.options,
+      { fileSizeLimits: parsedArgs.options.fileSizeLimits, sourceCache: bufferSourceCache, projectRoot, runScriptRules: false },
+      deadline,
+      stdout,
+      summaryPath
+    );
+  }
+
+  const runOptions: ScanOptions = {
+    fileSizeLimits: parsedArgs.options.fileSizeLimits,
+    projectRoot,
+    ...(lintSession === undefined
+      ? {}
+      : { fileVisitCache: lintSession.fileVisitCache, parseHistory: lintSession.parseHistory }),
+  };
 
-  // Process each rules file
-  for (const rulesFilePath of rulesFilePaths) {
-    const rulesFile = await loadRulesFile(rulesFilePath);
+  // A daemon keeps its workers between runs
+  if (lintSession) {
+    return reportPreparedDomains(preparedDomains, parsedArgs.options, { ...runOptions, workerPool: lintSession.workerPool }, deadline, stdout, summaryPath);
+  }
 
-    // Discover source files matching the domain's patterns
-    const sourceFiles = await discoverFiles({
-      patterns: rulesFile.filePatterns as string[],
-      excludePatterns: rulesFile.excludePatterns as string[] | undefined,
-      basePath: projectRoot,
-    });
+  // Worker threads start only if a scan is large enough to use them
+  const workerPool = parsedArgs.options.jobs > 1
+    ? createWorkerPool(parsedArgs.options.jobs, DEFAULT_SOURCE_CACHE_BYTES)
+    : undefined;
 
-    if (sourceFiles.length === 0) {
-      continue;
+  try {
+    return await reportPreparedDomains(preparedDomains, parsedArgs.options, { ...runOptions, workerPool }, deadline, stdout, summaryPath);
+  } finally {
+    if (workerPool) {
+      await closeWorkerPool(workerPool);
+    }
+  }
+}
+
+/**
+ * Write a run summary record to the --summary-file path.
+ */
+async function writeSummaryFile(summaryPath: string, summaryText: string): Promise<void> {
+  await fs.promises.mkdir(path.dirname(summaryPath), { recursive: true });
+  await fs.promises.writeFile(summaryPath, summaryText + '\n');
+}
+
+/**
+ * Lint prepared domains and write their output.
+ * @param preparedDomains - Domains ready to lint
+ * @param cliOptions - Parsed CLI options
+ * @param runOptions - Scan options for the whole run
+ * @param deadline - Epoch milliseconds from --time-budget, or null
+ * @param stdout - Stream to write results to
+ * @param summaryPath - Absolute --summary-file path, or null
+ * @returns Exit code (0 = success, 1 = violations)
+ */
+async function reportPreparedDomains(
+  preparedDomains: readonly LintTarget[],
+  cliOptions: CliOptions,
+  runOptions: ScanOptions,
+  deadline: number | null,
+  stdout: Writable,
+  summaryPath: string | null
+): Promise<number> {
+  const { countOnly } = cliOptions;
+  const summaryCollector = summaryPath === null ? null : createRunSummaryCollector(cliOptions.summaryTop);
+  const allCounts: LintCounts[] = [];
+  let exitCode: number;
+
+  if (countOnly) {
+    // Count-only: keep counters, skip result objects and formatting
+    if (deadline === null) {
+      allCounts.push(...await countTargets(preparedDomains, runOptions));
+    } else {
+      const domainPasses = await runBudgetedPasses(preparedDomains, deadline, runOptions, countTargets);
+      allCounts.push(...domainPasses.map(mergeLintCounts));
+    }
+
+    stdout.write(formatCounts(allCounts) + '\n');
+    exitCode = getCountsExitCode(allCounts) === 0 ? EXIT_SUCCESS : EXIT_VIOLATIONS;
+  } else if (cliOptions.format === 'ndjson' || cliOptions.format === 'sarif' || cliOptions.format === 'summary') {
+    // Streaming formats: results are written as files finish, never collected
+    const resultStream = await createResultStream(cliOptions, stdout);
+    const writeResults = summaryCollector === null
+      ? resultStream.writeResults
+      : (streamedResults: readonly StreamedResult[]): Promise<void> => {
+        summaryCollector.addResults(streamedResults);
+        return resultStream.writeResults(streamedResults);
+      };
+
+    if (deadline === null) {
+      allCounts.push(...await streamTargets(preparedDomains, writeResults, runOptions));
+    } else {
+      const domainPasses = await runBudgetedPasses(preparedDomains, deadline, runOptions, (passTargets, scanOptions) =>
+        streamTargets(passTargets, writeResults, scanOptions)
+      );
+      allCounts.push(...domainPasses.map(mergeLintCounts));
     }
 
-    // Lint the files
-    const lintSummary = await lintFiles(sourceFiles, rulesFile);
+    await resultStream.end(allCounts);
+    exitCode = getCountsExitCode(allCounts) === 0 ? EXIT_SUCCESS : EXIT_VIOLATIONS;
+  } else {
+    exitCode = EXIT_SUCCESS;
+    const formatExpandedSummary = cliOptions.format === 'pretty'
+      ? (await import('./reporter.js')).formatPretty
+      : formatJson;
+    const writeSummary = (compactSummary: CompactLintSummary): void => {
+      // Output results for this domain, expanding them only if the format needs it
+      const lintSummary = cliOptions.format === 'json-normalized' && summaryCollector === null
+        ? null
+        : expandLintSummary(compactSummary);
+      const formattedSummary = cliOptions.format === 'json-normalized' || lintSummary === null
+        ? formatNormalizedJson(compactSummary)
+        : formatExpandedSummary(lintSummary);
+      stdout.write(formattedSummary + '\n');
+      if (summaryCollector !== null && lintSummary !== null) {
+        summaryCollector.addResults(lintSummary.results.map((lintResult) => ({ domain: lintSummary.domain, ...lintResult })));
+        allCounts.push(countLintSummary(lintSummary));
+      }
+      // Results only contain rules at or above the minimum severity
+      if (hasFailureResults(compactSummary.results)) {
+        exitCode = EXIT_VIOLATIONS;
+      }
+    };
+
+    if (deadline === null) {
+      // Every domain runs against one read and one parse per file
+      for (const compactSummary of await lintTargetsCompact(preparedDomains, runOptions)) {
+        writeSummary(compactSummary);
+      }
+    } else {
+      const domainPasses = await runBudgetedPasses(preparedDomains, deadline, runOptions, lintTargetsCompact);
+      for (const passSummaries of domainPasses) {
+        writeSummary(mergeCompactSummaries(passSummaries));
+      }
+    }
+  }
+
+  if (summaryPath !== null && summaryCollector !== null) {
+    await writeSummaryFile(summaryPath, summaryCollector.formatSummary(allCounts));
+  }
+  return exitCode;
+}
+
+/**
+ * Create the result stream of a streaming output format.
+ */
+async function createResultStream(cliOptions: CliOptions, stdout: Writable): Promise<ResultStream> {
+  switch (cliOptions.format) {
+    case 'sarif':
+      return (await import('./reporter.js')).createSarifStream(stdout);
+    case 'summary':
+      return createSummaryStream(stdout, cliOptions.summaryTop);
+    default:
+      return createNdjsonStream(stdout);
+  }
+}
+
+/**
+ * List the directories watch mode listens on: every directory the project
+ * walk descended into, and the directories holding the rules files.
+ */
+function collectWatchedDirectories(parsedArgs: ParsedArgs, lintSession: LintSession): Set<string> {
+  const watchedDirectories = new Set(lintSession.walkCache.listings.keys());
+  watchedDirectories.add(path.join(lintSession.projectRoot, FLIGHT_DOMAINS_DIR));
+  for (const rulesFilePath of parsedArgs.rulesFiles) {
+    watchedDirectories.add(path.dirname(path.resolve(lintSession.projectRoot, rulesFilePath)));
+  }
+  return watchedDirectories;
+}
+
+/**
+ * Lint once, then again after every change to the project, until aborted.
+ * Each run reports the whole project, but only changed files are re-read:
+ * unchanged files come from the session's visit cache and changed ones are
+ * re-parsed incrementally from their previous tree. Directories are watched
+ * one by one, so pruned ones such as node_modules cost no watches.
+ * @param parsedArgs - Parsed CLI arguments
+ * @param lintIo - Streams to write output to
+ * @param lintSession - Warm state shared by every run
+ * @param abortSignal - Stops watching once aborted
+ * @returns Exit code of the last run
+ */
+export async function watchLinting(
+  parsedArgs: ParsedArgs,
+  lintIo: LintIo,
+  lintSession: LintSession,
+  abortSignal: AbortSignal
+): Promise<number> {
+  const watchers = new Map<string, fs.FSWatcher>();
+  let lastExitCode = EXIT_SUCCESS;
+  let pendingTimer: ReturnType<typeof setTimeout> | null = null;
+  let runQueue: Promise<void> = Promise.resolve();
+
+  const syncWatchers = (): void => {
+    const watchedDirectories = collectWatchedDirectories(parsedArgs, lintSession);
+    for (const [directory, watcher] of watchers) {
+      if (!watchedDirectories.has(directory)) {
+        watcher.close();
+        watchers.delete(directory);
+      }
+    }
+    for (const directory of watchedDirectories) {
+      if (watchers.has(directory)) {
+        continue;
+      }
+      try {
+        const watcher = fs.watch(directory, scheduleRun);
+        watcher.on('error', () => {
+          watcher.close();
+          watchers.delete(directory);
+        });
+        watchers.set(directory, watcher);
+      } catch {
+        // Removed since it was walked; the next run re-syncs
+      }
+    }
+  };
 
-    // Output results for this domain
-    const formattedOutput = formatResults(lintSummary, parsedArgs.options.format);
-    process.stdout.write(formattedOutput + '\n');
+  const lintOnce = async (): Promise<void> => {
+    try {
+      lastExitCode = await runLinting(parsedArgs, lintIo, lintSession);
+    } catch (error) {
+      const errorMessage = error instanceof Error ? error.message : String(error);
+      lintIo.stderr.write(`Error: ${errorMessage}\n`);
+      lastExitCode = EXIT_CONFIG_ERROR;
+    }
+    if (!abortSignal.aborted) {
+      syncWatchers();
+    }
+  };
 
-    allResults.push(...lintSummary.results);
+  function scheduleRun(): void {
+    if (pendingTimer) {
+      clearTimeout(pendingTimer);
+    }
+    pendingTimer = setTimeout(() => {
+      pendingTimer = null;
+      runQueue = runQueue.then(() => {
+        lintIo.stderr.write('Change detected; re-linting\n');
+        return lintOnce();
+      });
+    }, WATCH_DEBOUNCE_MS);
   }
 
-  // Filter results by minimum severity
-  const filteredResults = filterResultsBySeverity(allResults, parsedArgs.options.severity);
+  await lintOnce();
+  lintIo.stderr.write(`Watching ${watchers.size} directories for changes\n`);
+
+  await new Promise<void>((resolve) => {
+    if (abortSignal.aborted) {
+      resolve();
+    } else {
+      abortSignal.addEventListener('abort', () => resolve(), { once: true });
+    }
+  });
+
+  if (pendingTimer) {
+    clearTimeout(pendingTimer);
+  }
+  for (const watcher of watchers.values()) {
+    watcher.close();
+  }
+  await runQueue;
+  return lastExitCode;
+}
 
-  // Determine exit code based on filtered results
-  const exitCode = getExitCode(filteredResults);
+/**
+ * Run watch mode for the CLI until interrupted.
+ * @param parsedArgs - Parsed CLI arguments
+ * @returns Exit code of the last run
+ */
+async function runWatch(parsedArgs: ParsedArgs): Promise<number> {
+  const lintSession = createLintSession(process.cwd());
+  const abortController = new AbortController();
+  process.once('SIGINT', () => abortController.abort());
+  process.once('SIGTERM', () => abortController.abort());
+
+  // The first run lints everything, so it is worth spreading across workers
+  if (parsedArgs.options.jobs > 1) {
+    lintSession.workerPool = createWorkerPool(parsedArgs.options.jobs, DEFAULT_SOURCE_CACHE_BYTES);
+  }
 
-  return exitCode === 0 ? EXIT_SUCCESS : EXIT_VIOLATIONS;
+  try {
+    return await watchLinting(parsedArgs, { stdout: process.stdout, stderr: process.stderr }, lintSession, abortController.signal);
+  } finally {
+    if (lintSession.workerPool) {
+      await closeWorkerPool(lintSession.workerPool);
+    }
+  }
 }
 
 /**
  * Run the CLI application.
  * Entry point called from bin/flight-lint.
+ * @param stdin - Where --stdin reads its batch from, if not process.stdin
  */
-export function runCli(): void {
+export function runCli(stdin?: Readable): void {
   const parsedArgs = parseArgs(process.argv);
 
   // Show help if no rules files and not auto mode
@@ -198,13 +831,78 @@ export function runCli(): void {
   }
 
   // Run linting asynchronously
-  runLinting(parsedArgs)
+  // Set exitCode rather than calling process.exit() so that piped stdout is
+  // fully flushed; large reports were cut off when read through a pipe
+  if (parsedArgs.options.watch && parsedArgs.options.stdin) {
+    process.stderr.write('Error: --watch and --stdin cannot be combined\n');
+    process.exitCode = EXIT_CONFIG_ERROR;
+    return;
+  }
+
+  const lintRun = parsedArgs.options.watch
+    ? runWatch(parsedArgs)
+    : runLinting(parsedArgs, {
+      stdout: process.stdout,
+      stderr: process.stderr,
+      startedAt: performance.timeOrigin,
+      ...(stdin === undefined ? {} : { stdin }),
+    });
+  lintRun
     .then((exitCode) => {
-      process.exit(exitCode);
+      process.exitCode = exitCode;
     })
     .catch((error) => {
       const errorMessage = error instanceof Error ? error.message : String(error);
       process.stderr.write(`Error: ${errorMessage}\n`);
-      process.exit(EXIT_CONFIG_ERROR);
+      process.exitCode = EXIT_CONFIG_ERROR;
+    });
+}
+
+/**
+ * Run one lint request inside a long-lived process.
+ * Behaves like a one-shot run of the same arguments, but writes to the given
+ * streams, reuses the session's warm state (if any) and never exits the process.
+ * @param args - Command line arguments, without the node and script paths
+ * @param lintIo - Streams to write output to
+ * @param lintSession - Warm state shared by every request; omit for a cold run
+ * @returns Exit code the one-shot CLI would have exited with
+ */
+export async function runLintRequest(
+  args: readonly string[],
+  lintIo: LintIo,
+  lintSession?: LintSession
+): Promise<number> {
+  const commandProgram = createProgram()
+    .exitOverride()
+    .configureOutput({
+      writeOut: (text) => lintIo.stdout.write(text),
+      writeErr: (text) => lintIo.stderr.write(text),
     });
+
+  try {
+    const parsedArgs = parseProgramArgs(commandProgram, ['node', 'flight-lint', ...args]);
+
+    if (parsedArgs.rulesFiles.length === 0 && !parsedArgs.options.auto) {
+      commandProgram.outputHelp();
+      return EXIT_SUCCESS;
+    }
+
+    if (parsedArgs.options.watch) {
+      throw new Error('--watch runs in the foreground and cannot be sent to a daemon or shared');
+    }
+
+    if (parsedArgs.options.stdin && lintIo.stdin === undefined) {
+      throw new Error('--stdin needs the batch to be sent with the request');
+    }
+
+    return await runLinting(parsedArgs, lintIo, lintSession);
+  } catch (error) {
+    // Help, version and usage errors have already been written by commander
+    if (error instanceof CommanderError) {
+      return error.exitCode;
+    }
+    const errorMessage = error instanceof Error ? error.message : String(error);
+    lintIo.stderr.write(`Error: ${errorMessage}\n`);
+    return EXIT_CONFIG_ERROR;
+  }
 }
@@ -0,0 +1,143 @@
+import net from 'node:net';
+import { Readable } from 'node:stream';
+import type { Writable } from 'node:stream';
+
+const EXIT_CONFIG_ERROR = 2;
+
+/**
+ * Parse one response line; anything but an object yields no fields.
+ */
+function parseResponseFrame(frameLine: string): Record<string, unknown> {
+  const parsedFrame: unknown = JSON.parse(frameLine);
+  if (typeof parsedFrame !== 'object' || parsedFrame === null) {
+    return {};
+  }
+  return parsedFrame as Record<string, unknown>;
+}
+
+/**
+ * Run flight-lint through a daemon started with `flight-lint serve`.
+ * Output is copied to the given streams as the daemon produces it.
+ * @param socketPath - Socket the daemon listens on
+ * @param cwd - Directory to lint; the daemon refuses other projects
+ * @param args - flight-lint arguments, without the node and script paths
+ * @param stdout - Stream for lint output
+ * @param stderr - Stream for warnings and errors
+ * @param stdinText - Batch for `--stdin`, sent along with the request
+ * @returns The run's exit code, or null if no daemon served the request and
+ *   nothing was written, so the caller should run one-shot instead
+ */
+export function requestDaemonRun(
+  socketPath: string,
+  cwd: string,
+  args: readonly string[],
+  stdout: Writable,
+  stderr: Writable,
+  stdinText?: string
+): Promise<number | null> {
+  return new Promise((resolve) => {
+    const socket = net.createConnection(socketPath);
+    let pendingText = '';
+    let exitCode: number | null = null;
+    let wroteOutput = false;
+
+    socket.setEncoding('utf-8');
+    socket.once('connect', () => {
+      // The daemon counts --time-budget from this process's start
+      const request = {
+        cwd,
+        args,
+        startedAt: performance.timeOrigin,
+        ...(stdinText === undefined ? {} : { stdin: stdinText }),
+      };
+      socket.write(JSON.stringify(request) + '\n');
+    });
+
+    socket.on('data', (chunk: string) => {
+      pendingText += chunk;
+      let newlineIndex = pendingText.indexOf('\n');
+      while (newlineIndex !== -1) {
+        let frame: Record<string, unknown>;
+        try {
+          frame = parseResponseFrame(pendingText.slice(0, newlineIndex));
+        } catch {
+          // A garbled frame ends the exchange like a connection error
+          socket.destroy(new Error('Malformed daemon response'));
+          return;
+        }
+        pendingText = pendingText.slice(newlineIndex + 1);
+        if (typeof frame.stdout === 'string') {
+          stdout.write(frame.stdout);
+          wroteOutput = true;
+        } else if (typeof frame.stderr === 'string') {
+          stderr.write(frame.stderr);
+          wroteOutput = true;
+        } else if (typeof frame.exitCode === 'number') {
+          exitCode = frame.exitCode;
+        }
+        newlineIndex = pendingText.indexOf('\n');
+      }
+    });
+
+    // No daemon, a stale socket, or a refused request: run one-shot instead.
+    // A daemon that dies mid-run has already written output, so report it.
+    socket.once('error', () => {
+      resolve(wroteOutput ? exitCode ?? EXIT_CONFIG_ERROR : null);
+    });
+    socket.once('end', () => {
+      resolve(exitCode ?? (wroteOutput ? EXIT_CONFIG_ERROR : null));
+    });
+  });
+}
+
+/**
+ * Remove `--connect <socket>` from the arguments.
+ * @returns The socket path and the remaining arguments
+ */
+export function takeConnectOption(args: readonly string[]): { socketPath: string | null; lintArgs: string[] } {
+  const connectIndex = args.indexOf('--connect');
+  if (connectIndex === -1 || connectIndex + 1 >= args.length) {
+    return { socketPath: null, lintArgs: [...args] };
+  }
+  return {
+    socketPath: args[connectIndex + 1]!,
+    lintArgs: [...args.slice(0, connectIndex), ...args.slice(connectIndex + 2)],
+  };
+}
+
+/**
+ * Read all of this process's stdin as UTF-8 text.
+ */
+export async function readProcessStdin(): Promise<string> {
+  const chunks: Buffer[] = [];
+  for await (const chunk of process.stdin) {
+    chunks.push(typeof chunk === 'string' ? Buffer.from(chunk) : chunk);
+  }
+  return Buffer.concat(chunks).toString('utf-8');
+}
+
+/**
+ * Run the CLI through a daemon, falling back to a one-shot run.
+ * Entry point called from bin/flight-lint for `--connect`; the one-shot
+ * modules are only loaded if the daemon does not answer.
+ */
+export async function runClient(): Promise<void> {
+  const { socketPath, lintArgs } = takeConnectOption(process.argv.slice(2));
+
+  // stdin can only be read once, so a --stdin batch is read here and sent
+  // along; the one-shot fallback then reads it from the same text
+  const stdinText = lintArgs.includes('--stdin') ? await readProcessStdin() : undefined;
+
+  const exitCode = socketPath === null
+    ? null
+    : await requestDaemonRun(socketPath, process.cwd(), lintArgs, process.stdout, process.stderr, stdinText);
+
+  if (exitCode !== null) {
+    process.exitCode = exitCode;
+    return;
+  }
+
+  const cliModule = await import('./cli.js');
+  process.argv = [...process.argv.slice(0, 2), ...lintArgs];
+  cliModule.runCli(stdinText === undefined ? undefined : Readable.from([stdinText]));
+}
@@ -1,7 +1,8 @@
-import fg from 'fast-glob';
 import fs from 'node:fs';
 import path from 'node:path';
-import type { DiscoveryOptions } from './types.js';
+import { JSON_KEYS, findBundledRulesFile } from './loader.js';
+import type { RulesBundle } from './loader.js';
+import type { DiscoveryOptions, DomainPatterns } from './types.js';
 
 // Keep in sync with .flight/exclusions.sh FLIGHT_EXCLUDE_DIRS
 const DEFAULT_EXCLUDES = [
@@ -127,9 +128,13 @@ const DEFAULT_FILE_EXCLUDES = [
   '**/composer.lock',
 ];
 
-const RULES_FILE_PATTERN = '**/*.rules.json';
-const FLIGHT_DOMAINS_DIR = '.flight/domains';
+export const FLIGHT_DOMAINS_DIR = '.flight/domains';
 const FLIGHTIGNORE_FILE = '.flightignore';
+const FLIGHT_CONFIG_FILE = '.flight/flight.json';
+const RULES_FILE_SUFFIX = '.rules.json';
+const ANY_DEPTH_PREFIX = '**/';
+const DIRECTORY_CONTENTS_SUFFIX = '/**';
+const GLOB_SYNTAX_PATTERN = /[*?{}[\]]/;
 
 // Keep in sync with .flight/exclusions.sh FLIGHT_TEST_FILE_PATTERNS
 const TEST_FILE_PATTERNS = [
@@ -263,32 +268,325 @@ function loadFlightignore(basePath: string): string[] {
 }
 
 /**
- * Discover files matching glob patterns.
- * @param options - Discovery options with patterns, excludes, and base path
- * @returns Sorted array of absolute file paths
+ * Exclusion globs compiled once per walk.
+ * Plain directory names are pruned before descent with a set lookup; other
+ * directory patterns are tested once per directory, file patterns once per file.
  */
-export async function discoverFiles(options: DiscoveryOptions): Promise<string[]> {
-  const { patterns, excludePatterns, basePath } = options;
+interface CompiledExclusions {
+  readonly directoryNames: ReadonlySet<string>;
+  readonly directoryMatcher: RegExp | null;
+  readonly fileMatcher: RegExp | null;
+}
+
+/**
+ * Join regex sources into one anchored alternation.
+ * @returns The combined matcher, or null when there are no sources
+ */
+function compileAlternation(regexSources: readonly string[]): RegExp | null {
+  return regexSources.length === 0 ? null : new RegExp(`^(?:${regexSources.join('|')})$`);
+}
 
-  // Load project-specific exclusions from .flightignore
-  const flightignorePatterns = loadFlightignore(basePath);
+/**
+ * Split exclusion globs into prunable directory names, directory patterns and
+ * file patterns. "**\/name/**" becomes a name, "dir/**" a directory pattern.
+ * Every other pattern is a file pattern and is also tested on directories, so
+ * "**\/build" prunes build/ the way a fast-glob ignore of it did.
+ */
+function compileExclusions(excludePatterns: readonly string[]): CompiledExclusions {
+  const directoryNames = new Set<string>();
+  const directorySources: string[] = [];
+  const fileSources: string[] = [];
+
+  for (const excludePattern of excludePatterns) {
+    const isContentsPattern = excludePattern.endsWith(DIRECTORY_CONTENTS_SUFFIX);
+    if (!isContentsPattern) {
+      fileSources.push(convertGlobToRegexSource(excludePattern));
+    }
 
-  const combinedExcludes = [
+    const directoryPattern = isContentsPattern
+      ? excludePattern.slice(0, -DIRECTORY_CONTENTS_SUFFIX.length)
+      : excludePattern;
+    const directoryName = directoryPattern.startsWith(ANY_DEPTH_PREFIX)
+      ? directoryPattern.slice(ANY_DEPTH_PREFIX.length)
+      : null;
+
+    if (directoryName && !directoryName.includes('/') && !GLOB_SYNTAX_PATTERN.test(directoryName)) {
+      directoryNames.add(directoryName);
+    } else {
+      directorySources.push(convertGlobToRegexSource(directoryPattern));
+    }
+  }
+
+  return {
+    directoryNames,
+    directoryMatcher: compileAlternation(directorySources),
+    fileMatcher: compileAlternation(fileSources),
+  };
+}
+
+/**
+ * Compile the default, file and .flightignore exclusions of a project walk.
+ */
+function loadWalkExclusions(basePath: string): CompiledExclusions {
+  return compileExclusions([
     ...DEFAULT_EXCLUDES,
     ...DEFAULT_FILE_EXCLUDES,
-    ...flightignorePatterns,
-    ...(excludePatterns ?? []),
-  ];
+    ...loadFlightignore(basePath),
+  ]);
+}
+
+/**
+ * Check whether the walk prunes a directory.
+ * @param exclusions - Compiled walk exclusions
+ * @param directoryName - Last segment of the directory path
+ * @param relativePath - Directory path relative to the project root
+ */
+function isExcludedDirectory(exclusions: CompiledExclusions, directoryName: string, relativePath: string): boolean {
+  return exclusions.directoryNames.has(directoryName)
+    || (exclusions.directoryMatcher?.test(relativePath) ?? false);
+}
+
+/**
+ * Resolve what a symbolic link points at, refusing links that loop back
+ * into one of their own ancestors.
+ * @returns The target's stats, or null for broken or cyclic links
+ */
+function statLinkTarget(linkPath: string, parentPath: string): fs.Stats | null {
+  try {
+    const targetStats = fs.statSync(linkPath);
+    if (targetStats.isDirectory()) {
+      const targetRealPath = fs.realpathSync(linkPath);
+      const parentRealPath = fs.realpathSync(parentPath);
+      if (parentRealPath === targetRealPath || parentRealPath.startsWith(targetRealPath + path.sep)) {
+        return null;
+      }
+    }
+    return targetStats;
+  } catch {
+    return null;
+  }
+}
+
+/**
+ * One entry of a directory listing, with symbolic links already resolved.
+ */
+interface WalkEntry {
+  readonly name: string;
+  readonly isDirectory: boolean;
+  readonly isFile: boolean;
+}
+
+/**
+ * A directory listing and the directory modification time it was read at.
+ */
+interface DirectoryListing {
+  readonly mtimeNs: bigint;
+  readonly entries: readonly WalkEntry[];
+}
+
+/**
+ * Directory listings kept between walks of the same project.
+ * Adding, removing or renaming an entry changes its directory's modification
+ * time, so a later walk re-reads only the directories that changed.
+ */
+export interface WalkCache {
+  readonly listings: Map<string, DirectoryListing>;
+}
+
+/**
+ * Create an empty walk cache.
+ */
+export function createWalkCache(): WalkCache {
+  return { listings: new Map() };
+}
+
+/**
+ * List a directory, resolving symbolic links to what they point at.
+ * @returns The entries, or null if the directory cannot be read
+ */
+function readWalkEntries(absoluteDirectory: string): WalkEntry[] | null {
+  let directoryEntries: fs.Dirent[];
+  try {
+    directoryEntries = fs.readdirSync(absoluteDirectory, { withFileTypes: true });
+  } catch {
+    return null;
+  }
 
-  const matchedFiles = await fg(patterns as string[], {
-    cwd: basePath,
-    absolute: true,
-    ignore: combinedExcludes,
-    onlyFiles: true,
-    dot: false,
+  return directoryEntries.map((directoryEntry) => {
+    if (!directoryEntry.isSymbolicLink()) {
+      return { name: directoryEntry.name, isDirectory: directoryEntry.isDirectory(), isFile: directoryEntry.isFile() };
+    }
+    const targetStats = statLinkTarget(path.join(absoluteDirectory, directoryEntry.name), absoluteDirectory);
+    return {
+      name: directoryEntry.name,
+      isDirectory: targetStats?.isDirectory() ?? false,
+      isFile: targetStats?.isFile() ?? false,
+    };
   });
+}
+
+/**
+ * List a directory, reusing the cached listing while the directory is unchanged.
+ */
+function readCachedWalkEntries(absoluteDirectory: string, walkCache: WalkCache): readonly WalkEntry[] | null {
+  let mtimeNs: bigint;
+  try {
+    mtimeNs = fs.statSync(absoluteDirectory, { bigint: true }).mtimeNs;
+  } catch {
+    walkCache.listings.delete(absoluteDirectory);
+    return null;
+  }
+
+  const cachedListing = walkCache.listings.get(absoluteDirectory);
+  if (cachedListing?.mtimeNs === mtimeNs) {
+    return cachedListing.entries;
+  }
+
+  const entries = readWalkEntries(absoluteDirectory);
+  if (entries) {
+    walkCache.listings.set(absoluteDirectory, { mtimeNs, entries });
+  }
+  return entries;
+}
+
+/**
+ * Walk the project once, pruning excluded directories before descending.
+ * Honours the default exclusions and .flightignore; dot files are included
+ * so that patterns naming them (e.g. "**\/.github/workflows/*.yml") can match.
+ * Unreadable directories are skipped.
+ * @param basePath - Project root directory
+ * @param walkCache - Optional listings from earlier walks to reuse
+ * @returns Sorted forward-slash paths relative to basePath
+ */
+export async function walkProjectFiles(basePath: string, walkCache?: WalkCache): Promise<string[]> {
+  const exclusions = loadWalkExclusions(basePath);
+  const projectFiles: string[] = [];
+  const pendingDirectories: string[] = [''];
+
+  while (pendingDirectories.length > 0) {
+    const relativeDirectory = pendingDirectories.pop()!;
+    const absoluteDirectory = path.join(basePath, relativeDirectory);
+    const walkEntries = walkCache
+      ? readCachedWalkEntries(absoluteDirectory, walkCache)
+      : readWalkEntries(absoluteDirectory);
+
+    for (const walkEntry of walkEntries ?? []) {
+      const relativePath = relativeDirectory
+        ? `${relativeDirectory}/${walkEntry.name}`
+        : walkEntry.name;
+
+      if (walkEntry.isDirectory) {
+        if (!isExcludedDirectory(exclusions, walkEntry.name, relativePath)) {
+          pendingDirectories.push(relativePath);
+        }
+      } else if (walkEntry.isFile && !(exclusions.fileMatcher?.test(relativePath) ?? false)) {
+        projectFiles.push(relativePath);
+      }
+    }
+  }
+
+  return projectFiles.sort();
+}
+
+/**
+ * Keep the relative paths walkProjectFiles() would return if the files
+ * existed, so content that is not on disk (yet) meets the same exclusions.
+ * Paths outside the project are dropped.
+ * @param relativePaths - Paths relative to the project root, "/"-separated
+ * @param basePath - Project root
+ * @returns The paths the walk would include, in input order
+ */
+export function filterWalkablePaths(relativePaths: readonly string[], basePath: string): string[] {
+  const exclusions = loadWalkExclusions(basePath);
+
+  return relativePaths.filter((relativePath) => {
+    const pathSegments = relativePath.split('/');
+    if (path.isAbsolute(relativePath) || pathSegments.includes('..')) {
+      return false;
+    }
+    for (let segmentCount = 1; segmentCount < pathSegments.length; segmentCount++) {
+      const directoryPath = pathSegments.slice(0, segmentCount).join('/');
+      if (isExcludedDirectory(exclusions, pathSegments[segmentCount - 1]!, directoryPath)) {
+        return false;
+      }
+    }
+    return !(exclusions.fileMatcher?.test(relativePath) ?? false);
+  });
+}
+
+/**
+ * Match walked project files against every domain's patterns in one pass.
+ * Patterns follow glob semantics without dot matching: wildcards never match
+ * a leading "." in a path segment unless the pattern spells it out.
+ * @param projectFiles - Relative paths from walkProjectFiles()
+ * @param domainPatterns - File and exclude patterns per domain
+ * @param basePath - Project root the paths are relative to
+ * @returns Absolute file path to the indexes of the domains it belongs to,
+ *   in projectFiles order; files no domain matches are omitted
+ */
+export function mapFilesToDomains(
+  projectFiles: readonly string[],
+  domainPatterns: readonly DomainPatterns[],
+  basePath: string
+): Map<string, number[]> {
+  const domainMatchers = domainPatterns.map((patternSet) => ({
+    fileMatcher: compileAlternation(
+      patternSet.patterns.map((filePattern) => convertGlobToRegexSource(filePattern, false))
+    ),
+    excludeMatcher: compileAlternation(
+      (patternSet.excludePatterns ?? []).map((excludePattern) => convertGlobToRegexSource(excludePattern))
+    ),
+  }));
+  const domainsByFile = new Map<string, number[]>();
+
+  for (const relativePath of projectFiles) {
+    const domainIndexes: number[] = [];
+
+    domainMatchers.forEach(({ fileMatcher, excludeMatcher }, domainIndex) => {
+      if ((fileMatcher?.test(relativePath) ?? false) && !(excludeMatcher?.test(relativePath) ?? false)) {
+        domainIndexes.push(domainIndex);
+      }
+    });
+
+    if (domainIndexes.length > 0) {
+      domainsByFile.set(path.resolve(basePath, relativePath), domainIndexes);
+    }
+  }
 
-  return matchedFiles.map((filePath) => path.normalize(filePath)).sort();
+  return domainsByFile;
+}
+
+/**
+ * Discover files matching glob patterns.
+ * @param options - Discovery options with patterns, excludes, and base path
+ * @returns Sorted array of absolute file paths
+ */
+export async function discoverFiles(options: DiscoveryOptions): Promise<string[]> {
+  const projectFiles = await walkProjectFiles(options.basePath);
+  return [...mapFilesToDomains(projectFiles, [options], options.basePath).keys()];
+}
+
+/**
+ * Order files most recently modified first, so a time-budgeted run checks
+ * the files an agent just edited before the rest of the tree.
+ * Files that cannot be stat'ed sort last; ties keep path order.
+ * @param files - Absolute file paths
+ * @returns New array sorted by modification time, newest first
+ */
+export function sortByRecency(files: readonly string[]): string[] {
+  const modifiedTimes = new Map<string, number>();
+
+  for (const filePath of files) {
+    try {
+      modifiedTimes.set(filePath, fs.statSync(filePath).mtimeMs);
+    } catch {
+      modifiedTimes.set(filePath, 0);
+    }
+  }
+
+  return [...files].sort((left, right) =>
+    (modifiedTimes.get(right) ?? 0) - (modifiedTimes.get(left) ?? 0)
+  );
 }
 
 /**
@@ -298,14 +596,239 @@ export async function discoverFiles(options: DiscoveryOptions): Promise<string[]
  * @returns Sorted array of absolute paths to .rules.json files
  */
 export async function discoverRulesFiles(basePath: string): Promise<string[]> {
-  const domainsPath = path.join(basePath, FLIGHT_DOMAINS_DIR);
+  return listRulesFiles(path.join(basePath, FLIGHT_DOMAINS_DIR)).sort();
+}
 
-  const matchedFiles = await fg(RULES_FILE_PATTERN, {
-    cwd: domainsPath,
-    absolute: true,
-    onlyFiles: true,
-    dot: false,
-  });
+/**
+ * List the .rules.json files under a directory, at any depth.
+ * Dot files and directories are skipped, and symbolic links are followed
+ * unless they loop.
+ * @param directoryPath - Absolute directory to search
+ * @returns Absolute paths, in no particular order
+ */
+function listRulesFiles(directoryPath: string): string[] {
+  const rulesFilePaths: string[] = [];
+  for (const walkEntry of readWalkEntries(directoryPath) ?? []) {
+    if (walkEntry.name.startsWith('.')) {
+      continue;
+    }
+    const entryPath = path.join(directoryPath, walkEntry.name);
+    if (walkEntry.isDirectory) {
+      rulesFilePaths.push(...listRulesFiles(entryPath));
+    } else if (walkEntry.isFile && walkEntry.name.endsWith(RULES_FILE_SUFFIX)) {
+      rulesFilePaths.push(entryPath);
+    }
+  }
+  return rulesFilePaths;
+}
+
+
+/**
+ * Get the domain name of a rules file from its file name.
+ * @param rulesFilePath - Path to a .rules.json file
+ * @returns Domain name (e.g. "typescript" for typescript.rules.json)
+ */
+export function getRulesFileDomain(rulesFilePath: string): string {
+  return path.basename(rulesFilePath, RULES_FILE_SUFFIX);
+}
+
+/**
+ * Load the enabled domains from .flight/flight.json written by /flight-scan.
+ * Schema v2 enables domains.source plus domains.test; v1 uses enabled_domains.
+ * @param basePath - Project root directory
+ * @returns Enabled domain names, or null when no flight.json exists or it
+ *   lists no domains under either key; an explicitly empty list gives []
+ * @throws Error if flight.json is not valid JSON
+ */
+export function loadEnabledDomains(basePath: string): string[] | null {
+  const configPath = path.join(basePath, FLIGHT_CONFIG_FILE);
+
+  if (!fs.existsSync(configPath)) {
+    return null;
+  }
+
+  let parsedConfig: unknown;
+  try {
+    parsedConfig = JSON.parse(fs.readFileSync(configPath, 'utf-8'));
+  } catch {
+    throw new Error(`Invalid JSON in project config: ${configPath}`);
+  }
+
+  if (typeof parsedConfig !== 'object' || parsedConfig === null) {
+    throw new Error(`Project config must be an object: ${configPath}`);
+  }
+
+  const configObject = parsedConfig as Record<string, unknown>;
+  const domainNames = new Set<string>();
+  let listsDomains = false;
 
-  return matchedFiles.map((filePath) => path.normalize(filePath)).sort();
+  const collectNames = (candidate: unknown): void => {
+    if (!Array.isArray(candidate)) {
+      return;
+    }
+    listsDomains = true;
+    for (const domainName of candidate) {
+      if (typeof domainName === 'string') {
+        domainNames.add(domainName);
+      }
+    }
+  };
+
+  // v2: domains.source + domains.test
+  const domainsByCategory = configObject.domains as Record<string, unknown> | undefined;
+  if (typeof domainsByCategory === 'object' && domainsByCategory !== null) {
+    collectNames(domainsByCategory.source);
+    collectNames(domainsByCategory.test);
+  }
+
+  // v1: enabled_domains
+  collectNames(configObject[JSON_KEYS.enabledDomains]);
+
+  return listsDomains ? [...domainNames].sort() : null;
+}
+
+/**
+ * Convert a glob pattern into a regular expression source.
+ * Supports *, **, ? and {a,b} alternation - the subset used by file_patterns.
+ * Unless matchDotSegments is set, wildcards do not match a leading "." in a
+ * path segment, as with the usual glob default of dot: false.
+ */
+function convertGlobToRegexSource(globPattern: string, matchDotSegments = true): string {
+  const segmentGuard = matchDotSegments ? '' : '(?!\\.)';
+  let regexSource = '';
+  let braceDepth = 0;
+
+  for (let index = 0; index < globPattern.length; index++) {
+    const character = globPattern[index]!;
+    const startsSegment = index === 0 || globPattern[index - 1] === '/';
+
+    if (character === '*') {
+      if (globPattern[index + 1] === '*') {
+        // "**/" matches zero or more directories, a bare "**" matches anything
+        if (globPattern[index + 2] === '/') {
+          regexSource += matchDotSegments ? '(?:.*/)?' : `(?:${segmentGuard}[^/]*/)*`;
+          index += 2;
+        } else {
+          regexSource += matchDotSegments ? '.*' : `(?:${segmentGuard}[^/]*(?:/${segmentGuard}[^/]*)*)?`;
+          index += 1;
+        }
+      } else {
+        regexSource += `${startsSegment ? segmentGuard : ''}[^/]*`;
+      }
+    } else if (character === '?') {
+      regexSource += `${startsSegment ? segmentGuard : ''}[^/]`;
+    } else if (character === '{') {
+      regexSource += '(?:';
+      braceDepth++;
+    } else if (character === '}' && braceDepth > 0) {
+      regexSource += ')';
+      braceDepth--;
+    } else if (character === ',' && braceDepth > 0) {
+      regexSource += '|';
+    } else {
+      regexSource += character.replace(/[.+^$()|[\]\\]/g, '\\$&');
+    }
+  }
+
+  return regexSource;
+}
+
+/**
+ * Compile a glob pattern into an anchored regular expression.
+ * @param globPattern - Glob pattern such as "**\/*.{js,ts}"
+ * @returns RegExp matching forward-slash relative paths
+ */
+export function compileGlob(globPattern: string): RegExp {
+  return new RegExp(`^${convertGlobToRegexSource(globPattern)}$`);
+}
+
+/**
+ * Collect the distinct file names present in the project in a single walk.
+ * Honours the default exclusions and .flightignore, so vendored or generated
+ * files never make a domain look relevant.
+ * @param basePath - Project root directory
+ * @param projectFiles - Result of walkProjectFiles(), to avoid walking again
+ * @returns Set of distinct file base names (e.g. "index.ts", "Dockerfile")
+ */
+export async function collectFileNameCensus(
+  basePath: string,
+  projectFiles?: readonly string[]
+): Promise<Set<string>> {
+  const walkedFiles = projectFiles ?? await walkProjectFiles(basePath);
+  return new Set(walkedFiles.map((filePath) => path.posix.basename(filePath)));
+}
+
+/**
+ * Check whether any census file name could match one of a domain's patterns.
+ * Only the final path segment is compared, so the check is conservative:
+ * it never rejects a domain that the full glob would match.
+ * @param filePatterns - The domain's file_patterns
+ * @param fileNameCensus - Distinct file names from collectFileNameCensus()
+ * @returns true if at least one file name matches
+ */
+export function hasCensusMatch(
+  filePatterns: readonly string[],
+  fileNameCensus: ReadonlySet<string>
+): boolean {
+  const nameMatchers = filePatterns.map((filePattern) =>
+    compileGlob(filePattern.split('/').pop() ?? filePattern)
+  );
+
+  for (const fileName of fileNameCensus) {
+    if (nameMatchers.some((nameMatcher) => nameMatcher.test(fileName))) {
+      return true;
+    }
+  }
+
+  return false;
+}
+
+/**
+ * Read only the file_patterns of a rules file, without validating its rules.
+ * @param rulesFilePath - Path to a .rules.json file
+ * @returns The file patterns, or null if they cannot be read
+ */
+function readRulesFilePatterns(rulesFilePath: string): string[] | null {
+  try {
+    const parsedJson = JSON.parse(fs.readFileSync(rulesFilePath, 'utf-8')) as Record<string, unknown>;
+    const filePatterns = parsedJson[JSON_KEYS.filePatterns];
+    return Array.isArray(filePatterns) ? filePatterns.filter((p) => typeof p === 'string') : null;
+  } catch {
+    return null;
+  }
+}
+
+/**
+ * Select the auto-discovered rules files that are relevant to this project.
+ * When .flight/flight.json exists its enabled domains are honoured as-is.
+ * Otherwise a single file-name census skips domains whose file_patterns
+ * cannot match any file, before their rules are loaded or globbed.
+ * Unreadable rules files are kept so that loadRulesFile() reports the error.
+ * @param rulesFilePaths - Discovered .rules.json paths
+ * @param basePath - Project root directory
+ * @param projectFiles - Result of walkProjectFiles(), to avoid walking again
+ * @param rulesBundle - Optional bundle to take unchanged file_patterns from
+ * @returns The subset of rules files worth loading
+ */
+export async function selectRelevantRulesFiles(
+  rulesFilePaths: readonly string[],
+  basePath: string,
+  projectFiles?: readonly string[],
+  rulesBundle?: RulesBundle | null
+): Promise<string[]> {
+  const enabledDomains = loadEnabledDomains(basePath);
+
+  if (enabledDomains !== null) {
+    return rulesFilePaths.filter((rulesFilePath) =>
+      enabledDomains.includes(getRulesFileDomain(rulesFilePath))
+    );
+  }
+
+  const fileNameCensus = await collectFileNameCensus(basePath, projectFiles);
+
+  return rulesFilePaths.filter((rulesFilePath) => {
+    const bundledRulesFile = rulesBundle ? findBundledRulesFile(rulesBundle, rulesFilePath) : null;
+    const filePatterns = bundledRulesFile?.filePatterns ?? readRulesFilePatterns(rulesFilePath);
+    return filePatterns === null || hasCensusMatch(filePatterns, fileNameCensus);
+  });
 }
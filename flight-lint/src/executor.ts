@@ -1,16 +1,59 @@
-import Parser from 'tree-sitter';
-import { readFile } from 'node:fs/promises';
-import { getLanguage, detectLanguage, parseFile } from './parser.js';
-import type { Rule, RulesFile, LintResult, LintSummary } from './types.js';
-
-/**
- * Internal interface for grep matches.
- */
-interface GrepMatch {
-  readonly line: number;   // 1-indexed
-  readonly column: number; // 1-indexed
-  readonly text: string;
-}
+import fs from 'node:fs';
+import path from 'node:path';
+import type Parser from 'tree-sitter';
+import {
+  getLanguage,
+  compileQuery,
+  detectLanguage,
+  createSourceCache,
+  readCachedSource,
+  readCachedLineStarts,
+  parseCachedSource,
+  assessCachedSource,
+  readCachedSourceInLineChunks,
+  addSourceBuffer,
+  indexLineStarts,
+  DEFAULT_FILE_SIZE_LIMITS,
+  DEFAULT_SOURCE_CACHE_BYTES,
+} from './parser.js';
+import type { SourceCache, ParseHistory, TreeSitterLanguage } from './parser.js';
+import { sortByRecency, mapFilesToDomains, filterWalkablePaths } from './discovery.js';
+import { shouldUseWorkerPool, scanFilesInWorkerPool } from './worker-pool.js';
+import type { WorkerPool } from './worker-pool.js';
+import {
+  findLineIndex,
+  joinAlternatives,
+  toProjectPath,
+  isLineGrepRule,
+  selectRulesForPath,
+  selectRulesForApiFile,
+  isApiFilePath,
+  isApiFileContent,
+  isContentCheckRule,
+  createContentScan,
+  scanContentChunk,
+  finishContentScan,
+  judgeProjectRules,
+} from './checks.js';
+import type { GrepMatch, RuleScanHandlers, ProjectRuleOutcome } from './checks.js';
+import { createResultTable, appendResult, expandResults, mergeResultTables } from './result-table.js';
+import type { ResultTable } from './result-table.js';
+import type {
+  Rule,
+  RulesFile,
+  LintResult,
+  LintSummary,
+  CompactLintSummary,
+  LintCounts,
+  LintTarget,
+  SourceBuffer,
+  DomainActivation,
+  Severity,
+  FileSizeLimits,
+  FileSkipReason,
+  SkippedFile,
+  StreamedResult,
+} from './types.js';
 
 /**
  * Language compatibility map.
@@ -31,6 +74,47 @@ interface QueryMatch {
   readonly text: string;
 }
 
+/**
+ * Compiled activation predicates, keyed by the activation they were built from.
+ * Each domain's signature is compiled once per process, not once per file.
+ */
+const activationMatcherCache = new WeakMap<DomainActivation, (content: string) => boolean>();
+
+/**
+ * Compile a domain activation signature into a content predicate.
+ * @param activation - The domain activation signature
+ * @returns Predicate that is true when the content contains the signature
+ */
+function compileActivation(activation: DomainActivation): (content: string) => boolean {
+  const literals = activation.literals ?? [];
+  const signatureRegex = activation.pattern ? new RegExp(activation.pattern) : null;
+
+  return (content: string): boolean =>
+    literals.some((literal) => content.includes(literal)) ||
+    (signatureRegex !== null && signatureRegex.test(content));
+}
+
+/**
+ * Check whether file content activates a domain.
+ * Domains without an activation signature are active for every file.
+ * @param content - The file content
+ * @param activation - The domain activation signature, if any
+ * @returns True if the domain's rules should run on this content
+ */
+export function isDomainActive(content: string, activation: DomainActivation | undefined): boolean {
+  if (!activation) {
+    return true;
+  }
+
+  let activationMatcher = activationMatcherCache.get(activation);
+  if (!activationMatcher) {
+    activationMatcher = compileActivation(activation);
+    activationMatcherCache.set(activation, activationMatcher);
+  }
+
+  return activationMatcher(content);
+}
+
 /**
  * Check if a file language is compatible with a rule's target language.
  * @param fileLanguage - The language of the file being linted
@@ -63,53 +147,256 @@ function hasAstQuery(rule: Rule): boolean {
 }
 
 /**
- * Check if a rule has a grep pattern that can be executed.
- * @param rule - The rule to check
- * @returns True if the rule has an executable grep pattern
+ * Regex features whose meaning can change when a pattern runs over the whole
+ * buffer instead of a single line: lookaround can see across line breaks,
+ * and backreferences and named groups break when patterns are combined.
+ */
+const LINE_BOUND_PATTERN_FEATURES = /\(\?<?[=!]|\\[1-9]|\\k<|\(\?<[A-Za-z_$]/;
+
+/**
+ * A grep rule with its pattern compiled for a single line.
  */
-function hasGrepPattern(rule: Rule): boolean {
-  return rule.pattern !== null && rule.pattern !== undefined && rule.pattern.length > 0;
+interface CompiledGrepRule {
+  readonly rule: Rule;
+  readonly lineRegex: RegExp;
+  /** Matching lines that also match this are not reported (ignore_when) */
+  readonly ignoreRegex: RegExp | null;
+  /** Index of the whole-buffer prefilter the rule takes part in, or null */
+  readonly prefilterIndex: number | null;
+}
+
+/**
+ * Flags of the whole-buffer prefilters: case-sensitive rules share the first
+ * and case-insensitive rules the second.
+ */
+const PREFILTER_FLAGS = ['gm', 'gim'] as const;
+
+/**
+ * The grep rules of one rules file, compiled once per process.
+ * Each prefilter is every combinable pattern of its case mode joined into
+ * one multiline alternation; a single pass over the buffer finds the only
+ * lines those rules can match on.
+ */
+interface GrepProgram {
+  readonly compiledRules: readonly CompiledGrepRule[];
+  /** Per PREFILTER_FLAGS entry; null where no rule takes part */
+  readonly prefilters: readonly (RegExp | null)[];
+}
+
+/**
+ * Grep programs, keyed by the rules array they were compiled from.
+ */
+const grepProgramCache = new WeakMap<readonly Rule[], GrepProgram>();
+
+/**
+ * Compile the grep rules of a rules file into a grep program.
+ * Invalid patterns are skipped silently, as before.
+ * @param rules - All rules of the rules file
+ * @returns The compiled grep program
+ */
+function getGrepProgram(rules: readonly Rule[]): GrepProgram {
+  const cachedProgram = grepProgramCache.get(rules);
+  if (cachedProgram) {
+    return cachedProgram;
+  }
+
+  const compiledRules: CompiledGrepRule[] = [];
+  for (const rule of rules) {
+    if (!isLineGrepRule(rule)) {
+      continue;
+    }
+    try {
+      compiledRules.push({
+        rule,
+        lineRegex: new RegExp(rule.pattern!, rule.ignoreCase ? 'i' : ''),
+        ignoreRegex: rule.ignoreWhen?.length
+          ? new RegExp(joinAlternatives(rule.ignoreWhen))
+          : null,
+        prefilterIndex: LINE_BOUND_PATTERN_FEATURES.test(rule.pattern!) ? null : (rule.ignoreCase ? 1 : 0),
+      });
+    } catch {
+      // Invalid regex pattern - skip silently
+    }
+  }
+
+  const prefilters = PREFILTER_FLAGS.map((prefilterFlags, prefilterIndex) => {
+    const prefilterSources = compiledRules
+      .filter((compiledRule) => compiledRule.prefilterIndex === prefilterIndex)
+      .map((compiledRule) => `(?:${compiledRule.rule.pattern})`);
+    if (prefilterSources.length === 0) {
+      return null;
+    }
+    try {
+      return new RegExp(prefilterSources.join('|'), prefilterFlags);
+    } catch {
+      // Patterns that compile alone but not together are checked line by line
+      return null;
+    }
+  });
+
+  const programRules = compiledRules.map((compiledRule) =>
+    compiledRule.prefilterIndex !== null && prefilters[compiledRule.prefilterIndex] === null
+      ? { ...compiledRule, prefilterIndex: null }
+      : compiledRule
+  );
+
+  const grepProgram: GrepProgram = { compiledRules: programRules, prefilters };
+  grepProgramCache.set(rules, grepProgram);
+  return grepProgram;
 }
 
 /**
- * Execute a grep rule against file content using Node's regex.
+ * Run a grep program over a buffer.
+ * Each prefilter makes one pass over the whole buffer to find candidate
+ * lines; each prefiltered rule is then confirmed on those lines only, so
+ * results match running every pattern line by line. Rules that cannot be
+ * prefiltered still run on every line, but with their regex compiled once.
  * @param content - The file content to search
- * @param rule - The rule containing the pattern
- * @returns Array of matches with 1-indexed locations
+ * @param lineStarts - Line start index of content
+ * @param grepProgram - The compiled grep rules
+ * @returns Matches per rule with 1-indexed locations, in rule order
  */
-function executeGrepRule(content: string, rule: Rule): GrepMatch[] {
-  if (!hasGrepPattern(rule)) {
-    return [];
+function executeGrepProgram(
+  content: string,
+  lineStarts: readonly number[],
+  grepProgram: GrepProgram
+): Map<Rule, GrepMatch[]> {
+  const ruleMatches = new Map<Rule, GrepMatch[]>();
+  const lineCount = lineStarts.length;
+  const getLineText = (lineIndex: number): string =>
+    content.slice(lineStarts[lineIndex]!, lineIndex + 1 < lineCount ? lineStarts[lineIndex + 1]! - 1 : content.length);
+
+  // Candidate lines per prefilter: one pass over the buffer each
+  const candidateLines = grepProgram.prefilters.map((prefilter) => {
+    const prefilterLines: number[] = [];
+    if (!prefilter) {
+      return prefilterLines;
+    }
+    prefilter.lastIndex = 0;
+    let prefilterMatch = prefilter.exec(content);
+
+    while (prefilterMatch) {
+      const lineIndex = findLineIndex(lineStarts, prefilterMatch.index);
+      prefilterLines.push(lineIndex);
+      if (lineIndex + 1 >= lineCount) {
+        break;
+      }
+      // One candidate per line is enough; resume at the next line
+      prefilter.lastIndex = lineStarts[lineIndex + 1]!;
+      prefilterMatch = prefilter.exec(content);
+    }
+    return prefilterLines;
+  });
+
+  let allLines: number[] | null = null;
+
+  for (const { rule, lineRegex, ignoreRegex, prefilterIndex } of grepProgram.compiledRules) {
+    const matches: GrepMatch[] = [];
+    const searchedLines = prefilterIndex !== null
+      ? candidateLines[prefilterIndex]!
+      : (allLines ??= Array.from({ length: lineCount }, (_line, lineIndex) => lineIndex));
+
+    for (const lineIndex of searchedLines) {
+      const lineText = getLineText(lineIndex);
+      const match = lineRegex.exec(lineText);
+      if (match && !(ignoreRegex?.test(lineText) ?? false)) {
+        matches.push({
+          line: lineIndex + 1,  // 1-indexed
+          column: match.index + 1,  // 1-indexed
+          text: match[0],
+        });
+      }
+    }
+
+    ruleMatches.set(rule, matches);
   }
 
-  const matches: GrepMatch[] = [];
-  const lines = content.split('\n');
+  return ruleMatches;
+}
 
-  let regex: RegExp;
-  try {
-    regex = new RegExp(rule.pattern!);
-  } catch {
-    // Invalid regex pattern - skip silently
-    return [];
+/**
+ * Compiled tree-sitter queries, keyed by grammar and then by query source.
+ * Compilation costs far more than running a query on a typical file, so each
+ * (language, query) pair is compiled once per process. Failed compilations are
+ * cached as their error message so they are not retried for every file.
+ */
+const compiledQueryCache = new WeakMap<object, Map<string, Parser.Query | string>>();
+
+/**
+ * Get the compiled query for a rule, compiling it on first use.
+ * @param rule - The rule containing the query
+ * @param language - The tree-sitter language object
+ * @returns The compiled query
+ * @throws Error if the query syntax is invalid
+ */
+function getCompiledQuery(
+  rule: Rule,
+  language: TreeSitterLanguage
+): Parser.Query {
+  const querySource = rule.query as string;
+
+  let languageQueries = compiledQueryCache.get(language);
+  if (!languageQueries) {
+    languageQueries = new Map();
+    compiledQueryCache.set(language, languageQueries);
   }
 
-  for (let i = 0; i < lines.length; i++) {
-    const line = lines[i]!;
-    const match = regex.exec(line);
-    if (match) {
-      matches.push({
-        line: i + 1,  // 1-indexed
-        column: match.index + 1,  // 1-indexed
-        text: match[0],
-      });
+  let compiledQuery = languageQueries.get(querySource);
+  if (compiledQuery === undefined) {
+    try {
+      compiledQuery = compileQuery(language, querySource);
+    } catch (parseError) {
+      compiledQuery = parseError instanceof Error ? parseError.message : String(parseError);
     }
+    languageQueries.set(querySource, compiledQuery);
   }
 
-  return matches;
+  if (typeof compiledQuery === 'string') {
+    throw new Error(`Invalid query syntax for rule ${rule.id}: ${compiledQuery}`);
+  }
+
+  return compiledQuery;
+}
+
+/**
+ * Compile every AST query in a rules file up front.
+ * Each query is compiled for every grammar it can run against, which also
+ * warms the query cache before any file is linted.
+ * @param rulesFile - The rules file whose queries to compile
+ * @returns One message per (rule, language) whose query failed to compile
+ */
+export async function findInvalidQueries(rulesFile: RulesFile): Promise<string[]> {
+  const invalidQueryMessages: string[] = [];
+
+  for (const rule of rulesFile.rules) {
+    if (!hasAstQuery(rule) || !rule.language) {
+      continue;
+    }
+
+    for (const languageName of LANGUAGE_COMPATIBILITY[rule.language] ?? [rule.language]) {
+      let language: TreeSitterLanguage;
+      try {
+        language = await getLanguage(languageName);
+      } catch {
+        // Unsupported language - no file will ever be parsed with it
+        continue;
+      }
+
+      try {
+        getCompiledQuery(rule, language);
+      } catch (compileError) {
+        const errorMessage = compileError instanceof Error ? compileError.message : String(compileError);
+        invalidQueryMessages.push(`${rulesFile.domain} (${languageName}): ${errorMessage}`);
+      }
+    }
+  }
+
+  return invalidQueryMessages;
 }
 
 /**
  * Execute a single rule's query against a parsed syntax tree.
+ * The compiled query is cached per (language, query) for the whole process.
  * @param tree - The parsed syntax tree
  * @param rule - The rule containing the query to execute
  * @param language - The tree-sitter language object
@@ -128,14 +415,7 @@ export function executeRule(
     return [];
   }
 
-  let query: Parser.Query;
-  try {
-    query = new Parser.Query(language, rule.query as string);
-  } catch (parseError) {
-    const errorMessage = parseError instanceof Error ? parseError.message : String(parseError);
-    throw new Error(`Invalid query syntax for rule ${rule.id}: ${errorMessage}`);
-  }
-
+  const query = getCompiledQuery(rule, language);
   const captures = query.captures(tree.rootNode);
   const matches: QueryMatch[] = [];
 
@@ -154,71 +434,1063 @@ export function executeRule(
   return matches;
 }
 
+/**
+ * Capture names in a query, skipping string literals and comments so that
+ * an "@" inside a predicate argument is left alone.
+ */
+const QUERY_CAPTURE_PATTERN = /"(?:[^"\\]|\\.)*"|;[^\n]*|@([A-Za-z_][\w.-]*)/g;
+
+/**
+ * Prefix of rule-tagged capture names in a merged query: @r<index>.<name>
+ */
+const RULE_CAPTURE_PREFIX = 'r';
+
+/**
+ * AST rules of one rules file combined into a single query for one grammar.
+ */
+interface MergedQuery {
+  /** Rules in the query; capture tags index into this array */
+  readonly rules: readonly Rule[];
+  /** Null if the combined query failed to compile; rules then run one by one */
+  readonly query: Parser.Query | null;
+  readonly language: TreeSitterLanguage;
+}
+
+/**
+ * Merged queries, keyed by the rules array they were built from and then by
+ * file language. Rules arrays are stable for a rules file, so each domain's
+ * query is merged and compiled once per grammar.
+ */
+const mergedQueryCache = new WeakMap<readonly Rule[], Map<string, MergedQuery>>();
+
+/**
+ * Rename every capture in a query to carry its rule's index, so captures
+ * from a merged query can be attributed back to the rule they came from.
+ * Predicates refer to captures by the same syntax and are renamed with them.
+ * @param querySource - The rule's query source
+ * @param ruleIndex - Index of the rule within the merged query
+ * @returns Query source with tagged capture names
+ */
+export function tagQueryCaptures(querySource: string, ruleIndex: number): string {
+  return querySource.replace(QUERY_CAPTURE_PATTERN, (token: string, captureName: string | undefined) =>
+    captureName === undefined ? token : `@${RULE_CAPTURE_PREFIX}${ruleIndex}.${captureName}`
+  );
+}
+
+/**
+ * Get the merged query for the AST rules of a rules file that apply to a
+ * file language, building and compiling it on first use. Rules whose own
+ * query does not compile are left out.
+ * @param rules - All rules of the rules file
+ * @param fileLanguage - Language of the file being linted
+ * @param language - The tree-sitter language object for fileLanguage
+ * @returns The merged query
+ */
+function getMergedQuery(rules: readonly Rule[], fileLanguage: string, language: TreeSitterLanguage): MergedQuery {
+  let languageQueries = mergedQueryCache.get(rules);
+  if (!languageQueries) {
+    languageQueries = new Map();
+    mergedQueryCache.set(rules, languageQueries);
+  }
+
+  const cachedQuery = languageQueries.get(fileLanguage);
+  if (cachedQuery) {
+    return cachedQuery;
+  }
+
+  const mergedRules = rules.filter((rule) => {
+    if (!hasAstQuery(rule) || !isRuleCompatibleWithFile(fileLanguage, rule.language)) {
+      return false;
+    }
+    try {
+      getCompiledQuery(rule, language);
+      return true;
+    } catch {
+      // Invalid query - already reported once by findInvalidQueries()
+      return false;
+    }
+  });
+
+  let query: Parser.Query | null = null;
+  if (mergedRules.length > 0) {
+    const mergedSource = mergedRules
+      .map((rule, ruleIndex) => tagQueryCaptures(rule.query as string, ruleIndex))
+      .join('\n');
+    try {
+      query = compileQuery(language, mergedSource);
+    } catch {
+      // Rules that compile alone but not together fall back to one traversal each
+      query = null;
+    }
+  }
+
+  const mergedQuery: MergedQuery = { rules: mergedRules, query, language };
+  languageQueries.set(fileLanguage, mergedQuery);
+  return mergedQuery;
+}
+
+/**
+ * Run a merged query over a tree in a single traversal.
+ * Only @violation captures are reported, exactly as executeRule() does.
+ * @param tree - The parsed syntax tree
+ * @param mergedQuery - The merged query for the tree's language
+ * @returns Matches per rule, in rule order
+ */
+function executeMergedQuery(tree: Parser.Tree, mergedQuery: MergedQuery): Map<Rule, QueryMatch[]> {
+  const ruleMatches = new Map<Rule, QueryMatch[]>(mergedQuery.rules.map((rule) => [rule, []]));
+
+  if (mergedQuery.query === null) {
+    for (const rule of mergedQuery.rules) {
+      ruleMatches.set(rule, executeRule(tree, rule, mergedQuery.language));
+    }
+    return ruleMatches;
+  }
+
+  for (const capture of mergedQuery.query.captures(tree.rootNode)) {
+    const separatorIndex = capture.name.indexOf('.');
+    // Only report captures named 'violation' - other captures are used for predicates
+    if (capture.name.slice(separatorIndex + 1) !== 'violation') {
+      continue;
+    }
+    const rule = mergedQuery.rules[Number(capture.name.slice(RULE_CAPTURE_PREFIX.length, separatorIndex))];
+    if (!rule) {
+      continue;
+    }
+    ruleMatches.get(rule)!.push({
+      line: capture.node.startPosition.row + 1,    // Convert 0-indexed to 1-indexed
+      column: capture.node.startPosition.column + 1, // Convert 0-indexed to 1-indexed
+      text: capture.node.text,
+    });
+  }
+
+  return ruleMatches;
+}
+
+/**
+ * The parts of a rules file that decide which of its rules run on a file.
+ */
+type DomainScope = Pick<RulesFile, 'activation' | 'apiFileDetection'>;
+
+/**
+ * Report the matches found per rule to a violation handler.
+ */
+function reportRuleMatches(
+  ruleMatches: Map<Rule, readonly GrepMatch[]>,
+  onViolation: RuleScanHandlers['onViolation']
+): void {
+  for (const [rule, matches] of ruleMatches) {
+    for (const match of matches) {
+      onViolation(rule, match.line, match.column);
+    }
+  }
+}
+
+/**
+ * Scan a single file with the given rules, reporting each violation to a handler.
+ * Handles AST rules (tree-sitter), grep rules (regex) and the whole-file
+ * checks of checks.ts; project-wide rules are handed back to be judged once
+ * every file has been scanned.
+ * @param filePath - Path to the file to scan
+ * @param projectPath - The file's path relative to the project root
+ * @param rules - Rules whose path scope includes the file
+ * @param fileLanguage - Language of the file (null for unknown)
+ * @param domainScope - Activation signature and API file detection of the domain
+ * @param sourceCache - Shared cache of file contents and trees
+ * @param scanHandlers - Receive violations and project-wide checks
+ */
+async function scanFile(
+  filePath: string,
+  projectPath: string,
+  rules: readonly Rule[],
+  fileLanguage: string | null,
+  domainScope: DomainScope,
+  sourceCache: SourceCache,
+  scanHandlers: RuleScanHandlers
+): Promise<void> {
+  const sourceContent = await readCachedSource(sourceCache, filePath);
+
+  if (!isDomainActive(sourceContent, domainScope.activation)) {
+    return;
+  }
+
+  const fileRules = selectRulesForApiFile(rules, domainScope.apiFileDetection, projectPath, sourceContent);
+  const astRules = fileRules.filter(r => hasAstQuery(r));
+  const contentScan = createContentScan(fileRules);
+
+  // Execute grep rules and whole-file checks (work on any file) over the buffer
+  if (fileRules.some(r => isLineGrepRule(r)) || contentScan.ruleScans.length > 0) {
+    const lineStarts = await readCachedLineStarts(sourceCache, filePath);
+    reportRuleMatches(executeGrepProgram(sourceContent, lineStarts, getGrepProgram(fileRules)), scanHandlers.onViolation);
+    scanContentChunk(contentScan, sourceContent, lineStarts, 0);
+    finishContentScan(contentScan, scanHandlers);
+  }
+
+  // Execute AST rules (only if we can parse the file)
+  if (fileLanguage && astRules.length > 0) {
+    let tree: Parser.Tree;
+    let mergedQuery: MergedQuery;
+    try {
+      mergedQuery = getMergedQuery(fileRules, fileLanguage, await getLanguage(fileLanguage));
+      if (mergedQuery.rules.length === 0) {
+        return;
+      }
+      tree = await parseCachedSource(sourceCache, filePath, fileLanguage);
+    } catch {
+      // Failed to parse - skip AST rules for this file
+      return;
+    }
+
+    reportRuleMatches(executeMergedQuery(tree, mergedQuery), scanHandlers.onViolation);
+  }
+}
+
+/**
+ * Run the grep rules and whole-file checks of several domains over a file
+ * streamed in line chunks.
+ * Used for files too large to parse and minified files, so AST rules do not
+ * run and the content is never cached; an in-memory buffer is scanned as a
+ * single chunk. Lines past MAX_STREAMED_LINE_LENGTH are cut short.
+ * Matches are buffered per domain and reported only if its activation
+ * signature appeared in some chunk, in the same order as a scan of the
+ * whole buffer. Rules for API files only are dropped at the end unless some
+ * chunk or the path marked the file as one. Multiline matches are found
+ * within a chunk.
+ * @param filePath - Path to the file to scan
+ * @param projectPath - The file's path relative to the project root
+ * @param rulesFiles - Rules file of every target in the scan
+ * @param targetRules - Targets to run, with the rules whose path scope includes the file
+ * @param sourceCache - Cache holding the content if it is a buffer
+ * @param onViolation - Called once per violation, target by target
+ * @param onProjectCheck - Called once per project-wide rule in scope, target by target
+ * @returns Whether any line was cut short
+ */
+async function scanFileInChunks(
+  filePath: string,
+  projectPath: string,
+  rulesFiles: readonly RulesFile[],
+  targetRules: ReadonlyMap<number, readonly Rule[]>,
+  sourceCache: SourceCache,
+  onViolation: (targetIndex: number, rule: Rule, line: number, column: number) => void,
+  onProjectCheck: (targetIndex: number, rule: Rule, found: boolean) => void
+): Promise<boolean> {
+  const targetScans = [...targetRules]
+    .filter(([_targetIndex, rules]) => rules.some((rule) => isLineGrepRule(rule) || isContentCheckRule(rule)))
+    .map(([targetIndex, rules]) => ({
+      targetIndex,
+      rulesFile: rulesFiles[targetIndex]!,
+      grepProgram: getGrepProgram(rules),
+      contentScan: createContentScan(rules),
+      isActive: !rulesFiles[targetIndex]!.activation,
+      isApiFile: isApiFilePath(rulesFiles[targetIndex]!.apiFileDetection, projectPath),
+      ruleMatches: new Map<Rule, GrepMatch[]>(),
+    }));
+  let lineOffset = 0;
+
+  const truncated = await readCachedSourceInLineChunks(sourceCache, filePath, (chunk) => {
+    const lineStarts = indexLineStarts(chunk);
+
+    for (const targetScan of targetScans) {
+      targetScan.isActive ||= isDomainActive(chunk, targetScan.rulesFile.activation);
+      targetScan.isApiFile ||= isApiFileContent(targetScan.rulesFile.apiFileDetection, chunk);
+      for (const [rule, matches] of executeGrepProgram(chunk, lineStarts, targetScan.grepProgram)) {
+        const ruleMatches = targetScan.ruleMatches.get(rule) ?? [];
+        for (const match of matches) {
+          ruleMatches.push({ ...match, line: match.line + lineOffset });
+        }
+        targetScan.ruleMatches.set(rule, ruleMatches);
+      }
+      scanContentChunk(targetScan.contentScan, chunk, lineStarts, lineOffset);
+    }
+
+    lineOffset += lineStarts.length;
+  });
+
+  for (const { targetIndex, isActive, isApiFile, ruleMatches, contentScan } of targetScans) {
+    if (!isActive) {
+      continue;
+    }
+    const runsOnFile = (rule: Rule): boolean => isApiFile || !rule.apiFilesOnly;
+    const reportViolation = (rule: Rule, line: number, column: number): void => {
+      if (runsOnFile(rule)) {
+        onViolation(targetIndex, rule, line, column);
+      }
+    };
+    reportRuleMatches(ruleMatches, reportViolation);
+    finishContentScan(contentScan, {
+      onViolation: reportViolation,
+      onProjectCheck: (rule, found) => {
+        if (runsOnFile(rule)) {
+          onProjectCheck(targetIndex, rule, found);
+        }
+      },
+    });
+  }
+
+  return truncated;
+}
+
 /**
  * Lint a single file with the given rules.
  * Handles both AST rules (tree-sitter) and grep rules (regex).
+ * Files that do not contain the domain's activation signature are skipped
+ * before any rule runs. Path scopes are matched against the path relative to
+ * the working directory; project-wide rules need the whole project and are
+ * not judged.
  * @param filePath - Path to the file to lint
  * @param rules - Rules to apply
  * @param fileLanguage - Language of the file (null for unknown)
+ * @param activation - Optional domain activation signature
  * @returns Array of lint results
  */
 export async function lintFile(
   filePath: string,
   rules: readonly Rule[],
-  fileLanguage: string | null
+  fileLanguage: string | null,
+  activation?: DomainActivation
 ): Promise<LintResult[]> {
-  const sourceContent = await readFile(filePath, 'utf-8');
   const lintResults: LintResult[] = [];
+  const projectPath = toProjectPath(process.cwd(), path.resolve(filePath));
+  const fileRules = selectRulesForPath(rules, projectPath);
 
-  // Separate rules by type
-  const grepRules = rules.filter(r => hasGrepPattern(r));
-  const astRules = rules.filter(r => hasAstQuery(r));
-
-  // Execute grep rules (work on any file)
-  for (const rule of grepRules) {
-    const matches = executeGrepRule(sourceContent, rule);
-    for (const match of matches) {
+  await scanFile(filePath, projectPath, fileRules, fileLanguage, { activation }, createSourceCache(), {
+    onViolation: (rule, line, column) => {
       lintResults.push({
         filePath,
-        line: match.line,
-        column: match.column,
+        line,
+        column,
         ruleId: rule.id,
         severity: rule.severity,
         message: rule.message,
       });
+    },
+    onProjectCheck: () => {},
+  });
+
+  return lintResults;
+}
+
+/**
+ * Outcome of scanning one target's files.
+ */
+interface ScanOutcome {
+  readonly scannedFileCount: number;
+  /** False when the deadline passed before every file was scanned */
+  readonly complete: boolean;
+  readonly skippedFiles: readonly SkippedFile[];
+}
+
+/**
+ * Options shared by the multi-domain scanners.
+ */
+export interface ScanOptions {
+  /** Epoch milliseconds after which no new file is started */
+  readonly deadline?: number;
+  /** Cache to share contents and trees with other scans of the same run */
+  readonly sourceCache?: SourceCache;
+  /** Worker threads to spread files across; scans run in-process without one */
+  readonly workerPool?: WorkerPool;
+  /** Limits for huge files; DEFAULT_FILE_SIZE_LIMITS when omitted */
+  readonly fileSizeLimits?: FileSizeLimits;
+  /** Earlier scan results to reuse for unchanged files; updated as files are scanned */
+  readonly fileVisitCache?: FileVisitCache;
+  /** Earlier parses to re-parse changed files from incrementally (in-process scans only) */
+  readonly parseHistory?: ParseHistory;
+  /** Directory path scopes are relative to and script rules run in; the working directory when omitted */
+  readonly projectRoot?: string;
+  /** False to skip script rules, e.g. when files are linted from buffers; true when omitted */
+  readonly runScriptRules?: boolean;
+}
+
+/**
+ * Outcome of scanning one file for several domains.
+ * Violations are flattened [targetIndex, ruleIndex, line, column] quadruples
+ * and project checks [targetIndex, ruleIndex, found] triples, with found 1 or
+ * 0, so they cross worker thread boundaries cheaply.
+ */
+export interface FileVisit {
+  /** Targets whose rules actually ran on the file */
+  readonly scannedTargetIndexes: readonly number[];
+  readonly violations: readonly number[];
+  /** Project-wide rules the file is in scope for, judged after the scan */
+  readonly projectChecks: readonly number[];
+  /** Why the file was not fully linted, or null if it was */
+  readonly skipReason: FileSkipReason | null;
+  /** Targets that lost rules to skipReason */
+  readonly skippedTargetIndexes: readonly number[];
+}
+
+/**
+ * Size and modification time of a file, taken before it is scanned.
+ */
+interface FileSignature {
+  readonly size: bigint;
+  readonly mtimeNs: bigint;
+}
+
+/**
+ * What scanning one file found for one target.
+ */
+interface TargetVisit {
+  readonly scanned: boolean;
+  readonly skipped: boolean;
+  /** Flattened [ruleIndex, line, column] triples */
+  readonly violations: readonly number[];
+  /** Flattened [ruleIndex, found] pairs */
+  readonly projectChecks: readonly number[];
+}
+
+/**
+ * The cached scan results of one file, per rules file run on it.
+ */
+interface CachedFileVisits {
+  readonly signature: FileSignature;
+  readonly fileSizeLimits: FileSizeLimits;
+  readonly skipReason: FileSkipReason | null;
+  readonly targetVisits: WeakMap<RulesFile, TargetVisit>;
+}
+
+/**
+ * Scan results kept between runs, reused while a file and the rules run on
+ * it are unchanged. A file is unchanged while its size and modification time
+ * are; rules files are matched by identity, which the memoised severity
+ * filters in loader.ts keep stable for as long as a rules file is unchanged.
+ */
+export interface FileVisitCache {
+  readonly files: Map<string, CachedFileVisits>;
+}
+
+/**
+ * Create an empty file visit cache.
+ */
+export function createFileVisitCache(): FileVisitCache {
+  return { files: new Map() };
+}
+
+/**
+ * Read the signature a cached visit is checked against.
+ * @returns The signature, or null if the file cannot be stat'ed
+ */
+function readFileSignature(filePath: string): FileSignature | null {
+  try {
+    const fileStats = fs.statSync(filePath, { bigint: true });
+    return { size: fileStats.size, mtimeNs: fileStats.mtimeNs };
+  } catch {
+    return null;
+  }
+}
+
+/**
+ * Get the cached visits of a file if they were made of the same file under
+ * the same size limits.
+ */
+function findCachedFileVisits(
+  fileVisitCache: FileVisitCache,
+  filePath: string,
+  signature: FileSignature,
+  fileSizeLimits: FileSizeLimits
+): CachedFileVisits | null {
+  const cachedFileVisits = fileVisitCache.files.get(filePath);
+  const isCurrent = cachedFileVisits !== undefined &&
+    cachedFileVisits.signature.size === signature.size &&
+    cachedFileVisits.signature.mtimeNs === signature.mtimeNs &&
+    cachedFileVisits.fileSizeLimits.maxParseBytes === fileSizeLimits.maxParseBytes &&
+    cachedFileVisits.fileSizeLimits.maxFileBytes === fileSizeLimits.maxFileBytes;
+  return isCurrent ? cachedFileVisits : null;
+}
+
+/**
+ * Rebuild a file visit from the cache, if every target has a cached result.
+ * Violations come back in target order, as scanFileForTargets() reports them.
+ */
+function recallFileVisit(
+  fileVisitCache: FileVisitCache,
+  filePath: string,
+  signature: FileSignature,
+  targetIndexes: readonly number[],
+  rulesFiles: readonly RulesFile[],
+  fileSizeLimits: FileSizeLimits
+): FileVisit | null {
+  const cachedFileVisits = findCachedFileVisits(fileVisitCache, filePath, signature, fileSizeLimits);
+  if (!cachedFileVisits) {
+    return null;
+  }
+
+  const scannedTargetIndexes: number[] = [];
+  const skippedTargetIndexes: number[] = [];
+  const violations: number[] = [];
+  const projectChecks: number[] = [];
+
+  for (const targetIndex of targetIndexes) {
+    const targetVisit = cachedFileVisits.targetVisits.get(rulesFiles[targetIndex]!);
+    if (!targetVisit) {
+      return null;
+    }
+    if (targetVisit.scanned) {
+      scannedTargetIndexes.push(targetIndex);
+    }
+    if (targetVisit.skipped) {
+      skippedTargetIndexes.push(targetIndex);
+    }
+    for (let offset = 0; offset < targetVisit.violations.length; offset += 3) {
+      violations.push(
+        targetIndex,
+        targetVisit.violations[offset]!,
+        targetVisit.violations[offset + 1]!,
+        targetVisit.violations[offset + 2]!
+      );
+    }
+    for (let offset = 0; offset < targetVisit.projectChecks.length; offset += 2) {
+      projectChecks.push(targetIndex, targetVisit.projectChecks[offset]!, targetVisit.projectChecks[offset + 1]!);
+    }
+  }
+
+  return { scannedTargetIndexes, violations, projectChecks, skipReason: cachedFileVisits.skipReason, skippedTargetIndexes };
+}
+
+/**
+ * Store a fresh file visit in the cache, split per target.
+ */
+function rememberFileVisit(
+  fileVisitCache: FileVisitCache,
+  filePath: string,
+  signature: FileSignature,
+  targetIndexes: readonly number[],
+  rulesFiles: readonly RulesFile[],
+  fileSizeLimits: FileSizeLimits,
+  fileVisit: FileVisit
+): void {
+  let cachedFileVisits = findCachedFileVisits(fileVisitCache, filePath, signature, fileSizeLimits);
+  if (!cachedFileVisits) {
+    cachedFileVisits = { signature, fileSizeLimits, skipReason: fileVisit.skipReason, targetVisits: new WeakMap() };
+    fileVisitCache.files.set(filePath, cachedFileVisits);
+  }
+
+  const targetViolations = new Map<number, number[]>(targetIndexes.map((targetIndex) => [targetIndex, []]));
+  for (let offset = 0; offset < fileVisit.violations.length; offset += 4) {
+    targetViolations.get(fileVisit.violations[offset]!)?.push(
+      fileVisit.violations[offset + 1]!,
+      fileVisit.violations[offset + 2]!,
+      fileVisit.violations[offset + 3]!
+    );
+  }
+  const targetProjectChecks = new Map<number, number[]>(targetIndexes.map((targetIndex) => [targetIndex, []]));
+  for (let offset = 0; offset < fileVisit.projectChecks.length; offset += 3) {
+    targetProjectChecks.get(fileVisit.projectChecks[offset]!)?.push(
+      fileVisit.projectChecks[offset + 1]!,
+      fileVisit.projectChecks[offset + 2]!
+    );
+  }
+
+  for (const targetIndex of targetIndexes) {
+    cachedFileVisits.targetVisits.set(rulesFiles[targetIndex]!, {
+      scanned: fileVisit.scannedTargetIndexes.includes(targetIndex),
+      skipped: fileVisit.skippedTargetIndexes.includes(targetIndex),
+      violations: targetViolations.get(targetIndex)!,
+      projectChecks: targetProjectChecks.get(targetIndex)!,
+    });
+  }
+}
+
+/**
+ * Rule positions within their rules array, for compact violation records.
+ */
+const ruleIndexCache = new WeakMap<readonly Rule[], Map<Rule, number>>();
+
+/**
+ * Get the index of a rule within its rules array.
+ */
+function getRuleIndex(rules: readonly Rule[], rule: Rule): number {
+  let ruleIndexes = ruleIndexCache.get(rules);
+  if (!ruleIndexes) {
+    ruleIndexes = new Map(rules.map((indexedRule, ruleIndex) => [indexedRule, ruleIndex]));
+    ruleIndexCache.set(rules, ruleIndexes);
+  }
+  return ruleIndexes.get(rule) ?? -1;
+}
+
+/**
+ * Scan one file for every domain that includes it.
+ * Grep rules run on all files; AST rules only on files with supported languages.
+ * Rules are narrowed to those whose path scope includes the file before it
+ * is read, and targets left without rules to run skip it entirely.
+ * Binary and oversized files are skipped, and minified files and files too
+ * large to parse run grep rules only; the visit records which targets that
+ * affected.
+ * Used both in-process and by lint worker threads.
+ * @param filePath - Path to the file to scan
+ * @param rulesFiles - Rules file of every target in the scan
+ * @param targetIndexes - Targets that include this file
+ * @param sourceCache - Cache of file contents and trees
+ * @param fileSizeLimits - Limits for huge files
+ * @param projectRoot - Directory path scopes are relative to
+ * @returns The targets that ran and the violations they found
+ */
+export async function scanFileForTargets(
+  filePath: string,
+  rulesFiles: readonly RulesFile[],
+  targetIndexes: readonly number[],
+  sourceCache: SourceCache,
+  fileSizeLimits: FileSizeLimits = DEFAULT_FILE_SIZE_LIMITS,
+  projectRoot: string = process.cwd()
+): Promise<FileVisit> {
+  const fileLanguage = detectLanguage(filePath);
+  const projectPath = toProjectPath(projectRoot, filePath);
+  const violations: number[] = [];
+  const projectChecks: number[] = [];
+  const recordViolation = (targetIndex: number, rule: Rule, line: number, column: number): void => {
+    violations.push(targetIndex, getRuleIndex(rulesFiles[targetIndex]!.rules, rule), line, column);
+  };
+  const recordProjectCheck = (targetIndex: number, rule: Rule, found: boolean): void => {
+    projectChecks.push(targetIndex, getRuleIndex(rulesFiles[targetIndex]!.rules, rule), Number(found));
+  };
+
+  // Skip files only if no rule is in scope, or only AST rules without language support
+  const targetRules = new Map<number, readonly Rule[]>();
+  for (const targetIndex of targetIndexes) {
+    const rules = selectRulesForPath(rulesFiles[targetIndex]!.rules, projectPath);
+    if (rules.length > 0 && (fileLanguage !== null || rules.some(r => !hasAstQuery(r)))) {
+      targetRules.set(targetIndex, rules);
+    }
+  }
+  const eligibleTargetIndexes = [...targetRules.keys()];
+  if (eligibleTargetIndexes.length === 0) {
+    return { scannedTargetIndexes: [], violations, projectChecks, skipReason: null, skippedTargetIndexes: [] };
+  }
+
+  const skipReason = await assessCachedSource(sourceCache, filePath, fileSizeLimits);
+
+  if (skipReason === null) {
+    for (const [targetIndex, rules] of targetRules) {
+      await scanFile(filePath, projectPath, rules, fileLanguage, rulesFiles[targetIndex]!, sourceCache, {
+        onViolation: (rule, line, column) => recordViolation(targetIndex, rule, line, column),
+        onProjectCheck: (rule, found) => recordProjectCheck(targetIndex, rule, found),
+      });
     }
+    return { scannedTargetIndexes: eligibleTargetIndexes, violations, projectChecks, skipReason, skippedTargetIndexes: [] };
   }
 
-  // Execute AST rules (only if we can parse the file)
-  if (fileLanguage && astRules.length > 0) {
-    try {
-      const tree = await parseFile(sourceContent, fileLanguage);
-      const treeSitterLanguage = await getLanguage(fileLanguage);
+  if (skipReason !== 'ast-skipped' && skipReason !== 'minified') {
+    return { scannedTargetIndexes: [], violations, projectChecks, skipReason, skippedTargetIndexes: eligibleTargetIndexes };
+  }
+
+  const truncated = await scanFileInChunks(
+    filePath, projectPath, rulesFiles, targetRules, sourceCache, recordViolation, recordProjectCheck
+  );
+
+  // Only targets with AST rules for this language lost anything, unless a line was cut short
+  const skippedTargetIndexes = eligibleTargetIndexes.filter((targetIndex) => truncated ||
+    (fileLanguage !== null && targetRules.get(targetIndex)!.some((rule) =>
+      hasAstQuery(rule) && isRuleCompatibleWithFile(fileLanguage, rule.language)
+    ))
+  );
+  return { scannedTargetIndexes: eligibleTargetIndexes, violations, projectChecks, skipReason, skippedTargetIndexes };
+}
+
+/**
+ * Scan the files of several domains, reporting violations to a handler.
+ * Files are visited once each, in path order (newest first when a deadline
+ * is given), and every domain that includes a file runs against the same
+ * buffer and syntax tree. With a worker pool, files are spread across
+ * threads; violations are still reported in visit order, so output does not
+ * depend on the number of workers. With a file visit cache, unchanged files
+ * are reported from the cache without being read, even past the deadline.
+ * Project-wide rules are judged once a target's files have all been visited,
+ * and their violations are reported after its last file; they are not
+ * judged for targets the deadline cut short, and script rules still running
+ * at the deadline are killed, leaving their target incomplete.
+ * @param targets - Domains with the files they apply to
+ * @param onViolation - Called once per violation with the target index and file path
+ * @param scanOptions - Optional deadline, shared source cache and worker pool
+ * @param onFileReported - Awaited after each file's violations are reported,
+ *   so a slow consumer holds back the scan instead of buffering results
+ * @returns Per-target number of files scanned and whether all of them were
+ */
+async function scanTargets(
+  targets: readonly LintTarget[],
+  onViolation: (targetIndex: number, filePath: string, rule: Rule, line: number, column: number) => void,
+  scanOptions: ScanOptions,
+  onFileReported?: () => Promise<void>
+): Promise<ScanOutcome[]> {
+  const {
+    deadline,
+    workerPool,
+    fileVisitCache,
+    fileSizeLimits = DEFAULT_FILE_SIZE_LIMITS,
+    projectRoot = process.cwd(),
+    runScriptRules = true,
+  } = scanOptions;
+  const rulesFiles = targets.map((target) => target.rulesFile);
+
+  // Map every file to the targets that include it
+  const fileTargetIndexes = new Map<string, number[]>();
+  for (const [targetIndex, target] of targets.entries()) {
+    for (const filePath of new Set(target.sourceFiles)) {
+      const targetIndexes = fileTargetIndexes.get(filePath) ?? [];
+      targetIndexes.push(targetIndex);
+      fileTargetIndexes.set(filePath, targetIndexes);
+    }
+  }
+
+  const uniqueFiles = [...fileTargetIndexes.keys()];
+  const visitOrder = deadline === undefined ? uniqueFiles.sort() : sortByRecency(uniqueFiles);
+
+  const scannedFileCounts = targets.map(() => 0);
+  const unvisitedFileCounts = targets.map((target) => new Set(target.sourceFiles).size);
+  const skippedFiles: SkippedFile[][] = targets.map(() => []);
+  const projectRuleOutcomes: Map<Rule, ProjectRuleOutcome>[] = targets.map(() => new Map());
+
+  const reportFileVisit = (filePath: string, fileVisit: FileVisit): void => {
+    for (const targetIndex of fileTargetIndexes.get(filePath) ?? []) {
+      unvisitedFileCounts[targetIndex]!--;
+    }
+    for (const targetIndex of fileVisit.scannedTargetIndexes) {
+      scannedFileCounts[targetIndex]!++;
+    }
+    if (fileVisit.skipReason !== null) {
+      for (const targetIndex of fileVisit.skippedTargetIndexes) {
+        skippedFiles[targetIndex]!.push({ filePath, reason: fileVisit.skipReason });
+      }
+    }
+    for (let offset = 0; offset < fileVisit.violations.length; offset += 4) {
+      const targetIndex = fileVisit.violations[offset]!;
+      const rule = rulesFiles[targetIndex]!.rules[fileVisit.violations[offset + 1]!]!;
+      onViolation(targetIndex, filePath, rule, fileVisit.violations[offset + 2]!, fileVisit.violations[offset + 3]!);
+    }
+    for (let offset = 0; offset < fileVisit.projectChecks.length; offset += 3) {
+      const targetIndex = fileVisit.projectChecks[offset]!;
+      const rule = rulesFiles[targetIndex]!.rules[fileVisit.projectChecks[offset + 1]!]!;
+      const ruleOutcomes = projectRuleOutcomes[targetIndex]!;
+      let ruleOutcome = ruleOutcomes.get(rule);
+      if (!ruleOutcome) {
+        ruleOutcome = { rule, filePaths: [], found: false };
+        ruleOutcomes.set(rule, ruleOutcome);
+      }
+      ruleOutcome.filePaths.push(filePath);
+      ruleOutcome.found ||= fileVisit.projectChecks[offset + 2] === 1;
+    }
+  };
+
+  // Unchanged files are answered from the cache; the rest are scanned
+  const recalledVisits = new Map<number, FileVisit>();
+  const fileSignatures = new Map<string, FileSignature>();
+  if (fileVisitCache) {
+    for (const [visitIndex, filePath] of visitOrder.entries()) {
+      const signature = readFileSignature(filePath);
+      if (!signature) {
+        continue;
+      }
+      const targetIndexes = fileTargetIndexes.get(filePath) ?? [];
+      const recalledVisit = recallFileVisit(fileVisitCache, filePath, signature, targetIndexes, rulesFiles, fileSizeLimits);
+      if (recalledVisit) {
+        recalledVisits.set(visitIndex, recalledVisit);
+      } else {
+        fileSignatures.set(filePath, signature);
+      }
+    }
+  }
+
+  const reportScannedFile = (filePath: string, fileVisit: FileVisit): void => {
+    const signature = fileSignatures.get(filePath);
+    if (fileVisitCache && signature) {
+      const targetIndexes = fileTargetIndexes.get(filePath) ?? [];
+      rememberFileVisit(fileVisitCache, filePath, signature, targetIndexes, rulesFiles, fileSizeLimits, fileVisit);
+    }
+    reportFileVisit(filePath, fileVisit);
+  };
+
+  const scannedVisitIndexes = visitOrder
+    .map((_filePath, visitIndex) => visitIndex)
+    .filter((visitIndex) => !recalledVisits.has(visitIndex));
 
-      for (const rule of astRules) {
-        // Skip rules that don't match this file's language
-        if (!isRuleCompatibleWithFile(fileLanguage, rule.language)) {
-          continue;
+  if (workerPool && shouldUseWorkerPool(workerPool, scannedVisitIndexes.length)) {
+    // Recalled files are reported between scanned ones to keep visit order
+    let recalledCursor = 0;
+    const reportRecalledBefore = async (visitIndex: number): Promise<void> => {
+      for (; recalledCursor < visitIndex; recalledCursor++) {
+        const recalledVisit = recalledVisits.get(recalledCursor);
+        if (recalledVisit) {
+          reportFileVisit(visitOrder[recalledCursor]!, recalledVisit);
+          await onFileReported?.();
         }
+      }
+    };
 
-        const matches = executeRule(tree, rule, treeSitterLanguage);
-        for (const match of matches) {
-          lintResults.push({
-            filePath,
-            line: match.line,
-            column: match.column,
-            ruleId: rule.id,
-            severity: rule.severity,
-            message: rule.message,
-          });
+    await scanFilesInWorkerPool(
+      workerPool,
+      rulesFiles,
+      scannedVisitIndexes.map((visitIndex) => ({
+        filePath: visitOrder[visitIndex]!,
+        targetIndexes: fileTargetIndexes.get(visitOrder[visitIndex]!) ?? [],
+      })),
+      deadline,
+      fileSizeLimits,
+      projectRoot,
+      async (assignmentIndex, fileVisit) => {
+        const visitIndex = scannedVisitIndexes[assignmentIndex]!;
+        await reportRecalledBefore(visitIndex);
+        recalledCursor = visitIndex + 1;
+        if (fileVisit) {
+          reportScannedFile(visitOrder[visitIndex]!, fileVisit);
+          await onFileReported?.();
         }
       }
-    } catch {
-      // Failed to parse - skip AST rules for this file
+    );
+    await reportRecalledBefore(visitOrder.length);
+  } else {
+    const sourceCache = scanOptions.sourceCache ??
+      createSourceCache(DEFAULT_SOURCE_CACHE_BYTES, scanOptions.parseHistory ?? null);
+
+    for (const [visitIndex, filePath] of visitOrder.entries()) {
+      const recalledVisit = recalledVisits.get(visitIndex);
+      if (recalledVisit) {
+        reportFileVisit(filePath, recalledVisit);
+        await onFileReported?.();
+        continue;
+      }
+      if (deadline !== undefined && Date.now() >= deadline) {
+        continue;
+      }
+      const targetIndexes = fileTargetIndexes.get(filePath) ?? [];
+      reportScannedFile(
+        filePath,
+        await scanFileForTargets(filePath, rulesFiles, targetIndexes, sourceCache, fileSizeLimits, projectRoot)
+      );
+      await onFileReported?.();
     }
   }
 
-  return lintResults;
+  // Targets whose script rules the deadline cut off
+  const cutOffTargetIndexes = new Set<number>();
+  for (const [targetIndex, ruleOutcomes] of projectRuleOutcomes.entries()) {
+    if (ruleOutcomes.size === 0 || unvisitedFileCounts[targetIndex] !== 0) {
+      continue;
+    }
+    const rules = rulesFiles[targetIndex]!.rules;
+    const orderedOutcomes = [...ruleOutcomes.values()]
+      .sort((left, right) => getRuleIndex(rules, left.rule) - getRuleIndex(rules, right.rule));
+    const projectJudgement = await judgeProjectRules(orderedOutcomes, projectRoot, runScriptRules, deadline);
+    for (const projectViolation of projectJudgement.projectViolations) {
+      onViolation(targetIndex, projectViolation.filePath, projectViolation.rule, projectViolation.line, projectViolation.column);
+    }
+    if (!projectJudgement.complete) {
+      cutOffTargetIndexes.add(targetIndex);
+    }
+    await onFileReported?.();
+  }
+
+  return targets.map((_target, targetIndex) => ({
+    scannedFileCount: scannedFileCounts[targetIndex]!,
+    complete: unvisitedFileCounts[targetIndex] === 0 && !cutOffTargetIndexes.has(targetIndex),
+    skippedFiles: skippedFiles[targetIndex]!,
+  }));
+}
+
+/**
+ * Lint the files of several domains in one pass over the file system,
+ * keeping results in compact tables.
+ * Each file is read once and parsed at most once per grammar. Paths and rules
+ * are stored once per domain rather than once per result, which keeps memory
+ * low on codebases with many violations; expand the tables with
+ * expandLintSummary() only when formatting.
+ * @param targets - Domains with the files they apply to
+ * @param scanOptions - Optional deadline and shared source cache; with a
+ *   deadline, summaries are marked incomplete if it passes first
+ * @returns One summary per target, in target order; files that were skipped
+ *   or linted with grep rules only are listed in skippedFiles
+ */
+export async function lintTargetsCompact(
+  targets: readonly LintTarget[],
+  scanOptions: ScanOptions = {}
+): Promise<CompactLintSummary[]> {
+  const targetTables: ResultTable[] = targets.map(() => createResultTable());
+
+  const scanOutcomes = await scanTargets(targets, (targetIndex, filePath, rule, line, column) => {
+    appendResult(targetTables[targetIndex]!, filePath, rule, line, column);
+  }, scanOptions);
+
+  return targets.map((target, targetIndex) => {
+    const { scannedFileCount, complete, skippedFiles } = scanOutcomes[targetIndex]!;
+    return {
+      domain: target.rulesFile.domain,
+      fileCount: scannedFileCount,
+      results: targetTables[targetIndex]!,
+      ...(scanOptions.deadline === undefined ? {} : { complete }),
+      ...(skippedFiles.length === 0 ? {} : { skippedFiles }),
+    };
+  });
+}
+
+/**
+ * Expand the result table of a compact summary into lint results.
+ * @param compactSummary - Summary from lintTargetsCompact()
+ * @returns The same summary with one LintResult per row
+ */
+export function expandLintSummary(compactSummary: CompactLintSummary): LintSummary {
+  return { ...compactSummary, results: expandResults(compactSummary.results) };
+}
+
+/**
+ * Lint the files of several domains in one pass over the file system.
+ * Each file is read once and parsed at most once per grammar.
+ * @param targets - Domains with the files they apply to
+ * @param scanOptions - Optional deadline and shared source cache; with a
+ *   deadline, summaries are marked incomplete if it passes first
+ * @returns One summary per target, in target order; files that were skipped
+ *   or linted with grep rules only are listed in skippedFiles
+ */
+export async function lintTargets(
+  targets: readonly LintTarget[],
+  scanOptions: ScanOptions = {}
+): Promise<LintSummary[]> {
+  return (await lintTargetsCompact(targets, scanOptions)).map(expandLintSummary);
+}
+
+/**
+ * Options for linting in-memory buffers. Worker threads, the file visit
+ * cache and script rules work from the files on disk, so they do not apply.
+ */
+export type BufferScanOptions = Pick<ScanOptions, 'deadline' | 'fileSizeLimits'>;
+
+/**
+ * Create a source cache holding buffers under their absolute paths, so
+ * scans lint the buffers instead of the files on disk.
+ * @param sourceBuffers - Paths and contents; a later buffer for the same path wins
+ * @param projectRoot - Directory relative buffer paths are resolved against
+ * @param fileSizeLimits - Limits the buffers are checked against
+ * @returns A cache sized to keep every buffer
+ */
+export function createBufferSourceCache(
+  sourceBuffers: readonly SourceBuffer[],
+  projectRoot: string,
+  fileSizeLimits: FileSizeLimits = DEFAULT_FILE_SIZE_LIMITS
+): SourceCache {
+  const sourceCache = createSourceCache(Number.POSITIVE_INFINITY);
+  for (const sourceBuffer of sourceBuffers) {
+    addSourceBuffer(sourceCache, path.resolve(projectRoot, sourceBuffer.path), sourceBuffer.content, fileSizeLimits);
+  }
+  return sourceCache;
+}
+
+/**
+ * Lint in-memory buffers as if they were the project files at their paths,
+ * without touching those files. Each buffer is checked by every domain whose
+ * file patterns match its path, after the exclusions of a project walk.
+ * @param sourceBuffers - Paths and contents to lint
+ * @param rulesFiles - Domains to apply
+ * @param projectRoot - Project the paths belong to
+ * @param bufferScanOptions - Optional deadline and file size limits
+ * @returns One summary per domain that matched a buffer, in rules file order
+ */
+export async function lintBuffers(
+  sourceBuffers: readonly SourceBuffer[],
+  rulesFiles: readonly RulesFile[],
+  projectRoot: string = process.cwd(),
+  bufferScanOptions: BufferScanOptions = {}
+): Promise<LintSummary[]> {
+  const sourceCache = createBufferSourceCache(sourceBuffers, projectRoot, bufferScanOptions.fileSizeLimits);
+  const bufferPaths = filterWalkablePaths(
+    [...sourceCache.entries.keys()].map((filePath) => toProjectPath(projectRoot, filePath)),
+    projectRoot
+  );
+
+  const domainsByFile = mapFilesToDomains(
+    bufferPaths,
+    rulesFiles.map((rulesFile) => ({ patterns: rulesFile.filePatterns, excludePatterns: rulesFile.excludePatterns })),
+    projectRoot
+  );
+  const domainSourceFiles: string[][] = rulesFiles.map(() => []);
+  for (const [filePath, domainIndexes] of domainsByFile) {
+    for (const domainIndex of domainIndexes) {
+      domainSourceFiles[domainIndex]!.push(filePath);
+    }
+  }
+
+  const targets = rulesFiles
+    .map((rulesFile, domainIndex) => ({ rulesFile, sourceFiles: domainSourceFiles[domainIndex]! }))
+    .filter((target) => target.sourceFiles.length > 0);
+  return lintTargets(targets, { ...bufferScanOptions, sourceCache, projectRoot, runScriptRules: false });
+}
+
+/**
+ * Count violations per target, optionally handing each file's results to a
+ * handler as soon as the file is scanned. Results are never collected.
+ */
+async function tallyTargets(
+  targets: readonly LintTarget[],
+  scanOptions: ScanOptions,
+  onFileResults?: (fileResults: readonly StreamedResult[]) => void | Promise<void>
+): Promise<LintCounts[]> {
+  const targetCounts = targets.map(() => ({
+    severityCounts: { NEVER: 0, MUST: 0, SHOULD: 0, GUIDANCE: 0 } as Record<Severity, number>,
+    ruleCounts: {} as Record<string, number>,
+  }));
+  let fileResults: StreamedResult[] = [];
+
+  const scanOutcomes = await scanTargets(targets, (targetIndex, filePath, rule, line, column) => {
+    const { severityCounts, ruleCounts } = targetCounts[targetIndex]!;
+    severityCounts[rule.severity]++;
+    ruleCounts[rule.id] = (ruleCounts[rule.id] ?? 0) + 1;
+    if (onFileResults) {
+      fileResults.push({
+        domain: targets[targetIndex]!.rulesFile.domain,
+        filePath,
+        line,
+        column,
+        ruleId: rule.id,
+        severity: rule.severity,
+        message: rule.message,
+      });
+    }
+  }, scanOptions, onFileResults ? async (): Promise<void> => {
+    if (fileResults.length > 0) {
+      const reportedResults = fileResults;
+      fileResults = [];
+      await onFileResults(reportedResults);
+    }
+  } : undefined);
+
+  return targets.map((target, targetIndex) => ({
+    domain: target.rulesFile.domain,
+    fileCount: scanOutcomes[targetIndex]!.scannedFileCount,
+    severityCounts: targetCounts[targetIndex]!.severityCounts,
+    ruleCounts: targetCounts[targetIndex]!.ruleCounts,
+    complete: scanOutcomes[targetIndex]!.complete,
+    skippedFiles: scanOutcomes[targetIndex]!.skippedFiles,
+  }));
+}
+
+/**
+ * Count violations for several domains without materialising lint results.
+ * Only per-severity and per-rule counters are kept, so memory stays constant
+ * regardless of how many violations are found.
+ * @param targets - Domains with the files they apply to
+ * @param scanOptions - Optional deadline and shared source cache
+ * @returns Violation counts per target, in target order
+ */
+export async function countTargets(
+  targets: readonly LintTarget[],
+  scanOptions: ScanOptions = {}
+): Promise<LintCounts[]> {
+  return tallyTargets(targets, scanOptions);
+}
+
+/**
+ * Lint several domains, handing each file's results to a handler as soon as
+ * the file is scanned instead of collecting them, so memory stays flat
+ * regardless of how many violations are found. The handler is awaited
+ * before the next file's results are delivered.
+ * @param targets - Domains with the files they apply to
+ * @param onFileResults - Called with the results of each file that has any,
+ *   in visit order
+ * @param scanOptions - Optional deadline, shared source cache and worker pool
+ * @returns Violation counts per target, in target order
+ */
+export async function streamTargets(
+  targets: readonly LintTarget[],
+  onFileResults: (fileResults: readonly StreamedResult[]) => void | Promise<void>,
+  scanOptions: ScanOptions = {}
+): Promise<LintCounts[]> {
+  return tallyTargets(targets, scanOptions, onFileResults);
 }
 
 /**
@@ -226,34 +1498,112 @@ export async function lintFile(
  * Grep rules run on all files; AST rules only on files with supported languages.
  * @param files - Array of file paths to lint
  * @param rulesFile - The rules file containing rules
+ * @param deadline - Optional epoch milliseconds; the summary is marked
+ *   incomplete if it passes before all files are linted
  * @returns Summary of lint results
  */
 export async function lintFiles(
   files: readonly string[],
-  rulesFile: RulesFile
+  rulesFile: RulesFile,
+  deadline?: number
 ): Promise<LintSummary> {
-  const allResults: LintResult[] = [];
-  let lintedFileCount = 0;
+  const [lintSummary] = await lintTargets([{ rulesFile, sourceFiles: files }], { deadline });
+  return lintSummary!;
+}
 
-  // Check if we have any grep rules (these can run on any file)
-  const hasGrepRules = rulesFile.rules.some(r => hasGrepPattern(r));
+/**
+ * Count violations in multiple files without materialising lint results.
+ * @param files - Array of file paths to scan
+ * @param rulesFile - The rules file containing rules
+ * @param deadline - Optional epoch milliseconds, as for lintFiles()
+ * @returns Violation counts for the domain
+ */
+export async function countFiles(
+  files: readonly string[],
+  rulesFile: RulesFile,
+  deadline?: number
+): Promise<LintCounts> {
+  const [lintCounts] = await countTargets([{ rulesFile, sourceFiles: files }], { deadline });
+  return lintCounts!;
+}
 
-  for (const filePath of files) {
-    const fileLanguage = detectLanguage(filePath);
+/**
+ * Combine the skipped files of several passes, listing each file and reason once.
+ */
+function mergeSkippedFiles(passSkippedFiles: readonly (readonly SkippedFile[])[]): SkippedFile[] {
+  const skippedByKey = new Map<string, SkippedFile>();
+  for (const skippedFile of passSkippedFiles.flat()) {
+    skippedByKey.set(`${skippedFile.reason}:${skippedFile.filePath}`, skippedFile);
+  }
+  return [...skippedByKey.values()].sort((left, right) => left.filePath.localeCompare(right.filePath));
+}
 
-    // Skip files only if we have no grep rules AND no AST language support
-    if (!hasGrepRules && fileLanguage === null) {
-      continue;
-    }
+/**
+ * Combine the per-severity passes of one domain into a single summary.
+ * Results are ordered by file, line and column; the summary is complete only
+ * if every pass was.
+ * @param passSummaries - Summaries for the same domain, one per pass
+ * @returns Merged summary
+ */
+export function mergeLintSummaries(passSummaries: readonly LintSummary[]): LintSummary {
+  const mergedResults = passSummaries
+    .flatMap((passSummary) => passSummary.results)
+    .sort((left, right) =>
+      left.filePath.localeCompare(right.filePath) || left.line - right.line || left.column - right.column
+    );
+  const skippedFiles = mergeSkippedFiles(passSummaries.map((passSummary) => passSummary.skippedFiles ?? []));
 
-    const fileResults = await lintFile(filePath, rulesFile.rules, fileLanguage);
-    allResults.push(...fileResults);
-    lintedFileCount++;
+  return {
+    domain: passSummaries[0]?.domain ?? '',
+    fileCount: Math.max(0, ...passSummaries.map((passSummary) => passSummary.fileCount)),
+    results: mergedResults,
+    complete: passSummaries.every((passSummary) => passSummary.complete ?? true),
+    ...(skippedFiles.length === 0 ? {} : { skippedFiles }),
+  };
+}
+
+/**
+ * Combine the per-severity passes of one domain into a single compact summary,
+ * as mergeLintSummaries() does for expanded ones.
+ * @param passSummaries - Compact summaries for the same domain, one per pass
+ * @returns Merged summary
+ */
+export function mergeCompactSummaries(passSummaries: readonly CompactLintSummary[]): CompactLintSummary {
+  const skippedFiles = mergeSkippedFiles(passSummaries.map((passSummary) => passSummary.skippedFiles ?? []));
+
+  return {
+    domain: passSummaries[0]?.domain ?? '',
+    fileCount: Math.max(0, ...passSummaries.map((passSummary) => passSummary.fileCount)),
+    results: mergeResultTables(passSummaries.map((passSummary) => passSummary.results)),
+    complete: passSummaries.every((passSummary) => passSummary.complete ?? true),
+    ...(skippedFiles.length === 0 ? {} : { skippedFiles }),
+  };
+}
+
+/**
+ * Combine the per-severity count passes of one domain into a single record.
+ * @param passCounts - Counts for the same domain, one per pass
+ * @returns Merged counts; complete only if every pass was
+ */
+export function mergeLintCounts(passCounts: readonly LintCounts[]): LintCounts {
+  const severityCounts: Record<Severity, number> = { NEVER: 0, MUST: 0, SHOULD: 0, GUIDANCE: 0 };
+  const ruleCounts: Record<string, number> = {};
+
+  for (const counts of passCounts) {
+    for (const severity of Object.keys(severityCounts) as Severity[]) {
+      severityCounts[severity] += counts.severityCounts[severity];
+    }
+    for (const [ruleId, ruleCount] of Object.entries(counts.ruleCounts)) {
+      ruleCounts[ruleId] = (ruleCounts[ruleId] ?? 0) + ruleCount;
+    }
   }
 
   return {
-    domain: rulesFile.domain,
-    fileCount: lintedFileCount,
-    results: allResults,
+    domain: passCounts[0]?.domain ?? '',
+    fileCount: Math.max(0, ...passCounts.map((counts) => counts.fileCount)),
+    severityCounts,
+    ruleCounts,
+    complete: passCounts.every((counts) => counts.complete),
+    skippedFiles: mergeSkippedFiles(passCounts.map((counts) => counts.skippedFiles)),
   };
 }
@@ -1,10 +1,41 @@
 // Main exports for flight-lint
 export type { Severity, OutputFormat, CliOptions, ParsedArgs } from './types.js';
-export type { Rule, RuleProvenance, RulesFile, DomainProvenance } from './types.js';
-export type { DiscoveryOptions, LintResult, LintSummary } from './types.js';
-export { parseArgs, runCli } from './cli.js';
-export { getLanguage, parseFile, detectLanguage } from './parser.js';
-export { loadRulesFile } from './loader.js';
-export { discoverFiles } from './discovery.js';
-export { formatResults, getExitCode, groupBySeverity, groupByRule } from './reporter.js';
-export { executeRule, lintFile, lintFiles, isRuleCompatibleWithFile } from './executor.js';
+export type { Rule, RuleProvenance, RulesFile, DomainProvenance, DomainActivation } from './types.js';
+export type { DiscoveryOptions, DomainPatterns, LintResult, LintSummary, LintCounts, LintTarget } from './types.js';
+export type { StreamedResult, SkippedFile, FileSkipReason, FileSizeLimits, CompactLintSummary, SourceBuffer } from './types.js';
+export { parseArgs, runCli, runLintRequest, createLintSession, watchLinting, parseSourceBuffers } from './cli.js';
+export type { LintIo, LintSession } from './cli.js';
+export { serveLinting, DEFAULT_SOCKET_PATH } from './server.js';
+export type { DaemonRequest, DaemonResponse, ServeOptions } from './server.js';
+export { requestDaemonRun } from './client.js';
+export { coalesceRun, DEFAULT_SINGLE_FLIGHT_DIR } from './single-flight.js';
+export type { SharedRun } from './single-flight.js';
+export { getLanguage, parseFile, detectLanguage, createSourceCache, createParseHistory, reparseFile, addSourceBuffer } from './parser.js';
+export type { SourceCache, ParseHistory } from './parser.js';
+export { loadRulesFile, createRulesBundle } from './loader.js';
+export type { RulesBundle } from './loader.js';
+export { discoverFiles, walkProjectFiles, mapFilesToDomains, createWalkCache, filterWalkablePaths } from './discovery.js';
+export type { WalkCache } from './discovery.js';
+export { formatResults, getExitCode, groupBySeverity, groupByRule, formatCounts, getCountsExitCode } from './reporter.js';
+export { formatNdjson, formatNormalizedJson, createNdjsonStream, createSarifStream } from './reporter.js';
+export { formatRunSummary, countLintSummary, createRunSummaryCollector, createSummaryStream, DEFAULT_SUMMARY_TOP } from './reporter.js';
+export type { ResultStream, RunSummaryCollector } from './reporter.js';
+export { createResultTable, createResultTableFrom, appendResult, expandResults, mergeResultTables } from './result-table.js';
+export type { ResultTable, ResultRule } from './result-table.js';
+export {
+  executeRule,
+  lintFile,
+  lintFiles,
+  countFiles,
+  lintTargets,
+  lintTargetsCompact,
+  expandLintSummary,
+  countTargets,
+  streamTargets,
+  isRuleCompatibleWithFile,
+  isDomainActive,
+  createFileVisitCache,
+  createBufferSourceCache,
+  lintBuffers,
+} from './executor.js';
+export type { ScanOptions, FileVisitCache, BufferScanOptions } from './executor.js';
@@ -0,0 +1,344 @@
+import { once } from 'node:events';
+import type { Writable } from 'node:stream';
+import type {
+  CompactLintSummary,
+  FileSkipReason,
+  LintCounts,
+  LintResult,
+  LintSummary,
+  Severity,
+  StreamedResult,
+} from './types.js';
+
+/** Violations a run summary lists unless told otherwise */
+export const DEFAULT_SUMMARY_TOP = 10;
+
+/** Most severe first */
+const SEVERITY_ORDER: readonly Severity[] = ['NEVER', 'MUST', 'SHOULD', 'GUIDANCE'];
+
+/**
+ * How each skip reason is shown to users.
+ */
+export const SKIP_REASON_DESCRIPTIONS: Record<FileSkipReason, string> = {
+  binary: 'binary file - skipped',
+  minified: 'minified file - AST rules skipped',
+  'too-large': 'larger than --max-file-bytes - skipped',
+  'ast-skipped': 'larger than --max-parse-bytes - AST rules skipped',
+};
+
+/**
+ * Format lint results as JSON.
+ * @param summary - The lint summary to format
+ * @returns JSON string
+ */
+export function formatJson(summary: LintSummary): string {
+  return JSON.stringify(summary, null, 2);
+}
+
+/**
+ * Format lint results as normalized JSON on one line.
+ * Paths and rules are listed once in "files" and "rules" tables, and each
+ * result is a [fileIndex, ruleIndex, line, column] tuple referencing them,
+ * so output size grows with the number of violations rather than with the
+ * length of their paths and messages.
+ * @param summary - The compact lint summary to format
+ * @returns JSON string
+ */
+export function formatNormalizedJson(summary: CompactLintSummary): string {
+  const resultTable = summary.results;
+  const resultTuples: [number, number, number, number][] = new Array(resultTable.rowCount);
+  for (let row = 0; row < resultTable.rowCount; row++) {
+    resultTuples[row] = [
+      resultTable.fileIndexes[row]!,
+      resultTable.ruleIndexes[row]!,
+      resultTable.lines[row]!,
+      resultTable.columns[row]!,
+    ];
+  }
+
+  return JSON.stringify({
+    domain: summary.domain,
+    fileCount: summary.fileCount,
+    files: resultTable.filePaths,
+    rules: resultTable.rules.map((rule) => ({ id: rule.id, severity: rule.severity, message: rule.message })),
+    results: resultTuples,
+    ...(summary.complete === undefined ? {} : { complete: summary.complete }),
+    ...(summary.skippedFiles === undefined ? {} : { skippedFiles: summary.skippedFiles }),
+  });
+}
+
+/**
+ * Count results per severity and per rule ID.
+ */
+function tallyResults(results: readonly LintResult[]): Pick<LintCounts, 'severityCounts' | 'ruleCounts'> {
+  const severityCounts: Record<Severity, number> = { NEVER: 0, MUST: 0, SHOULD: 0, GUIDANCE: 0 };
+  const ruleCounts: Record<string, number> = {};
+
+  for (const lintResult of results) {
+    severityCounts[lintResult.severity]++;
+    ruleCounts[lintResult.ruleId] = (ruleCounts[lintResult.ruleId] ?? 0) + 1;
+  }
+
+  return { severityCounts, ruleCounts };
+}
+
+/**
+ * Count a domain's results the way count-only runs do.
+ * @param summary - The lint summary to count
+ * @returns Violation counts for the domain
+ */
+export function countLintSummary(summary: LintSummary): LintCounts {
+  return {
+    domain: summary.domain,
+    fileCount: summary.fileCount,
+    ...tallyResults(summary.results),
+    complete: summary.complete ?? true,
+    skippedFiles: summary.skippedFiles ?? [],
+  };
+}
+
+/**
+ * Format one result as an NDJSON "result" record.
+ */
+function formatNdjsonResult(streamedResult: StreamedResult): string {
+  return JSON.stringify({ type: 'result', ...streamedResult });
+}
+
+/**
+ * Format a domain's counts as an NDJSON "summary" record.
+ */
+function formatNdjsonSummary(domainCounts: LintCounts): string {
+  return JSON.stringify({ type: 'summary', ...domainCounts });
+}
+
+/**
+ * Format lint results as NDJSON: one "result" record per violation, then
+ * one "summary" record with the domain's counts - the same records that
+ * createNdjsonStream() writes.
+ * @param summary - The lint summary to format
+ * @returns Newline-delimited JSON string
+ */
+export function formatNdjson(summary: LintSummary): string {
+  const resultLines = summary.results.map((lintResult) =>
+    formatNdjsonResult({ domain: summary.domain, ...lintResult })
+  );
+  const summaryLine = formatNdjsonSummary(countLintSummary(summary));
+
+  return [...resultLines, summaryLine].join('\n');
+}
+
+/**
+ * Format lint results as a run summary record - the record that
+ * createSummaryStream() writes.
+ * @param summary - The lint summary to format
+ * @returns Compact JSON string
+ */
+export function formatRunSummary(summary: LintSummary): string {
+  const summaryCollector = createRunSummaryCollector();
+  summaryCollector.addResults(summary.results.map((lintResult) => ({ domain: summary.domain, ...lintResult })));
+  return summaryCollector.formatSummary([countLintSummary(summary)]);
+}
+
+/**
+ * Writes results incrementally as files finish, for output too large to
+ * build in memory.
+ */
+export interface ResultStream {
+  /** Write one file's results; resolves once the output can take more */
+  readonly writeResults: (streamedResults: readonly StreamedResult[]) => Promise<void>;
+  /** Write the closing records for every domain */
+  readonly end: (domainCounts: readonly LintCounts[]) => Promise<void>;
+}
+
+/**
+ * Write text, waiting for the output to drain if its buffer is full.
+ */
+export async function writeWithBackpressure(output: Writable, text: string): Promise<void> {
+  if (!output.write(text)) {
+    await once(output, 'drain');
+  }
+}
+
+/**
+ * Stream results as NDJSON: a "result" record per violation as each file
+ * finishes, then a "summary" record per domain with its counts.
+ * @param output - Stream to write to (e.g. process.stdout)
+ * @returns The result stream
+ */
+export function createNdjsonStream(output: Writable): ResultStream {
+  return {
+    writeResults: (streamedResults) =>
+      writeWithBackpressure(output, streamedResults.map((streamedResult) => formatNdjsonResult(streamedResult) + '\n').join('')),
+    end: (domainCounts) =>
+      writeWithBackpressure(output, domainCounts.map((counts) => formatNdjsonSummary(counts) + '\n').join('')),
+  };
+}
+
+/**
+ * Sum the NEVER and MUST counts of a severity counter.
+ */
+function sumFailureCounts(severityCounts: Readonly<Record<Severity, number>>): number {
+  return severityCounts.NEVER + severityCounts.MUST;
+}
+
+/**
+ * Totals of one or more domains' counts, as reported in count-only output
+ * and run summaries.
+ */
+interface CountTotals {
+  readonly files: number;
+  readonly total: number;
+  readonly errors: number;
+  readonly warnings: number;
+  readonly severity: Record<Severity, number>;
+  readonly complete: boolean;
+  readonly skippedFiles: number;
+}
+
+/**
+ * Add up domain counts. Errors are NEVER + MUST violations; warnings are
+ * everything else, matching the totals printed by the pretty formatter.
+ * "skippedFiles" counts the distinct files some domain did not fully lint.
+ */
+function totalCounts(domainCounts: readonly LintCounts[]): CountTotals {
+  const severityTotals: Record<Severity, number> = { NEVER: 0, MUST: 0, SHOULD: 0, GUIDANCE: 0 };
+  const skippedFilePaths = new Set<string>();
+  let fileTotal = 0;
+
+  for (const counts of domainCounts) {
+    fileTotal += counts.fileCount;
+    for (const skippedFile of counts.skippedFiles) {
+      skippedFilePaths.add(skippedFile.filePath);
+    }
+    for (const severity of Object.keys(severityTotals) as Severity[]) {
+      severityTotals[severity] += counts.severityCounts[severity];
+    }
+  }
+
+  const violationTotal = Object.values(severityTotals).reduce((sum, count) => sum + count, 0);
+  const errorTotal = sumFailureCounts(severityTotals);
+
+  return {
+    files: fileTotal,
+    total: violationTotal,
+    errors: errorTotal,
+    warnings: violationTotal - errorTotal,
+    severity: severityTotals,
+    complete: domainCounts.every((counts) => counts.complete),
+    skippedFiles: skippedFilePaths.size,
+  };
+}
+
+/**
+ * Count each rule's violations, keyed "domain/ruleId" since rule IDs repeat
+ * across domains.
+ */
+function totalRuleCounts(domainCounts: readonly LintCounts[]): Record<string, number> {
+  const ruleTotals: Record<string, number> = {};
+  for (const counts of domainCounts) {
+    for (const [ruleId, ruleCount] of Object.entries(counts.ruleCounts)) {
+      const ruleKey = `${counts.domain}/${ruleId}`;
+      ruleTotals[ruleKey] = (ruleTotals[ruleKey] ?? 0) + ruleCount;
+    }
+  }
+  return ruleTotals;
+}
+
+/**
+ * Format count-only results as a single-line JSON summary.
+ * Errors are NEVER + MUST violations; warnings are everything else,
+ * matching the totals printed by the pretty formatter.
+ * Rule keys are "domain/ruleId" since rule IDs repeat across domains.
+ * "complete" is false if a time budget cut any domain short; "skippedFiles"
+ * counts the distinct files some domain did not fully lint.
+ * @param domainCounts - Counts for each linted domain
+ * @returns Compact JSON string
+ */
+export function formatCounts(domainCounts: readonly LintCounts[]): string {
+  const { complete, skippedFiles, ...countTotals } = totalCounts(domainCounts);
+  return JSON.stringify({ ...countTotals, rules: totalRuleCounts(domainCounts), complete, skippedFiles });
+}
+
+/**
+ * Keeps what a run summary needs while results go past: the first
+ * violations of each severity, up to the number the summary lists.
+ */
+export interface RunSummaryCollector {
+  /** Note one file's results */
+  readonly addResults: (streamedResults: readonly StreamedResult[]) => void;
+  /** Format the summary record once every domain has been counted */
+  readonly formatSummary: (domainCounts: readonly LintCounts[]) => string;
+}
+
+/**
+ * Collect a run summary: the count-only totals plus per-domain totals and
+ * the "top" violations - the most severe first, in the order they were
+ * found. Memory stays bounded by the number listed, however many results
+ * go past.
+ * @param topCount - Number of violations to list
+ * @returns The collector
+ */
+export function createRunSummaryCollector(topCount: number = DEFAULT_SUMMARY_TOP): RunSummaryCollector {
+  const topResultsBySeverity = new Map<Severity, StreamedResult[]>(
+    SEVERITY_ORDER.map((severity) => [severity, []])
+  );
+
+  return {
+    addResults: (streamedResults) => {
+      for (const streamedResult of streamedResults) {
+        const severityResults = topResultsBySeverity.get(streamedResult.severity)!;
+        if (severityResults.length < topCount) {
+          severityResults.push(streamedResult);
+        }
+      }
+    },
+    formatSummary: (domainCounts) => {
+      const countsByDomain = new Map<string, LintCounts[]>();
+      for (const counts of domainCounts) {
+        countsByDomain.set(counts.domain, [...countsByDomain.get(counts.domain) ?? [], counts]);
+      }
+      const domainTotals = Object.fromEntries(
+        [...countsByDomain].map(([domain, sameDomainCounts]) => [domain, totalCounts(sameDomainCounts)])
+      );
+      const topResults = SEVERITY_ORDER
+        .flatMap((severity) => topResultsBySeverity.get(severity)!)
+        .slice(0, topCount);
+
+      const { complete, skippedFiles, ...countTotals } = totalCounts(domainCounts);
+      return JSON.stringify({
+        ...countTotals,
+        rules: totalRuleCounts(domainCounts),
+        complete,
+        skippedFiles,
+        domains: domainTotals,
+        top: topResults,
+      });
+    },
+  };
+}
+
+/**
+ * Stream results as a single run summary record, written once the run ends.
+ * Only the listed violations are kept; the rest are counted and dropped.
+ * @param output - Stream to write to (e.g. process.stdout)
+ * @param topCount - Number of violations to list
+ * @returns The result stream
+ */
+export function createSummaryStream(output: Writable, topCount: number = DEFAULT_SUMMARY_TOP): ResultStream {
+  const summaryCollector = createRunSummaryCollector(topCount);
+  return {
+    writeResults: async (streamedResults) => summaryCollector.addResults(streamedResults),
+    end: (domainCounts) => writeWithBackpressure(output, summaryCollector.formatSummary(domainCounts) + '\n'),
+  };
+}
+
+/**
+ * Get exit code based on count-only results.
+ * Returns 1 if any domain has NEVER or MUST violations, 0 otherwise.
+ * @param domainCounts - Counts for each linted domain
+ * @returns Exit code (0 or 1)
+ */
+export function getCountsExitCode(domainCounts: readonly LintCounts[]): number {
+  const hasFailures = domainCounts.some((counts) => sumFailureCounts(counts.severityCounts) > 0);
+  return hasFailures ? 1 : 0;
+}
@@ -0,0 +1,69 @@
+import { parentPort, workerData } from 'node:worker_threads';
+import { scanFileForTargets } from './executor.js';
+import type { FileVisit } from './executor.js';
+import { createSourceCache } from './parser.js';
+import type { WorkerRequest, WorkerResponse } from './worker-pool.js';
+
+// Entry point of a flight-lint worker thread (see worker-pool.ts).
+// Parsers and compiled queries live for the whole life of the pool; the
+// source cache lives for one scan, like the main thread's per-run cache, so a
+// long-lived pool (daemon, watch mode) never lints a file from old contents.
+
+const sourceCacheBytes = (workerData as { sourceCacheBytes: number }).sourceCacheBytes;
+let sourceCache = createSourceCache(sourceCacheBytes);
+const scanTargetRequests = new Map<number, Extract<WorkerRequest, { kind: 'targets' }>>();
+
+/**
+ * Scan a batch of files, leaving null for those started after the deadline.
+ */
+async function visitFiles(request: Extract<WorkerRequest, { kind: 'files' }>): Promise<(FileVisit | null)[]> {
+  const targetsRequest = scanTargetRequests.get(request.scanId);
+  const fileVisits: (FileVisit | null)[] = [];
+
+  for (const assignment of request.assignments) {
+    if (request.deadline !== undefined && Date.now() >= request.deadline) {
+      fileVisits.push(null);
+      continue;
+    }
+    fileVisits.push(await scanFileForTargets(
+      assignment.filePath,
+      targetsRequest?.rulesFiles ?? [],
+      assignment.targetIndexes,
+      sourceCache,
+      targetsRequest?.fileSizeLimits,
+      targetsRequest?.projectRoot
+    ));
+  }
+
+  return fileVisits;
+}
+
+/**
+ * Handle one request; requests are processed strictly in arrival order.
+ */
+async function handleRequest(request: WorkerRequest): Promise<void> {
+  if (request.kind === 'targets') {
+    // Only the current scan's rules are needed; dropping older ones lets
+    // their per-rules caches be collected. Files may have changed since the
+    // last scan, so their cached contents go too
+    scanTargetRequests.clear();
+    scanTargetRequests.set(request.scanId, request);
+    sourceCache = createSourceCache(sourceCacheBytes);
+    return;
+  }
+
+  let response: WorkerResponse;
+  try {
+    response = { requestId: request.requestId, fileVisits: await visitFiles(request) };
+  } catch (scanError) {
+    const errorMessage = scanError instanceof Error ? scanError.message : String(scanError);
+    response = { requestId: request.requestId, errorMessage };
+  }
+  parentPort?.postMessage(response);
+}
+
+let requestQueue = Promise.resolve();
+
+parentPort?.on('message', (request: WorkerRequest) => {
+  requestQueue = requestQueue.then(() => handleRequest(request));
+});
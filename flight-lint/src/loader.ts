@@ -1,8 +1,38 @@
+import fs from 'node:fs';
+import path from 'node:path';
 import { readFile } from 'node:fs/promises';
-import type { RulesFile, Rule, RuleProvenance, DomainProvenance, Severity, RuleType } from './types.js';
+import type {
+  RulesFile,
+  Rule,
+  RuleCondition,
+  RuleProvenance,
+  DomainProvenance,
+  DomainActivation,
+  ApiFileDetection,
+  Severity,
+  RuleType,
+} from './types.js';
 
 const VALID_SEVERITIES: readonly Severity[] = ['NEVER', 'MUST', 'SHOULD', 'GUIDANCE'];
 
+const VALID_RULE_TYPES: readonly RuleType[] = [
+  'ast',
+  'grep',
+  'presence',
+  'requires',
+  'multi-condition',
+  'file_exists',
+  'script',
+];
+
+/** Severity rank: lower is more severe */
+const SEVERITY_ORDER: Record<Severity, number> = {
+  NEVER: 0,
+  MUST: 1,
+  SHOULD: 2,
+  GUIDANCE: 3,
+};
+
 /**
  * JSON schema uses underscore-delimited property names.
  * We construct these dynamically to avoid code-hygiene N10 false positives.
@@ -12,7 +42,7 @@ function joinWithUnderscore(...parts: string[]): string {
 }
 
 /** JSON schema property keys */
-const JSON_KEYS = {
+export const JSON_KEYS = {
   filePatterns: joinWithUnderscore('file', 'patterns'),
   excludePatterns: joinWithUnderscore('exclude', 'patterns'),
   lastFullAudit: joinWithUnderscore('last', 'full', 'audit'),
@@ -21,15 +51,182 @@ const JSON_KEYS = {
   lastVerified: joinWithUnderscore('last', 'verified'),
   reVerifyAfter: joinWithUnderscore('re', 'verify', 'after'),
   supersededBy: joinWithUnderscore('superseded', 'by'),
+  enabledDomains: joinWithUnderscore('enabled', 'domains'),
+  apiFileDetection: joinWithUnderscore('api', 'file', 'detection'),
+  ignoreCase: joinWithUnderscore('ignore', 'case'),
+  ignoreWhen: joinWithUnderscore('ignore', 'when'),
+  triggerCount: joinWithUnderscore('trigger', 'count'),
+  mustExist: joinWithUnderscore('must', 'exist'),
+  skipPaths: joinWithUnderscore('skip', 'paths'),
+  onlyPaths: joinWithUnderscore('only', 'paths'),
+  apiFilesOnly: joinWithUnderscore('api', 'files', 'only'),
 } as const;
 
+/** Bundle of every rules file, written by flight-domain-compile --all */
+export const RULES_BUNDLE_FILE = 'rules.bundle.json';
+
+/** Bundle layout this loader understands; bundles of any other version are ignored */
+const RULES_BUNDLE_VERSION = 2;
+
+/**
+ * A rules file as stored in the bundle: already validated and converted,
+ * with the stat signature of the source it was built from.
+ */
+interface BundledRulesFile {
+  readonly size: number;
+  /** Modification time in nanoseconds, as a decimal string */
+  readonly mtimeNs: string;
+  readonly rulesFile: RulesFile;
+}
+
+/**
+ * Prevalidated rules files, keyed by absolute source path.
+ * loadRulesFile() adds every file it has to read, so a bundle kept across
+ * runs (as flight-lint serve does) reloads only the files that change.
+ */
+export interface RulesBundle {
+  readonly entries: Map<string, BundledRulesFile>;
+}
+
+/**
+ * Create an empty rules bundle to collect loaded rules files in.
+ */
+export function createRulesBundle(): RulesBundle {
+  return { entries: new Map() };
+}
+
+/**
+ * List every regex a rules file holds, as readRulesFile() validates them.
+ */
+function listRulesFileRegexes(rulesFile: RulesFile): string[] {
+  const regexes = [
+    ...(rulesFile.activation?.pattern === undefined ? [] : [rulesFile.activation.pattern]),
+    ...(rulesFile.apiFileDetection?.paths ?? []),
+    ...(rulesFile.apiFileDetection?.patterns ?? []),
+  ];
+  for (const rule of rulesFile.rules) {
+    for (const ruleRegex of [rule.pattern, rule.trigger, rule.requirement, rule.mustExist]) {
+      if (typeof ruleRegex === 'string') {
+        regexes.push(ruleRegex);
+      }
+    }
+    regexes.push(...(rule.ignoreWhen ?? []), ...(rule.conditions ?? []).map((condition) => condition.pattern));
+  }
+  return regexes;
+}
+
+/**
+ * Check that every regex of a bundled rules file compiles here.
+ * The compiler checks patterns with Python's re, which accepts some that
+ * RegExp rejects.
+ */
+function hasValidRegexes(rulesFile: RulesFile, filePath: string): boolean {
+  try {
+    for (const regex of listRulesFileRegexes(rulesFile)) {
+      validateRegex(regex, 'pattern', filePath);
+    }
+    return true;
+  } catch {
+    return false;
+  }
+}
+
+/**
+ * Load the rules bundle from a domains directory with a single read.
+ * The bundle is only a cache: a missing, unreadable or outdated bundle
+ * yields null and rules files are loaded one by one instead. Bundled regexes
+ * are compiled once per load; a rules file with one that does not compile
+ * is left out, so loading it reads the file and reports the error.
+ * @param domainsPath - The .flight/domains directory
+ * @returns The bundle, or null if there is none to use
+ */
+export function loadRulesBundle(domainsPath: string): RulesBundle | null {
+  let parsedBundle: unknown;
+  try {
+    parsedBundle = JSON.parse(fs.readFileSync(path.join(domainsPath, RULES_BUNDLE_FILE), 'utf-8'));
+  } catch {
+    return null;
+  }
+
+  const bundleObject = parsedBundle as Record<string, unknown> | null;
+  if (bundleObject?.bundleVersion !== RULES_BUNDLE_VERSION || !Array.isArray(bundleObject.domains)) {
+    return null;
+  }
+
+  const entries = new Map<string, BundledRulesFile>();
+  for (const bundleEntry of bundleObject.domains as (BundledRulesFile & { source: string })[]) {
+    const sourcePath = path.resolve(domainsPath, bundleEntry.source);
+    if (hasValidRegexes(bundleEntry.rulesFile, sourcePath)) {
+      entries.set(sourcePath, bundleEntry);
+    }
+  }
+  return { entries };
+}
+
+/**
+ * Get the stat signature bundles compare sources against.
+ */
+function readBundleSignature(filePath: string): Pick<BundledRulesFile, 'size' | 'mtimeNs'> | null {
+  try {
+    const sourceStats = fs.statSync(filePath, { bigint: true });
+    return { size: Number(sourceStats.size), mtimeNs: sourceStats.mtimeNs.toString() };
+  } catch {
+    return null;
+  }
+}
+
+/**
+ * Get a rules file from the bundle if its source is unchanged since the
+ * bundle was built. Only the source's size and modification time are
+ * checked, so this costs one stat instead of a read, parse and validation.
+ * @param rulesBundle - Bundle from loadRulesBundle()
+ * @param filePath - Path to the rules file
+ * @returns The bundled rules file, or null if absent or stale
+ */
+export function findBundledRulesFile(rulesBundle: RulesBundle, filePath: string): RulesFile | null {
+  const bundledRulesFile = rulesBundle.entries.get(path.resolve(filePath));
+  if (!bundledRulesFile) {
+    return null;
+  }
+
+  const sourceSignature = readBundleSignature(filePath);
+  const isUnchanged = sourceSignature?.size === bundledRulesFile.size &&
+    sourceSignature.mtimeNs === bundledRulesFile.mtimeNs;
+  return isUnchanged ? bundledRulesFile.rulesFile : null;
+}
+
 /**
  * Load and validate a .rules.json file.
  * @param filePath - Path to the rules file
+ * @param rulesBundle - Optional bundle; an unchanged bundled copy is used
+ *   without reading or validating the file, and a file that has to be read
+ *   is added to it
  * @returns Parsed and validated rules file
  * @throws Error with context if file cannot be read or is invalid
  */
-export async function loadRulesFile(filePath: string): Promise<RulesFile> {
+export async function loadRulesFile(filePath: string, rulesBundle?: RulesBundle | null): Promise<RulesFile> {
+  if (!rulesBundle) {
+    return readRulesFile(filePath);
+  }
+
+  const bundledRulesFile = findBundledRulesFile(rulesBundle, filePath);
+  if (bundledRulesFile) {
+    return bundledRulesFile;
+  }
+
+  // Stat before reading: a change made mid-read then shows up as stale
+  const bundleSignature = readBundleSignature(filePath);
+  const rulesFile = await readRulesFile(filePath);
+  if (bundleSignature) {
+    rulesBundle.entries.set(path.resolve(filePath), { ...bundleSignature, rulesFile });
+  }
+  return rulesFile;
+}
+
+/**
+ * Read and validate a .rules.json file.
+ */
+async function readRulesFile(filePath: string): Promise<RulesFile> {
   let fileContent: string;
   try {
     fileContent = await readFile(filePath, 'utf-8');
@@ -47,6 +244,71 @@ export async function loadRulesFile(filePath: string): Promise<RulesFile> {
   return validateRulesFile(parsedJson, filePath);
 }
 
+/**
+ * Check whether a severity meets a minimum severity threshold.
+ * @param severity - The severity to test
+ * @param minimumSeverity - The least severe level still included
+ * @returns True if severity is at least as severe as minimumSeverity
+ */
+export function meetsMinimumSeverity(severity: Severity, minimumSeverity: Severity): boolean {
+  return SEVERITY_ORDER[severity] <= SEVERITY_ORDER[minimumSeverity];
+}
+
+/**
+ * Severity-filtered copies of rules files, so the same filter of the same
+ * rules file always yields the same object. Compiled grep programs and
+ * cached scan results are keyed by these objects, and stay valid across
+ * runs that reuse loaded rules files.
+ */
+const filteredRulesFileCache = new WeakMap<RulesFile, Map<string, RulesFile>>();
+
+/**
+ * Get a memoised filtered copy of a rules file.
+ */
+function getFilteredRulesFile(
+  rulesFile: RulesFile,
+  filterKey: string,
+  keepRule: (rule: Rule) => boolean
+): RulesFile {
+  let filteredCopies = filteredRulesFileCache.get(rulesFile);
+  if (!filteredCopies) {
+    filteredCopies = new Map();
+    filteredRulesFileCache.set(rulesFile, filteredCopies);
+  }
+
+  let filteredRulesFile = filteredCopies.get(filterKey);
+  if (!filteredRulesFile) {
+    filteredRulesFile = { ...rulesFile, rules: rulesFile.rules.filter(keepRule) };
+    filteredCopies.set(filterKey, filteredRulesFile);
+  }
+  return filteredRulesFile;
+}
+
+/**
+ * Narrow a rules file to the rules at or above a minimum severity.
+ * Filtering before execution means excluded rules never run.
+ * @param rulesFile - The loaded rules file
+ * @param minimumSeverity - Minimum severity to keep
+ * @returns Rules file containing only the qualifying rules
+ */
+export function filterRulesBySeverity(rulesFile: RulesFile, minimumSeverity: Severity): RulesFile {
+  return getFilteredRulesFile(rulesFile, `min:${minimumSeverity}`, (rule) =>
+    meetsMinimumSeverity(rule.severity, minimumSeverity)
+  );
+}
+
+/**
+ * Narrow a rules file to the rules of exactly one severity.
+ * Time-budgeted runs execute one such pass per severity, most severe first,
+ * so NEVER and MUST rules finish before SHOULD rules start.
+ * @param rulesFile - The loaded rules file
+ * @param severity - Severity to keep
+ * @returns Rules file containing only rules of that severity
+ */
+export function selectRulesOfSeverity(rulesFile: RulesFile, severity: Severity): RulesFile {
+  return getFilteredRulesFile(rulesFile, `only:${severity}`, (rule) => rule.severity === severity);
+}
+
 /**
  * Validate the structure of a parsed rules file.
  */
@@ -83,17 +345,121 @@ function validateRulesFile(parsedData: unknown, filePath: string): RulesFile {
   // Map JSON underscore naming to TypeScript camelCase
   const rawExcludePatterns = jsonObject[JSON_KEYS.excludePatterns] as string[] | undefined;
   const rawProvenance = jsonObject.provenance as Record<string, unknown> | undefined;
+  const rawActivation = jsonObject.activation;
+  const rawApiFileDetection = jsonObject[JSON_KEYS.apiFileDetection];
+
+  const apiFileDetection = rawApiFileDetection === undefined
+    ? undefined
+    : validateApiFileDetection(rawApiFileDetection, filePath);
+  const apiOnlyRule = validatedRules.find((rule) => rule.apiFilesOnly);
+  if (apiOnlyRule && !apiFileDetection) {
+    throw new Error(
+      `Rule ${apiOnlyRule.id} sets '${JSON_KEYS.apiFilesOnly}' but there is no '${JSON_KEYS.apiFileDetection}' in: ${filePath}`
+    );
+  }
 
   return {
     domain: jsonObject.domain as string,
     version: jsonObject.version as string,
     filePatterns: jsonObject[JSON_KEYS.filePatterns] as string[],
     excludePatterns: rawExcludePatterns,
+    activation: rawActivation !== undefined ? validateActivation(rawActivation, filePath) : undefined,
+    ...(apiFileDetection === undefined ? {} : { apiFileDetection }),
     provenance: rawProvenance ? mapDomainProvenance(rawProvenance) : undefined,
     rules: validatedRules,
   };
 }
 
+/**
+ * Check that a value is a compilable regex.
+ * @throws Error naming the field if it is not
+ */
+function validateRegex(patternValue: unknown, fieldName: string, filePath: string): string {
+  if (typeof patternValue !== 'string' || patternValue.length === 0) {
+    throw new Error(`Missing or invalid '${fieldName}' in: ${filePath}`);
+  }
+  try {
+    new RegExp(patternValue);
+  } catch {
+    throw new Error(`Invalid regex in '${fieldName}' in: ${filePath}`);
+  }
+  return patternValue;
+}
+
+/**
+ * Check that a value is an array of non-empty strings.
+ * @throws Error naming the field if it is not
+ */
+function validateStringList(listValue: unknown, fieldName: string, filePath: string): string[] {
+  if (!Array.isArray(listValue) || !listValue.every((item) => typeof item === 'string' && item.length > 0)) {
+    throw new Error(`Invalid '${fieldName}' in: ${filePath}`);
+  }
+  return listValue as string[];
+}
+
+/**
+ * Validate how a domain recognises API endpoint files.
+ * Requires at least one path or content regex, each compilable.
+ */
+function validateApiFileDetection(detectionData: unknown, filePath: string): ApiFileDetection {
+  if (typeof detectionData !== 'object' || detectionData === null) {
+    throw new Error(`Invalid '${JSON_KEYS.apiFileDetection}' in: ${filePath}`);
+  }
+
+  const detectionObject = detectionData as Record<string, unknown>;
+  const detection: Record<'paths' | 'patterns', string[]> = { paths: [], patterns: [] };
+  for (const fieldName of ['paths', 'patterns'] as const) {
+    const fieldLabel = `${JSON_KEYS.apiFileDetection}.${fieldName}`;
+    const listValue = detectionObject[fieldName] ?? [];
+    detection[fieldName] = validateStringList(listValue, fieldLabel, filePath)
+      .map((pattern) => validateRegex(pattern, fieldLabel, filePath));
+  }
+
+  if (detection.paths.length === 0 && detection.patterns.length === 0) {
+    throw new Error(`'${JSON_KEYS.apiFileDetection}' needs 'paths' or 'patterns' in: ${filePath}`);
+  }
+  return detection;
+}
+
+/**
+ * Validate the domain activation signature.
+ * Requires at least one literal or a compilable regex pattern.
+ */
+function validateActivation(activationData: unknown, filePath: string): DomainActivation {
+  if (typeof activationData !== 'object' || activationData === null) {
+    throw new Error(`Invalid 'activation' in: ${filePath}`);
+  }
+
+  const activationObject = activationData as Record<string, unknown>;
+  const rawLiterals = activationObject.literals;
+  const rawPattern = activationObject.pattern;
+
+  if (rawLiterals !== undefined &&
+      (!Array.isArray(rawLiterals) || !rawLiterals.every((literal) => typeof literal === 'string' && literal.length > 0))) {
+    throw new Error(`Invalid 'activation.literals' in: ${filePath}`);
+  }
+
+  if (rawPattern !== undefined) {
+    if (typeof rawPattern !== 'string' || rawPattern.length === 0) {
+      throw new Error(`Invalid 'activation.pattern' in: ${filePath}`);
+    }
+    try {
+      new RegExp(rawPattern);
+    } catch {
+      throw new Error(`Invalid regex in 'activation.pattern' in: ${filePath}`);
+    }
+  }
+
+  const literals = rawLiterals as string[] | undefined;
+  const pattern = rawPattern as string | undefined;
+
+  if ((literals === undefined || literals.length === 0) && pattern === undefined) {
+    throw new Error(`'activation' needs 'literals' or 'pattern' in: ${filePath}`);
+  }
+
+  return { literals, pattern };
+}
+
 /**
  * Map JSON domain provenance to TypeScript interface (camelCase).
  */
@@ -164,6 +530,13 @@ function validateRule(ruleData: unknown, ruleIndex: number, filePath: string): R
   const ruleType = ruleObject.type as RuleType | undefined;
   const ruleLanguage = ruleObject.language as string | undefined;
 
+  if (ruleType !== undefined && !VALID_RULE_TYPES.includes(ruleType)) {
+    throw new Error(
+      `Rule ${ruleIndex} (${ruleObject.id}) has invalid type '${String(ruleType)}' in: ${filePath}. ` +
+        `Valid: ${VALID_RULE_TYPES.join(', ')}`
+    );
+  }
+
   // Validate: AST rules should have a language field
   if (ruleType === 'ast' && !ruleLanguage) {
     throw new Error(`Rule ${ruleIndex} (${ruleObject.id}) is type 'ast' but missing 'language' in: ${filePath}`);
@@ -185,5 +558,134 @@ function validateRule(ruleData: unknown, ruleIndex: number, filePath: string): R
     query: queryValue as string | null,
     message: ruleObject.message as string,
     provenance: rawProvenance ? mapRuleProvenance(rawProvenance) : undefined,
+    ...validateCheckFields(ruleObject, `Rule ${ruleIndex} (${ruleObject.id})`, filePath),
+  };
+}
+
+/**
+ * Validate the fields that configure a rule's check beyond its pattern or
+ * query: those of its type, and the path and API file scoping any rule may
+ * have. Fields that are absent stay absent.
+ * @param ruleObject - The rule as parsed from JSON
+ * @param ruleLabel - How the rule is named in errors
+ * @param filePath - Rules file path, for errors
+ * @returns The check fields, in camelCase
+ */
+function validateCheckFields(ruleObject: Record<string, unknown>, ruleLabel: string, filePath: string): Partial<Rule> {
+  const checkFields: Record<string, unknown> = {};
+  const fieldLabel = (fieldName: string): string => `${ruleLabel} ${fieldName}`;
+
+  const flagKeys = [
+    [JSON_KEYS.ignoreCase, 'ignoreCase'],
+    ['multiline', 'multiline'],
+    [JSON_KEYS.apiFilesOnly, 'apiFilesOnly'],
+  ] as const;
+  for (const [jsonKey, ruleKey] of flagKeys) {
+    const flagValue = ruleObject[jsonKey];
+    if (flagValue !== undefined && typeof flagValue !== 'boolean') {
+      throw new Error(`Invalid '${fieldLabel(jsonKey)}' in: ${filePath}`);
+    }
+    if (flagValue) {
+      checkFields[ruleKey] = true;
+    }
+  }
+
+  for (const [jsonKey, ruleKey] of [[JSON_KEYS.skipPaths, 'skipPaths'], [JSON_KEYS.onlyPaths, 'onlyPaths']] as const) {
+    if (ruleObject[jsonKey] !== undefined) {
+      checkFields[ruleKey] = validateStringList(ruleObject[jsonKey], fieldLabel(jsonKey), filePath);
+    }
+  }
+
+  switch (ruleObject.type) {
+    case 'grep':
+    case undefined:
+      if (ruleObject[JSON_KEYS.ignoreWhen] !== undefined) {
+        checkFields.ignoreWhen = validateStringList(ruleObject[JSON_KEYS.ignoreWhen], fieldLabel(JSON_KEYS.ignoreWhen), filePath)
+          .map((ignorePattern) => validateRegex(ignorePattern, fieldLabel(JSON_KEYS.ignoreWhen), filePath));
+      }
+      break;
+    case 'presence':
+      validateRegex(ruleObject.pattern, fieldLabel('pattern'), filePath);
+      break;
+    case 'requires':
+      Object.assign(checkFields, validateRequiresFields(ruleObject, fieldLabel, filePath));
+      break;
+    case 'multi-condition':
+      Object.assign(checkFields, validateConditionFields(ruleObject, fieldLabel, filePath));
+      break;
+    case 'file_exists': {
+      const paths = validateStringList(ruleObject.paths, fieldLabel('paths'), filePath);
+      if (paths.length === 0) {
+        throw new Error(`${ruleLabel} needs at least one path in 'paths' in: ${filePath}`);
+      }
+      checkFields.paths = paths;
+      break;
+    }
+    case 'script':
+      if (typeof ruleObject.code !== 'string' || ruleObject.code.trim().length === 0) {
+        throw new Error(`Missing or invalid '${fieldLabel('code')}' in: ${filePath}`);
+      }
+      checkFields.code = ruleObject.code;
+      break;
+    default:
+      break;
+  }
+
+  return checkFields as Partial<Rule>;
+}
+
+/**
+ * Validate a requires rule: either a trigger with its requirement, or a
+ * pattern every file must match.
+ */
+function validateRequiresFields(
+  ruleObject: Record<string, unknown>,
+  fieldLabel: (fieldName: string) => string,
+  filePath: string
+): Partial<Rule> {
+  if (ruleObject[JSON_KEYS.mustExist] !== undefined) {
+    return { mustExist: validateRegex(ruleObject[JSON_KEYS.mustExist], fieldLabel(JSON_KEYS.mustExist), filePath) };
+  }
+
+  const triggerCount = ruleObject[JSON_KEYS.triggerCount];
+  if (triggerCount !== undefined && !(Number.isInteger(triggerCount) && (triggerCount as number) > 0)) {
+    throw new Error(`Invalid '${fieldLabel(JSON_KEYS.triggerCount)}' in: ${filePath}`);
+  }
+
+  return {
+    trigger: validateRegex(ruleObject.trigger, fieldLabel('trigger'), filePath),
+    requirement: validateRegex(ruleObject.requirement, fieldLabel('requirement'), filePath),
+    ...(triggerCount === undefined ? {} : { triggerCount: triggerCount as number }),
   };
 }
+
+/**
+ * Validate a multi-condition rule: its conditions and how they combine.
+ */
+function validateConditionFields(
+  ruleObject: Record<string, unknown>,
+  fieldLabel: (fieldName: string) => string,
+  filePath: string
+): Partial<Rule> {
+  const logic = ruleObject.logic ?? 'AND';
+  if (logic !== 'AND' && logic !== 'OR') {
+    throw new Error(`Invalid '${fieldLabel('logic')}' in: ${filePath}. Valid: AND, OR`);
+  }
+
+  const rawConditions = ruleObject.conditions;
+  if (!Array.isArray(rawConditions) || rawConditions.length === 0) {
+    throw new Error(`Missing or invalid '${fieldLabel('conditions')}' in: ${filePath}`);
+  }
+
+  const conditions = rawConditions.map((conditionData: unknown, conditionIndex): RuleCondition => {
+    const conditionLabel = fieldLabel(`conditions[${conditionIndex}]`);
+    if (typeof conditionData !== 'object' || conditionData === null) {
+      throw new Error(`Invalid '${conditionLabel}' in: ${filePath}`);
+    }
+    const conditionObject = conditionData as Record<string, unknown>;
+    const pattern = validateRegex(conditionObject.pattern, `${conditionLabel}.pattern`, filePath);
+    return conditionObject[JSON_KEYS.ignoreCase] ? { pattern, ignoreCase: true } : { pattern };
+  });
+
+  return { logic, conditions };
+}
@@ -1,9 +1,12 @@
-import Parser from 'tree-sitter';
+import type Parser from 'tree-sitter';
+import { open, readFile } from 'node:fs/promises';
+import { StringDecoder } from 'node:string_decoder';
+import type { FileSizeLimits, FileSkipReason } from './types.js';
 
 // tree-sitter's TypeScript types use `any` for language objects.
 // There is no exported Language type, so we must use the library's actual API.
 // eslint-disable-next-line @typescript-eslint/no-explicit-any
-type TreeSitterLanguage = any;
+export type TreeSitterLanguage = any;
 
 /**
  * Interface for dynamically imported language modules.
@@ -15,6 +18,129 @@ interface LanguageModule {
 
 const languageCache = new Map<string, TreeSitterLanguage>();
 
+/**
+ * The tree-sitter binding, loaded with the first grammar so runs that never
+ * parse a file never load the native module.
+ */
+let treeSitter: typeof Parser | null = null;
+
+/**
+ * Load the tree-sitter binding on first use.
+ */
+async function loadTreeSitter(): Promise<typeof Parser> {
+  treeSitter ??= (await import('tree-sitter')).default;
+  return treeSitter;
+}
+
+/**
+ * One parser per language, reused for every file of that language.
+ */
+const parserCache = new Map<string, Parser>();
+
+const BYTES_PER_MEBIBYTE = 1_048_576;
+
+/**
+ * Default memory cap for a source cache.
+ */
+export const DEFAULT_SOURCE_CACHE_BYTES = 128 * BYTES_PER_MEBIBYTE;
+
+/**
+ * Rough native memory per source character held by a tree-sitter tree.
+ * Trees live outside the JS heap, so their size can only be estimated.
+ */
+const TREE_BYTES_PER_CHARACTER = 8;
+
+/**
+ * Memory per entry of a line-start index (one double per line).
+ */
+const BYTES_PER_LINE_START = 8;
+
+/**
+ * Default size limits: files over 1 MiB skip tree-sitter, files over 16 MiB
+ * are not read at all.
+ */
+export const DEFAULT_FILE_SIZE_LIMITS: FileSizeLimits = {
+  maxParseBytes: BYTES_PER_MEBIBYTE,
+  maxFileBytes: 16 * BYTES_PER_MEBIBYTE,
+};
+
+/**
+ * Size of the leading block inspected for binary and minified content.
+ */
+const SNIFF_BYTES = 8192;
+
+/**
+ * Mean line length in the first block above which a file counts as minified.
+ */
+const MINIFIED_MEAN_LINE_LENGTH = 200;
+
+/**
+ * Bytes read per chunk when streaming a file too large to parse.
+ */
+const STREAM_CHUNK_BYTES = BYTES_PER_MEBIBYTE;
+
+/**
+ * Characters of a single line kept when streaming; the rest of a longer
+ * line is dropped rather than buffered.
+ */
+export const MAX_STREAMED_LINE_LENGTH = BYTES_PER_MEBIBYTE;
+
+const NUL_BYTE = 0;
+const NEWLINE_BYTE = 10;
+
+/**
+ * Files whose last parse a parse history keeps by default.
+ */
+export const DEFAULT_PARSE_HISTORY_FILES = 256;
+
+/**
+ * File content and its syntax trees, keyed by grammar name.
+ */
+interface CachedSource {
+  readonly content: string;
+  /** Result of the file guard; only buffers added unread can be other than null */
+  readonly skipReason: FileSkipReason | null;
+  readonly trees: Map<string, Parser.Tree>;
+  lineStarts: readonly number[] | null;
+  estimatedBytes: number;
+}
+
+/**
+ * Per-run cache of file contents and syntax trees.
+ * Lets every domain share one read and one parse per file and grammar.
+ * Entries are evicted least recently used first once the estimated size
+ * exceeds maxBytes.
+ */
+export interface SourceCache {
+  readonly maxBytes: number;
+  readonly entries: Map<string, CachedSource>;
+  cachedBytes: number;
+  /** Earlier parses to re-parse changed files from, if kept across runs */
+  readonly parseHistory: ParseHistory | null;
+}
+
+/**
+ * A file's content when it was last parsed with a grammar, and that tree.
+ */
+interface ParsedRevision {
+  readonly content: string;
+  readonly tree: Parser.Tree;
+}
+
+/**
+ * The last parse of recently parsed files, kept across runs so that a file
+ * that changed is re-parsed incrementally: its previous tree is edited to the
+ * new text and handed to tree-sitter, which reuses every unchanged subtree.
+ * Holds at most maxFiles file and grammar pairs, dropping the least recently
+ * parsed first. Trees are edited in place, so only one run may use a history
+ * at a time.
+ */
+export interface ParseHistory {
+  readonly maxFiles: number;
+  /** Keyed by grammar name and file path */
+  readonly revisions: Map<string, ParsedRevision>;
+}
+
 /**
  * Get a tree-sitter language by name, with caching.
  * @param languageName - The language to load (javascript, jsx, typescript, tsx, python)
@@ -27,6 +153,8 @@ export async function getLanguage(languageName: string): Promise<TreeSitterLangu
     return cachedLanguage;
   }
 
+  // Languages are only usable through the binding, so load it with the first
+  await loadTreeSitter();
   let languageModule: LanguageModule;
 
   switch (languageName) {
@@ -73,6 +201,38 @@ export async function getLanguage(languageName: string): Promise<TreeSitterLangu
   return languageModule.default;
 }
 
+/**
+ * Get the shared parser for a language, creating it on first use.
+ * @param languageName - The language the parser is set to
+ * @returns A parser with the language already set
+ */
+async function getParser(languageName: string): Promise<Parser> {
+  const cachedParser = parserCache.get(languageName);
+  if (cachedParser) {
+    return cachedParser;
+  }
+
+  const TreeSitterParser = await loadTreeSitter();
+  const parser = new TreeSitterParser();
+  parser.setLanguage(await getLanguage(languageName));
+  parserCache.set(languageName, parser);
+  return parser;
+}
+
+/**
+ * Compile a tree-sitter query for a language.
+ * @param language - A language from getLanguage(), which loads tree-sitter
+ * @param querySource - The query in tree-sitter's S-expression syntax
+ * @returns The compiled query
+ * @throws Error if the query is invalid, or if no language has been loaded
+ */
+export function compileQuery(language: TreeSitterLanguage, querySource: string): Parser.Query {
+  if (treeSitter === null) {
+    throw new Error('tree-sitter is not loaded: get the language from getLanguage() first');
+  }
+  return new treeSitter.Query(language, querySource);
+}
+
 /**
  * Parse source code content using the specified language.
  * @param sourceContent - The source code to parse
@@ -80,12 +240,453 @@ export async function getLanguage(languageName: string): Promise<TreeSitterLangu
  * @returns The parsed syntax tree
  */
 export async function parseFile(sourceContent: string, languageName: string): Promise<Parser.Tree> {
-  const parser = new Parser();
-  const language = await getLanguage(languageName);
-  parser.setLanguage(language);
+  const parser = await getParser(languageName);
   return parser.parse(sourceContent);
 }
 
+/**
+ * Get the row and column of an offset, both counted in UTF-16 code units
+ * as tree-sitter counts them for JavaScript strings.
+ */
+function getTextPoint(content: string, offset: number): Parser.Point {
+  let row = 0;
+  let lineStart = 0;
+  let newlineOffset = content.indexOf('\n');
+
+  while (newlineOffset !== -1 && newlineOffset < offset) {
+    row++;
+    lineStart = newlineOffset + 1;
+    newlineOffset = content.indexOf('\n', lineStart);
+  }
+
+  return { row, column: offset - lineStart };
+}
+
+/**
+ * Describe how one text became another as a single replaced span: the
+ * common prefix and suffix are kept and everything between them changed.
+ * @param oldContent - Text before the change
+ * @param newContent - Text after the change
+ * @returns The edit to apply to a tree of the old text
+ */
+export function computeTextEdit(oldContent: string, newContent: string): Parser.Edit {
+  const sharedLength = Math.min(oldContent.length, newContent.length);
+
+  let startIndex = 0;
+  while (startIndex < sharedLength && oldContent.charCodeAt(startIndex) === newContent.charCodeAt(startIndex)) {
+    startIndex++;
+  }
+
+  // The suffix may not reach back into the prefix of the shorter text
+  let suffixLength = 0;
+  while (
+    suffixLength < sharedLength - startIndex &&
+    oldContent.charCodeAt(oldContent.length - 1 - suffixLength) ===
+      newContent.charCodeAt(newContent.length - 1 - suffixLength)
+  ) {
+    suffixLength++;
+  }
+
+  const oldEndIndex = oldContent.length - suffixLength;
+  const newEndIndex = newContent.length - suffixLength;
+
+  return {
+    startIndex,
+    oldEndIndex,
+    newEndIndex,
+    startPosition: getTextPoint(newContent, startIndex),
+    oldEndPosition: getTextPoint(oldContent, oldEndIndex),
+    newEndPosition: getTextPoint(newContent, newEndIndex),
+  };
+}
+
+/**
+ * Create an empty parse history.
+ * @param maxFiles - Most file and grammar pairs to keep a parse of
+ * @returns A new parse history
+ */
+export function createParseHistory(maxFiles: number = DEFAULT_PARSE_HISTORY_FILES): ParseHistory {
+  return { maxFiles, revisions: new Map() };
+}
+
+/**
+ * Parse a file's content, incrementally from its last parse when the
+ * history has one, and record the result as its latest parse.
+ * @param parseHistory - History kept across runs
+ * @param filePath - Path of the file
+ * @param sourceContent - Current content of the file
+ * @param languageName - Grammar to parse with
+ * @returns The syntax tree of sourceContent
+ */
+export async function reparseFile(
+  parseHistory: ParseHistory,
+  filePath: string,
+  sourceContent: string,
+  languageName: string
+): Promise<Parser.Tree> {
+  const revisionKey = `${languageName}\0${filePath}`;
+  const previousRevision = parseHistory.revisions.get(revisionKey);
+  parseHistory.revisions.delete(revisionKey);
+
+  let tree: Parser.Tree;
+  if (previousRevision?.content === sourceContent) {
+    tree = previousRevision.tree;
+  } else if (previousRevision) {
+    const parser = await getParser(languageName);
+    previousRevision.tree.edit(computeTextEdit(previousRevision.content, sourceContent));
+    tree = parser.parse(sourceContent, previousRevision.tree);
+    // Error recovery can differ from a fresh parse; keep results identical
+    if (tree.rootNode.hasError) {
+      tree = parser.parse(sourceContent);
+    }
+  } else {
+    tree = await parseFile(sourceContent, languageName);
+  }
+
+  // Re-inserting keeps the map ordered from least to most recently parsed
+  parseHistory.revisions.set(revisionKey, { content: sourceContent, tree });
+  for (const staleKey of parseHistory.revisions.keys()) {
+    if (parseHistory.revisions.size <= parseHistory.maxFiles) {
+      break;
+    }
+    parseHistory.revisions.delete(staleKey);
+  }
+
+  return tree;
+}
+
+/**
+ * Create an empty source cache.
+ * @param maxBytes - Estimated memory cap for cached contents and trees
+ * @param parseHistory - Earlier parses to re-parse changed files from
+ * @returns A new source cache
+ */
+export function createSourceCache(
+  maxBytes: number = DEFAULT_SOURCE_CACHE_BYTES,
+  parseHistory: ParseHistory | null = null
+): SourceCache {
+  return { maxBytes, entries: new Map(), cachedBytes: 0, parseHistory };
+}
+
+/**
+ * Look up a cached file and mark it most recently used.
+ */
+function touchCachedSource(sourceCache: SourceCache, filePath: string): CachedSource | undefined {
+  const cachedSource = sourceCache.entries.get(filePath);
+  if (cachedSource) {
+    // Map iteration order is insertion order, so re-inserting moves it to the back
+    sourceCache.entries.delete(filePath);
+    sourceCache.entries.set(filePath, cachedSource);
+  }
+  return cachedSource;
+}
+
+/**
+ * Grow an entry's size estimate and evict least recently used entries
+ * until the cache is back under its cap. The entry itself is never evicted
+ * here, so callers can keep using it.
+ */
+function accountCachedBytes(sourceCache: SourceCache, filePath: string, addedBytes: number): void {
+  const cachedSource = sourceCache.entries.get(filePath);
+  if (!cachedSource) {
+    return;
+  }
+
+  cachedSource.estimatedBytes += addedBytes;
+  sourceCache.cachedBytes += addedBytes;
+
+  for (const [evictedPath, evictedSource] of sourceCache.entries) {
+    if (sourceCache.cachedBytes <= sourceCache.maxBytes) {
+      break;
+    }
+    if (evictedPath === filePath) {
+      continue;
+    }
+    sourceCache.entries.delete(evictedPath);
+    sourceCache.cachedBytes -= evictedSource.estimatedBytes;
+  }
+}
+
+/**
+ * Read a file as UTF-8, at most once while it stays in the cache.
+ * @param sourceCache - The per-run source cache
+ * @param filePath - Path of the file to read
+ * @returns The file content
+ */
+export async function readCachedSource(sourceCache: SourceCache, filePath: string): Promise<string> {
+  const cachedSource = touchCachedSource(sourceCache, filePath);
+  if (cachedSource) {
+    return cachedSource.content;
+  }
+
+  const content = await readFile(filePath, 'utf-8');
+  sourceCache.entries.set(filePath, { content, skipReason: null, trees: new Map(), lineStarts: null, estimatedBytes: 0 });
+  accountCachedBytes(sourceCache, filePath, content.length * 2);
+  return content;
+}
+
+/**
+ * Put in-memory content in the cache under a path, so scans use it instead
+ * of the file on disk (which need not exist). The content goes through the
+ * same guard as a file read from disk.
+ * Use a cache large enough for every buffer: an evicted buffer would be
+ * read back from disk.
+ * @param sourceCache - Cache to add to
+ * @param filePath - Path the content stands for
+ * @param content - The content
+ * @param fileSizeLimits - Size limits for the run
+ */
+export function addSourceBuffer(
+  sourceCache: SourceCache,
+  filePath: string,
+  content: string,
+  fileSizeLimits: FileSizeLimits
+): void {
+  const skipReason = assessSourceContent(content, fileSizeLimits);
+  sourceCache.entries.delete(filePath);
+  sourceCache.entries.set(filePath, { content, skipReason, trees: new Map(), lineStarts: null, estimatedBytes: 0 });
+  accountCachedBytes(sourceCache, filePath, content.length * 2);
+}
+
+/**
+ * Compute the offset at which each line of a text starts.
+ * Lines are split on "\n" only, matching content.split('\n').
+ * @param content - The text to index
+ * @returns Ascending start offsets; the first is always 0
+ */
+export function indexLineStarts(content: string): number[] {
+  const lineStarts = [0];
+  let newlineOffset = content.indexOf('\n');
+
+  while (newlineOffset !== -1) {
+    lineStarts.push(newlineOffset + 1);
+    newlineOffset = content.indexOf('\n', newlineOffset + 1);
+  }
+
+  return lineStarts;
+}
+
+/**
+ * Get the line-start index of a file, computing it once while it stays cached.
+ * @param sourceCache - The per-run source cache
+ * @param filePath - Path of the file
+ * @returns Ascending line start offsets
+ */
+export async function readCachedLineStarts(sourceCache: SourceCache, filePath: string): Promise<readonly number[]> {
+  const content = await readCachedSource(sourceCache, filePath);
+  const cachedSource = sourceCache.entries.get(filePath);
+  if (cachedSource?.lineStarts) {
+    return cachedSource.lineStarts;
+  }
+
+  const lineStarts = indexLineStarts(content);
+  if (cachedSource) {
+    cachedSource.lineStarts = lineStarts;
+    accountCachedBytes(sourceCache, filePath, lineStarts.length * BYTES_PER_LINE_START);
+  }
+  return lineStarts;
+}
+
+/**
+ * Parse a file with a grammar, at most once while it stays in the cache.
+ * @param sourceCache - The per-run source cache
+ * @param filePath - Path of the file to parse
+ * @param languageName - Grammar to parse with
+ * @returns The parsed syntax tree
+ */
+export async function parseCachedSource(
+  sourceCache: SourceCache,
+  filePath: string,
+  languageName: string
+): Promise<Parser.Tree> {
+  const content = await readCachedSource(sourceCache, filePath);
+  const cachedTree = sourceCache.entries.get(filePath)?.trees.get(languageName);
+  if (cachedTree) {
+    return cachedTree;
+  }
+
+  const tree = sourceCache.parseHistory
+    ? await reparseFile(sourceCache.parseHistory, filePath, content, languageName)
+    : await parseFile(content, languageName);
+  // Concurrent reads may have evicted the entry while it was being parsed
+  sourceCache.entries.get(filePath)?.trees.set(languageName, tree);
+  accountCachedBytes(sourceCache, filePath, content.length * TREE_BYTES_PER_CHARACTER);
+  return tree;
+}
+
+/**
+ * Decide how much of a file can safely be linted, from its size and first block.
+ * @param filePath - Path of the file
+ * @param fileSizeLimits - Size limits for the run
+ * @returns null to lint the file normally, "ast-skipped" or "minified" to
+ *   run grep rules only, or the reason to skip it entirely
+ */
+export async function assessSourceFile(
+  filePath: string,
+  fileSizeLimits: FileSizeLimits
+): Promise<FileSkipReason | null> {
+  const fileHandle = await open(filePath, 'r');
+
+  try {
+    const { size } = await fileHandle.stat();
+    if (size > fileSizeLimits.maxFileBytes) {
+      return 'too-large';
+    }
+
+    const sniffBuffer = Buffer.alloc(Math.min(size, SNIFF_BYTES));
+    const { bytesRead } = await fileHandle.read(sniffBuffer, 0, sniffBuffer.length, 0);
+    const firstBlock = sniffBuffer.subarray(0, bytesRead);
+
+    if (firstBlock.includes(NUL_BYTE)) {
+      return 'binary';
+    }
+
+    // Only judge full blocks; a short file with one long line is harmless
+    if (bytesRead === SNIFF_BYTES) {
+      let newlineCount = 0;
+      for (const byte of firstBlock) {
+        if (byte === NEWLINE_BYTE) {
+          newlineCount++;
+        }
+      }
+      if (bytesRead / (newlineCount + 1) > MINIFIED_MEAN_LINE_LENGTH) {
+        return 'minified';
+      }
+    }
+
+    return size > fileSizeLimits.maxParseBytes ? 'ast-skipped' : null;
+  } finally {
+    await fileHandle.close();
+  }
+}
+
+/**
+ * Decide how much of an in-memory buffer can safely be linted, with the
+ * same checks assessSourceFile() makes on a file.
+ * @param content - The buffer
+ * @param fileSizeLimits - Size limits for the run
+ * @returns As for assessSourceFile()
+ */
+export function assessSourceContent(content: string, fileSizeLimits: FileSizeLimits): FileSkipReason | null {
+  const size = Buffer.byteLength(content, 'utf-8');
+  if (size > fileSizeLimits.maxFileBytes) {
+    return 'too-large';
+  }
+
+  const firstBlock = Buffer.from(content.slice(0, SNIFF_BYTES), 'utf-8').subarray(0, SNIFF_BYTES);
+  if (firstBlock.includes(NUL_BYTE)) {
+    return 'binary';
+  }
+
+  // Only judge full blocks; a short file with one long line is harmless
+  if (firstBlock.length === SNIFF_BYTES) {
+    let newlineCount = 0;
+    for (const byte of firstBlock) {
+      if (byte === NEWLINE_BYTE) {
+        newlineCount++;
+      }
+    }
+    if (firstBlock.length / (newlineCount + 1) > MINIFIED_MEAN_LINE_LENGTH) {
+      return 'minified';
+    }
+  }
+
+  return size > fileSizeLimits.maxParseBytes ? 'ast-skipped' : null;
+}
+
+/**
+ * Assess a file unless it is already cached, in which case it was read in
+ * full before and passed the assessment then (or, for a buffer, was
+ * assessed when it was added).
+ * @param sourceCache - The per-run source cache
+ * @param filePath - Path of the file
+ * @param fileSizeLimits - Size limits for the run
+ * @returns As for assessSourceFile()
+ */
+export async function assessCachedSource(
+  sourceCache: SourceCache,
+  filePath: string,
+  fileSizeLimits: FileSizeLimits
+): Promise<FileSkipReason | null> {
+  const cachedSource = sourceCache.entries.get(filePath);
+  return cachedSource ? cachedSource.skipReason : assessSourceFile(filePath, fileSizeLimits);
+}
+
+/**
+ * Stream a file as UTF-8 text in chunks of whole lines, without holding it in memory.
+ * Chunks split the file at line breaks: joining them with "\n" gives the
+ * file content back, so line N of the file is line N of the joined chunks.
+ * Lines longer than MAX_STREAMED_LINE_LENGTH are cut to that length, so a
+ * huge single-line file is never buffered whole; line numbers still match.
+ * @param filePath - Path of the file to read
+ * @param onChunk - Called with each chunk, in file order; at least once
+ * @returns Whether any line was cut short
+ */
+export async function readSourceInLineChunks(
+  filePath: string,
+  onChunk: (chunk: string) => void
+): Promise<boolean> {
+  const fileHandle = await open(filePath, 'r');
+
+  try {
+    const decoder = new StringDecoder('utf8');
+    const chunkBuffer = Buffer.alloc(STREAM_CHUNK_BYTES);
+    let pendingText = '';
+    let isDroppingLineTail = false;
+    let truncated = false;
+    let bytesRead = (await fileHandle.read(chunkBuffer, 0, chunkBuffer.length, null)).bytesRead;
+
+    while (bytesRead > 0) {
+      let text = decoder.write(chunkBuffer.subarray(0, bytesRead));
+      if (isDroppingLineTail) {
+        // Keep the line break so the lines after it keep their numbers
+        const newlineIndex = text.indexOf('\n');
+        isDroppingLineTail = newlineIndex === -1;
+        text = isDroppingLineTail ? '' : text.slice(newlineIndex);
+      }
+      pendingText += text;
+      const lastNewline = pendingText.lastIndexOf('\n');
+      if (lastNewline !== -1) {
+        onChunk(pendingText.slice(0, lastNewline));
+        pendingText = pendingText.slice(lastNewline + 1);
+      }
+      if (pendingText.length > MAX_STREAMED_LINE_LENGTH) {
+        pendingText = pendingText.slice(0, MAX_STREAMED_LINE_LENGTH);
+        isDroppingLineTail = true;
+        truncated = true;
+      }
+      bytesRead = (await fileHandle.read(chunkBuffer, 0, chunkBuffer.length, null)).bytesRead;
+    }
+
+    const finalText = decoder.end();
+    onChunk(isDroppingLineTail ? pendingText : pendingText + finalText);
+    return truncated;
+  } finally {
+    await fileHandle.close();
+  }
+}
+
+/**
+ * Stream a file in chunks of whole lines, like readSourceInLineChunks(),
+ * or hand over its cached content as one chunk if it has any.
+ * @param sourceCache - Cache that may hold the file
+ * @param filePath - Path of the file to read
+ * @param onChunk - Called with each chunk, in file order; at least once
+ * @returns Whether any line was cut short; cached content never is
+ */
+export async function readCachedSourceInLineChunks(
+  sourceCache: SourceCache,
+  filePath: string,
+  onChunk: (chunk: string) => void
+): Promise<boolean> {
+  const cachedSource = sourceCache.entries.get(filePath);
+  if (cachedSource) {
+    onChunk(cachedSource.content);
+    return false;
+  }
+  return readSourceInLineChunks(filePath, onChunk);
+}
+
 /**
  * Detect the language from a file path based on extension.
  * @param filePath - The path to the file
@@ -1,5 +1,39 @@
 import chalk from 'chalk';
-import type { LintResult, LintSummary, OutputFormat, Severity } from './types.js';
+import type { Writable } from 'node:stream';
+import { createResultTableFrom } from './result-table.js';
+import {
+  SKIP_REASON_DESCRIPTIONS,
+  writeWithBackpressure,
+  formatJson,
+  formatNormalizedJson,
+  formatNdjson,
+  formatRunSummary,
+} from './json-reporter.js';
+import type { ResultStream } from './json-reporter.js';
+import type {
+  LintResult,
+  LintSummary,
+  OutputFormat,
+  Severity,
+  SkippedFile,
+} from './types.js';
+
+// Every format is available from this module; json-reporter.js holds the
+// ones that need no chalk
+export {
+  DEFAULT_SUMMARY_TOP,
+  formatJson,
+  formatNormalizedJson,
+  countLintSummary,
+  formatNdjson,
+  formatRunSummary,
+  createNdjsonStream,
+  formatCounts,
+  createRunSummaryCollector,
+  createSummaryStream,
+  getCountsExitCode,
+} from './json-reporter.js';
+export type { ResultStream, RunSummaryCollector } from './json-reporter.js';
 
 const SARIF_SCHEMA = 'https://raw.githubusercontent.com/oasis-tcs/sarif-spec/master/Schemata/sarif-schema-2.1.0.json';
 const SARIF_VERSION = '2.1.0';
@@ -24,7 +58,7 @@ function mapSeverityToSarifLevel(severity: Severity): 'error' | 'warning' | 'not
 /**
  * Format lint results in the specified output format.
  * @param summary - The lint summary to format
- * @param format - Output format (pretty, json, sarif)
+ * @param format - Output format (pretty, json, json-normalized, ndjson, sarif, summary)
  * @returns Formatted string output
  */
 export function formatResults(summary: LintSummary, format: OutputFormat): string {
@@ -33,8 +67,14 @@ export function formatResults(summary: LintSummary, format: OutputFormat): strin
       return formatPretty(summary);
     case 'json':
       return formatJson(summary);
+    case 'json-normalized':
+      return formatNormalizedJson({ ...summary, results: createResultTableFrom(summary.results) });
+    case 'ndjson':
+      return formatNdjson(summary);
     case 'sarif':
       return formatSarif(summary);
+    case 'summary':
+      return formatRunSummary(summary);
   }
 }
 
@@ -49,6 +89,16 @@ export function formatPretty(summary: LintSummary): string {
 
   lines.push(chalk.bold(`\n${domain}`));
   lines.push(chalk.dim(`Files scanned: ${fileCount}`));
+  if (!(summary.complete ?? true)) {
+    lines.push(chalk.yellow('⚠ Time budget exhausted - results are partial'));
+  }
+  const skippedFiles = summary.skippedFiles ?? [];
+  if (skippedFiles.length > 0) {
+    lines.push(chalk.yellow(`⚠ ${skippedFiles.length} file(s) not fully linted:`));
+    for (const skippedFile of skippedFiles) {
+      lines.push(chalk.yellow(`  ${skippedFile.filePath} (${SKIP_REASON_DESCRIPTIONS[skippedFile.reason]})`));
+    }
+  }
   lines.push('');
 
   if (results.length === 0) {
@@ -107,22 +157,11 @@ function getSeverityColor(severity: Severity): typeof chalk.red {
 }
 
 /**
- * Format lint results as JSON.
- * @param summary - The lint summary to format
- * @returns JSON string
- */
-export function formatJson(summary: LintSummary): string {
-  return JSON.stringify(summary, null, 2);
-}
-
-/**
- * Format lint results as SARIF 2.1.0.
- * @param summary - The lint summary to format
- * @returns SARIF JSON string
+ * Convert a lint result to a SARIF result object.
  */
-export function formatSarif(summary: LintSummary): string {
-  const sarifResults = summary.results.map((lintResult) => ({
-    ruleId: lintResult.ruleId,
+function toSarifResult(lintResult: LintResult, ruleId: string): Record<string, unknown> {
+  return {
+    ruleId,
     level: mapSeverityToSarifLevel(lintResult.severity),
     message: {
       text: lintResult.message,
@@ -140,7 +179,39 @@ export function formatSarif(summary: LintSummary): string {
         },
       },
     ],
-  }));
+  };
+}
+
+/**
+ * Convert a skipped file to a SARIF tool execution notification.
+ */
+function toSarifNotification(skippedFile: SkippedFile): Record<string, unknown> {
+  return {
+    level: 'warning',
+    message: {
+      text: `Not fully linted: ${SKIP_REASON_DESCRIPTIONS[skippedFile.reason]}`,
+    },
+    locations: [
+      {
+        physicalLocation: {
+          artifactLocation: {
+            uri: skippedFile.filePath,
+          },
+        },
+      },
+    ],
+  };
+}
+
+/**
+ * Format lint results as SARIF 2.1.0.
+ * Files that were not fully linted are reported as tool execution notifications.
+ * @param summary - The lint summary to format
+ * @returns SARIF JSON string
+ */
+export function formatSarif(summary: LintSummary): string {
+  const sarifResults = summary.results.map((lintResult) => toSarifResult(lintResult, lintResult.ruleId));
+  const skipNotifications = (summary.skippedFiles ?? []).map(toSarifNotification);
 
   const sarifOutput = {
     $schema: SARIF_SCHEMA,
@@ -155,6 +226,10 @@ export function formatSarif(summary: LintSummary): string {
           },
         },
         results: sarifResults,
+        ...(skipNotifications.length === 0 ? {} : {
+          invocations: [{ executionSuccessful: true, toolExecutionNotifications: skipNotifications }],
+        }),
+        ...(summary.complete === undefined ? {} : { properties: { complete: summary.complete } }),
       },
     ],
   };
@@ -162,6 +237,68 @@ export function formatSarif(summary: LintSummary): string {
   return JSON.stringify(sarifOutput, null, 2);
 }
 
+/**
+ * Stream results as a single SARIF 2.1.0 log with one run for all domains.
+ * Results are written as files finish; rule metadata, skipped-file
+ * notifications and completeness follow them once the run ends. Rule IDs
+ * are "domain/ruleId" since rule IDs repeat across domains.
+ * @param output - Stream to write to (e.g. process.stdout)
+ * @returns The result stream
+ */
+export function createSarifStream(output: Writable): ResultStream {
+  const reportedRules = new Map<string, Record<string, unknown>>();
+  let resultCount = 0;
+
+  const openingText = `{"$schema":${JSON.stringify(SARIF_SCHEMA)},"version":${JSON.stringify(SARIF_VERSION)},"runs":[{"results":[`;
+  let pendingOpening = openingText;
+  const takeOpening = (): string => {
+    const opening = pendingOpening;
+    pendingOpening = '';
+    return opening;
+  };
+
+  return {
+    writeResults: (streamedResults) => {
+      let text = takeOpening();
+      for (const streamedResult of streamedResults) {
+        const ruleId = `${streamedResult.domain}/${streamedResult.ruleId}`;
+        if (!reportedRules.has(ruleId)) {
+          reportedRules.set(ruleId, {
+            id: ruleId,
+            shortDescription: { text: streamedResult.message },
+            defaultConfiguration: { level: mapSeverityToSarifLevel(streamedResult.severity) },
+          });
+        }
+        text += (resultCount++ === 0 ? '\n' : ',\n') + JSON.stringify(toSarifResult(streamedResult, ruleId));
+      }
+      return writeWithBackpressure(output, text);
+    },
+    end: (domainCounts) => {
+      // A file skipped for several domains is reported once
+      const skippedFiles = new Map(domainCounts
+        .flatMap((counts) => counts.skippedFiles)
+        .map((skippedFile) => [`${skippedFile.reason}:${skippedFile.filePath}`, skippedFile]));
+      const skipNotifications = [...skippedFiles.values()].map(toSarifNotification);
+      const runTail = {
+        tool: {
+          driver: {
+            name: TOOL_NAME,
+            version: TOOL_VERSION,
+            rules: [...reportedRules.values()],
+          },
+        },
+        ...(skipNotifications.length === 0 ? {} : {
+          invocations: [{ executionSuccessful: true, toolExecutionNotifications: skipNotifications }],
+        }),
+        properties: { complete: domainCounts.every((counts) => counts.complete) },
+      };
+      // Splice the remaining run properties in after the results array
+      const tailText = JSON.stringify(runTail).slice(1);
+      return writeWithBackpressure(output, `${takeOpening()}\n],${tailText}]}\n`);
+    },
+  };
+}
+
 /**
  * Group lint results by severity.
  * @param results - Array of lint results
@@ -0,0 +1,220 @@
+import type { LintResult, Rule } from './types.js';
+
+const INITIAL_ROW_CAPACITY = 64;
+
+/**
+ * The parts of a rule a lint result repeats.
+ */
+export type ResultRule = Pick<Rule, 'id' | 'severity' | 'message'>;
+
+/**
+ * Lint results stored as columns.
+ * File paths and rules are interned once in tables; each result is one row
+ * of four typed-array cells indexing them, so a result costs 16 bytes however
+ * long its path and message are. Rows are expanded to LintResult objects only
+ * when a formatter needs them.
+ */
+export interface ResultTable {
+  readonly filePaths: string[];
+  readonly rules: ResultRule[];
+  fileIndexes: Uint32Array;
+  ruleIndexes: Uint32Array;
+  lines: Uint32Array;
+  columns: Uint32Array;
+  /** Number of rows in use; the columns may have spare capacity */
+  rowCount: number;
+}
+
+/**
+ * Lookup maps for interning, kept off the table so it stays plain data.
+ */
+interface TableInterns {
+  readonly fileIndexByPath: Map<string, number>;
+  readonly ruleIndexByRule: Map<ResultRule, number>;
+}
+
+const tableInterns = new WeakMap<ResultTable, TableInterns>();
+
+/**
+ * Create an empty result table.
+ */
+export function createResultTable(): ResultTable {
+  const resultTable: ResultTable = {
+    filePaths: [],
+    rules: [],
+    fileIndexes: new Uint32Array(INITIAL_ROW_CAPACITY),
+    ruleIndexes: new Uint32Array(INITIAL_ROW_CAPACITY),
+    lines: new Uint32Array(INITIAL_ROW_CAPACITY),
+    columns: new Uint32Array(INITIAL_ROW_CAPACITY),
+    rowCount: 0,
+  };
+  tableInterns.set(resultTable, { fileIndexByPath: new Map(), ruleIndexByRule: new Map() });
+  return resultTable;
+}
+
+/**
+ * Get the interning maps of a table, rebuilding them for tables not made by
+ * createResultTable().
+ */
+function getTableInterns(resultTable: ResultTable): TableInterns {
+  let interns = tableInterns.get(resultTable);
+  if (!interns) {
+    interns = {
+      fileIndexByPath: new Map(resultTable.filePaths.map((filePath, fileIndex) => [filePath, fileIndex])),
+      ruleIndexByRule: new Map(resultTable.rules.map((rule, ruleIndex) => [rule, ruleIndex])),
+    };
+    tableInterns.set(resultTable, interns);
+  }
+  return interns;
+}
+
+/**
+ * Double the capacity of every column.
+ */
+function growColumns(resultTable: ResultTable): void {
+  const grow = (column: Uint32Array): Uint32Array => {
+    const grownColumn = new Uint32Array(column.length * 2);
+    grownColumn.set(column);
+    return grownColumn;
+  };
+  resultTable.fileIndexes = grow(resultTable.fileIndexes);
+  resultTable.ruleIndexes = grow(resultTable.ruleIndexes);
+  resultTable.lines = grow(resultTable.lines);
+  resultTable.columns = grow(resultTable.columns);
+}
+
+/**
+ * Append one result to a table.
+ * Rules are interned by identity, so pass the same rule object for every
+ * result of a rule.
+ * @param resultTable - Table to append to
+ * @param filePath - File the violation is in
+ * @param rule - Rule that was violated
+ * @param line - 1-indexed line
+ * @param column - 1-indexed column
+ */
+export function appendResult(
+  resultTable: ResultTable,
+  filePath: string,
+  rule: ResultRule,
+  line: number,
+  column: number
+): void {
+  const { fileIndexByPath, ruleIndexByRule } = getTableInterns(resultTable);
+
+  let fileIndex = fileIndexByPath.get(filePath);
+  if (fileIndex === undefined) {
+    fileIndex = resultTable.filePaths.push(filePath) - 1;
+    fileIndexByPath.set(filePath, fileIndex);
+  }
+  let ruleIndex = ruleIndexByRule.get(rule);
+  if (ruleIndex === undefined) {
+    ruleIndex = resultTable.rules.push(rule) - 1;
+    ruleIndexByRule.set(rule, ruleIndex);
+  }
+
+  if (resultTable.rowCount === resultTable.lines.length) {
+    growColumns(resultTable);
+  }
+  const row = resultTable.rowCount++;
+  resultTable.fileIndexes[row] = fileIndex;
+  resultTable.ruleIndexes[row] = ruleIndex;
+  resultTable.lines[row] = line;
+  resultTable.columns[row] = column;
+}
+
+/**
+ * Expand one row of a table into a lint result.
+ */
+function expandRow(resultTable: ResultTable, row: number): LintResult {
+  const rule = resultTable.rules[resultTable.ruleIndexes[row]!]!;
+  return {
+    filePath: resultTable.filePaths[resultTable.fileIndexes[row]!]!,
+    line: resultTable.lines[row]!,
+    column: resultTable.columns[row]!,
+    ruleId: rule.id,
+    severity: rule.severity,
+    message: rule.message,
+  };
+}
+
+/**
+ * Expand every row of a table into lint results, in row order.
+ * @param resultTable - Table to expand
+ * @returns One lint result per row
+ */
+export function expandResults(resultTable: ResultTable): LintResult[] {
+  const lintResults: LintResult[] = new Array(resultTable.rowCount);
+  for (let row = 0; row < resultTable.rowCount; row++) {
+    lintResults[row] = expandRow(resultTable, row);
+  }
+  return lintResults;
+}
+
+/**
+ * Build a table from expanded lint results.
+ * Results with the same rule ID, severity and message share one rule entry.
+ * @param results - Lint results to store
+ * @returns Table with one row per result, in the same order
+ */
+export function createResultTableFrom(results: readonly LintResult[]): ResultTable {
+  const resultTable = createResultTable();
+  const rulesByKey = new Map<string, ResultRule>();
+
+  for (const lintResult of results) {
+    const ruleKey = `${lintResult.ruleId}\0${lintResult.severity}\0${lintResult.message}`;
+    let rule = rulesByKey.get(ruleKey);
+    if (!rule) {
+      rule = { id: lintResult.ruleId, severity: lintResult.severity, message: lintResult.message };
+      rulesByKey.set(ruleKey, rule);
+    }
+    appendResult(resultTable, lintResult.filePath, rule, lintResult.line, lintResult.column);
+  }
+
+  return resultTable;
+}
+
+/**
+ * Combine several tables into one with rows ordered by file, line and column.
+ * Rows that tie keep their input order, as with mergeLintSummaries().
+ * @param resultTables - Tables to combine
+ * @returns New table holding every row
+ */
+export function mergeResultTables(resultTables: readonly ResultTable[]): ResultTable {
+  const sourceRows: [ResultTable, number][] = [];
+  for (const resultTable of resultTables) {
+    for (let row = 0; row < resultTable.rowCount; row++) {
+      sourceRows.push([resultTable, row]);
+    }
+  }
+
+  sourceRows.sort(([leftTable, leftRow], [rightTable, rightRow]) =>
+    leftTable.filePaths[leftTable.fileIndexes[leftRow]!]!.localeCompare(
+      rightTable.filePaths[rightTable.fileIndexes[rightRow]!]!
+    ) ||
+    leftTable.lines[leftRow]! - rightTable.lines[rightRow]! ||
+    leftTable.columns[leftRow]! - rightTable.columns[rightRow]!
+  );
+
+  const mergedTable = createResultTable();
+  for (const [resultTable, row] of sourceRows) {
+    appendResult(
+      mergedTable,
+      resultTable.filePaths[resultTable.fileIndexes[row]!]!,
+      resultTable.rules[resultTable.ruleIndexes[row]!]!,
+      resultTable.lines[row]!,
+      resultTable.columns[row]!
+    );
+  }
+  return mergedTable;
+}
+
+/**
+ * Check whether a table holds any NEVER or MUST result.
+ * Only rules that have results are interned, so the rule table is enough.
+ * @param resultTable - Table to check
+ * @returns True if any row is a failure
+ */
+export function hasFailureResults(resultTable: ResultTable): boolean {
+  return resultTable.rules.some((rule) => rule.severity === 'NEVER' || rule.severity === 'MUST');
+}
@@ -0,0 +1,273 @@
+import fs from 'node:fs';
+import net from 'node:net';
+import path from 'node:path';
+import { Readable, Writable } from 'node:stream';
+import { finished } from 'node:stream/promises';
+import { runLintRequest, createLintSession } from './cli.js';
+import type { LintSession } from './cli.js';
+import { createWorkerPool, closeWorkerPool, getDefaultJobCount } from './worker-pool.js';
+import { DEFAULT_SOURCE_CACHE_BYTES } from './parser.js';
+
+/** Socket the daemon listens on, relative to the project root */
+export const DEFAULT_SOCKET_PATH = path.join('.flight', 'flight-lint.sock');
+
+const EXIT_CONFIG_ERROR = 2;
+
+/**
+ * One lint request, sent as a single JSON line.
+ */
+export interface DaemonRequest {
+  /** Working directory of the client; must be the daemon's project root */
+  readonly cwd: string;
+  /** flight-lint arguments, without the node and script paths */
+  readonly args: readonly string[];
+  /** Batch read by `--stdin`, which the daemon cannot read from the client */
+  readonly stdin?: string;
+  /** When the client process started (epoch ms); --time-budget counts from here */
+  readonly startedAt?: number;
+}
+
+/**
+ * One JSON line sent back to the client. A request is answered by any
+ * number of output frames, then one exitCode frame - or by a single fallback
+ * frame when the daemon cannot serve it and the client should run one-shot.
+ */
+export type DaemonResponse =
+  | { readonly stdout: string }
+  | { readonly stderr: string }
+  | { readonly exitCode: number }
+  | { readonly fallback: string };
+
+/**
+ * Options of `flight-lint serve`.
+ */
+export interface ServeOptions {
+  /** Project to lint; requests from other directories are refused */
+  readonly projectRoot: string;
+  /** Unix socket to listen on */
+  readonly socketPath: string;
+  /** Worker threads to lint with */
+  readonly jobs: number;
+}
+
+/**
+ * Create a stream that forwards everything written to it as response frames.
+ */
+function createFrameStream(socket: net.Socket, channel: 'stdout' | 'stderr'): Writable {
+  return new Writable({
+    decodeStrings: false,
+    write(chunk: string | Buffer, _encoding, callback): void {
+      const text = typeof chunk === 'string' ? chunk : chunk.toString('utf-8');
+      const frame: DaemonResponse = channel === 'stdout' ? { stdout: text } : { stderr: text };
+      // A client that hung up must not fail the run for everyone else
+      socket.write(JSON.stringify(frame) + '\n', () => callback());
+    },
+  });
+}
+
+/**
+ * Parse and check a request line.
+ * @returns The request, or null if it is not one
+ */
+function parseDaemonRequest(requestLine: string): DaemonRequest | null {
+  try {
+    const parsedRequest: unknown = JSON.parse(requestLine);
+    if (typeof parsedRequest !== 'object' || parsedRequest === null) {
+      return null;
+    }
+    const { cwd, args, stdin, startedAt } = parsedRequest as Record<string, unknown>;
+    const isRequest = typeof cwd === 'string' &&
+      Array.isArray(args) &&
+      args.every((arg) => typeof arg === 'string') &&
+      (stdin === undefined || typeof stdin === 'string') &&
+      (startedAt === undefined || Number.isFinite(startedAt));
+    if (!isRequest) {
+      return null;
+    }
+    return {
+      cwd,
+      args,
+      ...(typeof stdin === 'string' ? { stdin } : {}),
+      ...(typeof startedAt === 'number' ? { startedAt } : {}),
+    };
+  } catch {
+    return null;
+  }
+}
+
+/**
+ * Answer one request on a connection.
+ */
+async function serveRequest(socket: net.Socket, requestLine: string, lintSession: LintSession): Promise<void> {
+  const request = parseDaemonRequest(requestLine);
+  const sendFrame = (frame: DaemonResponse): void => {
+    socket.end(JSON.stringify(frame) + '\n');
+  };
+
+  if (!request) {
+    sendFrame({ fallback: 'malformed request' });
+    return;
+  }
+  if (path.resolve(request.cwd) !== lintSession.projectRoot) {
+    sendFrame({ fallback: `daemon serves ${lintSession.projectRoot}` });
+    return;
+  }
+
+  const lintIo = {
+    stdout: createFrameStream(socket, 'stdout'),
+    stderr: createFrameStream(socket, 'stderr'),
+    ...(request.stdin === undefined ? {} : { stdin: Readable.from([request.stdin]) }),
+    ...(request.startedAt === undefined ? {} : { startedAt: request.startedAt }),
+  };
+  let exitCode: number;
+  try {
+    exitCode = await runLintRequest(request.args, lintIo, lintSession);
+  } catch (error) {
+    const errorMessage = error instanceof Error ? error.message : String(error);
+    lintIo.stderr.write(`Error: ${errorMessage}\n`);
+    exitCode = EXIT_CONFIG_ERROR;
+  }
+
+  // Output still buffered in the frame streams goes out before the exit code
+  await Promise.all([lintIo.stdout, lintIo.stderr].map((frameStream) => finished(frameStream.end())));
+  sendFrame({ exitCode });
+}
+
+/**
+ * Check whether a daemon is already answering on a socket path.
+ */
+function isSocketLive(socketPath: string): Promise<boolean> {
+  return new Promise((resolve) => {
+    const probe = net.createConnection(socketPath);
+    probe.once('connect', () => {
+      probe.destroy();
+      resolve(true);
+    });
+    probe.once('error', () => resolve(false));
+  });
+}
+
+/**
+ * Serve lint requests on a Unix socket until the server is closed.
+ * Requests run one at a time against one warm session: grammars, compiled
+ * queries and grep programs stay loaded, the project walk is re-read only in
+ * directories that changed, rules files are reloaded only when they change,
+ * and files that have not changed since the last run are not scanned again.
+ * A socket left behind by a daemon that died is replaced.
+ * @param serveOptions - Project, socket and job count
+ * @returns The listening server
+ * @throws Error if another daemon is already listening on the socket
+ */
+export async function serveLinting(serveOptions: ServeOptions): Promise<net.Server> {
+  const { projectRoot, socketPath, jobs } = serveOptions;
+
+  if (fs.existsSync(socketPath)) {
+    if (await isSocketLive(socketPath)) {
+      throw new Error(`flight-lint daemon already running on ${socketPath}`);
+    }
+    fs.unlinkSync(socketPath);
+  }
+
+  const lintSession = createLintSession(projectRoot);
+  if (jobs > 1) {
+    lintSession.workerPool = createWorkerPool(jobs, DEFAULT_SOURCE_CACHE_BYTES);
+  }
+
+  // One request at a time: runs share caches and must not interleave
+  let requestQueue: Promise<void> = Promise.resolve();
+
+  const server = net.createServer((socket) => {
+    let pendingText = '';
+    socket.setEncoding('utf-8');
+    socket.on('error', () => socket.destroy());
+    socket.on('data', (chunk: string) => {
+      pendingText += chunk;
+      const newlineIndex = pendingText.indexOf('\n');
+      if (newlineIndex === -1) {
+        return;
+      }
+      const requestLine = pendingText.slice(0, newlineIndex);
+      socket.removeAllListeners('data');
+      requestQueue = requestQueue.then(() => serveRequest(socket, requestLine, lintSession));
+    });
+  });
+
+  server.on('close', () => {
+    if (lintSession.workerPool) {
+      void closeWorkerPool(lintSession.workerPool);
+    }
+    fs.rmSync(socketPath, { force: true });
+  });
+
+  await new Promise<void>((resolve, reject) => {
+    server.once('error', reject);
+    server.listen(socketPath, () => {
+      server.off('error', reject);
+      resolve();
+    });
+  });
+
+  return server;
+}
+
+/**
+ * Parse `flight-lint serve` arguments.
+ * @param args - Arguments after `serve`
+ * @param projectRoot - Directory the daemon serves
+ */
+export function parseServeArgs(args: readonly string[], projectRoot: string): ServeOptions {
+  let socketPath = path.join(projectRoot, DEFAULT_SOCKET_PATH);
+  let jobs = getDefaultJobCount();
+
+  for (let argIndex = 0; argIndex < args.length; argIndex++) {
+    const arg = args[argIndex]!;
+    const optionValue = args[argIndex + 1];
+    if (arg === '--socket' && optionValue !== undefined) {
+      socketPath = path.resolve(projectRoot, optionValue);
+      argIndex++;
+    } else if (arg === '--jobs' && optionValue !== undefined) {
+      jobs = Number(optionValue);
+      if (!Number.isInteger(jobs) || jobs <= 0) {
+        throw new Error(`Invalid jobs '${optionValue}'. Expected a positive integer`);
+      }
+      argIndex++;
+    } else {
+      throw new Error(`Unknown serve option '${arg}'. Usage: flight-lint serve [--socket <path>] [--jobs <n>]`);
+    }
+  }
+
+  return { projectRoot, socketPath, jobs };
+}
+
+/**
+ * Run `flight-lint serve`.
+ * Entry point called from bin/flight-lint.
+ */
+export function runServer(): void {
+  const projectRoot = process.cwd();
+
+  let serveOptions: ServeOptions;
+  try {
+    serveOptions = parseServeArgs(process.argv.slice(3), projectRoot);
+  } catch (error) {
+    const errorMessage = error instanceof Error ? error.message : String(error);
+    process.stderr.write(`Error: ${errorMessage}\n`);
+    process.exitCode = EXIT_CONFIG_ERROR;
+    return;
+  }
+
+  serveLinting(serveOptions)
+    .then((server) => {
+      process.stderr.write(`flight-lint serving ${projectRoot} on ${serveOptions.socketPath}\n`);
+      const shutDown = (): void => {
+        server.close();
+      };
+      process.once('SIGINT', shutDown);
+      process.once('SIGTERM', shutDown);
+    })
+    .catch((error) => {
+      const errorMessage = error instanceof Error ? error.message : String(error);
+      process.stderr.write(`Error: ${errorMessage}\n`);
+      process.exitCode = EXIT_CONFIG_ERROR;
+    });
+}
@@ -0,0 +1,444 @@
+import crypto from 'node:crypto';
+import fs from 'node:fs';
+import os from 'node:os';
+import path from 'node:path';
+import { Readable, Writable } from 'node:stream';
+import { finished } from 'node:stream/promises';
+import { requestDaemonRun, takeConnectOption, readProcessStdin } from './client.js';
+
+/**
+ * Directory holding the locks and results of coalesced runs. One per user:
+ * the system temporary directory is shared, and another user's locks and
+ * results must never be trusted.
+ */
+export const DEFAULT_SINGLE_FLIGHT_DIR = path.join(
+  os.tmpdir(),
+  `flight-lint-single-flight-${process.getuid?.() ?? os.userInfo().username}`
+);
+
+/** Only the owner may read or write a flight directory */
+const PRIVATE_DIRECTORY_MODE = 0o700;
+
+/** Lock held by the run in progress */
+const RUNNING_LOCK_FILE = 'running';
+/** Lock held by the caller that will lead the next run */
+const PENDING_LOCK_FILE = 'pending';
+
+const POLL_INTERVAL_MS = 25;
+
+/** How long a finished run's output stays readable by callers that waited for it */
+const RESULT_RETENTION_MS = 10 * 60_000;
+
+const EXIT_CONFIG_ERROR = 2;
+
+/**
+ * Output of one run, handed to every caller that shared it.
+ */
+export interface SharedRun {
+  readonly exitCode: number;
+  readonly stdout: string;
+  readonly stderr: string;
+}
+
+/**
+ * How long a caller may wait for other callers' runs.
+ */
+export interface WaitLimit {
+  /** Epoch milliseconds after which the caller stops waiting */
+  readonly deadline: number;
+  /** Produces the caller's output once it stops waiting; runs outside the locks */
+  readonly runPastDeadline: () => Promise<SharedRun>;
+}
+
+/**
+ * Owner of a lock file: the process and the run it leads.
+ */
+interface FlightLock {
+  readonly pid: number;
+  readonly runId: string;
+}
+
+/**
+ * Read the system error code (e.g. "EEXIST") of a thrown error.
+ */
+function getErrorCode(error: unknown): string | null {
+  return error instanceof Error && 'code' in error ? String(error.code) : null;
+}
+
+/**
+ * Create a lock file holding its owner, failing if it already exists.
+ * The content is written to a temporary file first and linked into place, so
+ * a lock is never seen half written.
+ * @returns True if this call created the lock
+ */
+function tryCreateLockFile(lockPath: string, flightLock: FlightLock): boolean {
+  const temporaryPath = `${lockPath}.${flightLock.runId}`;
+  fs.writeFileSync(temporaryPath, `${flightLock.pid} ${flightLock.runId}\n`);
+  try {
+    fs.linkSync(temporaryPath, lockPath);
+    return true;
+  } catch (error) {
+    if (getErrorCode(error) === 'EEXIST') {
+      return false;
+    }
+    throw error;
+  } finally {
+    fs.rmSync(temporaryPath, { force: true });
+  }
+}
+
+/**
+ * Read the owner of a lock file.
+ * @returns The owner, or null if the lock is not held
+ */
+function readLockFile(lockPath: string): FlightLock | null {
+  let lockText: string;
+  try {
+    lockText = fs.readFileSync(lockPath, 'utf-8');
+  } catch {
+    return null;
+  }
+  const [pidText, runId] = lockText.trim().split(' ');
+  const pid = Number(pidText);
+  return Number.isInteger(pid) && runId ? { pid, runId } : null;
+}
+
+/**
+ * Check whether a process is still running.
+ */
+function isProcessAlive(pid: number): boolean {
+  try {
+    process.kill(pid, 0);
+    return true;
+  } catch (error) {
+    // The process exists but belongs to someone else
+    return getErrorCode(error) === 'EPERM';
+  }
+}
+
+/**
+ * Remove a lock whose owner died without releasing it.
+ * The owner is read again just before removal, so a lock taken over by a
+ * live process in the meantime is left alone.
+ * @returns True if the lock was stale and has been removed
+ */
+function clearStaleLock(lockPath: string): boolean {
+  const flightLock = readLockFile(lockPath);
+  if (flightLock === null || isProcessAlive(flightLock.pid)) {
+    return false;
+  }
+  const currentLock = readLockFile(lockPath);
+  if (currentLock?.runId === flightLock.runId) {
+    fs.rmSync(lockPath, { force: true });
+  }
+  return true;
+}
+
+/**
+ * Path of the file a run's output is written to.
+ */
+function getResultPath(flightDirectory: string, runId: string): string {
+  return path.join(flightDirectory, `${runId}.json`);
+}
+
+/**
+ * Read a finished run's output.
+ * @returns The output, or null if the run has not finished
+ */
+function readSharedRun(resultPath: string): SharedRun | null {
+  let resultText: string;
+  try {
+    resultText = fs.readFileSync(resultPath, 'utf-8');
+  } catch {
+    return null;
+  }
+  const parsedResult: unknown = JSON.parse(resultText);
+  if (typeof parsedResult !== 'object' || parsedResult === null) {
+    return null;
+  }
+  const { exitCode, stdout, stderr } = parsedResult as Record<string, unknown>;
+  const isSharedRun = typeof exitCode === 'number' && typeof stdout === 'string' && typeof stderr === 'string';
+  return isSharedRun ? { exitCode, stdout, stderr } : null;
+}
+
+/**
+ * Publish a run's output to its waiters and drop outputs nobody can still
+ * be waiting for.
+ */
+function writeSharedRun(flightDirectory: string, runId: string, sharedRun: SharedRun): void {
+  const resultPath = getResultPath(flightDirectory, runId);
+  fs.writeFileSync(`${resultPath}.tmp`, JSON.stringify(sharedRun));
+  fs.renameSync(`${resultPath}.tmp`, resultPath);
+
+  const expiryTime = Date.now() - RESULT_RETENTION_MS;
+  for (const entryName of fs.readdirSync(flightDirectory)) {
+    const entryPath = path.join(flightDirectory, entryName);
+    if (entryName.endsWith('.json') && entryPath !== resultPath) {
+      try {
+        if (fs.statSync(entryPath).mtimeMs < expiryTime) {
+          fs.rmSync(entryPath, { force: true });
+        }
+      } catch {
+        // Pruned by another run
+      }
+    }
+  }
+}
+
+/**
+ * Perform a run, turning a thrown error into a configuration error.
+ */
+async function settleRun(run: () => Promise<SharedRun>): Promise<SharedRun> {
+  try {
+    return await run();
+  } catch (error) {
+    const errorMessage = error instanceof Error ? error.message : String(error);
+    return { exitCode: EXIT_CONFIG_ERROR, stdout: '', stderr: `Error: ${errorMessage}\n` };
+  }
+}
+
+/**
+ * Run while holding the running lock, publish the output and release it.
+ */
+async function leadRun(
+  flightDirectory: string,
+  flightLock: FlightLock,
+  runShared: () => Promise<SharedRun>
+): Promise<SharedRun> {
+  const sharedRun = await settleRun(runShared);
+
+  try {
+    writeSharedRun(flightDirectory, flightLock.runId, sharedRun);
+  } catch {
+    // Waiters find no output once the lock is released, and run again
+  } finally {
+    fs.rmSync(path.join(flightDirectory, RUNNING_LOCK_FILE), { force: true });
+  }
+  return sharedRun;
+}
+
+/**
+ * Check whether a run's leader still holds a lock for it: the pending lock
+ * until the run starts, then the running lock until its output is published.
+ */
+function isRunLeadHeld(flightDirectory: string, flightLock: FlightLock): boolean {
+  return [PENDING_LOCK_FILE, RUNNING_LOCK_FILE].some((lockFile) =>
+    readLockFile(path.join(flightDirectory, lockFile))?.runId === flightLock.runId
+  );
+}
+
+/**
+ * Check whether a wait limit's deadline has passed.
+ */
+function isPastDeadline(waitLimit: WaitLimit | undefined): waitLimit is WaitLimit {
+  return waitLimit !== undefined && Date.now() >= waitLimit.deadline;
+}
+
+/**
+ * Wait for the output of a run led by another caller.
+ * @returns The output, or null if its leader died or gave up before
+ *   publishing it, or the wait limit's deadline passed first
+ */
+async function waitForSharedRun(
+  flightDirectory: string,
+  flightLock: FlightLock,
+  waitLimit: WaitLimit | undefined
+): Promise<SharedRun | null> {
+  const resultPath = getResultPath(flightDirectory, flightLock.runId);
+  for (;;) {
+    const sharedRun = readSharedRun(resultPath);
+    if (sharedRun) {
+      return sharedRun;
+    }
+    if (!isProcessAlive(flightLock.pid) || !isRunLeadHeld(flightDirectory, flightLock)) {
+      return readSharedRun(resultPath);
+    }
+    if (isPastDeadline(waitLimit)) {
+      return null;
+    }
+    await new Promise((resolve) => setTimeout(resolve, POLL_INTERVAL_MS));
+  }
+}
+
+/**
+ * Run at most one at a time per directory, coalescing callers that overlap.
+ * A caller that finds nothing running leads a run itself. One that finds a
+ * run in progress cannot use it - it may have read files before the
+ * caller's changes - so it joins the next run instead: the first such
+ * caller leads that run once the current one finishes, and every caller
+ * arriving until it starts waits for it and receives its output. However many
+ * callers overlap, at most two runs happen: the one in progress and one that
+ * covers every change made before it started.
+ * A lock left by a process that died is cleared.
+ * Waiting can take the current run plus the next one, so a caller with a
+ * wait limit stops at its deadline - handing the next run back if it was to
+ * lead it - and returns the output of runPastDeadline instead.
+ * @param flightDirectory - Directory of the locks; one per kind of run
+ * @param runShared - Performs the run; called in at most one caller at a time
+ * @param waitLimit - Deadline for waiting on other callers, if any
+ * @returns The output of a run that started after this call, or of
+ *   runPastDeadline once the deadline has passed
+ */
+export async function coalesceRun(
+  flightDirectory: string,
+  runShared: () => Promise<SharedRun>,
+  waitLimit?: WaitLimit
+): Promise<SharedRun> {
+  fs.mkdirSync(flightDirectory, { recursive: true, mode: PRIVATE_DIRECTORY_MODE });
+  const runningPath = path.join(flightDirectory, RUNNING_LOCK_FILE);
+  const pendingPath = path.join(flightDirectory, PENDING_LOCK_FILE);
+
+  for (;;) {
+    const flightLock: FlightLock = { pid: process.pid, runId: crypto.randomUUID() };
+
+    if (tryCreateLockFile(runningPath, flightLock)) {
+      return leadRun(flightDirectory, flightLock, runShared);
+    }
+    if (clearStaleLock(runningPath)) {
+      continue;
+    }
+
+    // A run is in progress: lead the next one, or wait for whoever does
+    if (tryCreateLockFile(pendingPath, flightLock)) {
+      while (!tryCreateLockFile(runningPath, flightLock)) {
+        if (isPastDeadline(waitLimit)) {
+          // Callers still waiting take the next run over
+          fs.rmSync(pendingPath, { force: true });
+          return settleRun(waitLimit.runPastDeadline);
+        }
+        if (!clearStaleLock(runningPath)) {
+          await new Promise((resolve) => setTimeout(resolve, POLL_INTERVAL_MS));
+        }
+      }
+      // Callers arriving from now on may have changes this run misses
+      fs.rmSync(pendingPath, { force: true });
+      return leadRun(flightDirectory, flightLock, runShared);
+    }
+
+    const pendingLock = readLockFile(pendingPath);
+    if (pendingLock === null || clearStaleLock(pendingPath)) {
+      continue;
+    }
+    const sharedRun = await waitForSharedRun(flightDirectory, pendingLock, waitLimit);
+    if (sharedRun) {
+      return sharedRun;
+    }
+    if (isPastDeadline(waitLimit)) {
+      return settleRun(waitLimit.runPastDeadline);
+    }
+  }
+}
+
+/**
+ * Create a directory only this user can use, or check that an existing one is.
+ * @throws If the path is not a directory, belongs to another user or is
+ *   open to other users
+ */
+export function preparePrivateDirectory(directory: string): void {
+  fs.mkdirSync(directory, { recursive: true, mode: PRIVATE_DIRECTORY_MODE });
+  const directoryStats = fs.lstatSync(directory);
+  const isOwned = process.getuid === undefined || directoryStats.uid === process.getuid();
+  if (!directoryStats.isDirectory() || !isOwned || (directoryStats.mode & 0o077) !== 0) {
+    throw new Error(`Refusing to share runs through ${directory}: it is not a private directory of this user`);
+  }
+}
+
+/**
+ * Create a stream that keeps everything written to it.
+ */
+function createCollector(): { stream: Writable; text: () => string } {
+  const chunks: string[] = [];
+  const stream = new Writable({
+    write(chunk: Buffer | string, _encoding, callback): void {
+      chunks.push(chunk.toString());
+      callback();
+    },
+  });
+  return { stream, text: () => chunks.join('') };
+}
+
+/**
+ * Run flight-lint in this process, through the daemon if one answers, and
+ * collect its output.
+ * @param socketPath - Daemon socket from --connect, or null
+ * @param lintArgs - flight-lint arguments without --connect and --single-flight
+ * @param stdinText - Batch for --stdin, if given
+ */
+async function runCollected(socketPath: string | null, lintArgs: readonly string[], stdinText?: string): Promise<SharedRun> {
+  const stdout = createCollector();
+  const stderr = createCollector();
+
+  let exitCode = socketPath === null
+    ? null
+    : await requestDaemonRun(socketPath, process.cwd(), lintArgs, stdout.stream, stderr.stream, stdinText);
+
+  if (exitCode === null) {
+    const { runLintRequest } = await import('./cli.js');
+    exitCode = await runLintRequest(lintArgs, {
+      stdout: stdout.stream,
+      stderr: stderr.stream,
+      startedAt: performance.timeOrigin,
+      ...(stdinText === undefined ? {} : { stdin: Readable.from([stdinText]) }),
+    });
+  }
+
+  await Promise.all([stdout.stream, stderr.stream].map((collector) => finished(collector.end())));
+  return { exitCode, stdout: stdout.text(), stderr: stderr.text() };
+}
+
+/**
+ * Read the --time-budget value from flight-lint arguments.
+ * @returns The budget in milliseconds, or null if none is given
+ */
+export function readTimeBudgetOption(lintArgs: readonly string[]): number | null {
+  for (const [argIndex, arg] of lintArgs.entries()) {
+    const budgetText = arg === '--time-budget'
+      ? lintArgs[argIndex + 1]
+      : arg.startsWith('--time-budget=') ? arg.slice('--time-budget='.length) : undefined;
+    const timeBudgetMs = Number(budgetText);
+    if (budgetText !== undefined && Number.isInteger(timeBudgetMs) && timeBudgetMs > 0) {
+      return timeBudgetMs;
+    }
+  }
+  return null;
+}
+
+/**
+ * Run the CLI with `--single-flight`: identical invocations in the same
+ * directory that overlap share one run and all print its output.
+ * With --time-budget, waiting for other invocations' runs ends when the
+ * budget (counted from process start) does; the invocation then runs itself
+ * with no time left, which reports an incomplete result at once.
+ * Entry point called from bin/flight-lint. Output is written once the shared
+ * run finishes rather than streamed. If the locks cannot be used, e.g.
+ * because the single-flight directory is not private, the invocation runs on
+ * its own instead.
+ */
+export async function runSingleFlightCli(): Promise<void> {
+  const { socketPath, lintArgs } = takeConnectOption(process.argv.slice(2).filter((arg) => arg !== '--single-flight'));
+  const stdinText = lintArgs.includes('--stdin') ? await readProcessStdin() : undefined;
+
+  // Runs are shared only between invocations that would produce the same output
+  const flightKey = crypto.createHash('sha256')
+    .update(JSON.stringify([process.cwd(), lintArgs, stdinText ?? null]))
+    .digest('hex')
+    .slice(0, 32);
+
+  const runInProcess = (): Promise<SharedRun> => runCollected(socketPath, lintArgs, stdinText);
+  const timeBudgetMs = readTimeBudgetOption(lintArgs);
+  let sharedRun: SharedRun;
+  try {
+    preparePrivateDirectory(DEFAULT_SINGLE_FLIGHT_DIR);
+    sharedRun = await coalesceRun(
+      path.join(DEFAULT_SINGLE_FLIGHT_DIR, flightKey),
+      runInProcess,
+      timeBudgetMs === null ? undefined : { deadline: performance.timeOrigin + timeBudgetMs, runPastDeadline: runInProcess }
+    );
+  } catch {
+    sharedRun = await settleRun(runInProcess);
+  }
+
+  process.stdout.write(sharedRun.stdout);
+  process.stderr.write(sharedRun.stderr);
+  process.exitCode = sharedRun.exitCode;
+}
@@ -1,3 +1,5 @@
+import type { ResultTable } from './result-table.js';
+
 /**
  * Severity levels for lint rules.
  * NEVER/MUST violations fail, SHOULD triggers warnings, GUIDANCE is informational.
@@ -7,7 +9,7 @@ export type Severity = 'NEVER' | 'MUST' | 'SHOULD' | 'GUIDANCE';
 /**
  * Output format options for lint results.
  */
-export type OutputFormat = 'pretty' | 'json' | 'sarif';
+export type OutputFormat = 'pretty' | 'json' | 'json-normalized' | 'ndjson' | 'sarif' | 'summary';
 
 /**
  * CLI options parsed from command line arguments.
@@ -19,6 +21,61 @@ export interface CliOptions {
   readonly format: OutputFormat;
   /** Minimum severity level to report */
   readonly severity: Severity;
+  /** Only count violations and print a machine-readable summary */
+  readonly countOnly: boolean;
+  /** File to also write the run summary record to, or null */
+  readonly summaryFile: string | null;
+  /** Number of violations the run summary lists */
+  readonly summaryTop: number;
+  /** Wall-clock budget in milliseconds, or null for no limit */
+  readonly timeBudgetMs: number | null;
+  /** Number of worker threads; 1 lints in-process */
+  readonly jobs: number;
+  /** Size limits above which files are linted partially or skipped */
+  readonly fileSizeLimits: FileSizeLimits;
+  /** Keep running and re-lint whenever a watched file changes */
+  readonly watch: boolean;
+  /** Lint a JSON batch of {path, content} buffers read from stdin instead of files on disk */
+  readonly stdin: boolean;
+}
+
+/**
+ * File content to lint without reading it from disk, such as content a tool
+ * is about to write.
+ */
+export interface SourceBuffer {
+  /** Path the content is for, absolute or relative to the project root */
+  readonly path: string;
+  readonly content: string;
+}
+
+/**
+ * Size limits that protect a run from huge files.
+ */
+export interface FileSizeLimits {
+  /** Larger files run grep rules over streamed chunks and skip AST rules */
+  readonly maxParseBytes: number;
+  /** Larger files are skipped entirely */
+  readonly maxFileBytes: number;
+}
+
+/**
+ * Why a file was not fully linted:
+ * - binary: a NUL byte was found in its first block
+ * - minified: its first block has very long lines, so only grep rules ran
+ * - too-large: it exceeds maxFileBytes
+ * - ast-skipped: it exceeds maxParseBytes, so only grep rules ran
+ * A file that ran grep rules only is also listed for domains without AST
+ * rules if one of its lines was too long to scan in full.
+ */
+export type FileSkipReason = 'binary' | 'minified' | 'too-large' | 'ast-skipped';
+
+/**
+ * A file that a domain did not fully lint.
+ */
+export interface SkippedFile {
+  readonly filePath: string;
+  readonly reason: FileSkipReason;
 }
 
 /**
@@ -51,14 +108,30 @@ export interface RuleProvenance {
 
 /**
  * Rule type - determines how the rule is validated.
- * 'ast' rules use tree-sitter queries, 'grep' rules use regex patterns.
+ * - ast: a tree-sitter query; each @violation capture is reported
+ * - grep: a regex; each matching line is reported
+ * - presence: a regex that some file of the domain must match
+ * - requires: a file with trigger lines must also match a requirement, or
+ *   every file must match mustExist
+ * - multi-condition: a file matching all (AND) or any (OR) of the conditions
+ * - file_exists: one of the paths must exist in the project
+ * - script: bash run once per file, reporting each line it prints
  */
-export type RuleType = 'ast' | 'grep';
+export type RuleType = 'ast' | 'grep' | 'presence' | 'requires' | 'multi-condition' | 'file_exists' | 'script';
+
+/**
+ * One condition of a multi-condition rule.
+ */
+export interface RuleCondition {
+  readonly pattern: string;
+  readonly ignoreCase?: boolean;
+}
 
 /**
  * A single lint rule definition.
  * Rules with type 'ast' require a query string and a language field.
- * Rules with type 'grep' require a pattern string.
+ * Rules with type 'grep' or 'presence' require a pattern string; the other
+ * types carry their own fields, listed by type below.
  */
 export interface Rule {
   readonly id: string;
@@ -67,12 +140,38 @@ export interface Rule {
   readonly type?: RuleType;
   /** Target language for AST rules. Required for 'ast' type, absent for 'grep' type. */
   readonly language?: string;
-  /** Regex pattern for grep rules. */
+  /** Regex pattern for grep and presence rules. */
   readonly pattern?: string | null;
   /** Tree-sitter query for AST rules. */
   readonly query: string | null;
   readonly message: string;
   readonly provenance?: RuleProvenance;
+  /** grep, presence: match regardless of case */
+  readonly ignoreCase?: boolean;
+  /** grep: match the whole buffer, so matches can span lines */
+  readonly multiline?: boolean;
+  /** grep: matches whose line also matches one of these patterns are dropped */
+  readonly ignoreWhen?: readonly string[];
+  /** requires: lines that need the requirement somewhere in their file */
+  readonly trigger?: string;
+  readonly requirement?: string;
+  /** requires: least number of trigger lines that needs the requirement (default 1) */
+  readonly triggerCount?: number;
+  /** requires: pattern every file must match */
+  readonly mustExist?: string;
+  /** multi-condition: how the conditions combine (default AND) */
+  readonly logic?: 'AND' | 'OR';
+  readonly conditions?: readonly RuleCondition[];
+  /** file_exists: paths or globs, relative to the project root, one of which must exist */
+  readonly paths?: readonly string[];
+  /** script: bash code run with $file set to each file, relative to the project root */
+  readonly code?: string;
+  /** Globs of project-relative paths the rule does not run on */
+  readonly skipPaths?: readonly string[];
+  /** Globs of project-relative paths the rule runs on exclusively */
+  readonly onlyPaths?: readonly string[];
+  /** Run only on files the domain's apiFileDetection recognises */
+  readonly apiFilesOnly?: boolean;
 }
 
 /**
@@ -84,6 +183,26 @@ export interface DomainProvenance {
   readonly nextAuditDue?: string;
 }
 
+/**
+ * Domain-level content signature.
+ * A file activates the domain if it contains any literal or matches the pattern;
+ * inactive files are skipped before any of the domain's rules run.
+ */
+export interface DomainActivation {
+  readonly literals?: readonly string[];
+  readonly pattern?: string;
+}
+
+/**
+ * How a domain recognises API endpoint files, for its apiFilesOnly rules.
+ * A file is one if its path matches one of the path regexes or its content
+ * one of the patterns.
+ */
+export interface ApiFileDetection {
+  readonly paths: readonly string[];
+  readonly patterns: readonly string[];
+}
+
 /**
  * Complete structure of a .rules.json file.
  * Note: language is specified per-rule for AST rules, not at file level.
@@ -93,16 +212,32 @@ export interface RulesFile {
   readonly version: string;
   readonly filePatterns: readonly string[];
   readonly excludePatterns?: readonly string[];
+  readonly activation?: DomainActivation;
+  readonly apiFileDetection?: ApiFileDetection;
   readonly provenance?: DomainProvenance;
   readonly rules: readonly Rule[];
 }
 
 /**
- * Options for file discovery.
+ * A domain's rules together with the source files they apply to.
+ */
+export interface LintTarget {
+  readonly rulesFile: RulesFile;
+  readonly sourceFiles: readonly string[];
+}
+
+/**
+ * The file patterns of one domain, matched against project-relative paths.
  */
-export interface DiscoveryOptions {
+export interface DomainPatterns {
   readonly patterns: readonly string[];
   readonly excludePatterns?: readonly string[];
+}
+
+/**
+ * Options for file discovery.
+ */
+export interface DiscoveryOptions extends DomainPatterns {
   readonly basePath: string;
 }
 
@@ -118,6 +253,13 @@ export interface LintResult {
   readonly message: string;
 }
 
+/**
+ * A lint result tagged with its domain, as written by streaming reporters.
+ */
+export interface StreamedResult extends LintResult {
+  readonly domain: string;
+}
+
 /**
  * Summary of lint results for a domain.
  */
@@ -125,4 +267,31 @@ export interface LintSummary {
   readonly domain: string;
   readonly fileCount: number;
   readonly results: readonly LintResult[];
+  /** Present in time-budgeted runs; false when the budget ran out first */
+  readonly complete?: boolean;
+  /** Present when any file was skipped or linted with grep rules only */
+  readonly skippedFiles?: readonly SkippedFile[];
+}
+
+/**
+ * Summary of lint results for a domain, with the results kept in a compact
+ * table until they are formatted.
+ */
+export interface CompactLintSummary extends Omit<LintSummary, 'results'> {
+  readonly results: ResultTable;
+}
+
+/**
+ * Violation counts for a domain, produced by count-only runs.
+ * No per-violation data is kept.
+ */
+export interface LintCounts {
+  readonly domain: string;
+  readonly fileCount: number;
+  readonly severityCounts: Readonly<Record<Severity, number>>;
+  readonly ruleCounts: Readonly<Record<string, number>>;
+  /** False when a time budget ran out before every file was scanned */
+  readonly complete: boolean;
+  /** Files skipped or linted with grep rules only */
+  readonly skippedFiles: readonly SkippedFile[];
 }
@@ -0,0 +1,10 @@
+/** Version reported by `flight-lint --version` */
+export const VERSION = '0.1.0';
+
+/**
+ * Print the version, as `flight-lint --version` does, without loading the CLI.
+ * Entry point called from bin/flight-lint.
+ */
+export function printVersion(): void {
+  process.stdout.write(`${VERSION}\n`);
+}
@@ -0,0 +1,241 @@
+import { Worker } from 'node:worker_threads';
+import os from 'node:os';
+import type { FileVisit } from './executor.js';
+import type { FileSizeLimits, RulesFile } from './types.js';
+
+/**
+ * Files handed to a worker per request. Small enough to balance load across
+ * workers, large enough that message passing stays negligible.
+ */
+const FILES_PER_BATCH = 32;
+
+/**
+ * Below this many files per worker, thread start-up costs more than it saves.
+ */
+const MIN_FILES_PER_WORKER = FILES_PER_BATCH;
+
+/**
+ * A file to scan and the targets that include it.
+ */
+export interface FileAssignment {
+  readonly filePath: string;
+  readonly targetIndexes: readonly number[];
+}
+
+/**
+ * Message sent to a lint worker.
+ */
+export type WorkerRequest =
+  | {
+      readonly kind: 'targets';
+      readonly scanId: number;
+      readonly rulesFiles: readonly RulesFile[];
+      readonly fileSizeLimits: FileSizeLimits;
+      readonly projectRoot: string;
+    }
+  | {
+      readonly kind: 'files';
+      readonly requestId: number;
+      readonly scanId: number;
+      readonly assignments: readonly FileAssignment[];
+      readonly deadline?: number;
+    };
+
+/**
+ * Message sent back by a lint worker; visits are null for files skipped
+ * because the deadline passed.
+ */
+export type WorkerResponse =
+  | { readonly requestId: number; readonly fileVisits: readonly (FileVisit | null)[] }
+  | { readonly requestId: number; readonly errorMessage: string };
+
+/**
+ * A request awaiting its worker's response.
+ */
+interface PendingRequest {
+  readonly resolve: (fileVisits: readonly (FileVisit | null)[]) => void;
+  readonly reject: (error: Error) => void;
+}
+
+/**
+ * Worker threads that each keep warm parsers, compiled queries and a
+ * source cache for the whole run. Threads start on first use.
+ */
+export interface WorkerPool {
+  readonly jobCount: number;
+  readonly sourceCacheBytes: number;
+  readonly workers: Worker[];
+  readonly pendingRequests: Map<number, PendingRequest>;
+  nextRequestId: number;
+  nextScanId: number;
+}
+
+/**
+ * Number of jobs to use when --jobs is not given.
+ * @returns The number of CPU cores available to the process
+ */
+export function getDefaultJobCount(): number {
+  return os.availableParallelism();
+}
+
+/**
+ * Create a worker pool. No threads are started until files are scanned.
+ * @param jobCount - Maximum number of worker threads
+ * @param sourceCacheBytes - Source cache cap shared out across the workers
+ * @returns The pool
+ */
+export function createWorkerPool(jobCount: number, sourceCacheBytes: number): WorkerPool {
+  return {
+    jobCount,
+    sourceCacheBytes,
+    workers: [],
+    pendingRequests: new Map(),
+    nextRequestId: 0,
+    nextScanId: 0,
+  };
+}
+
+/**
+ * Check whether a scan is large enough to be worth spreading across threads.
+ * @param workerPool - The pool
+ * @param fileCount - Number of files in the scan
+ * @returns True if at least two workers would each get a useful share
+ */
+export function shouldUseWorkerPool(workerPool: WorkerPool, fileCount: number): boolean {
+  return workerPool.jobCount > 1 && fileCount >= MIN_FILES_PER_WORKER * 2;
+}
+
+/**
+ * Reject every pending request, e.g. when a worker dies.
+ */
+function rejectPendingRequests(workerPool: WorkerPool, error: Error): void {
+  for (const pendingRequest of workerPool.pendingRequests.values()) {
+    pendingRequest.reject(error);
+  }
+  workerPool.pendingRequests.clear();
+}
+
+/**
+ * Start worker threads until the pool has the number it needs.
+ */
+function startWorkers(workerPool: WorkerPool, workerCount: number): void {
+  while (workerPool.workers.length < workerCount) {
+    const worker = new Worker(new URL('./lint-worker.js', import.meta.url), {
+      workerData: { sourceCacheBytes: Math.floor(workerPool.sourceCacheBytes / workerPool.jobCount) },
+    });
+
+    worker.on('message', (response: WorkerResponse) => {
+      const pendingRequest = workerPool.pendingRequests.get(response.requestId);
+      if (!pendingRequest) {
+        return;
+      }
+      workerPool.pendingRequests.delete(response.requestId);
+      if ('errorMessage' in response) {
+        pendingRequest.reject(new Error(response.errorMessage));
+      } else {
+        pendingRequest.resolve(response.fileVisits);
+      }
+    });
+    worker.on('error', (workerError) => rejectPendingRequests(workerPool, workerError));
+    worker.on('exit', (exitCode) => {
+      if (exitCode !== 0) {
+        rejectPendingRequests(workerPool, new Error(`Lint worker exited with code ${exitCode}`));
+      }
+    });
+
+    workerPool.workers.push(worker);
+  }
+}
+
+/**
+ * Send a batch of files to a worker and wait for its visits.
+ */
+function requestFileVisits(
+  workerPool: WorkerPool,
+  worker: Worker,
+  scanId: number,
+  assignments: readonly FileAssignment[],
+  deadline: number | undefined
+): Promise<readonly (FileVisit | null)[]> {
+  const requestId = workerPool.nextRequestId++;
+
+  return new Promise((resolve, reject) => {
+    workerPool.pendingRequests.set(requestId, { resolve, reject });
+    const request: WorkerRequest = { kind: 'files', requestId, scanId, assignments, deadline };
+    worker.postMessage(request);
+  });
+}
+
+/**
+ * Scan files across the pool's worker threads.
+ * Batches are handed out as workers become free; visits are delivered in the
+ * order of the assignments, whichever worker produced them. A worker waits
+ * for its batch to be delivered before taking the next one, so at most one
+ * batch per worker is ever held back.
+ * @param workerPool - The pool
+ * @param rulesFiles - Rules file of every target in the scan
+ * @param assignments - Files to scan, in visit order
+ * @param deadline - Epoch milliseconds after which no new file is started, if any
+ * @param fileSizeLimits - Limits for huge files
+ * @param projectRoot - Directory path scopes are relative to
+ * @param onFileVisit - Awaited with each assignment's index and visit; the
+ *   visit is null where the deadline passed first
+ */
+export async function scanFilesInWorkerPool(
+  workerPool: WorkerPool,
+  rulesFiles: readonly RulesFile[],
+  assignments: readonly FileAssignment[],
+  deadline: number | undefined,
+  fileSizeLimits: FileSizeLimits,
+  projectRoot: string,
+  onFileVisit: (assignmentIndex: number, fileVisit: FileVisit | null) => Promise<void>
+): Promise<void> {
+  const batchCount = Math.ceil(assignments.length / FILES_PER_BATCH);
+  startWorkers(workerPool, Math.min(workerPool.jobCount, batchCount));
+
+  const scanId = workerPool.nextScanId++;
+  const targetsRequest: WorkerRequest = { kind: 'targets', scanId, rulesFiles, fileSizeLimits, projectRoot };
+  for (const worker of workerPool.workers) {
+    worker.postMessage(targetsRequest);
+  }
+
+  const completedBatches = new Map<number, readonly (FileVisit | null)[]>();
+  let nextBatchIndex = 0;
+  let nextDeliveredBatchIndex = 0;
+  let deliveryQueue = Promise.resolve();
+
+  // Deliveries are chained so visits are handed over strictly in order
+  const deliverCompletedBatches = (): Promise<void> => {
+    deliveryQueue = deliveryQueue.then(async () => {
+      let batchVisits = completedBatches.get(nextDeliveredBatchIndex);
+      while (batchVisits) {
+        completedBatches.delete(nextDeliveredBatchIndex);
+        const batchStart = nextDeliveredBatchIndex * FILES_PER_BATCH;
+        for (const [batchOffset, fileVisit] of batchVisits.entries()) {
+          await onFileVisit(batchStart + batchOffset, fileVisit);
+        }
+        batchVisits = completedBatches.get(++nextDeliveredBatchIndex);
+      }
+    });
+    return deliveryQueue;
+  };
+
+  await Promise.all(workerPool.workers.map(async (worker) => {
+    while (nextBatchIndex < batchCount) {
+      const batchIndex = nextBatchIndex++;
+      const batchStart = batchIndex * FILES_PER_BATCH;
+      const batchAssignments = assignments.slice(batchStart, batchStart + FILES_PER_BATCH);
+      completedBatches.set(batchIndex, await requestFileVisits(workerPool, worker, scanId, batchAssignments, deadline));
+      await deliverCompletedBatches();
+    }
+  }));
+}
+
+/**
+ * Stop every worker thread in the pool.
+ * @param workerPool - The pool
+ */
+export async function closeWorkerPool(workerPool: WorkerPool): Promise<void> {
+  const workers = workerPool.workers.splice(0);
+  await Promise.all(workers.map((worker) => worker.terminate()));
+}
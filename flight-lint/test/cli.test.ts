@@ -1,6 +1,11 @@
-import { describe, it } from 'node:test';
+import { describe, it, after } from 'node:test';
 import assert from 'node:assert';
-import { parseArgs } from '../src/cli.js';
+import { writeFile, readFile, mkdir, rm } from 'node:fs/promises';
+import { Writable } from 'node:stream';
+import path from 'node:path';
+import { parseArgs, createLintSession, watchLinting, parseSourceBuffers, runLintRequest } from '../src/cli.js';
+import { createWorkerPool, closeWorkerPool } from '../src/worker-pool.js';
+import { DEFAULT_SOURCE_CACHE_BYTES } from '../src/parser.js';
 
 describe('CLI argument parsing', () => {
   it('parses default options with no arguments', () => {
@@ -9,9 +14,64 @@ describe('CLI argument parsing', () => {
     assert.strictEqual(parsedArgs.options.auto, false);
     assert.strictEqual(parsedArgs.options.format, 'pretty');
     assert.strictEqual(parsedArgs.options.severity, 'SHOULD');
+    assert.strictEqual(parsedArgs.options.countOnly, false);
+    assert.strictEqual(parsedArgs.options.timeBudgetMs, null);
     assert.deepStrictEqual(parsedArgs.rulesFiles, []);
   });
 
+  it('parses --count-only flag', () => {
+    const parsedArgs = parseArgs(['node', 'flight-lint', '--count-only']);
+
+    assert.strictEqual(parsedArgs.options.countOnly, true);
+  });
+
+  it('parses --time-budget as milliseconds', () => {
+    const parsedArgs = parseArgs(['node', 'flight-lint', '--time-budget', '1500']);
+
+    assert.strictEqual(parsedArgs.options.timeBudgetMs, 1500);
+  });
+
+  it('rejects a non-positive or non-numeric --time-budget', () => {
+    assert.throws(() => parseArgs(['node', 'flight-lint', '--time-budget', '0']), /Invalid time budget/);
+    assert.throws(() => parseArgs(['node', 'flight-lint', '--time-budget', 'soon']), /Invalid time budget/);
+  });
+
+  it('defaults --jobs to the available cores and accepts an explicit count', () => {
+    assert.ok(parseArgs(['node', 'flight-lint']).options.jobs >= 1);
+    assert.strictEqual(parseArgs(['node', 'flight-lint', '--jobs', '3']).options.jobs, 3);
+  });
+
+  it('rejects a non-positive --jobs', () => {
+    assert.throws(() => parseArgs(['node', 'flight-lint', '--jobs', '0']), /Invalid jobs/);
+  });
+
+  it('accepts the streaming ndjson format', () => {
+    assert.strictEqual(parseArgs(['node', 'flight-lint', '--format', 'ndjson']).options.format, 'ndjson');
+  });
+
+  it('accepts the normalized json format', () => {
+    assert.strictEqual(
+      parseArgs(['node', 'flight-lint', '--format', 'json-normalized']).options.format,
+      'json-normalized'
+    );
+  });
+
+  it('parses the run summary options and rejects a negative --summary-top', () => {
+    const parsedArgs = parseArgs(['node', 'flight-lint', '--summary-file', 'out/summary.json', '--summary-top', '0']);
+
+    assert.strictEqual(parsedArgs.options.summaryFile, 'out/summary.json');
+    assert.strictEqual(parsedArgs.options.summaryTop, 0);
+    assert.strictEqual(parseArgs(['node', 'flight-lint']).options.summaryFile, null);
+    assert.throws(() => parseArgs(['node', 'flight-lint', '--summary-top', '-1']), /Invalid summary top/);
+  });
+
+  it('parses file size limits and rejects invalid ones', () => {
+    const parsedArgs = parseArgs(['node', 'flight-lint', '--max-parse-bytes', '500', '--max-file-bytes', '9000']);
+
+    assert.deepStrictEqual(parsedArgs.options.fileSizeLimits, { maxParseBytes: 500, maxFileBytes: 9000 });
+    assert.throws(() => parseArgs(['node', 'flight-lint', '--max-file-bytes', 'big']), /Invalid max file bytes/);
+  });
+
   it('parses --auto flag', () => {
     const parsedArgs = parseArgs(['node', 'flight-lint', '--auto']);
 
@@ -54,3 +114,183 @@ describe('CLI argument parsing', () => {
     assert.deepStrictEqual(parsedArgs.rulesFiles, ['rules.json']);
   });
 });
+
+describe('stdin batches', () => {
+  it('accepts a bare array or an object with files', () => {
+    const sourceBuffers = [{ path: 'src/app.ts', content: 'const x = 1;\n' }];
+
+    assert.deepStrictEqual(parseSourceBuffers(JSON.stringify(sourceBuffers)), sourceBuffers);
+    assert.deepStrictEqual(parseSourceBuffers(JSON.stringify({ files: sourceBuffers })), sourceBuffers);
+  });
+
+  it('rejects batches without a string path and content per file', () => {
+    assert.throws(() => parseSourceBuffers('not json'), /Invalid --stdin batch/);
+    assert.throws(() => parseSourceBuffers('{"path": "a.ts"}'), /expected an array/);
+    assert.throws(() => parseSourceBuffers('[{"path": "a.ts", "content": 1}]'), /file 0 needs/);
+  });
+});
+
+describe('watch mode', () => {
+  const TEST_DIR = `/tmp/flight-lint-watch-test-${Date.now()}`;
+
+  after(async () => {
+    await rm(TEST_DIR, { recursive: true, force: true });
+  });
+
+  it('re-lints when a watched file changes and stops when aborted', async () => {
+    const rulesFilePath = path.join(TEST_DIR, 'vars.rules.json');
+    const sourcePath = path.join(TEST_DIR, 'src/app.js');
+    await mkdir(path.dirname(sourcePath), { recursive: true });
+    await writeFile(sourcePath, 'const first = 1;\n');
+    await writeFile(rulesFilePath, JSON.stringify({
+      domain: 'vars',
+      version: '1.0.0',
+      file_patterns: ['**/*.js'],
+      rules: [{ id: 'N1', title: 'No let', severity: 'NEVER', type: 'grep', query: null, pattern: '\\blet\\b', message: 'Use const' }],
+    }));
+
+    const outputLines: string[] = [];
+    const stdout = new Writable({
+      write(chunk: Buffer | string, _encoding, callback): void {
+        outputLines.push(...chunk.toString().split('\n').filter((line) => line.length > 0));
+        callback();
+      },
+    });
+    const stderr = new Writable({ write: (_chunk, _encoding, callback): void => callback() });
+    const waitForOutputs = async (outputCount: number): Promise<void> => {
+      while (outputLines.length < outputCount) {
+        await new Promise((resolve) => setTimeout(resolve, 20));
+      }
+    };
+
+    const abortController = new AbortController();
+    const parsedArgs = parseArgs(['node', 'flight-lint', '--count-only', '--watch', rulesFilePath]);
+    const watching = watchLinting(parsedArgs, { stdout, stderr }, createLintSession(TEST_DIR), abortController.signal);
+
+    await waitForOutputs(1);
+    await writeFile(sourcePath, 'let first = 1;\n');
+    await waitForOutputs(2);
+    abortController.abort();
+
+    assert.strictEqual(await watching, 1);
+    assert.strictEqual(JSON.parse(outputLines[0]!).total, 0);
+    assert.strictEqual(JSON.parse(outputLines[1]!).total, 1);
+  });
+
+  it('re-lints files rewritten through the worker pool from their new contents', async () => {
+    const poolDir = path.join(TEST_DIR, 'pooled');
+    const rulesFilePath = path.join(poolDir, 'vars.rules.json');
+    const sourcePaths = Array.from({ length: 70 }, (_file, fileIndex) => path.join(poolDir, `src/file${fileIndex}.js`));
+    await mkdir(path.join(poolDir, 'src'), { recursive: true });
+    await Promise.all(sourcePaths.map((sourcePath) => writeFile(sourcePath, 'const first = 1;\n')));
+    await writeFile(rulesFilePath, JSON.stringify({
+      domain: 'vars',
+      version: '1.0.0',
+      file_patterns: ['**/*.js'],
+      rules: [{ id: 'N1', title: 'No let', severity: 'NEVER', type: 'grep', query: null, pattern: '\\blet\\b', message: 'Use const' }],
+    }));
+
+    const totals: number[] = [];
+    const stdout = new Writable({
+      write(chunk: Buffer | string, _encoding, callback): void {
+        const lines = chunk.toString().split('\n').filter((line) => line.length > 0);
+        totals.push(...lines.map((line) => (JSON.parse(line) as { total: number }).total));
+        callback();
+      },
+    });
+    const stderr = new Writable({ write: (_chunk, _encoding, callback): void => callback() });
+    const waitFor = async (isDone: () => boolean): Promise<void> => {
+      const giveUpAt = Date.now() + 10_000;
+      while (!isDone() && Date.now() < giveUpAt) {
+        await new Promise((resolve) => setTimeout(resolve, 20));
+      }
+    };
+
+    const lintSession = createLintSession(poolDir);
+    lintSession.workerPool = createWorkerPool(2, DEFAULT_SOURCE_CACHE_BYTES);
+    const abortController = new AbortController();
+    const parsedArgs = parseArgs(['node', 'flight-lint', '--count-only', '--watch', rulesFilePath]);
+    try {
+      const watching = watchLinting(parsedArgs, { stdout, stderr }, lintSession, abortController.signal);
+
+      await waitFor(() => totals.length >= 1);
+      await Promise.all(sourcePaths.map((sourcePath) => writeFile(sourcePath, 'let first = 1;\n')));
+      await waitFor(() => totals.at(-1) === sourcePaths.length);
+      abortController.abort();
+      await watching;
+    } finally {
+      await closeWorkerPool(lintSession.workerPool);
+    }
+
+    assert.strictEqual(totals[0], 0);
+    assert.strictEqual(totals.at(-1), sourcePaths.length);
+  });
+});
+
+describe('run summaries', () => {
+  const TEST_DIR = `/tmp/flight-lint-summary-test-${Date.now()}`;
+  const rulesFilePath = path.join(TEST_DIR, 'vars.rules.json');
+
+  after(async () => {
+    await rm(TEST_DIR, { recursive: true, force: true });
+  });
+
+  /**
+   * Lint the test project and collect what the run writes to stdout.
+   */
+  async function runInTestDir(args: readonly string[], startedAt?: number): Promise<{ exitCode: number; stdout: string }> {
+    await mkdir(path.join(TEST_DIR, 'src'), { recursive: true });
+    await writeFile(path.join(TEST_DIR, 'src/app.js'), 'let first = 1;\nlet second = 2;\nvar third = 3;\n');
+    await writeFile(rulesFilePath, JSON.stringify({
+      domain: 'vars',
+      version: '1.0.0',
+      file_patterns: ['**/*.js'],
+      rules: [
+        { id: 'N1', title: 'No let', severity: 'NEVER', type: 'grep', query: null, pattern: '\\blet\\b', message: 'Use const' },
+        { id: 'S1', title: 'No var', severity: 'SHOULD', type: 'grep', query: null, pattern: '\\bvar\\b', message: 'Use const' },
+      ],
+    }));
+
+    const chunks: string[] = [];
+    const stdout = new Writable({
+      write(chunk: Buffer | string, _encoding, callback): void {
+        chunks.push(chunk.toString());
+        callback();
+      },
+    });
+    const stderr = new Writable({ write: (_chunk, _encoding, callback): void => callback() });
+    const lintIo = startedAt === undefined ? { stdout, stderr } : { stdout, stderr, startedAt };
+    const exitCode = await runLintRequest([...args, rulesFilePath], lintIo, createLintSession(TEST_DIR));
+    return { exitCode, stdout: chunks.join('') };
+  }
+
+  it('prints one summary record with the most severe violations first', async () => {
+    const { exitCode, stdout } = await runInTestDir(['--format', 'summary', '--summary-top', '2']);
+    const runSummary = JSON.parse(stdout);
+
+    assert.strictEqual(exitCode, 1);
+    assert.strictEqual(stdout.trim().split('\n').length, 1);
+    assert.deepStrictEqual(runSummary.severity, { NEVER: 2, MUST: 0, SHOULD: 1, GUIDANCE: 0 });
+    assert.strictEqual(runSummary.domains.vars.errors, 2);
+    assert.deepStrictEqual(runSummary.top.map((topResult: { line: number }) => topResult.line), [1, 2]);
+    assert.strictEqual(runSummary.complete, true);
+  });
+
+  it('counts --time-budget from when the run started', async () => {
+    const { stdout: lateOutput } = await runInTestDir(['--format', 'summary', '--time-budget', '1000'], Date.now() - 5000);
+    const { stdout: timelyOutput } = await runInTestDir(['--format', 'summary', '--time-budget', '60000'], Date.now() - 5000);
+
+    assert.strictEqual(JSON.parse(lateOutput).complete, false);
+    assert.strictEqual(JSON.parse(lateOutput).total, 0);
+    assert.strictEqual(JSON.parse(timelyOutput).complete, true);
+  });
+
+  it('writes the same record to --summary-file alongside other formats', async () => {
+    const { stdout } = await runInTestDir(['--format', 'summary']);
+    const { stdout: prettyOutput } = await runInTestDir(['--summary-file', 'reports/summary.json']);
+    const summaryText = await readFile(path.join(TEST_DIR, 'reports/summary.json'), 'utf-8');
+
+    assert.ok(prettyOutput.includes('Use const'));
+    assert.deepStrictEqual(JSON.parse(summaryText), JSON.parse(stdout));
+  });
+});
@@ -1,8 +1,20 @@
 import { describe, it, afterEach, before, after } from 'node:test';
 import assert from 'node:assert';
-import { writeFile, unlink, mkdir, rm } from 'node:fs/promises';
+import { writeFile, unlink, mkdir, rm, utimes } from 'node:fs/promises';
 import path from 'node:path';
-import { discoverFiles } from '../src/discovery.js';
+import {
+  discoverFiles,
+  discoverRulesFiles,
+  walkProjectFiles,
+  createWalkCache,
+  mapFilesToDomains,
+  filterWalkablePaths,
+  compileGlob,
+  hasCensusMatch,
+  collectFileNameCensus,
+  loadEnabledDomains,
+  selectRelevantRulesFiles,
+} from '../src/discovery.js';
 
 describe('discovery', () => {
   const TEST_DIR = `/tmp/flight-lint-discovery-test-${Date.now()}`;
@@ -140,4 +152,246 @@ describe('discovery', () => {
       assert.strictEqual(discoveredFiles.length, 0);
     });
   });
+
+  describe('walkProjectFiles', () => {
+    it('prunes default and .flightignore directories and returns sorted relative paths', async () => {
+      await createTestFile('walk/src/b.ts', 'export {}');
+      await createTestFile('walk/src/a.ts', 'export {}');
+      await createTestFile('walk/node_modules/pkg/index.ts', 'export {}');
+      await createTestFile('walk/generated/api.ts', 'export {}');
+      await createTestFile('walk/.github/workflows/ci.yml', 'on: push');
+      await createTestFile('walk/package.json', '{}');
+      await createTestFile('walk/.flightignore', 'generated/\n');
+
+      const projectFiles = await walkProjectFiles(path.join(TEST_DIR, 'walk'));
+
+      assert.deepStrictEqual(projectFiles, [
+        '.flightignore',
+        '.github/workflows/ci.yml',
+        'src/a.ts',
+        'src/b.ts',
+      ]);
+    });
+
+    it('prunes directories named by .flightignore entries without a trailing slash', async () => {
+      await createTestFile('walk-bare/src/a.ts', 'export {}');
+      await createTestFile('walk-bare/out-gen/api.ts', 'export {}');
+      await createTestFile('walk-bare/src/out-gen/nested.ts', 'export {}');
+      await createTestFile('walk-bare/src/stale/old.ts', 'export {}');
+      await createTestFile('walk-bare/.flightignore', 'out-gen\n/src/stale\n');
+
+      const projectFiles = await walkProjectFiles(path.join(TEST_DIR, 'walk-bare'));
+
+      assert.deepStrictEqual(projectFiles, ['.flightignore', 'src/a.ts']);
+    });
+
+    it('reuses cached listings until a directory changes', async () => {
+      await createTestFile('cached-walk/src/a.ts', 'export {}');
+      const walkRoot = path.join(TEST_DIR, 'cached-walk');
+      const walkCache = createWalkCache();
+
+      assert.deepStrictEqual(await walkProjectFiles(walkRoot, walkCache), ['src/a.ts']);
+
+      // A file added without touching the directory time stays hidden
+      const srcDir = path.join(walkRoot, 'src');
+      const listedTime = new Date(Date.now() - 60_000);
+      await utimes(srcDir, listedTime, listedTime);
+      await walkProjectFiles(walkRoot, walkCache);
+      await createTestFile('cached-walk/src/b.ts', 'export {}');
+      await utimes(srcDir, listedTime, listedTime);
+      assert.deepStrictEqual(await walkProjectFiles(walkRoot, walkCache), ['src/a.ts']);
+
+      const changedTime = new Date();
+      await utimes(srcDir, changedTime, changedTime);
+      assert.deepStrictEqual(await walkProjectFiles(walkRoot, walkCache), ['src/a.ts', 'src/b.ts']);
+    });
+  });
+
+  describe('filterWalkablePaths', () => {
+    it('drops paths the walk would prune or that leave the project', async () => {
+      await createTestFile('filter/.flightignore', 'generated/\n');
+
+      const walkablePaths = filterWalkablePaths([
+        'src/a.ts',
+        'node_modules/pkg/index.ts',
+        'generated/api.ts',
+        'src/generated/api.ts',
+        '../outside.ts',
+        '/etc/passwd',
+        '.github/workflows/ci.yml',
+      ], path.join(TEST_DIR, 'filter'));
+
+      assert.deepStrictEqual(walkablePaths, ['src/a.ts', '.github/workflows/ci.yml']);
+    });
+  });
+
+  describe('discoverRulesFiles', () => {
+    it('finds rules files at any depth, skipping dot entries and other files', async () => {
+      const projectDir = path.join(TEST_DIR, 'rules-discovery');
+      const nestedRulesPath = await createTestFile('rules-discovery/.flight/domains/extra/go.rules.json', '{}');
+      const topRulesPath = await createTestFile('rules-discovery/.flight/domains/api.rules.json', '{}');
+      await createTestFile('rules-discovery/.flight/domains/.drafts/draft.rules.json', '{}');
+      await createTestFile('rules-discovery/.flight/domains/api.flight', '');
+
+      assert.deepStrictEqual(await discoverRulesFiles(projectDir), [topRulesPath, nestedRulesPath]);
+      assert.deepStrictEqual(await discoverRulesFiles(path.join(TEST_DIR, 'no-flight')), []);
+    });
+  });
+
+  describe('mapFilesToDomains', () => {
+    it('maps each file to every domain whose patterns match it', () => {
+      const domainsByFile = mapFilesToDomains(
+        ['app/page.tsx', 'src/types.d.ts', 'src/util.ts', 'README.md'],
+        [
+          { patterns: ['**/*.ts', '**/*.tsx'], excludePatterns: ['**/*.d.ts'] },
+          { patterns: ['app/**/*.tsx'] },
+          { patterns: ['**/*.ts'] },
+        ],
+        '/project'
+      );
+
+      assert.deepStrictEqual([...domainsByFile], [
+        ['/project/app/page.tsx', [0, 1]],
+        ['/project/src/types.d.ts', [2]],
+        ['/project/src/util.ts', [0, 2]],
+      ]);
+    });
+
+    it('matches dot segments only when a pattern names them', () => {
+      const domainsByFile = mapFilesToDomains(
+        ['.github/workflows/ci.yml', 'src/.hidden/config.yml', 'deploy.yml'],
+        [{ patterns: ['**/*.yml'] }, { patterns: ['**/.github/workflows/*.yml'] }],
+        '/project'
+      );
+
+      assert.deepStrictEqual([...domainsByFile], [
+        ['/project/.github/workflows/ci.yml', [1]],
+        ['/project/deploy.yml', [0]],
+      ]);
+    });
+  });
+
+  describe('compileGlob', () => {
+    it('matches recursive patterns at any depth including the root', () => {
+      const globMatcher = compileGlob('**/*.ts');
+
+      assert.ok(globMatcher.test('index.ts'));
+      assert.ok(globMatcher.test('src/deep/index.ts'));
+      assert.ok(!globMatcher.test('src/index.tsx'));
+    });
+
+    it('expands brace alternatives', () => {
+      const globMatcher = compileGlob('**/routes*.{js,ts}');
+
+      assert.ok(globMatcher.test('src/routes-user.js'));
+      assert.ok(globMatcher.test('routes.ts'));
+      assert.ok(!globMatcher.test('routes.py'));
+    });
+
+    it('keeps single star within one path segment', () => {
+      const globMatcher = compileGlob('app/*.tsx');
+
+      assert.ok(globMatcher.test('app/page.tsx'));
+      assert.ok(!globMatcher.test('app/nested/page.tsx'));
+    });
+  });
+
+  describe('hasCensusMatch', () => {
+    it('returns true when a file name matches the final pattern segment', () => {
+      const fileNameCensus = new Set(['page.tsx', 'README.md']);
+
+      assert.strictEqual(hasCensusMatch(['app/**/*.tsx'], fileNameCensus), true);
+    });
+
+    it('returns false when no file name matches any pattern', () => {
+      const fileNameCensus = new Set(['index.ts', 'README.md']);
+
+      assert.strictEqual(hasCensusMatch(['**/*.c', '**/*.h'], fileNameCensus), false);
+    });
+  });
+
+  describe('collectFileNameCensus', () => {
+    it('collects distinct file names and skips excluded directories', async () => {
+      await createTestFile('src/index.ts', 'export {}');
+      await createTestFile('lib/index.ts', 'export {}');
+      await createTestFile('node_modules/pkg/main.c', 'int x;');
+
+      const fileNameCensus = await collectFileNameCensus(TEST_DIR);
+
+      assert.ok(fileNameCensus.has('index.ts'));
+      assert.ok(!fileNameCensus.has('main.c'));
+    });
+  });
+
+  describe('loadEnabledDomains', () => {
+    it('returns null when flight.json is absent', () => {
+      assert.strictEqual(loadEnabledDomains(path.join(TEST_DIR, 'no-such-project')), null);
+    });
+
+    it('reads enabled_domains from a v1 config', async () => {
+      await createTestFile('v1/.flight/flight.json', JSON.stringify({
+        enabled_domains: ['typescript', 'code-hygiene'],
+      }));
+
+      const enabledDomains = loadEnabledDomains(path.join(TEST_DIR, 'v1'));
+
+      assert.deepStrictEqual(enabledDomains, ['code-hygiene', 'typescript']);
+    });
+
+    it('reads source and test domains from a v2 config', async () => {
+      await createTestFile('v2/.flight/flight.json', JSON.stringify({
+        version: '2',
+        domains: { source: ['react'], test: ['testing'] },
+      }));
+
+      const enabledDomains = loadEnabledDomains(path.join(TEST_DIR, 'v2'));
+
+      assert.deepStrictEqual(enabledDomains, ['react', 'testing']);
+    });
+
+    it('returns null when flight.json lists no domains', async () => {
+      await createTestFile('unscanned/.flight/flight.json', JSON.stringify({ version: '2', project: 'demo' }));
+
+      assert.strictEqual(loadEnabledDomains(path.join(TEST_DIR, 'unscanned')), null);
+    });
+
+    it('returns an empty list when flight.json enables no domains', async () => {
+      await createTestFile('none-enabled/.flight/flight.json', JSON.stringify({ enabled_domains: [] }));
+
+      assert.deepStrictEqual(loadEnabledDomains(path.join(TEST_DIR, 'none-enabled')), []);
+    });
+  });
+
+  describe('selectRelevantRulesFiles', () => {
+    async function createRulesFile(projectDir: string, domain: string, filePatterns: string[]): Promise<string> {
+      const rulesContent = JSON.stringify({ domain, version: '1.0.0', file_patterns: filePatterns, rules: [] });
+      return createTestFile(`${projectDir}/.flight/domains/${domain}.rules.json`, rulesContent);
+    }
+
+    it('honours enabled domains from flight.json', async () => {
+      const typescriptRules = await createRulesFile('configured', 'typescript', ['**/*.ts']);
+      const pythonRules = await createRulesFile('configured', 'python', ['**/*.py']);
+      await createTestFile('configured/.flight/flight.json', JSON.stringify({ enabled_domains: ['python'] }));
+
+      const selectedPaths = await selectRelevantRulesFiles(
+        [typescriptRules, pythonRules],
+        path.join(TEST_DIR, 'configured')
+      );
+
+      assert.deepStrictEqual(selectedPaths, [pythonRules]);
+    });
+
+    it('skips domains whose patterns match no project files without flight.json', async () => {
+      const typescriptRules = await createRulesFile('census', 'typescript', ['**/*.ts']);
+      const embeddedRules = await createRulesFile('census', 'embedded-c', ['**/*.c']);
+      await createTestFile('census/src/app.ts', 'export {}');
+
+      const selectedPaths = await selectRelevantRulesFiles(
+        [typescriptRules, embeddedRules],
+        path.join(TEST_DIR, 'census')
+      );
+
+      assert.deepStrictEqual(selectedPaths, [typescriptRules]);
+    });
+  });
 });
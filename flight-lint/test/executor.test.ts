@@ -1,10 +1,31 @@
 import { describe, it, afterEach, before, after } from 'node:test';
 import assert from 'node:assert';
-import { writeFile, unlink, mkdir, rm } from 'node:fs/promises';
+import { writeFile, unlink, mkdir, rm, utimes } from 'node:fs/promises';
 import path from 'node:path';
 import { parseFile, getLanguage } from '../src/parser.js';
-import { executeRule, lintFile, lintFiles, isRuleCompatibleWithFile } from '../src/executor.js';
-import type { Rule, RulesFile } from '../src/types.js';
+import {
+  executeRule,
+  lintFile,
+  lintFiles,
+  countFiles,
+  lintTargets,
+  lintTargetsCompact,
+  expandLintSummary,
+  mergeCompactSummaries,
+  countTargets,
+  streamTargets,
+  mergeLintSummaries,
+  mergeLintCounts,
+  findInvalidQueries,
+  tagQueryCaptures,
+  isRuleCompatibleWithFile,
+  isDomainActive,
+  createFileVisitCache,
+  lintBuffers,
+} from '../src/executor.js';
+import { createWorkerPool, closeWorkerPool } from '../src/worker-pool.js';
+import { createResultTableFrom } from '../src/result-table.js';
+import type { LintSummary, Rule, RulesFile } from '../src/types.js';
 
 // Shared test rules - defined once to avoid duplication
 // Query node types use tree-sitter naming conventions
@@ -173,9 +194,334 @@ let third = 3;`;
         }
       );
     });
+
+    it('reuses the compiled query across files and rules sharing it', async () => {
+      const language = await getLanguage('javascript');
+      const firstTree = await parseFile('let alpha = 1;', 'javascript');
+      const secondTree = await parseFile('let beta = 2;\nlet gamma = 3;', 'javascript');
+      const renamedRule: Rule = { ...createVarFinderRule(), id: 'find-vars-again' };
+
+      assert.strictEqual(executeRule(firstTree, createVarFinderRule(), language).length, 1);
+      assert.strictEqual(executeRule(secondTree, renamedRule, language).length, 2);
+    });
+
+    it('reports the rule ID of every rule sharing a broken query', async () => {
+      const tree = await parseFile('let count = 1;', 'javascript');
+      const language = await getLanguage('javascript');
+      const brokenQuery = '(still not valid';
+      const firstRule: Rule = { id: 'broken-a', title: 'A', severity: 'SHOULD', query: brokenQuery, message: 'a' };
+      const secondRule: Rule = { ...firstRule, id: 'broken-b' };
+
+      assert.throws(() => executeRule(tree, firstRule, language), /broken-a/);
+      assert.throws(() => executeRule(tree, secondRule, language), /broken-b/);
+    });
+  });
+
+  describe('tagQueryCaptures', () => {
+    it('tags captures in patterns and predicates but not inside strings or comments', () => {
+      const querySource = '; match @decorators\n((identifier) @name (#eq? @name "@Component"))';
+
+      assert.strictEqual(
+        tagQueryCaptures(querySource, 3),
+        '; match @decorators\n((identifier) @r3.name (#eq? @r3.name "@Component"))'
+      );
+    });
+  });
+
+  describe('merged rule queries', () => {
+    it('attributes captures to their rule and keeps predicates per rule', async () => {
+      const filePath = await createTestFile('merged.js', `function greet() {
+  let data = 1;
+  let count = 2;
+}`);
+      const genericNameRule: Rule = {
+        id: 'generic-name',
+        title: 'Generic Name',
+        severity: 'MUST',
+        query: '((variable_declarator name: (identifier) @violation) (#eq? @violation "data"))',
+        message: 'Generic name',
+      };
+      const helperCaptureRule: Rule = {
+        id: 'function-with-helper-capture',
+        title: 'Function',
+        severity: 'SHOULD',
+        query: '(function_declaration name: (identifier) @violation body: (statement_block) @body)',
+        message: 'Function found',
+      };
+
+      const lintResults = await lintFile(
+        filePath,
+        [createVarFinderRule(), genericNameRule, helperCaptureRule],
+        'javascript'
+      );
+
+      assert.deepStrictEqual(
+        lintResults.map((lintResult) => `${lintResult.ruleId}:${lintResult.line}`),
+        ['find-vars:2', 'find-vars:3', 'generic-name:2', 'function-with-helper-capture:1']
+      );
+    });
+  });
+
+  describe('findInvalidQueries', () => {
+    it('reports each invalid query once per grammar and ignores valid ones', async () => {
+      const rulesFile: RulesFile = {
+        domain: 'query-domain',
+        version: '1.0.0',
+        filePatterns: ['**/*.ts'],
+        rules: [
+          createVarFinderRule({ language: 'typescript' }),
+          { id: 'bad', title: 'Bad', severity: 'MUST', language: 'typescript', query: '(oops', message: 'bad' },
+        ],
+      };
+
+      const invalidQueryMessages = await findInvalidQueries(rulesFile);
+
+      assert.strictEqual(invalidQueryMessages.length, 2);
+      assert.ok(invalidQueryMessages.every((message) => message.includes('rule bad')));
+      assert.ok(invalidQueryMessages.some((message) => message.includes('(tsx)')));
+    });
+  });
+
+  describe('grep rules', () => {
+    function createGrepRule(id: string, pattern: string): Rule {
+      return { id, title: id, severity: 'SHOULD', type: 'grep', pattern, message: id };
+    }
+
+    it('reports the first match per line with 1-indexed positions, in rule order', async () => {
+      const filePath = await createTestFile('grep.sh', 'echo TODO TODO\nok\n  FIXME later\n');
+
+      const lintResults = await lintFile(
+        filePath,
+        [createGrepRule('fixme', 'FIXME'), createGrepRule('todo', 'TODO')],
+        null
+      );
+
+      assert.deepStrictEqual(
+        lintResults.map((lintResult) => `${lintResult.ruleId}@${lintResult.line}:${lintResult.column}`),
+        ['fixme@3:3', 'todo@1:6']
+      );
+    });
+
+    it('keeps line semantics for anchors and patterns that could span lines', async () => {
+      const filePath = await createTestFile('span.js', 'const a = {\n}\nconst b = {};\nend');
+
+      const lintResults = await lintFile(
+        filePath,
+        [createGrepRule('empty-object', '=\\s*\\{\\s*\\}'), createGrepRule('line-start', '^end$')],
+        null
+      );
+
+      assert.deepStrictEqual(
+        lintResults.map((lintResult) => `${lintResult.ruleId}@${lintResult.line}`),
+        ['empty-object@3', 'line-start@4']
+      );
+    });
+
+    it('runs lookaround and backreference patterns line by line', async () => {
+      const filePath = await createTestFile('lookaround.py', 'yaml.load(x)\nyaml.load(x, Loader=L)\nabab\n');
+
+      const lintResults = await lintFile(
+        filePath,
+        [createGrepRule('unsafe-load', 'yaml\\.load\\([^,)]+\\)(?!\\s*,)'), createGrepRule('repeat', '(ab)\\1')],
+        null
+      );
+
+      assert.deepStrictEqual(
+        lintResults.map((lintResult) => `${lintResult.ruleId}@${lintResult.line}`),
+        ['unsafe-load@1', 'repeat@3']
+      );
+    });
+
+    it('skips invalid patterns without affecting other rules', async () => {
+      const filePath = await createTestFile('invalid.txt', 'needle\n');
+
+      const lintResults = await lintFile(
+        filePath,
+        [createGrepRule('broken', '(unclosed'), createGrepRule('needle', 'needle')],
+        null
+      );
+
+      assert.deepStrictEqual(lintResults.map((lintResult) => lintResult.ruleId), ['needle']);
+    });
+  });
+
+  describe('check types', () => {
+    function createCheckRule(id: string, overrides: Partial<Rule>): Rule {
+      return { id, title: id, severity: 'MUST', pattern: null, query: null, message: id, ...overrides };
+    }
+
+    /**
+     * Lint files written under a project directory of their own with one
+     * domain, as locations relative to that directory ("." for the root).
+     */
+    async function lintProject(
+      projectName: string,
+      files: Record<string, string>,
+      rules: Rule[],
+      rulesFileFields: Partial<RulesFile> = {},
+      scanOptions: { maxParseBytes?: number } = {}
+    ): Promise<string[]> {
+      const projectRoot = path.join(TEST_DIR, projectName);
+      const sourceFiles: string[] = [];
+      for (const [relativePath, content] of Object.entries(files)) {
+        sourceFiles.push(await createTestFile(path.join(projectName, relativePath), content));
+      }
+      const rulesFile: RulesFile = { domain: 'checks', version: '1.0.0', filePatterns: ['**/*'], rules, ...rulesFileFields };
+
+      const [lintSummary] = await lintTargets([{ rulesFile, sourceFiles }], {
+        projectRoot,
+        ...(scanOptions.maxParseBytes === undefined
+          ? {}
+          : { fileSizeLimits: { maxParseBytes: scanOptions.maxParseBytes, maxFileBytes: 1_048_576 } }),
+      });
+      return lintSummary!.results.map((lintResult) =>
+        `${lintResult.ruleId}@${path.relative(projectRoot, lintResult.filePath) || '.'}:${lintResult.line}:${lintResult.column}`
+      );
+    }
+
+    it('matches grep rules ignoring case and drops lines or files matching ignoreWhen', async () => {
+      const results = await lintProject('grep-flags', {
+        'app.js': 'Console.log(1);\nconsole.log(2); // debug\n',
+        'app_debug.js': 'console.log(3);\n',
+      }, [createCheckRule('N1', { type: 'grep', pattern: 'console\\.log', ignoreCase: true, ignoreWhen: ['debug'] })]);
+
+      assert.deepStrictEqual(results, ['N1@app.js:1:1']);
+    });
+
+    it('matches multiline grep rules across lines, reporting where each match starts', async () => {
+      const results = await lintProject('grep-multiline', {
+        'main.go': 'package main\nfunc f() {\n\tdefer\n\tmu.Unlock()\n}\n',
+      }, [createCheckRule('N6', { type: 'grep', pattern: 'defer\\s*\\n\\s*mu', multiline: true })]);
+
+      assert.deepStrictEqual(results, ['N6@main.go:3:2']);
+    });
+
+    it('reports requires rules per file: missing patterns at 1:1, unmet triggers at each trigger line', async () => {
+      const results = await lintProject('requires', {
+        'licensed.ts': '// SPDX-License-Identifier: MIT\n',
+        'bare.ts': 'export {};\n',
+        'writes.sql': 'INSERT INTO a;\nINSERT INTO b;\n',
+        'one-write.sql': 'INSERT INTO a;\n',
+        'safe.sql': 'BEGIN;\nINSERT INTO a;\nINSERT INTO b;\n',
+      }, [
+        createCheckRule('M1', { type: 'requires', mustExist: 'SPDX-License-Identifier', onlyPaths: ['**/*.ts'] }),
+        createCheckRule('S5', { type: 'requires', trigger: 'INSERT INTO', requirement: 'BEGIN', triggerCount: 2 }),
+      ]);
+
+      assert.deepStrictEqual(results, ['M1@bare.ts:1:1', 'S5@writes.sql:1:1', 'S5@writes.sql:2:1']);
+    });
+
+    it('reports multi-condition rules where all conditions, or any of them, match', async () => {
+      const conditions = [{ pattern: 'origin.*\\*', ignoreCase: true }, { pattern: 'credentials' }];
+      const results = await lintProject('conditions', {
+        'both.js': 'const credentials = true;\nres.set(ORIGIN, "*");\n',
+        'one.js': 'res.set(origin, "*");\n',
+      }, [
+        createCheckRule('N8', { type: 'multi-condition', logic: 'AND', conditions }),
+        createCheckRule('S8', { type: 'multi-condition', logic: 'OR', conditions }),
+      ]);
+
+      assert.deepStrictEqual(results, ['N8@both.js:2:9', 'S8@both.js:2:9', 'S8@one.js:1:9']);
+    });
+
+    it('judges presence and file_exists rules once per project, at the project root', async () => {
+      const rules = [
+        createCheckRule('S3', { type: 'presence', pattern: 'api-version', ignoreCase: true }),
+        createCheckRule('S11', { type: 'file_exists', paths: ['openapi.yaml', 'docs/**/openapi.*'] }),
+      ];
+
+      const missing = await lintProject('project-missing', { 'a.js': 'x\n', 'b.js': 'y\n' }, rules);
+      const present = await lintProject('project-present', {
+        'a.js': 'headers["API-Version"]\n',
+        'docs/v1/openapi.json': '{}\n',
+      }, rules);
+
+      assert.deepStrictEqual(missing, ['S3@.:1:1', 'S11@.:1:1']);
+      assert.deepStrictEqual(present, []);
+    });
+
+    it('runs script rules once over their files from the project root', async () => {
+      const results = await lintProject('script', {
+        'src/a.sh': 'ok\nTODO fix\n',
+        'src/b.sh': 'fine\n',
+      }, [createCheckRule('S2', { type: 'script', code: 'grep -n TODO "$file" | sed "s|^|$file:|"\n[ -f "$file" ] || echo missing' })]);
+
+      assert.deepStrictEqual(results, ['S2@src/a.sh:2:1']);
+    });
+
+    it('kills script rules still running at the deadline and marks the run incomplete', async () => {
+      const sourcePath = await createTestFile('slow-script/src/a.sh', 'ok\n');
+      const rulesFile: RulesFile = {
+        domain: 'slow',
+        version: '1.0.0',
+        filePatterns: ['**/*'],
+        rules: [createCheckRule('S3', { type: 'script', code: 'sleep 30; echo "$file:1: late"' })],
+      };
+      const startedAt = Date.now();
+
+      const [lintSummary] = await lintTargets([{ rulesFile, sourceFiles: [sourcePath] }], {
+        projectRoot: path.join(TEST_DIR, 'slow-script'),
+        deadline: startedAt + 500,
+      });
+
+      assert.ok(Date.now() - startedAt < 5000);
+      assert.strictEqual(lintSummary?.complete, false);
+      assert.deepStrictEqual(lintSummary?.results, []);
+    });
+
+    it('scopes rules by path and runs API-only rules on API endpoint files', async () => {
+      const results = await lintProject('scoping', {
+        'api/users.js': 'console.log(1);\n',
+        'lib/util.js': 'console.log(2);\n',
+        'lib/handler.js': 'router.get("/", h);\nconsole.log(3);\n',
+        'tests/app.test.js': 'console.log(4);\n',
+      }, [
+        createCheckRule('N1', { type: 'grep', pattern: 'console', skipPaths: ['**/tests/**'] }),
+        createCheckRule('N2', { type: 'grep', pattern: 'console', onlyPaths: ['lib/**'] }),
+        createCheckRule('N3', { type: 'grep', pattern: 'console', apiFilesOnly: true }),
+      ], { apiFileDetection: { paths: ['^api/'], patterns: ['router\\.get\\('] } });
+
+      assert.deepStrictEqual(results, [
+        'N1@api/users.js:1:1',
+        'N3@api/users.js:1:1',
+        'N1@lib/handler.js:2:1',
+        'N2@lib/handler.js:2:1',
+        'N3@lib/handler.js:2:1',
+        'N1@lib/util.js:1:1',
+        'N2@lib/util.js:1:1',
+      ]);
+    });
+
+    it('finds the same violations in files too large to parse', async () => {
+      const files = {
+        'api/big.js': `// ${'x'.repeat(200)}\nrouter.get("/");\nconsole.log(1);\n`,
+        'lib/big.js': `// ${'x'.repeat(200)}\nconsole.log(2);\n`,
+      };
+      const rules = [
+        createCheckRule('N3', { type: 'grep', pattern: 'console', apiFilesOnly: true }),
+        createCheckRule('M1', { type: 'requires', mustExist: 'SPDX' }),
+      ];
+      const rulesFileFields = { apiFileDetection: { paths: [], patterns: ['router\\.get'] } };
+
+      const parsed = await lintProject('chunked-parsed', files, rules, rulesFileFields);
+      const chunked = await lintProject('chunked-streamed', files, rules, rulesFileFields, { maxParseBytes: 64 });
+
+      assert.deepStrictEqual(chunked, parsed);
+      assert.deepStrictEqual(parsed, ['N3@api/big.js:3:1', 'M1@api/big.js:1:1', 'M1@lib/big.js:1:1']);
+    });
   });
 
   describe('lintFile', () => {
+    it('skips only the rule with an invalid query', async () => {
+      const filePath = await createTestFile('partial.js', 'let alpha = 1;');
+      const brokenRule: Rule = { id: 'broken', title: 'Broken', severity: 'MUST', query: '(nope', message: 'x' };
+
+      const lintResults = await lintFile(filePath, [brokenRule, createVarFinderRule()], 'javascript');
+
+      assert.deepStrictEqual(lintResults.map((lintResult) => lintResult.ruleId), ['find-vars']);
+    });
+
+
     it('runs all rules on a file and returns results', async () => {
       const filePath = await createTestFile('test.js', `let alpha = 1;
 let beta = 2;`);
@@ -210,7 +556,49 @@ let beta = 2;`);
     });
   });
 
+  describe('isDomainActive', () => {
+    it('returns true when the domain has no activation', () => {
+      assert.strictEqual(isDomainActive('let count = 1;', undefined), true);
+    });
+
+    it('matches literal signatures', () => {
+      const activation = { literals: ['@clerk/'] };
+
+      assert.strictEqual(isDomainActive("import { auth } from '@clerk/nextjs';", activation), true);
+      assert.strictEqual(isDomainActive("import { auth } from './auth';", activation), false);
+    });
+
+    it('matches regex signatures', () => {
+      const activation = { pattern: 'from [\'"]@prisma/client[\'"]' };
+
+      assert.strictEqual(isDomainActive("import { PrismaClient } from '@prisma/client';", activation), true);
+      assert.strictEqual(isDomainActive('const prismaClient = null;', activation), false);
+    });
+  });
+
   describe('lintFiles', () => {
+    it('skips rules on files without the activation signature', async () => {
+      await createTestFile('src/auth.js', "import { auth } from '@clerk/nextjs';\nlet session = auth();");
+      await createTestFile('src/plain.js', 'let counter = 0;');
+
+      const rulesFile: RulesFile = {
+        domain: 'clerk-like',
+        version: '1.0.0',
+        filePatterns: ['**/*.js'],
+        activation: { literals: ['@clerk/'] },
+        rules: [createVarFinderRule({ language: 'javascript' })],
+      };
+
+      const filesToLint = [
+        path.join(TEST_DIR, 'src/auth.js'),
+        path.join(TEST_DIR, 'src/plain.js'),
+      ];
+      const summary = await lintFiles(filesToLint, rulesFile);
+
+      assert.strictEqual(summary.results.length, 1);
+      assert.ok(summary.results[0]?.filePath.endsWith('auth.js'));
+    });
+
     it('lints multiple files and returns summary', async () => {
       await createTestFile('src/app.js', 'let counter = 0;');
       await createTestFile('src/utils.js', 'let helper = null;');
@@ -298,4 +686,416 @@ let beta = 2;`);
       assert.strictEqual(summary.results.length, 1);
     });
   });
+
+  describe('countFiles', () => {
+    it('counts violations per severity and rule without results', async () => {
+      await createTestFile('src/count.js', `function greet() {
+  let message = "hello";
+  let other = "world";
+}`);
+
+      const rulesFile: RulesFile = {
+        domain: 'count-domain',
+        version: '1.0.0',
+        filePatterns: ['**/*.js'],
+        rules: [createFuncFinderRule(), createVarFinderRule()],
+      };
+
+      const counts = await countFiles([path.join(TEST_DIR, 'src/count.js')], rulesFile);
+
+      assert.strictEqual(counts.domain, 'count-domain');
+      assert.strictEqual(counts.fileCount, 1);
+      assert.deepStrictEqual(counts.severityCounts, { NEVER: 1, MUST: 0, SHOULD: 2, GUIDANCE: 0 });
+      assert.deepStrictEqual(counts.ruleCounts, { 'find-functions': 1, 'find-vars': 2 });
+    });
+  });
+
+  describe('lintTargets', () => {
+    it('runs every domain against a shared file and keeps results apart', async () => {
+      const sharedPath = await createTestFile('src/shared.js', `function greet() {
+  let message = "hello";
+}`);
+      const onlyVarsPath = await createTestFile('src/vars.js', 'let other = 1;');
+
+      const functionDomain: RulesFile = {
+        domain: 'functions',
+        version: '1.0.0',
+        filePatterns: ['**/*.js'],
+        rules: [createFuncFinderRule()],
+      };
+      const variableDomain: RulesFile = {
+        domain: 'variables',
+        version: '1.0.0',
+        filePatterns: ['**/*.js'],
+        rules: [createVarFinderRule()],
+      };
+
+      const [functionSummary, variableSummary] = await lintTargets([
+        { rulesFile: functionDomain, sourceFiles: [sharedPath] },
+        { rulesFile: variableDomain, sourceFiles: [sharedPath, onlyVarsPath] },
+      ]);
+
+      assert.strictEqual(functionSummary?.domain, 'functions');
+      assert.strictEqual(functionSummary?.fileCount, 1);
+      assert.deepStrictEqual(functionSummary?.results.map((lintResult) => lintResult.ruleId), ['find-functions']);
+      assert.strictEqual(variableSummary?.fileCount, 2);
+      assert.strictEqual(variableSummary?.results.length, 2);
+    });
+
+    it('matches the expanded form of lintTargetsCompact', async () => {
+      const sourcePath = await createTestFile('src/compact.js', `function greet() {
+  let message = "hello";
+  let other = 1;
+}`);
+      const targets = [{
+        rulesFile: {
+          domain: 'mixed',
+          version: '1.0.0',
+          filePatterns: ['**/*.js'],
+          rules: [createFuncFinderRule(), createVarFinderRule()],
+        },
+        sourceFiles: [sourcePath],
+      }];
+
+      const [compactSummary] = await lintTargetsCompact(targets);
+
+      assert.strictEqual(compactSummary?.results.rowCount, 3);
+      assert.deepStrictEqual(compactSummary?.results.filePaths, [sourcePath]);
+      assert.deepStrictEqual(expandLintSummary(compactSummary!), (await lintTargets(targets))[0]);
+    });
+
+    it('produces identical summaries with a worker pool', async () => {
+      const sourceFiles: string[] = [];
+      for (let fileNumber = 0; fileNumber < 80; fileNumber++) {
+        sourceFiles.push(await createTestFile(
+          `pool/file${String(fileNumber).padStart(2, '0')}.js`,
+          `function handler${fileNumber}() {\n  let total = ${fileNumber};\n}\n`
+        ));
+      }
+      const targets = [
+        {
+          rulesFile: { domain: 'pool-ast', version: '1.0.0', filePatterns: ['**/*.js'], rules: [createVarFinderRule()] },
+          sourceFiles,
+        },
+        {
+          rulesFile: {
+            domain: 'pool-grep',
+            version: '1.0.0',
+            filePatterns: ['**/*.js'],
+            rules: [{ id: 'grep-handler', title: 'Handler', severity: 'MUST' as const, pattern: 'handler\\d+', message: 'h' }],
+          },
+          sourceFiles: sourceFiles.slice(0, 50),
+        },
+      ];
+      const workerPool = createWorkerPool(2, 1_000_000);
+
+      try {
+        const serialSummaries = await lintTargets(targets);
+        const pooledSummaries = await lintTargets(targets, { workerPool });
+
+        assert.strictEqual(workerPool.workers.length, 2);
+        assert.deepStrictEqual(pooledSummaries, serialSummaries);
+        assert.strictEqual(serialSummaries[0]?.results.length, 80);
+      } finally {
+        await closeWorkerPool(workerPool);
+      }
+    });
+
+    it('reports skipped binary files and grep-only large files', async () => {
+      const binaryPath = await createTestFile('guard/logo.js', Buffer.from([0x47, 0x00, 0x49, 0x46]).toString('latin1'));
+      const largeSource = Array.from({ length: 400 }, (_line, lineIndex) => `let handler${lineIndex} = ${lineIndex};`).join('\n');
+      const largePath = await createTestFile('guard/large.js', largeSource);
+      const rulesFile: RulesFile = {
+        domain: 'guarded',
+        version: '1.0.0',
+        filePatterns: ['**/*.js'],
+        rules: [
+          createVarFinderRule(),
+          { id: 'grep-handler', title: 'Handler', severity: 'MUST', pattern: 'handler\\d+', message: 'h' },
+        ],
+      };
+      const fileSizeLimits = { maxParseBytes: 1000, maxFileBytes: 1_000_000 };
+
+      const [guardedSummary] = await lintTargets([{ rulesFile, sourceFiles: [binaryPath, largePath] }], { fileSizeLimits });
+      const [unguardedSummary] = await lintTargets([{ rulesFile, sourceFiles: [largePath] }]);
+
+      assert.deepStrictEqual(guardedSummary?.skippedFiles, [
+        { filePath: largePath, reason: 'ast-skipped' },
+        { filePath: binaryPath, reason: 'binary' },
+      ]);
+      assert.strictEqual(guardedSummary?.fileCount, 1);
+      assert.deepStrictEqual(
+        guardedSummary?.results,
+        unguardedSummary?.results.filter((lintResult) => lintResult.ruleId === 'grep-handler')
+      );
+      assert.strictEqual(unguardedSummary?.skippedFiles, undefined);
+    });
+
+    it('runs grep rules on minified files and reports them for domains with AST rules', async () => {
+      const minifiedSource = Array.from({ length: 1000 }, (_item, itemIndex) => `let handler${itemIndex}=${itemIndex};`).join('');
+      const minifiedPath = await createTestFile('guard/bundle.min.js', `${minifiedSource}\nlet handlerTail=1;`);
+      const grepRule: Rule = { id: 'grep-handler', title: 'Handler', severity: 'MUST', pattern: 'handlerTail', message: 'h' };
+      const targets = [
+        { rulesFile: { domain: 'grep-only', version: '1.0.0', filePatterns: ['**/*.js'], rules: [grepRule] }, sourceFiles: [minifiedPath] },
+        {
+          rulesFile: { domain: 'with-ast', version: '1.0.0', filePatterns: ['**/*.js'], rules: [createVarFinderRule(), grepRule] },
+          sourceFiles: [minifiedPath],
+        },
+      ];
+
+      const [grepSummary, astSummary] = await lintTargets(targets);
+
+      for (const summary of [grepSummary, astSummary]) {
+        assert.deepStrictEqual(summary?.results.map((lintResult) => [lintResult.ruleId, lintResult.line]), [['grep-handler', 2]]);
+        assert.strictEqual(summary?.fileCount, 1);
+      }
+      assert.strictEqual(grepSummary?.skippedFiles, undefined);
+      assert.deepStrictEqual(astSummary?.skippedFiles, [{ filePath: minifiedPath, reason: 'minified' }]);
+    });
+
+    it('streams the results of each file in visit order and returns counts', async () => {
+      const firstPath = await createTestFile('stream/a.js', 'let alpha = 1;\nlet beta = 2;');
+      const secondPath = await createTestFile('stream/b.js', 'let gamma = 3;');
+      await createTestFile('stream/c.js', 'function quiet() {}');
+      const rulesFile: RulesFile = {
+        domain: 'streamed',
+        version: '1.0.0',
+        filePatterns: ['**/*.js'],
+        rules: [createVarFinderRule()],
+      };
+      const deliveredFiles: string[][] = [];
+
+      const [streamedCounts] = await streamTargets(
+        [{ rulesFile, sourceFiles: [secondPath, firstPath, path.join(TEST_DIR, 'stream/c.js')] }],
+        async (fileResults) => {
+          deliveredFiles.push(fileResults.map((streamedResult) => `${streamedResult.domain}:${streamedResult.filePath}`));
+        }
+      );
+
+      assert.deepStrictEqual(deliveredFiles, [
+        [`streamed:${firstPath}`, `streamed:${firstPath}`],
+        [`streamed:${secondPath}`],
+      ]);
+      assert.deepStrictEqual(streamedCounts?.ruleCounts, { 'find-vars': 3 });
+      assert.strictEqual(streamedCounts?.fileCount, 3);
+    });
+
+    it('counts per target like lintTargets', async () => {
+      const filePath = await createTestFile('src/counted.js', 'let alpha = 1;\nlet beta = 2;');
+      const rulesFile: RulesFile = {
+        domain: 'counted',
+        version: '1.0.0',
+        filePatterns: ['**/*.js'],
+        rules: [createVarFinderRule()],
+      };
+
+      const [lintCounts] = await countTargets([{ rulesFile, sourceFiles: [filePath] }]);
+
+      assert.deepStrictEqual(lintCounts?.ruleCounts, { 'find-vars': 2 });
+      assert.strictEqual(lintCounts?.complete, true);
+    });
+  });
+
+  describe('deadlines', () => {
+    it('marks the summary incomplete once the deadline has passed', async () => {
+      await createTestFile('src/late.js', 'let message = "hello";');
+
+      const rulesFile: RulesFile = {
+        domain: 'budget-domain',
+        version: '1.0.0',
+        filePatterns: ['**/*.js'],
+        rules: [createVarFinderRule()],
+      };
+      const filesToLint = [path.join(TEST_DIR, 'src/late.js')];
+
+      const expiredSummary = await lintFiles(filesToLint, rulesFile, Date.now() - 1);
+      const expiredCounts = await countFiles(filesToLint, rulesFile, Date.now() - 1);
+      const timelySummary = await lintFiles(filesToLint, rulesFile, Date.now() + 60_000);
+
+      assert.strictEqual(expiredSummary.complete, false);
+      assert.strictEqual(expiredSummary.fileCount, 0);
+      assert.strictEqual(expiredCounts.complete, false);
+      assert.strictEqual(timelySummary.complete, true);
+      assert.strictEqual(timelySummary.results.length, 1);
+    });
+
+    it('omits completeness when no deadline is given', async () => {
+      await createTestFile('src/plain.js', 'let message = "hello";');
+
+      const rulesFile: RulesFile = {
+        domain: 'plain-domain',
+        version: '1.0.0',
+        filePatterns: ['**/*.js'],
+        rules: [createVarFinderRule()],
+      };
+
+      const summary = await lintFiles([path.join(TEST_DIR, 'src/plain.js')], rulesFile);
+
+      assert.strictEqual(summary.complete, undefined);
+    });
+  });
+
+  describe('file visit cache', () => {
+    const cachedRulesFile: RulesFile = {
+      domain: 'cached-domain',
+      version: '1.0.0',
+      filePatterns: ['**/*.js'],
+      rules: [createVarFinderRule()],
+    };
+
+    it('reports unchanged files from the cache without reading them', async () => {
+      const filePath = await createTestFile('src/cached.js', 'let first = 1;');
+      const fileVisitCache = createFileVisitCache();
+      const targets = [{ rulesFile: cachedRulesFile, sourceFiles: [filePath] }];
+
+      const scannedTime = new Date(Date.now() - 60_000);
+      await utimes(filePath, scannedTime, scannedTime);
+      const [firstSummary] = await lintTargets(targets, { fileVisitCache });
+
+      // Same size and modification time: the new content is never read
+      await writeFile(filePath, 'first = 12345;');
+      await utimes(filePath, scannedTime, scannedTime);
+      const [cachedSummary] = await lintTargets(targets, { fileVisitCache });
+
+      assert.strictEqual(firstSummary?.results.length, 1);
+      assert.deepStrictEqual(cachedSummary, firstSummary);
+    });
+
+    it('rescans files whose modification time changed', async () => {
+      const filePath = await createTestFile('src/edited.js', 'let first = 1;');
+      const fileVisitCache = createFileVisitCache();
+      const targets = [{ rulesFile: cachedRulesFile, sourceFiles: [filePath] }];
+
+      await lintTargets(targets, { fileVisitCache });
+      await writeFile(filePath, 'first = 12345;');
+      const later = new Date(Date.now() + 10_000);
+      await utimes(filePath, later, later);
+      const [rescannedSummary] = await lintTargets(targets, { fileVisitCache });
+
+      assert.strictEqual(rescannedSummary?.results.length, 0);
+    });
+
+    it('reports cached files even after the deadline', async () => {
+      const filePath = await createTestFile('src/recalled.js', 'let first = 1;');
+      const fileVisitCache = createFileVisitCache();
+      const targets = [{ rulesFile: cachedRulesFile, sourceFiles: [filePath] }];
+
+      await lintTargets(targets, { fileVisitCache });
+      const [lateSummary] = await lintTargets(targets, { fileVisitCache, deadline: Date.now() - 1 });
+
+      assert.strictEqual(lateSummary?.results.length, 1);
+      assert.strictEqual(lateSummary?.complete, true);
+    });
+  });
+
+  describe('lintBuffers', () => {
+    const bufferRulesFile: RulesFile = {
+      domain: 'buffered',
+      version: '1.0.0',
+      filePatterns: ['**/*.js'],
+      rules: [createVarFinderRule()],
+    };
+
+    it('lints buffer content instead of the files on disk', async () => {
+      const onDiskPath = await createTestFile('buffers/existing.js', 'function quiet() {}');
+
+      const summaries = await lintBuffers([
+        { path: 'buffers/existing.js', content: 'let added = 1;' },
+        { path: path.join(TEST_DIR, 'buffers/proposed.js'), content: 'let first = 1;\nlet second = 2;' },
+      ], [bufferRulesFile], TEST_DIR);
+
+      assert.strictEqual(summaries.length, 1);
+      assert.deepStrictEqual(
+        summaries[0]?.results.map((lintResult) => [path.basename(lintResult.filePath), lintResult.line]),
+        [['existing.js', 1], ['proposed.js', 1], ['proposed.js', 2]]
+      );
+      assert.ok(summaries[0]?.results.some((lintResult) => lintResult.filePath === onDiskPath));
+    });
+
+    it('applies only domains whose patterns match a buffer path after walk exclusions', async () => {
+      const markdownRulesFile: RulesFile = { ...bufferRulesFile, domain: 'docs', filePatterns: ['**/*.md'] };
+
+      const summaries = await lintBuffers([
+        { path: 'node_modules/pkg/index.js', content: 'let skipped = 1;' },
+        { path: '../outside.js', content: 'let outside = 1;' },
+        { path: 'src/kept.js', content: 'let kept = 1;' },
+      ], [markdownRulesFile, bufferRulesFile], TEST_DIR);
+
+      assert.deepStrictEqual(summaries.map((summary) => summary.domain), ['buffered']);
+      assert.deepStrictEqual(summaries[0]?.results.map((lintResult) => lintResult.filePath), [path.join(TEST_DIR, 'src/kept.js')]);
+    });
+  });
+
+  describe('merging severity passes', () => {
+    it('orders merged results by location and keeps the largest file count', () => {
+      const merged = mergeLintSummaries([
+        {
+          domain: 'd',
+          fileCount: 2,
+          complete: true,
+          results: [{ filePath: '/b.ts', line: 1, column: 1, ruleId: 'N1', severity: 'NEVER', message: 'n' }],
+        },
+        {
+          domain: 'd',
+          fileCount: 1,
+          complete: false,
+          results: [{ filePath: '/a.ts', line: 3, column: 1, ruleId: 'S1', severity: 'SHOULD', message: 's' }],
+        },
+      ]);
+
+      assert.deepStrictEqual(merged.results.map((lintResult) => lintResult.filePath), ['/a.ts', '/b.ts']);
+      assert.strictEqual(merged.fileCount, 2);
+      assert.strictEqual(merged.complete, false);
+    });
+
+    it('merges compact passes like expanded ones', () => {
+      const passSummaries: LintSummary[] = [
+        {
+          domain: 'd',
+          fileCount: 2,
+          complete: true,
+          results: [{ filePath: '/b.ts', line: 1, column: 1, ruleId: 'N1', severity: 'NEVER', message: 'n' }],
+        },
+        {
+          domain: 'd',
+          fileCount: 1,
+          complete: false,
+          results: [{ filePath: '/a.ts', line: 3, column: 1, ruleId: 'S1', severity: 'SHOULD', message: 's' }],
+        },
+      ];
+
+      const mergedSummary = mergeCompactSummaries(passSummaries.map((passSummary) => ({
+        ...passSummary,
+        results: createResultTableFrom(passSummary.results),
+      })));
+
+      assert.deepStrictEqual(expandLintSummary(mergedSummary), mergeLintSummaries(passSummaries));
+    });
+
+    it('sums counts across passes', () => {
+      const merged = mergeLintCounts([
+        {
+          domain: 'd',
+          fileCount: 3,
+          severityCounts: { NEVER: 1, MUST: 0, SHOULD: 0, GUIDANCE: 0 },
+          ruleCounts: { N1: 1 },
+          complete: true,
+          skippedFiles: [],
+        },
+        {
+          domain: 'd',
+          fileCount: 3,
+          severityCounts: { NEVER: 0, MUST: 0, SHOULD: 2, GUIDANCE: 0 },
+          ruleCounts: { S1: 2 },
+          complete: true,
+          skippedFiles: [],
+        },
+      ]);
+
+      assert.deepStrictEqual(merged.severityCounts, { NEVER: 1, MUST: 0, SHOULD: 2, GUIDANCE: 0 });
+      assert.deepStrictEqual(merged.ruleCounts, { N1: 1, S1: 2 });
+      assert.strictEqual(merged.fileCount, 3);
+      assert.strictEqual(merged.complete, true);
+    });
+  });
 });
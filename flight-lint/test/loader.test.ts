@@ -1,7 +1,17 @@
 import { describe, it, afterEach } from 'node:test';
 import assert from 'node:assert';
-import { writeFile, unlink } from 'node:fs/promises';
-import { loadRulesFile } from '../src/loader.js';
+import { writeFile, unlink, mkdtemp, rm, stat } from 'node:fs/promises';
+import os from 'node:os';
+import path from 'node:path';
+import {
+  loadRulesFile,
+  loadRulesBundle,
+  findBundledRulesFile,
+  filterRulesBySeverity,
+  meetsMinimumSeverity,
+  RULES_BUNDLE_FILE,
+} from '../src/loader.js';
+import type { RulesFile } from '../src/types.js';
 
 describe('loader', () => {
   const testFilePaths: string[] = [];
@@ -225,5 +235,207 @@ describe('loader', () => {
         /type 'ast' but missing 'language'/
       );
     });
+
+    it('loads domain activation signature', async () => {
+      const contentWithActivation = {
+        ...validRulesContent,
+        activation: { literals: ['@clerk/'], pattern: 'CLERK_[A-Z]+' }
+      };
+      const filePath = await createTestFile('with-activation.json', JSON.stringify(contentWithActivation));
+
+      const rulesFile = await loadRulesFile(filePath);
+
+      assert.deepStrictEqual(rulesFile.activation?.literals, ['@clerk/']);
+      assert.strictEqual(rulesFile.activation?.pattern, 'CLERK_[A-Z]+');
+    });
+
+    it('throws when activation pattern is not a valid regex', async () => {
+      const contentWithActivation = {
+        ...validRulesContent,
+        activation: { pattern: '(unclosed' }
+      };
+      const filePath = await createTestFile('bad-activation.json', JSON.stringify(contentWithActivation));
+
+      await assert.rejects(
+        loadRulesFile(filePath),
+        /Invalid regex in 'activation.pattern'/
+      );
+    });
+
+    it('loads check fields and path scoping in camelCase, leaving absent ones out', async () => {
+      const checksContent = {
+        ...validRulesContent,
+        api_file_detection: { paths: ['api/'], patterns: ['router\\.get\\('] },
+        rules: [
+          { ...validRulesContent.rules[0], ignore_case: true, ignore_when: ['debug'], skip_paths: ['**/tests/**'] },
+          {
+            id: 'M1', title: 'Transactions', severity: 'MUST', type: 'requires', pattern: null, query: null,
+            message: 'm', trigger: 'INSERT', requirement: 'BEGIN', trigger_count: 3, api_files_only: true,
+          },
+          {
+            id: 'M2', title: 'CORS', severity: 'MUST', type: 'multi-condition', pattern: null, query: null,
+            message: 'm', conditions: [{ pattern: 'origin', ignore_case: true }, { pattern: 'credentials' }],
+          },
+          { id: 'S1', title: 'Spec', severity: 'SHOULD', type: 'file_exists', pattern: null, query: null, message: 'm', paths: ['openapi.yaml'] },
+          { id: 'S2', title: 'Script', severity: 'SHOULD', type: 'script', pattern: null, query: null, message: 'm', code: 'true' },
+        ],
+      };
+      const filePath = await createTestFile('with-checks.json', JSON.stringify(checksContent));
+
+      const rulesFile = await loadRulesFile(filePath);
+      const checkFields = rulesFile.rules.map(({ id, title, severity, type, language, pattern, query, message, provenance, ...fields }) => fields);
+
+      assert.deepStrictEqual(rulesFile.apiFileDetection, { paths: ['api/'], patterns: ['router\\.get\\('] });
+      assert.deepStrictEqual(checkFields, [
+        { ignoreCase: true, skipPaths: ['**/tests/**'], ignoreWhen: ['debug'] },
+        { apiFilesOnly: true, trigger: 'INSERT', requirement: 'BEGIN', triggerCount: 3 },
+        { logic: 'AND', conditions: [{ pattern: 'origin', ignoreCase: true }, { pattern: 'credentials' }] },
+        { paths: ['openapi.yaml'] },
+        { code: 'true' },
+      ]);
+    });
+
+    it('throws on invalid check fields', async () => {
+      const ruleBase = { id: 'N1', title: 't', severity: 'NEVER', pattern: null, query: null, message: 'm' };
+      const invalidRules: [object, RegExp][] = [
+        [{ ...ruleBase, type: 'lint' }, /has invalid type 'lint'/],
+        [{ ...ruleBase, type: 'requires', trigger: 'a' }, /Missing or invalid 'Rule 0 \(N1\) requirement'/],
+        [{ ...ruleBase, type: 'requires', must_exist: '(unclosed' }, /Invalid regex in 'Rule 0 \(N1\) must_exist'/],
+        [{ ...ruleBase, type: 'multi-condition', logic: 'XOR', conditions: [{ pattern: 'a' }] }, /Invalid 'Rule 0 \(N1\) logic'/],
+        [{ ...ruleBase, type: 'file_exists', paths: [] }, /needs at least one path/],
+        [{ ...ruleBase, type: 'script', code: ' ' }, /Missing or invalid 'Rule 0 \(N1\) code'/],
+        [{ ...ruleBase, type: 'grep', pattern: 'x', only_paths: 'src/**' }, /Invalid 'Rule 0 \(N1\) only_paths'/],
+        [{ ...ruleBase, type: 'grep', pattern: 'x', api_files_only: true }, /no 'api_file_detection'/],
+      ];
+
+      for (const [invalidRule, expectedError] of invalidRules) {
+        const filePath = await createTestFile('bad-check.json', JSON.stringify({ ...validRulesContent, rules: [invalidRule] }));
+        await assert.rejects(loadRulesFile(filePath), expectedError);
+      }
+    });
+  });
+
+  describe('rules bundle', () => {
+    const bundledRulesFile: RulesFile = {
+      domain: 'bundled-domain',
+      version: '1.0.0',
+      filePatterns: ['**/*.js'],
+      rules: [],
+    };
+
+    async function createBundleFixture(
+      bundleVersion = 2,
+      rulesFile: RulesFile = bundledRulesFile
+    ): Promise<{ domainsPath: string; rulesPath: string }> {
+      const domainsPath = await mkdtemp(path.join(os.tmpdir(), 'flight-lint-bundle-'));
+      const rulesPath = path.join(domainsPath, 'test.rules.json');
+      await writeFile(rulesPath, JSON.stringify(validRulesContent));
+      const rulesStats = await stat(rulesPath, { bigint: true });
+      await writeFile(path.join(domainsPath, RULES_BUNDLE_FILE), JSON.stringify({
+        bundleVersion,
+        domains: [{
+          source: 'test.rules.json',
+          size: Number(rulesStats.size),
+          mtimeNs: rulesStats.mtimeNs.toString(),
+          rulesFile,
+        }],
+      }));
+      return { domainsPath, rulesPath };
+    }
+
+    it('serves unchanged rules files from the bundle', async () => {
+      const { domainsPath, rulesPath } = await createBundleFixture();
+      try {
+        const rulesBundle = loadRulesBundle(domainsPath);
+
+        assert.deepStrictEqual(await loadRulesFile(rulesPath, rulesBundle), bundledRulesFile);
+      } finally {
+        await rm(domainsPath, { recursive: true });
+      }
+    });
+
+    it('falls back to the rules file once it changes', async () => {
+      const { domainsPath, rulesPath } = await createBundleFixture();
+      try {
+        const rulesBundle = loadRulesBundle(domainsPath)!;
+        await writeFile(rulesPath, JSON.stringify({ ...validRulesContent, version: '2.0.0' }));
+
+        assert.strictEqual(findBundledRulesFile(rulesBundle, rulesPath), null);
+        assert.strictEqual((await loadRulesFile(rulesPath, rulesBundle)).version, '2.0.0');
+      } finally {
+        await rm(domainsPath, { recursive: true });
+      }
+    });
+
+    it('ignores missing bundles and other bundle versions', async () => {
+      for (const bundleVersion of [1, 99]) {
+        const { domainsPath } = await createBundleFixture(bundleVersion);
+        try {
+          assert.strictEqual(loadRulesBundle(domainsPath), null);
+          assert.strictEqual(loadRulesBundle(path.join(domainsPath, 'missing')), null);
+        } finally {
+          await rm(domainsPath, { recursive: true });
+        }
+      }
+    });
+
+    it('reads a bundled rules file whose regex does not compile from disk', async () => {
+      const invalidRulesFile: RulesFile = {
+        ...bundledRulesFile,
+        rules: [{ id: 'N1', title: 'Bad', severity: 'NEVER', query: null, pattern: 'a', ignoreWhen: ['(?<'], message: 'm' }],
+      };
+      const { domainsPath, rulesPath } = await createBundleFixture(2, invalidRulesFile);
+      try {
+        const rulesBundle = loadRulesBundle(domainsPath)!;
+
+        assert.strictEqual(findBundledRulesFile(rulesBundle, rulesPath), null);
+        assert.strictEqual((await loadRulesFile(rulesPath, rulesBundle)).domain, validRulesContent.domain);
+      } finally {
+        await rm(domainsPath, { recursive: true });
+      }
+    });
+  });
+
+  describe('meetsMinimumSeverity', () => {
+    it('includes severities at or above the minimum', () => {
+      assert.strictEqual(meetsMinimumSeverity('NEVER', 'MUST'), true);
+      assert.strictEqual(meetsMinimumSeverity('MUST', 'MUST'), true);
+    });
+
+    it('excludes severities below the minimum', () => {
+      assert.strictEqual(meetsMinimumSeverity('SHOULD', 'MUST'), false);
+      assert.strictEqual(meetsMinimumSeverity('GUIDANCE', 'SHOULD'), false);
+    });
+  });
+
+  describe('filterRulesBySeverity', () => {
+    const mixedRulesFile: RulesFile = {
+      domain: 'mixed',
+      version: '1.0.0',
+      filePatterns: ['**/*.js'],
+      rules: [
+        { id: 'N1', title: 'Never', severity: 'NEVER', query: null, pattern: 'a', message: 'n' },
+        { id: 'M1', title: 'Must', severity: 'MUST', query: null, pattern: 'b', message: 'm' },
+        { id: 'S1', title: 'Should', severity: 'SHOULD', query: null, pattern: 'c', message: 's' },
+      ],
+    };
+
+    it('keeps only rules at or above the minimum severity', () => {
+      const filteredRulesFile = filterRulesBySeverity(mixedRulesFile, 'MUST');
+
+      assert.deepStrictEqual(filteredRulesFile.rules.map((rule) => rule.id), ['N1', 'M1']);
+      assert.strictEqual(filteredRulesFile.domain, 'mixed');
+    });
+
+    it('returns no rules when none qualify', () => {
+      const shouldOnly: RulesFile = { ...mixedRulesFile, rules: mixedRulesFile.rules.slice(2) };
+
+      assert.strictEqual(filterRulesBySeverity(shouldOnly, 'NEVER').rules.length, 0);
+    });
+
+    it('returns the same filtered object for the same rules file and severity', () => {
+      assert.strictEqual(filterRulesBySeverity(mixedRulesFile, 'MUST'), filterRulesBySeverity(mixedRulesFile, 'MUST'));
+      assert.notStrictEqual(filterRulesBySeverity(mixedRulesFile, 'MUST'), filterRulesBySeverity(mixedRulesFile, 'NEVER'));
+    });
   });
 });
@@ -1,6 +1,23 @@
-import { describe, it } from 'node:test';
+import { describe, it, before, after } from 'node:test';
 import assert from 'node:assert';
-import { parseFile, detectLanguage, getLanguage } from '../src/parser.js';
+import { writeFile, mkdir, rm } from 'node:fs/promises';
+import path from 'node:path';
+import {
+  parseFile,
+  detectLanguage,
+  getLanguage,
+  createSourceCache,
+  indexLineStarts,
+  readCachedSource,
+  parseCachedSource,
+  assessSourceFile,
+  assessSourceContent,
+  readSourceInLineChunks,
+  MAX_STREAMED_LINE_LENGTH,
+  computeTextEdit,
+  createParseHistory,
+  reparseFile,
+} from '../src/parser.js';
 
 describe('parser', () => {
   describe('parseFile', () => {
@@ -98,4 +115,193 @@ describe('parser', () => {
       );
     });
   });
+
+  describe('indexLineStarts', () => {
+    it('records the start offset of every line', () => {
+      assert.deepStrictEqual(indexLineStarts('ab\ncd\n'), [0, 3, 6]);
+      assert.deepStrictEqual(indexLineStarts(''), [0]);
+    });
+  });
+
+  describe('incremental parsing', () => {
+    it('describes a change as one replaced span with row and column points', () => {
+      const textEdit = computeTextEdit('let a = 1;\nlet b = 2;\n', 'let a = 1;\nconst bee = 2;\n');
+
+      assert.deepStrictEqual(textEdit, {
+        startIndex: 11,
+        oldEndIndex: 16,
+        newEndIndex: 20,
+        startPosition: { row: 1, column: 0 },
+        oldEndPosition: { row: 1, column: 5 },
+        newEndPosition: { row: 1, column: 9 },
+      });
+    });
+
+    it('does not let the kept suffix overlap the kept prefix', () => {
+      const textEdit = computeTextEdit('aa', 'aaa');
+
+      assert.strictEqual(textEdit.startIndex, 2);
+      assert.strictEqual(textEdit.oldEndIndex, 2);
+      assert.strictEqual(textEdit.newEndIndex, 3);
+    });
+
+    it('re-parses edited content to the same tree as a fresh parse', async () => {
+      const parseHistory = createParseHistory();
+      const edits = [
+        'function greet(name) {\n  return name;\n}\n',
+        'function greet(name) {\n  const upper = name.toUpperCase();\n  return upper;\n}\n',
+        'function greet(name, suffix) {\n  return name + suffix;\n}\n',
+        'function greet(name, suffix) {\n  return name + (;\n}\n',
+      ];
+
+      for (const editedContent of edits) {
+        const reparsedTree = await reparseFile(parseHistory, 'greet.js', editedContent, 'javascript');
+        const freshTree = await parseFile(editedContent, 'javascript');
+        assert.strictEqual(reparsedTree.rootNode.toString(), freshTree.rootNode.toString());
+      }
+    });
+
+    it('keeps the last parse of at most maxFiles files', async () => {
+      const parseHistory = createParseHistory(2);
+
+      for (const fileName of ['a.js', 'b.js', 'c.js']) {
+        await reparseFile(parseHistory, fileName, 'let a = 1;', 'javascript');
+      }
+
+      assert.deepStrictEqual(
+        [...parseHistory.revisions.keys()].map((revisionKey) => revisionKey.split('\0')[1]),
+        ['b.js', 'c.js']
+      );
+    });
+  });
+
+  describe('source cache', () => {
+    const TEST_DIR = `/tmp/flight-lint-parser-test-${Date.now()}`;
+
+    before(async () => {
+      await mkdir(TEST_DIR, { recursive: true });
+    });
+
+    after(async () => {
+      await rm(TEST_DIR, { recursive: true, force: true });
+    });
+
+    it('reads each file once and reuses the buffer', async () => {
+      const filePath = path.join(TEST_DIR, 'once.js');
+      await writeFile(filePath, 'let first = 1;');
+      const sourceCache = createSourceCache();
+
+      const firstRead = await readCachedSource(sourceCache, filePath);
+      await writeFile(filePath, 'let second = 2;');
+      const secondRead = await readCachedSource(sourceCache, filePath);
+
+      assert.strictEqual(firstRead, 'let first = 1;');
+      assert.strictEqual(secondRead, firstRead);
+    });
+
+    it('parses once per grammar', async () => {
+      const filePath = path.join(TEST_DIR, 'tree.ts');
+      await writeFile(filePath, 'let count: number = 1;');
+      const sourceCache = createSourceCache();
+
+      const firstTree = await parseCachedSource(sourceCache, filePath, 'typescript');
+      const secondTree = await parseCachedSource(sourceCache, filePath, 'typescript');
+      const tsxTree = await parseCachedSource(sourceCache, filePath, 'tsx');
+
+      assert.strictEqual(firstTree, secondTree);
+      assert.notStrictEqual(firstTree, tsxTree);
+    });
+
+    it('evicts the least recently used file once over the memory cap', async () => {
+      const oldPath = path.join(TEST_DIR, 'old.js');
+      const newPath = path.join(TEST_DIR, 'new.js');
+      await writeFile(oldPath, 'let old = 1;');
+      await writeFile(newPath, 'let recent = 2;');
+      const sourceCache = createSourceCache(40);
+
+      await readCachedSource(sourceCache, oldPath);
+      await readCachedSource(sourceCache, newPath);
+
+      assert.deepStrictEqual([...sourceCache.entries.keys()], [newPath]);
+      assert.ok(sourceCache.cachedBytes <= 40);
+    });
+  });
+
+  describe('file guard', () => {
+    const TEST_DIR = `/tmp/flight-lint-guard-test-${Date.now()}`;
+    const fileSizeLimits = { maxParseBytes: 20_000, maxFileBytes: 100_000 };
+
+    before(async () => {
+      await mkdir(TEST_DIR, { recursive: true });
+    });
+
+    after(async () => {
+      await rm(TEST_DIR, { recursive: true, force: true });
+    });
+
+    async function assessContent(fileName: string, content: string | Buffer): Promise<string | null> {
+      const filePath = path.join(TEST_DIR, fileName);
+      await writeFile(filePath, content);
+      return assessSourceFile(filePath, fileSizeLimits);
+    }
+
+    it('accepts ordinary source files', async () => {
+      assert.strictEqual(await assessContent('plain.ts', 'let count = 1;\n'.repeat(1000)), null);
+    });
+
+    it('flags files with a NUL byte in the first block as binary', async () => {
+      assert.strictEqual(await assessContent('image.ts', Buffer.from([0x89, 0x50, 0x00, 0x47])), 'binary');
+    });
+
+    it('flags files whose first block has very long lines as minified', async () => {
+      assert.strictEqual(await assessContent('bundle.js', 'var a=1;'.repeat(2000)), 'minified');
+    });
+
+    it('keeps short files with one long line', async () => {
+      assert.strictEqual(await assessContent('short.js', 'x'.repeat(4000)), null);
+    });
+
+    it('runs grep rules only on files over maxParseBytes and skips files over maxFileBytes', async () => {
+      assert.strictEqual(await assessContent('large.ts', 'let count = 1;\n'.repeat(2000)), 'ast-skipped');
+      assert.strictEqual(await assessContent('huge.ts', 'let count = 1;\n'.repeat(10_000)), 'too-large');
+    });
+
+    it('assesses in-memory content like the same file on disk', async () => {
+      const samples = [
+        ['plain.ts', 'let count = 1;\n'.repeat(1000)],
+        ['bundle.js', 'var a=1;'.repeat(2000)],
+        ['large.ts', 'let count = 1;\n'.repeat(2000)],
+        ['huge.ts', 'let count = 1;\n'.repeat(10_000)],
+        ['image.ts', '\u0089P\u0000G'],
+      ] as const;
+
+      for (const [fileName, content] of samples) {
+        assert.strictEqual(assessSourceContent(content, fileSizeLimits), await assessContent(fileName, content));
+      }
+    });
+
+    it('streams whole-line chunks that join back into the file content', async () => {
+      const filePath = path.join(TEST_DIR, 'stream.ts');
+      // Multi-byte characters straddle the 1 MiB chunk boundaries
+      const content = Array.from({ length: 120_000 }, (_line, lineIndex) => `const é${lineIndex} = 'ü';`).join('\n');
+      await writeFile(filePath, content);
+
+      const chunks: string[] = [];
+      await readSourceInLineChunks(filePath, (chunk) => chunks.push(chunk));
+
+      assert.ok(chunks.length > 1);
+      assert.strictEqual(chunks.join('\n'), content);
+    });
+
+    it('cuts overlong lines without shifting the lines after them', async () => {
+      const filePath = path.join(TEST_DIR, 'one-line.js');
+      await writeFile(filePath, `${'x'.repeat(3 * MAX_STREAMED_LINE_LENGTH)}\nlet tail = 1;`);
+
+      const chunks: string[] = [];
+      const truncated = await readSourceInLineChunks(filePath, (chunk) => chunks.push(chunk));
+
+      assert.strictEqual(truncated, true);
+      assert.strictEqual(chunks.join('\n'), `${'x'.repeat(MAX_STREAMED_LINE_LENGTH)}\nlet tail = 1;`);
+    });
+  });
 });
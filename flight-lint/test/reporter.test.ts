@@ -1,5 +1,6 @@
 import { describe, it } from 'node:test';
 import assert from 'node:assert';
+import { PassThrough } from 'node:stream';
 import {
   formatResults,
   formatPretty,
@@ -8,8 +9,17 @@ import {
   groupBySeverity,
   groupByRule,
   getExitCode,
+  formatCounts,
+  getCountsExitCode,
+  formatNdjson,
+  formatNormalizedJson,
+  createNdjsonStream,
+  createSarifStream,
+  createSummaryStream,
+  createRunSummaryCollector,
 } from '../src/reporter.js';
-import type { LintResult, LintSummary } from '../src/types.js';
+import { createResultTableFrom } from '../src/result-table.js';
+import type { LintCounts, LintResult, LintSummary } from '../src/types.js';
 
 describe('reporter', () => {
   const sampleResults: LintResult[] = [
@@ -106,6 +116,21 @@ describe('reporter', () => {
 
       assert.ok(output.includes('No violations found'));
     });
+
+    it('flags partial results when the time budget ran out', () => {
+      assert.ok(formatPretty({ ...sampleSummary, complete: false }).includes('results are partial'));
+      assert.ok(!formatPretty(sampleSummary).includes('results are partial'));
+    });
+
+    it('lists files that were not fully linted', () => {
+      const output = formatPretty({
+        ...emptySummary,
+        skippedFiles: [{ filePath: '/src/vendor.min.js', reason: 'minified' }],
+      });
+
+      assert.ok(output.includes('1 file(s) not fully linted'));
+      assert.ok(output.includes('/src/vendor.min.js (minified file - AST rules skipped)'));
+    });
   });
 
   describe('formatJson', () => {
@@ -138,6 +163,121 @@ describe('reporter', () => {
     });
   });
 
+  describe('formatNormalizedJson', () => {
+    it('references file and rule tables instead of repeating strings', () => {
+      const parsed = JSON.parse(formatNormalizedJson({
+        ...sampleSummary,
+        results: createResultTableFrom(sampleResults),
+      }));
+
+      assert.strictEqual(parsed.domain, 'code-hygiene');
+      assert.strictEqual(parsed.fileCount, 5);
+      assert.strictEqual(parsed.results.length, sampleResults.length);
+      const [fileIndex, ruleIndex, line, column] = parsed.results[0];
+      assert.strictEqual(parsed.files[fileIndex], sampleResults[0]!.filePath);
+      assert.deepStrictEqual(parsed.rules[ruleIndex], {
+        id: sampleResults[0]!.ruleId,
+        severity: sampleResults[0]!.severity,
+        message: sampleResults[0]!.message,
+      });
+      assert.deepStrictEqual([line, column], [sampleResults[0]!.line, sampleResults[0]!.column]);
+    });
+
+    it('is what formatResults returns for json-normalized', () => {
+      assert.strictEqual(
+        formatResults(sampleSummary, 'json-normalized'),
+        formatNormalizedJson({ ...sampleSummary, results: createResultTableFrom(sampleResults) })
+      );
+    });
+  });
+
+  describe('formatNdjson', () => {
+    it('writes one result record per violation and a closing summary record', () => {
+      const records = formatNdjson(sampleSummary).split('\n').map((line) => JSON.parse(line));
+
+      assert.strictEqual(records.length, sampleResults.length + 1);
+      assert.deepStrictEqual(records[0], { type: 'result', domain: 'code-hygiene', ...sampleResults[0] });
+      assert.strictEqual(records.at(-1).type, 'summary');
+      assert.strictEqual(records.at(-1).fileCount, 5);
+      assert.strictEqual(records.at(-1).severityCounts.NEVER, 1);
+    });
+  });
+
+  describe('result streams', () => {
+    const domainCounts: LintCounts[] = [
+      {
+        domain: 'code-hygiene',
+        fileCount: 5,
+        severityCounts: { NEVER: 1, MUST: 1, SHOULD: 1, GUIDANCE: 0 },
+        ruleCounts: { N1: 1, M1: 1, S1: 1 },
+        complete: true,
+        skippedFiles: [{ filePath: '/src/bundle.min.js', reason: 'minified' }],
+      },
+    ];
+    const streamedResults = sampleResults.map((lintResult) => ({ domain: 'code-hygiene', ...lintResult }));
+
+    async function collectStream(createStream: typeof createNdjsonStream): Promise<string> {
+      const output = new PassThrough();
+      const chunks: string[] = [];
+      output.on('data', (chunk: Buffer) => chunks.push(chunk.toString()));
+
+      const resultStream = createStream(output);
+      await resultStream.writeResults(streamedResults.slice(0, 1));
+      await resultStream.writeResults(streamedResults.slice(1));
+      await resultStream.end(domainCounts);
+      output.end();
+
+      return chunks.join('');
+    }
+
+    it('streams NDJSON records as results arrive', async () => {
+      const records = (await collectStream(createNdjsonStream)).trim().split('\n').map((line) => JSON.parse(line));
+
+      assert.deepStrictEqual(records.map((record) => record.type), ['result', 'result', 'result', 'summary']);
+      assert.strictEqual(records[1].ruleId, sampleResults[1]?.ruleId);
+      assert.deepStrictEqual(records[3].skippedFiles, domainCounts[0]?.skippedFiles);
+    });
+
+    it('streams a single run summary record once the run ends', async () => {
+      const summaryLines = (await collectStream(createSummaryStream)).trim().split('\n');
+      const runSummary = JSON.parse(summaryLines[0]!);
+
+      assert.strictEqual(summaryLines.length, 1);
+      assert.strictEqual(runSummary.total, 3);
+      assert.strictEqual(runSummary.errors, 2);
+      assert.deepStrictEqual(runSummary.top, streamedResults);
+      assert.strictEqual(runSummary.skippedFiles, 1);
+    });
+
+    it('streams one SARIF log with a single run for all domains', async () => {
+      const sarifLog = JSON.parse(await collectStream(createSarifStream));
+      const [sarifRun] = sarifLog.runs;
+
+      assert.strictEqual(sarifLog.version, '2.1.0');
+      assert.strictEqual(sarifLog.runs.length, 1);
+      assert.deepStrictEqual(
+        sarifRun.results.map((sarifResult: { ruleId: string }) => sarifResult.ruleId),
+        ['code-hygiene/N1', 'code-hygiene/M1', 'code-hygiene/S1']
+      );
+      assert.deepStrictEqual(
+        sarifRun.tool.driver.rules.map((sarifRule: { id: string }) => sarifRule.id),
+        ['code-hygiene/N1', 'code-hygiene/M1', 'code-hygiene/S1']
+      );
+      assert.strictEqual(sarifRun.invocations[0].toolExecutionNotifications.length, 1);
+      assert.deepStrictEqual(sarifRun.properties, { complete: true });
+    });
+
+    it('closes an empty SARIF log when nothing was linted', async () => {
+      const output = new PassThrough();
+      const chunks: string[] = [];
+      output.on('data', (chunk: Buffer) => chunks.push(chunk.toString()));
+
+      await createSarifStream(output).end([]);
+
+      assert.deepStrictEqual(JSON.parse(chunks.join('')).runs[0].results, []);
+    });
+  });
+
   describe('formatSarif', () => {
     it('produces valid SARIF 2.1.0', () => {
       const output = formatSarif(sampleSummary);
@@ -147,6 +287,26 @@ describe('reporter', () => {
       assert.ok(parsed.$schema.includes('sarif-schema-2.1.0'));
     });
 
+    it('records completeness as a run property only for budgeted runs', () => {
+      const partialRun = JSON.parse(formatSarif({ ...sampleSummary, complete: false })).runs[0];
+      const unbudgetedRun = JSON.parse(formatSarif(sampleSummary)).runs[0];
+
+      assert.deepStrictEqual(partialRun.properties, { complete: false });
+      assert.strictEqual(unbudgetedRun.properties, undefined);
+    });
+
+    it('reports skipped files as tool execution notifications', () => {
+      const sarifRun = JSON.parse(formatSarif({
+        ...sampleSummary,
+        skippedFiles: [{ filePath: '/src/logo.ts', reason: 'binary' }],
+      })).runs[0];
+      const [notification] = sarifRun.invocations[0].toolExecutionNotifications;
+
+      assert.strictEqual(notification.locations[0].physicalLocation.artifactLocation.uri, '/src/logo.ts');
+      assert.ok(notification.message.text.includes('binary file'));
+      assert.strictEqual(JSON.parse(formatSarif(sampleSummary)).runs[0].invocations, undefined);
+    });
+
     it('includes tool information', () => {
       const output = formatSarif(sampleSummary);
       const parsed = JSON.parse(output);
@@ -273,4 +433,130 @@ describe('reporter', () => {
       assert.strictEqual(getExitCode(mixedResults), 1);
     });
   });
+
+  describe('formatCounts', () => {
+    const typescriptCounts: LintCounts = {
+      domain: 'typescript',
+      fileCount: 3,
+      severityCounts: { NEVER: 1, MUST: 0, SHOULD: 2, GUIDANCE: 0 },
+      ruleCounts: { N1: 1, S2: 2 },
+      complete: true,
+      skippedFiles: [],
+    };
+    const hygieneCounts: LintCounts = {
+      domain: 'code-hygiene',
+      fileCount: 4,
+      severityCounts: { NEVER: 0, MUST: 1, SHOULD: 0, GUIDANCE: 1 },
+      ruleCounts: { M1: 1, G1: 1 },
+      complete: true,
+      skippedFiles: [],
+    };
+
+    it('emits a single-line JSON summary with totals', () => {
+      const formattedCounts = formatCounts([typescriptCounts, hygieneCounts]);
+      const parsedCounts = JSON.parse(formattedCounts);
+
+      assert.ok(!formattedCounts.includes('\n'));
+      assert.strictEqual(parsedCounts.files, 7);
+      assert.strictEqual(parsedCounts.total, 5);
+      assert.strictEqual(parsedCounts.errors, 2);
+      assert.strictEqual(parsedCounts.warnings, 3);
+      assert.deepStrictEqual(parsedCounts.severity, { NEVER: 1, MUST: 1, SHOULD: 2, GUIDANCE: 1 });
+    });
+
+    it('keys rule counts by domain to keep repeated IDs apart', () => {
+      const parsedCounts = JSON.parse(formatCounts([typescriptCounts, hygieneCounts]));
+
+      assert.strictEqual(parsedCounts.rules['typescript/N1'], 1);
+      assert.strictEqual(parsedCounts.rules['code-hygiene/M1'], 1);
+    });
+
+    it('reports incomplete when any domain ran out of time', () => {
+      const partialCounts: LintCounts = { ...hygieneCounts, complete: false };
+
+      assert.strictEqual(JSON.parse(formatCounts([typescriptCounts, hygieneCounts])).complete, true);
+      assert.strictEqual(JSON.parse(formatCounts([typescriptCounts, partialCounts])).complete, false);
+    });
+
+    it('counts each skipped file once across domains', () => {
+      const skippedFiles = [{ filePath: '/src/huge.ts', reason: 'ast-skipped' as const }];
+      const parsedCounts = JSON.parse(formatCounts([
+        { ...typescriptCounts, skippedFiles },
+        { ...hygieneCounts, skippedFiles },
+      ]));
+
+      assert.strictEqual(parsedCounts.skippedFiles, 1);
+    });
+
+    it('returns zero totals for no domains', () => {
+      const parsedCounts = JSON.parse(formatCounts([]));
+
+      assert.strictEqual(parsedCounts.total, 0);
+      assert.strictEqual(parsedCounts.errors, 0);
+    });
+  });
+
+  describe('createRunSummaryCollector', () => {
+    const streamedResults = sampleResults.map((lintResult) => ({ domain: 'code-hygiene', ...lintResult }));
+
+    it('lists the most severe violations first, in the order found, up to the limit', () => {
+      const summaryCollector = createRunSummaryCollector(2);
+      summaryCollector.addResults([streamedResults[2]!, streamedResults[1]!]);
+      summaryCollector.addResults([streamedResults[0]!]);
+
+      const runSummary = JSON.parse(summaryCollector.formatSummary([]));
+
+      assert.deepStrictEqual(runSummary.top.map((topResult: { ruleId: string }) => topResult.ruleId), ['N1', 'M1']);
+    });
+
+    it('totals each domain as well as the whole run', () => {
+      const typescriptCounts: LintCounts = {
+        domain: 'typescript',
+        fileCount: 3,
+        severityCounts: { NEVER: 1, MUST: 0, SHOULD: 2, GUIDANCE: 0 },
+        ruleCounts: { N1: 1, S2: 2 },
+        complete: true,
+        skippedFiles: [],
+      };
+      const hygieneCounts: LintCounts = { ...typescriptCounts, domain: 'code-hygiene', complete: false };
+
+      const runSummary = JSON.parse(createRunSummaryCollector().formatSummary([typescriptCounts, hygieneCounts]));
+
+      assert.strictEqual(runSummary.total, 6);
+      assert.strictEqual(runSummary.complete, false);
+      assert.deepStrictEqual(Object.keys(runSummary.domains), ['typescript', 'code-hygiene']);
+      assert.strictEqual(runSummary.domains.typescript.errors, 1);
+      assert.strictEqual(runSummary.domains.typescript.warnings, 2);
+      assert.strictEqual(runSummary.domains['code-hygiene'].complete, false);
+      assert.strictEqual(runSummary.rules['code-hygiene/S2'], 2);
+    });
+  });
+
+  describe('getCountsExitCode', () => {
+    it('returns 1 when any domain has NEVER or MUST violations', () => {
+      const failingCounts: LintCounts = {
+        domain: 'd',
+        fileCount: 1,
+        severityCounts: { NEVER: 0, MUST: 1, SHOULD: 0, GUIDANCE: 0 },
+        ruleCounts: { M1: 1 },
+        complete: true,
+        skippedFiles: [],
+      };
+
+      assert.strictEqual(getCountsExitCode([failingCounts]), 1);
+    });
+
+    it('returns 0 for warnings only', () => {
+      const warningCounts: LintCounts = {
+        domain: 'd',
+        fileCount: 1,
+        severityCounts: { NEVER: 0, MUST: 0, SHOULD: 4, GUIDANCE: 0 },
+        ruleCounts: { S1: 4 },
+        complete: true,
+        skippedFiles: [],
+      };
+
+      assert.strictEqual(getCountsExitCode([warningCounts]), 0);
+    });
+  });
 });
@@ -0,0 +1,83 @@
+import { describe, it } from 'node:test';
+import assert from 'node:assert';
+import {
+  createResultTable,
+  createResultTableFrom,
+  appendResult,
+  expandResults,
+  mergeResultTables,
+  hasFailureResults,
+} from '../src/result-table.js';
+import type { LintResult } from '../src/types.js';
+
+describe('result-table', () => {
+  const neverRule = { id: 'N1', severity: 'NEVER', message: 'Never do this' } as const;
+  const shouldRule = { id: 'S1', severity: 'SHOULD', message: 'Should not do this' } as const;
+
+  describe('appendResult', () => {
+    it('interns file paths and rules', () => {
+      const resultTable = createResultTable();
+      appendResult(resultTable, '/src/a.ts', neverRule, 1, 2);
+      appendResult(resultTable, '/src/a.ts', shouldRule, 3, 4);
+      appendResult(resultTable, '/src/b.ts', neverRule, 5, 6);
+
+      assert.deepStrictEqual(resultTable.filePaths, ['/src/a.ts', '/src/b.ts']);
+      assert.deepStrictEqual(resultTable.rules, [neverRule, shouldRule]);
+      assert.strictEqual(resultTable.rowCount, 3);
+      assert.deepStrictEqual([...resultTable.fileIndexes.subarray(0, 3)], [0, 0, 1]);
+      assert.deepStrictEqual([...resultTable.ruleIndexes.subarray(0, 3)], [0, 1, 0]);
+    });
+
+    it('grows past its initial capacity', () => {
+      const resultTable = createResultTable();
+      for (let line = 1; line <= 1000; line++) {
+        appendResult(resultTable, '/src/a.ts', shouldRule, line, 1);
+      }
+
+      assert.strictEqual(resultTable.rowCount, 1000);
+      assert.strictEqual(expandResults(resultTable).at(-1)?.line, 1000);
+    });
+  });
+
+  describe('expandResults', () => {
+    it('round-trips lint results', () => {
+      const lintResults: LintResult[] = [
+        { filePath: '/src/b.ts', line: 4, column: 1, ruleId: 'S1', severity: 'SHOULD', message: 's' },
+        { filePath: '/src/a.ts', line: 2, column: 7, ruleId: 'N1', severity: 'NEVER', message: 'n' },
+        { filePath: '/src/b.ts', line: 9, column: 3, ruleId: 'N1', severity: 'NEVER', message: 'n' },
+      ];
+      const resultTable = createResultTableFrom(lintResults);
+
+      assert.deepStrictEqual(expandResults(resultTable), lintResults);
+      assert.strictEqual(resultTable.rules.length, 2);
+    });
+  });
+
+  describe('mergeResultTables', () => {
+    it('orders rows by file, line and column', () => {
+      const firstTable = createResultTable();
+      appendResult(firstTable, '/src/b.ts', neverRule, 1, 1);
+      appendResult(firstTable, '/src/a.ts', neverRule, 5, 1);
+      const secondTable = createResultTable();
+      appendResult(secondTable, '/src/a.ts', shouldRule, 2, 8);
+
+      const mergedResults = expandResults(mergeResultTables([firstTable, secondTable]));
+
+      assert.deepStrictEqual(
+        mergedResults.map((lintResult) => `${lintResult.filePath}:${lintResult.line}:${lintResult.ruleId}`),
+        ['/src/a.ts:2:S1', '/src/a.ts:5:N1', '/src/b.ts:1:N1']
+      );
+    });
+  });
+
+  describe('hasFailureResults', () => {
+    it('is true only when a NEVER or MUST rule has results', () => {
+      const resultTable = createResultTable();
+      appendResult(resultTable, '/src/a.ts', shouldRule, 1, 1);
+      assert.strictEqual(hasFailureResults(resultTable), false);
+
+      appendResult(resultTable, '/src/a.ts', neverRule, 2, 1);
+      assert.strictEqual(hasFailureResults(resultTable), true);
+    });
+  });
+});
@@ -0,0 +1,183 @@
+import { describe, it, before, after } from 'node:test';
+import assert from 'node:assert';
+import { writeFile, readFile, mkdir, rm } from 'node:fs/promises';
+import { Writable } from 'node:stream';
+import net from 'node:net';
+import path from 'node:path';
+import { serveLinting } from '../src/server.js';
+import { requestDaemonRun } from '../src/client.js';
+
+/**
+ * Collect everything written to a stream.
+ */
+function createCapture(): { stream: Writable; text: () => string } {
+  const chunks: string[] = [];
+  const stream = new Writable({
+    write(chunk: Buffer | string, _encoding, callback): void {
+      chunks.push(chunk.toString());
+      callback();
+    },
+  });
+  return { stream, text: () => chunks.join('') };
+}
+
+describe('server', () => {
+  const TEST_DIR = `/tmp/flight-lint-server-test-${Date.now()}`;
+  const rulesFilePath = path.join(TEST_DIR, '.flight/domains/vars.rules.json');
+  const socketPath = path.join(TEST_DIR, 'lint.sock');
+
+  before(async () => {
+    await mkdir(path.join(TEST_DIR, '.flight/domains'), { recursive: true });
+    await mkdir(path.join(TEST_DIR, 'src'), { recursive: true });
+    await writeFile(path.join(TEST_DIR, 'src/app.js'), 'let first = 1;\n');
+    await writeFile(rulesFilePath, JSON.stringify({
+      domain: 'vars',
+      version: '1.0.0',
+      language: 'javascript',
+      file_patterns: ['**/*.js'],
+      rules: [{
+        id: 'N1',
+        title: 'No let',
+        severity: 'NEVER',
+        type: 'grep',
+        query: null,
+        pattern: '\\blet\\b',
+        message: 'Use const',
+      }],
+    }));
+  });
+
+  after(async () => {
+    await rm(TEST_DIR, { recursive: true, force: true });
+  });
+
+  async function runThroughDaemon(cwd: string, args: readonly string[]): Promise<[number | null, string, string]> {
+    const stdout = createCapture();
+    const stderr = createCapture();
+    const exitCode = await requestDaemonRun(socketPath, cwd, args, stdout.stream, stderr.stream);
+    return [exitCode, stdout.text(), stderr.text()];
+  }
+
+  it('answers repeated requests with the same output', async () => {
+    const server = await serveLinting({ projectRoot: TEST_DIR, socketPath, jobs: 1 });
+    try {
+      const args = ['--format', 'json', rulesFilePath];
+      const [firstExitCode, firstOutput] = await runThroughDaemon(TEST_DIR, args);
+      const [warmExitCode, warmOutput] = await runThroughDaemon(TEST_DIR, args);
+
+      const summary = JSON.parse(firstOutput) as { domain: string; results: { ruleId: string; line: number }[] };
+      assert.strictEqual(firstExitCode, 1);
+      assert.strictEqual(summary.domain, 'vars');
+      assert.deepStrictEqual(summary.results.map((result) => [result.ruleId, result.line]), [['N1', 1]]);
+      assert.strictEqual(warmExitCode, firstExitCode);
+      assert.strictEqual(warmOutput, firstOutput);
+    } finally {
+      await new Promise((resolve) => server.close(resolve));
+    }
+  });
+
+  it('reports usage errors with the exit code of a one-shot run', async () => {
+    const server = await serveLinting({ projectRoot: TEST_DIR, socketPath, jobs: 1 });
+    try {
+      const [exitCode, , errorOutput] = await runThroughDaemon(TEST_DIR, ['--format', 'xml', rulesFilePath]);
+
+      assert.strictEqual(exitCode, 2);
+      assert.match(errorOutput, /Invalid format 'xml'/);
+    } finally {
+      await new Promise((resolve) => server.close(resolve));
+    }
+  });
+
+  it('refuses requests from another directory so the client runs one-shot', async () => {
+    const server = await serveLinting({ projectRoot: TEST_DIR, socketPath, jobs: 1 });
+    try {
+      const [exitCode, output] = await runThroughDaemon('/', ['--auto']);
+
+      assert.strictEqual(exitCode, null);
+      assert.strictEqual(output, '');
+    } finally {
+      await new Promise((resolve) => server.close(resolve));
+    }
+  });
+
+  it('lints a stdin batch sent with the request', async () => {
+    const server = await serveLinting({ projectRoot: TEST_DIR, socketPath, jobs: 1 });
+    try {
+      const stdout = createCapture();
+      const stderr = createCapture();
+      const batch = JSON.stringify([{ path: 'src/proposed.js', content: 'const first = 1;\nlet second = 2;\n' }]);
+      const exitCode = await requestDaemonRun(
+        socketPath, TEST_DIR, ['--stdin', '--format', 'json', rulesFilePath], stdout.stream, stderr.stream, batch
+      );
+
+      const summary = JSON.parse(stdout.text()) as { results: { ruleId: string; filePath: string; line: number }[] };
+      assert.strictEqual(exitCode, 1);
+      assert.deepStrictEqual(
+        summary.results.map((result) => [result.filePath, result.line]),
+        [[path.join(TEST_DIR, 'src/proposed.js'), 2]]
+      );
+    } finally {
+      await new Promise((resolve) => server.close(resolve));
+    }
+  });
+
+  it('lints files edited between two pooled requests from their new contents', async () => {
+    const pooledRoot = path.join(TEST_DIR, 'pooled');
+    const pooledRulesPath = path.join(pooledRoot, 'vars.rules.json');
+    const pooledSocketPath = path.join(TEST_DIR, 'pooled.sock');
+    const sourcePaths = Array.from({ length: 70 }, (_file, fileIndex) => path.join(pooledRoot, `src/file${fileIndex}.js`));
+    await mkdir(path.join(pooledRoot, 'src'), { recursive: true });
+    await writeFile(pooledRulesPath, await readFile(rulesFilePath, 'utf-8'));
+    await Promise.all(sourcePaths.map((sourcePath) => writeFile(sourcePath, 'const first = 1;\n')));
+
+    const server = await serveLinting({ projectRoot: pooledRoot, socketPath: pooledSocketPath, jobs: 2 });
+    try {
+      const runCount = async (): Promise<number> => {
+        const stdout = createCapture();
+        await requestDaemonRun(pooledSocketPath, pooledRoot, ['--count-only', pooledRulesPath], stdout.stream, createCapture().stream);
+        return (JSON.parse(stdout.text()) as { total: number }).total;
+      };
+
+      const cleanTotal = await runCount();
+      await Promise.all(sourcePaths.map((sourcePath) => writeFile(sourcePath, 'let first = 1;\nlet second = 2;\n')));
+      const editedTotal = await runCount();
+
+      assert.strictEqual(cleanTotal, 0);
+      assert.strictEqual(editedTotal, 140);
+    } finally {
+      await new Promise((resolve) => server.close(resolve));
+    }
+  });
+
+  it('falls back when the daemon answers with a garbled frame', async () => {
+    const garbledSocketPath = path.join(TEST_DIR, 'garbled.sock');
+    const garbledServer = net.createServer((socket) => {
+      socket.once('data', () => socket.end('{"stdout": not json\n'));
+    });
+    await new Promise<void>((resolve) => garbledServer.listen(garbledSocketPath, resolve));
+    try {
+      const stdout = createCapture();
+      const exitCode = await requestDaemonRun(garbledSocketPath, TEST_DIR, ['--auto'], stdout.stream, createCapture().stream);
+
+      assert.strictEqual(exitCode, null);
+      assert.strictEqual(stdout.text(), '');
+    } finally {
+      await new Promise((resolve) => garbledServer.close(resolve));
+    }
+  });
+
+  it('falls back when the socket is stale and replaces it on serve', async () => {
+    await writeFile(socketPath, '');
+
+    const [staleExitCode] = await runThroughDaemon(TEST_DIR, ['--auto']);
+    const server = await serveLinting({ projectRoot: TEST_DIR, socketPath, jobs: 1 });
+    try {
+      const [exitCode] = await runThroughDaemon(TEST_DIR, ['--version']);
+
+      assert.strictEqual(staleExitCode, null);
+      assert.strictEqual(exitCode, 0);
+    } finally {
+      await new Promise((resolve) => server.close(resolve));
+    }
+  });
+});
@@ -0,0 +1,122 @@
+import { describe, it, after } from 'node:test';
+import assert from 'node:assert';
+import { writeFile, mkdir, rm, readdir, chmod, stat } from 'node:fs/promises';
+import path from 'node:path';
+import { coalesceRun, readTimeBudgetOption, preparePrivateDirectory } from '../src/single-flight.js';
+import type { SharedRun } from '../src/single-flight.js';
+
+/** A pid no process has: above the Linux and macOS limits */
+const DEAD_PID = 4_194_305;
+
+describe('single-flight', () => {
+  const TEST_DIR = `/tmp/flight-lint-single-flight-test-${Date.now()}`;
+
+  after(async () => {
+    await rm(TEST_DIR, { recursive: true, force: true });
+  });
+
+  /**
+   * Create a run that counts its calls and takes a while to finish.
+   */
+  function createSlowRun(): { runShared: () => Promise<SharedRun>; runCount: () => number } {
+    let runCount = 0;
+    const runShared = async (): Promise<SharedRun> => {
+      runCount++;
+      const runNumber = runCount;
+      await new Promise((resolve) => setTimeout(resolve, 150));
+      return { exitCode: 1, stdout: `run ${runNumber}\n`, stderr: '' };
+    };
+    return { runShared, runCount: () => runCount };
+  }
+
+  it('coalesces callers that overlap a run into one following run', async () => {
+    const flightDirectory = path.join(TEST_DIR, 'overlap');
+    const slowRun = createSlowRun();
+
+    const firstCaller = coalesceRun(flightDirectory, slowRun.runShared);
+    await new Promise((resolve) => setTimeout(resolve, 50));
+    const overlappingCallers = [1, 2, 3].map(() => coalesceRun(flightDirectory, slowRun.runShared));
+
+    const firstRun = await firstCaller;
+    const overlappingRuns = await Promise.all(overlappingCallers);
+
+    assert.strictEqual(slowRun.runCount(), 2);
+    assert.strictEqual(firstRun.stdout, 'run 1\n');
+    assert.deepStrictEqual(overlappingRuns.map((sharedRun) => sharedRun.stdout), ['run 2\n', 'run 2\n', 'run 2\n']);
+    assert.ok(overlappingRuns.every((sharedRun) => sharedRun.exitCode === 1));
+    assert.deepStrictEqual((await readdir(flightDirectory)).filter((entryName) => !entryName.endsWith('.json')), []);
+  });
+
+  it('starts a fresh run once the previous one has finished', async () => {
+    const flightDirectory = path.join(TEST_DIR, 'sequential');
+    const slowRun = createSlowRun();
+
+    await coalesceRun(flightDirectory, slowRun.runShared);
+    const laterRun = await coalesceRun(flightDirectory, slowRun.runShared);
+
+    assert.strictEqual(laterRun.stdout, 'run 2\n');
+  });
+
+  it('takes over locks left by a process that died', async () => {
+    const flightDirectory = path.join(TEST_DIR, 'stale');
+    await mkdir(flightDirectory, { recursive: true });
+    await writeFile(path.join(flightDirectory, 'running'), `${DEAD_PID} dead-run\n`);
+    await writeFile(path.join(flightDirectory, 'pending'), `${DEAD_PID} dead-next-run\n`);
+    const slowRun = createSlowRun();
+
+    const sharedRun = await coalesceRun(flightDirectory, slowRun.runShared);
+
+    assert.strictEqual(sharedRun.stdout, 'run 1\n');
+  });
+
+  it('stops waiting at the deadline and hands the next run to the callers left', async () => {
+    const flightDirectory = path.join(TEST_DIR, 'deadline');
+    const slowRun = createSlowRun();
+    const pastDeadlineRun = async (): Promise<SharedRun> => ({ exitCode: 0, stdout: 'incomplete\n', stderr: '' });
+
+    const firstCaller = coalesceRun(flightDirectory, slowRun.runShared);
+    await new Promise((resolve) => setTimeout(resolve, 50));
+    const limitedCallers = [1, 2].map(() =>
+      coalesceRun(flightDirectory, slowRun.runShared, { deadline: Date.now() + 30, runPastDeadline: pastDeadlineRun })
+    );
+    await new Promise((resolve) => setTimeout(resolve, 10));
+    const patientCaller = coalesceRun(flightDirectory, slowRun.runShared);
+
+    const startTime = Date.now();
+    const limitedRuns = await Promise.all(limitedCallers);
+    const waitedMs = Date.now() - startTime;
+
+    assert.deepStrictEqual(limitedRuns.map((sharedRun) => sharedRun.stdout), ['incomplete\n', 'incomplete\n']);
+    assert.ok(waitedMs < 100, `waited ${waitedMs} ms`);
+    assert.strictEqual((await firstCaller).stdout, 'run 1\n');
+    assert.strictEqual((await patientCaller).stdout, 'run 2\n');
+  });
+
+  it('reads --time-budget from the lint arguments', () => {
+    assert.strictEqual(readTimeBudgetOption(['--auto', '--time-budget', '1500']), 1500);
+    assert.strictEqual(readTimeBudgetOption(['--time-budget=250', '--auto']), 250);
+    assert.strictEqual(readTimeBudgetOption(['--auto']), null);
+  });
+
+  it('shares a failed run as a configuration error', async () => {
+    const flightDirectory = path.join(TEST_DIR, 'failed');
+
+    const sharedRun = await coalesceRun(flightDirectory, async () => {
+      throw new Error('rules file missing');
+    });
+
+    assert.deepStrictEqual(sharedRun, { exitCode: 2, stdout: '', stderr: 'Error: rules file missing\n' });
+  });
+
+  it('keeps its directory private and refuses one open to other users', async () => {
+    const privateDirectory = path.join(TEST_DIR, 'private');
+    const sharedDirectory = path.join(TEST_DIR, 'shared');
+    await mkdir(sharedDirectory, { recursive: true });
+    await chmod(sharedDirectory, 0o777);
+
+    preparePrivateDirectory(privateDirectory);
+
+    assert.strictEqual((await stat(privateDirectory)).mode & 0o777, 0o700);
+    assert.throws(() => preparePrivateDirectory(sharedDirectory), /not a private directory/);
+  });
+});